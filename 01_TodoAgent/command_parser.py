@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Local parser for TodoAgent commands
+
+Handles the common commands (add, list, complete, delete, priority and due
+date changes, search) with regular expressions, producing the same structure
+the GPT parser returns. Anything it is not sure about returns None so the
+caller can fall back to GPT.
+"""
+
+import re
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+CATEGORIES = ["work", "personal", "shopping", "health", "learning", "other"]
+
+PRIORITY_WORDS = {
+    "high": "high", "urgent": "high", "important": "high", "critical": "high", "asap": "high",
+    "medium": "medium", "normal": "medium", "moderate": "medium",
+    "low": "low", "minor": "low", "someday": "low",
+}
+
+STATUS_WORDS = {
+    "done": "completed", "complete": "completed", "completed": "completed", "finished": "completed",
+    "in progress": "in_progress", "in_progress": "in_progress", "started": "in_progress", "active": "in_progress",
+    "pending": "pending", "todo": "pending", "not done": "pending", "open": "pending", "incomplete": "pending",
+}
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+
+_ID = r"(?:task|todo|item|number|no\.?)?\s*#?(?P<id>\d+)"
+_PRIORITY = "|".join(sorted(PRIORITY_WORDS, key=len, reverse=True))
+_STATUS = "|".join(sorted(STATUS_WORDS, key=len, reverse=True))
+_CATEGORY = "|".join(CATEGORIES)
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+_WEEKDAY = "|".join(WEEKDAYS)
+
+# Date expressions, most specific first
+_DATE = (
+    r"\d{4}-\d{1,2}-\d{1,2}"
+    rf"|{_MONTH}\s+\d{{1,2}}(?:st|nd|rd|th)?(?:,?\s+\d{{4}})?"
+    rf"|\d{{1,2}}(?:st|nd|rd|th)?\s+(?:of\s+)?{_MONTH}(?:,?\s+\d{{4}})?"
+    r"|today|tonight|tomorrow|day after tomorrow"
+    r"|(?:this|next)\s+(?:week|month|weekend)"
+    r"|in\s+(?:\d+|a|an|one|two|three)\s+(?:days?|weeks?|months?)"
+    rf"|(?:(?:this|next)\s+)?(?:{_WEEKDAY})"
+)
+
+_SMALL_NUMBERS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3}
+
+
+def resolve_date(text: str, today: Optional[date] = None) -> Optional[str]:
+    """Turns a date expression ("tomorrow", "next friday", "jan 20", "2024-01-20") into YYYY-MM-DD."""
+    today = today or date.today()
+    text = " ".join(text.lower().replace(",", " ").split())
+
+    m = re.fullmatch(r"(\d{4})-(\d{1,2})-(\d{1,2})", text)
+    if m:
+        try:
+            return date(*map(int, m.groups())).isoformat()
+        except ValueError:
+            return None
+
+    m = (re.fullmatch(rf"(?P<month>{_MONTH})\s+(?P<day>\d{{1,2}})(?:st|nd|rd|th)?(?:\s+(?P<year>\d{{4}}))?", text)
+         or re.fullmatch(rf"(?P<day>\d{{1,2}})(?:st|nd|rd|th)?\s+(?:of\s+)?(?P<month>{_MONTH})(?:\s+(?P<year>\d{{4}}))?", text))
+    if m:
+        month = MONTHS.index(m.group("month")[:3]) + 1
+        try:
+            if m.group("year"):
+                return date(int(m.group("year")), month, int(m.group("day"))).isoformat()
+            # Without a year, the next time that date comes round
+            candidate = date(today.year, month, int(m.group("day")))
+            if candidate < today:
+                candidate = date(today.year + 1, month, int(m.group("day")))
+            return candidate.isoformat()
+        except ValueError:
+            return None
+
+    if text in ("today", "tonight"):
+        return today.isoformat()
+    if text == "tomorrow":
+        return (today + timedelta(days=1)).isoformat()
+    if text == "day after tomorrow":
+        return (today + timedelta(days=2)).isoformat()
+    if text in ("this week", "this weekend"):
+        # The coming Sunday (Saturday for the weekend)
+        target = 6 if text == "this week" else 5
+        return (today + timedelta(days=(target - today.weekday()) % 7)).isoformat()
+    if text == "next weekend":
+        return (today + timedelta(days=(5 - today.weekday()) % 7 + 7)).isoformat()
+    if text == "next week":
+        return (today + timedelta(weeks=1)).isoformat()
+    if text in ("this month", "next month"):
+        first_of_next = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+        if text == "this month":
+            return (first_of_next - timedelta(days=1)).isoformat()
+        return first_of_next.isoformat()
+
+    m = re.fullmatch(r"in\s+(\d+|a|an|one|two|three)\s+(day|week|month)s?", text)
+    if m:
+        count = int(m.group(1)) if m.group(1).isdigit() else _SMALL_NUMBERS[m.group(1)]
+        days = {"day": 1, "week": 7, "month": 30}[m.group(2)] * count
+        return (today + timedelta(days=days)).isoformat()
+
+    m = re.fullmatch(rf"(?:(this|next)\s+)?({_WEEKDAY})", text)
+    if m:
+        ahead = (WEEKDAYS.index(m.group(2)) - today.weekday()) % 7 or 7
+        if m.group(1) == "next" and ahead < 7:
+            ahead += 7
+        return (today + timedelta(days=ahead)).isoformat()
+    return None
+
+
+def _empty(action: str, **fields: Any) -> Dict[str, Any]:
+    result = {
+        "action": action, "task": None, "priority": None, "category": None, "due_date": None,
+        "status": None, "task_id": None, "search_term": None,
+    }
+    result.update(fields)
+    return result
+
+
+def _take(pattern: str, text: str) -> Tuple[Optional[re.Match], str]:
+    """Finds `pattern` in `text` and returns the match and the text with it removed."""
+    m = re.search(pattern, text, re.IGNORECASE)
+    if not m:
+        return None, text
+    return m, text[:m.start()] + " " + text[m.end():]
+
+
+def _take_date(pattern: str, text: str, today: date) -> Tuple[Optional[str], str]:
+    """Like _take for a date phrase: (YYYY-MM-DD or None, rest), or ("", text) when it cannot be used locally."""
+    m, rest = _take(pattern, text)
+    if not m:
+        return None, text
+    due_date = resolve_date(m.group("date"), today)
+    # "every monday" is a recurring task, not a due date; leave it to GPT
+    if not due_date or re.search(r"\b(?:every|each)\s+(?:other\s+)?$", text[:m.start()], re.IGNORECASE):
+        return "", text
+    return due_date, rest
+
+
+def _extract_fields(text: str, today: date) -> Tuple[Dict[str, Any], str]:
+    """Pulls priority, category and due date phrases out of free text; returns them and what is left."""
+    fields: Dict[str, Any] = {}
+    # Dates count after due/by/on anywhere, otherwise only at the end ("prepare talk for next week conference"
+    # keeps its wording); the end is checked again once a trailing priority or category is gone
+    trailing_date = rf"\b(?P<date>{_DATE})\s*[.!]?\s*$"
+
+    due_date, text = _take_date(rf"\b(?:due(?:[ _]date)?|by|before|on)\s*:?\s+(?P<date>{_DATE})\b", text, today)
+    if due_date is None:
+        due_date, text = _take_date(trailing_date, text, today)
+    if due_date == "":
+        return {}, ""
+
+    m, text = _take(rf"\b(?:with\s+|as\s+)?(?:a\s+)?(?:priority\s*:?\s*(?P<p1>{_PRIORITY})|(?P<p2>{_PRIORITY})[\s-]+priority)\b", text)
+    if not m:
+        # A bare "urgent" is a priority at either end or after "mark as", not inside the task ("fix urgent care form")
+        m, text = _take(r"^\s*(?P<p1>urgent|important|critical|asap)\b[,:]?"
+                        r"|\bmark(?:ed)?\s+(?:it\s+)?as\s+(?P<p2>urgent|important|critical|asap)\b"
+                        r"|(?:,\s*)?\b(?P<p3>urgent|important|critical|asap)\s*[.!]?\s*$", text)
+    if m:
+        fields["priority"] = PRIORITY_WORDS[next(word for word in m.groupdict().values() if word).lower()]
+
+    m, text = _take(rf"(?:\b(?:in\s+(?:the\s+)?|under\s+)?(?:category\s*:?\s*(?P<c1>{_CATEGORY})|(?P<c2>{_CATEGORY})\s+category)\b"
+                    rf"|#(?P<c3>{_CATEGORY})\b)", text)
+    if m:
+        fields["category"] = (m.group("c1") or m.group("c2") or m.group("c3")).lower()
+
+    if due_date is None:
+        due_date, text = _take_date(trailing_date, text.rstrip(" ,.;:-"), today)
+        if due_date == "":
+            return {}, ""
+    if due_date:
+        fields["due_date"] = due_date
+
+    text = re.sub(r"\s+(?:on|by|for|due|before|with)\s*$", "", " ".join(text.split()), flags=re.IGNORECASE)
+    return fields, text.strip(" ,.;:-")
+
+
+def _parse_list(rest: str, today: date) -> Optional[Dict[str, Any]]:
+    filters: Dict[str, Any] = {}
+    text = rest.lower()
+    m, text = _take(rf"\b(?P<s>{_STATUS})\b", text)
+    if m:
+        filters["status"] = STATUS_WORDS[m.group("s")]
+    m, text = _take(rf"\b(?P<p>{_PRIORITY})\b(?:[\s-]+priority)?", text)
+    if m:
+        filters["priority"] = PRIORITY_WORDS[m.group("p")]
+    m, text = _take(rf"\b(?P<c>{_CATEGORY})\b", text)
+    if m:
+        filters["category"] = m.group("c")
+    m, text = _take(r"\b(?P<d>overdue|late)\b", text)
+    if m:
+        filters["due_filter"] = "overdue"
+    else:
+        m, text = _take(rf"\b(?:due\s+)?(?:(?:on|by|before)\s+)?(?P<d>{_DATE})\b", text)
+        if m:
+            due_date = resolve_date(m.group("d"), today)
+            if not due_date:
+                return None
+            # "this week" and the like mean everything up to that date, a specific day means that day
+            by = re.match(r"(?:this|next)\s+(?:week|month|weekend)|in\s", m.group("d"))
+            filters["due_filter"] = f"by:{due_date}" if by else due_date
+    leftover = set(text.split()) - {"all", "my", "the", "todos", "todo", "tasks", "task", "items", "item",
+                                    "priority", "category", "due", "that", "are", "is", "with", "in", "of", "me",
+                                    "what", "what's", "whats", "which", "s"}
+    if leftover:
+        return None
+    return _empty("list", **filters)
+
+
+def _parse_update(task_id: int, rest: str, today: date) -> Optional[Dict[str, Any]]:
+    """Field changes for one task: "priority high", "due friday", "category work", "as completed"..."""
+    text = rest.strip()
+    m = re.fullmatch(rf"(?:as\s+|to\s+)?(?P<s>{_STATUS})", text, re.IGNORECASE)
+    if m:
+        return _empty("mark", task_id=task_id, status=STATUS_WORDS[m.group("s").lower()])
+    m = re.fullmatch(rf"(?:as\s+|to\s+)?(?P<p>{_PRIORITY})(?:\s+priority)?", text, re.IGNORECASE)
+    if m:
+        return _empty("update", task_id=task_id, priority=PRIORITY_WORDS[m.group("p").lower()])
+    m = re.fullmatch(rf"(?:to\s+|for\s+|until\s+)(?P<date>{_DATE})", text, re.IGNORECASE)
+    if m:
+        due_date = resolve_date(m.group("date"), today)
+        return _empty("update", task_id=task_id, due_date=due_date) if due_date else None
+
+    m, text = _take(rf"\bstatus\s*:?\s*(?:to\s+)?(?P<s>{_STATUS})\b", text)
+    status = STATUS_WORDS[m.group("s").lower()] if m else None
+    text = re.sub(rf"\bpriority\s+(?:to\s+)(?={_PRIORITY})", "priority ", text, flags=re.IGNORECASE)
+    text = re.sub(r"\b(?:due(?:[ _]date)?|deadline)\s+(?:to\s+)", "due ", text, flags=re.IGNORECASE)
+    text = re.sub(rf"\bcategory\s+(?:to\s+)(?={_CATEGORY})", "category ", text, flags=re.IGNORECASE)
+    fields, leftover = _extract_fields(text, today)
+    if status:
+        fields["status"] = status
+    if not fields or re.sub(r"\b(?:and|set|to|with|the)\b", "", leftover, flags=re.IGNORECASE).strip(" ,"):
+        return None
+    return _empty("update", task_id=task_id, **fields)
+
+
+def parse_command(command: str, today: Optional[date] = None) -> Optional[Dict[str, Any]]:
+    """
+    Parses a todo command locally. Returns the same fields as the GPT parser
+    (list commands may also carry status/priority/category and a due_filter),
+    or None when the command should go to GPT.
+    """
+    today = today or date.today()
+    text = " ".join(command.strip().split()).rstrip("?!")
+    if not text:
+        return None
+    lower = text.lower()
+
+    m = re.fullmatch(r"(?:add|create|new|remember to|remind me to|todo:?)\s+(?:(?:a\s+)?(?:new\s+)?(?:task|todo)\s*:?\s+)?(?P<rest>.+)", text, re.IGNORECASE)
+    if m:
+        fields, task = _extract_fields(m.group("rest"), today)
+        if not task:
+            return None
+        return _empty("add", task=task, status="pending", **fields)
+
+    m = re.fullmatch(r"(?:list|show|display|view|what are|what's|whats)(?:\s+me)?(?P<rest>.*)", lower)
+    if m:
+        return _parse_list(m.group("rest"), today)
+
+    m = re.fullmatch(r"(?:search|find|look for|look up)\s+(?:for\s+)?(?P<term>.+)", text, re.IGNORECASE)
+    if m:
+        return _empty("search", search_term=m.group("term").strip("'\" "))
+
+    m = re.fullmatch(rf"(?:delete|remove|drop|erase|cancel)\s+{_ID}", lower)
+    if m:
+        return _empty("delete", task_id=int(m.group("id")))
+
+    m = re.fullmatch(rf"(?:complete|finish|done|check off|close|tick off|finished)\s+{_ID}", lower) \
+        or re.fullmatch(rf"{_ID}\s+(?:is\s+)?(?:done|completed|complete|finished)", lower)
+    if m:
+        return _empty("mark", task_id=int(m.group("id")), status="completed")
+    m = re.fullmatch(rf"(?:start|begin|work on)\s+(?:working\s+on\s+)?{_ID}", lower)
+    if m:
+        return _empty("mark", task_id=int(m.group("id")), status="in_progress")
+    m = re.fullmatch(rf"(?:reopen|uncheck|unmark|undo)\s+{_ID}", lower)
+    if m:
+        return _empty("mark", task_id=int(m.group("id")), status="pending")
+
+    m = re.fullmatch(rf"(?:set|change|update)\s+(?:the\s+)?(?P<field>priority|due date|due_date|deadline|category|status)"
+                     rf"\s+(?:of|for|on)\s+{_ID}\s+(?:to\s+|as\s+)?(?P<value>.+)", lower)
+    if m:
+        field = {"due date": "due", "due_date": "due", "deadline": "due"}.get(m.group("field"), m.group("field"))
+        return _parse_update(int(m.group("id")), f"{field} {m.group('value')}", today)
+
+    m = re.fullmatch(rf"(?:mark|set|make|update|edit|change|modify|move|reschedule|push)\s+{_ID}\s+(?P<rest>.+)", lower) \
+        or re.fullmatch(rf"{_ID}\s+(?P<rest>(?:is\s+)?(?:due|priority|category|status)\b.+)", lower)
+    if m:
+        rest = re.sub(r"^is\s+", "", m.group("rest"))
+        return _parse_update(int(m.group("id")), rest, today)
+
+    return None
+
+
+def mentions_status(command: str) -> bool:
+    """Whether the command names a status at all; GPT tends to fill one in regardless."""
+    return re.search(rf"\b(?:status|{_STATUS})\b", command, re.IGNORECASE) is not None
+
+
+def normalize_command(command: str) -> str:
+    """Cache key for a command: case and whitespace do not change its meaning."""
+    return " ".join(command.lower().split())
+
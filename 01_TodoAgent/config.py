@@ -24,6 +24,10 @@ if os.path.exists(env_file):
 # Or use environment variable (recommended)
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
+# Storage and parsing settings
+TODOS_DB = os.getenv('TODOS_DB', 'todos.db')  # SQLite database; todos.json is imported on first run
+PARSE_CACHE_SIZE = int(os.getenv('PARSE_CACHE_SIZE', '256'))  # GPT parses kept for repeated commands
+
 def get_api_key():
     """Get the OpenAI API key from various sources."""
     # First check if it's set in this file
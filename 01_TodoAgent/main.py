@@ -12,58 +12,76 @@ Features:
 - Due dates and reminders
 - Categories and tags
 - Status tracking (Pending, In Progress, Completed)
-- Persistent JSON storage
+- Fast local parsing of common commands, GPT for the rest
+- Persistent SQLite storage with indexed filtering
 - Interactive CLI interface
 
 Author: Muhammad Sami Asghar Mughal
 """
 
 import json
-import os
 import sys
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Any
 import openai
 from colorama import init, Fore, Back, Style
-from config import get_api_key, setup_instructions
+from config import get_api_key, setup_instructions, TODOS_DB, PARSE_CACHE_SIZE
+from command_parser import mentions_status, parse_command, normalize_command
+from todo_store import TodoStore
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
 
 class TodoAgent:
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize the TodoAgent with OpenAI API key and load existing todos."""
+    def __init__(self, api_key: Optional[str] = None, db_path: Optional[str] = None):
+        """Initialize the TodoAgent with OpenAI API key and open the todo database."""
         self.api_key = api_key or get_api_key()
         if not self.api_key:
             print(f"{Fore.RED}❌ Error: OpenAI API key not found!")
             print()
             setup_instructions()
             sys.exit(1)
-        self.todos_file = "todos.json"
-        self.todos = self.load_todos()
+        self.todos_file = "todos.json"  # imported into the database on first run
+        self.store = TodoStore(db_path or TODOS_DB, import_json=self.todos_file)
+        self._client = None
+        # LRU cache of GPT parses, keyed by day (relative dates) and normalized command
+        self._parse_cache = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
         self.categories = ["work", "personal", "shopping", "health", "learning", "other"]
         self.priorities = ["high", "medium", "low"]
         self.statuses = ["pending", "in_progress", "completed"]
         
-    def load_todos(self) -> List[Dict[str, Any]]:
-        """Load todos from JSON file."""
-        try:
-            if os.path.exists(self.todos_file):
-                with open(self.todos_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"{Fore.RED}❌ Error loading todos: {e}")
-        return []
-    
-    def save_todos(self):
-        """Save todos to JSON file."""
-        try:
-            with open(self.todos_file, 'w', encoding='utf-8') as f:
-                json.dump(self.todos, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"{Fore.RED}❌ Error saving todos: {e}")
+    @property
+    def todos(self) -> List[Dict[str, Any]]:
+        """All todos, by ID."""
+        return self.store.all()
     
     def parse_natural_language(self, command: str) -> Dict[str, Any]:
+        """Parse a command locally if possible, otherwise with OpenAI GPT (cached)."""
+        parsed = parse_command(command)
+        if parsed:
+            return parsed
+        
+        key = (date.today().isoformat(), normalize_command(command))
+        with self._parse_cache_lock:
+            if key in self._parse_cache:
+                self._parse_cache.move_to_end(key)
+                return dict(self._parse_cache[key])
+        
+        parsed = self.parse_with_gpt(command)
+        if parsed.get("action") == "update" and not mentions_status(command):
+            # The prompt's examples default status to "pending"; an update must not reopen a task unasked
+            parsed["status"] = None
+        if parsed.get("action") != "error":
+            with self._parse_cache_lock:
+                self._parse_cache[key] = dict(parsed)
+                if len(self._parse_cache) > PARSE_CACHE_SIZE:
+                    self._parse_cache.popitem(last=False)
+        return parsed
+    
+    def parse_with_gpt(self, command: str) -> Dict[str, Any]:
         """Use OpenAI GPT to parse natural language commands into structured data."""
         try:
             system_prompt = """You are a todo management assistant. Parse the user's natural language command and return a JSON object with the following structure:
@@ -86,7 +104,7 @@ Rules:
 - For "delete" action: extract task_id
 - For "mark" action: extract task_id and status
 - For "search" action: extract search_term
-- If due_date is mentioned as "tomorrow", "next week", etc., convert to YYYY-MM-DD
+- If due_date is mentioned as "tomorrow", "next week", etc., convert to YYYY-MM-DD (today is """ + date.today().isoformat() + """)
 - If priority is mentioned as "urgent", "important", "low priority", etc., map to high/medium/low
 - If no specific values are provided, use null
 
@@ -99,8 +117,9 @@ Examples:
 
 Return only the JSON object, no additional text."""
 
-            client = openai.OpenAI(api_key=self.api_key)
-            response = client.chat.completions.create(
+            if self._client is None:
+                self._client = openai.OpenAI(api_key=self.api_key)
+            response = self._client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -125,19 +144,7 @@ Return only the JSON object, no additional text."""
             if due_date:
                 datetime.strptime(due_date, "%Y-%m-%d")
             
-            todo = {
-                "id": len(self.todos) + 1,
-                "task": task,
-                "priority": priority,
-                "category": category,
-                "due_date": due_date,
-                "status": status,
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat()
-            }
-            
-            self.todos.append(todo)
-            self.save_todos()
+            todo = self.store.add(task, priority, category, due_date, status)
             
             print(f"{Fore.GREEN}✅ Added todo: {task}")
             self.display_todo(todo)
@@ -149,16 +156,23 @@ Return only the JSON object, no additional text."""
     
     def list_todos(self, filter_status: Optional[str] = None, 
                    filter_category: Optional[str] = None, 
-                   filter_priority: Optional[str] = None):
-        """List all todos with optional filtering."""
-        filtered_todos = self.todos.copy()
-        
-        if filter_status:
-            filtered_todos = [t for t in filtered_todos if t["status"] == filter_status]
-        if filter_category:
-            filtered_todos = [t for t in filtered_todos if t["category"] == filter_category]
-        if filter_priority:
-            filtered_todos = [t for t in filtered_todos if t["priority"] == filter_priority]
+                   filter_priority: Optional[str] = None,
+                   filter_due: Optional[str] = None):
+        """
+        List all todos with optional filtering. filter_due is "overdue",
+        a YYYY-MM-DD date, or "by:YYYY-MM-DD" for everything due up to then.
+        """
+        due = {}
+        if filter_due == "overdue":
+            due["due_before"] = date.today().isoformat()
+        elif filter_due and filter_due.startswith("by:"):
+            due["due_by"] = filter_due[3:]
+        elif filter_due:
+            due["due_on"] = filter_due
+        filtered_todos = self.store.query(status=filter_status, category=filter_category,
+                                          priority=filter_priority, **due)
+        if filter_due == "overdue" and not filter_status:
+            filtered_todos = [t for t in filtered_todos if t["status"] != "completed"]
         
         if not filtered_todos:
             print(f"{Fore.YELLOW}📝 No todos found.")
@@ -217,19 +231,14 @@ Return only the JSON object, no additional text."""
     def update_todo(self, task_id: int, **kwargs) -> bool:
         """Update a todo item."""
         try:
-            todo = next((t for t in self.todos if t["id"] == task_id), None)
+            if kwargs.get("due_date"):
+                datetime.strptime(kwargs["due_date"], "%Y-%m-%d")
+            
+            todo = self.store.update(task_id, **kwargs)
             if not todo:
                 print(f"{Fore.RED}❌ Todo with ID {task_id} not found.")
                 return False
             
-            # Update fields
-            for key, value in kwargs.items():
-                if key in todo and value is not None:
-                    todo[key] = value
-            
-            todo["updated_at"] = datetime.now().isoformat()
-            self.save_todos()
-            
             print(f"{Fore.GREEN}✅ Updated todo {task_id}")
             self.display_todo(todo)
             return True
@@ -241,14 +250,11 @@ Return only the JSON object, no additional text."""
     def delete_todo(self, task_id: int) -> bool:
         """Delete a todo item."""
         try:
-            todo = next((t for t in self.todos if t["id"] == task_id), None)
-            if not todo:
+            todo = self.store.get(task_id)
+            if not todo or not self.store.delete(task_id):
                 print(f"{Fore.RED}❌ Todo with ID {task_id} not found.")
                 return False
             
-            self.todos = [t for t in self.todos if t["id"] != task_id]
-            self.save_todos()
-            
             print(f"{Fore.GREEN}✅ Deleted todo: {todo['task']}")
             return True
             
@@ -262,10 +268,7 @@ Return only the JSON object, no additional text."""
     
     def search_todos(self, search_term: str):
         """Search todos by task description."""
-        matching_todos = [
-            todo for todo in self.todos 
-            if search_term.lower() in todo["task"].lower()
-        ]
+        matching_todos = self.store.query(search=search_term)
         
         if not matching_todos:
             print(f"{Fore.YELLOW}🔍 No todos found matching '{search_term}'")
@@ -279,10 +282,11 @@ Return only the JSON object, no additional text."""
     
     def get_statistics(self):
         """Display todo statistics."""
-        total = len(self.todos)
-        completed = len([t for t in self.todos if t["status"] == "completed"])
-        pending = len([t for t in self.todos if t["status"] == "pending"])
-        in_progress = len([t for t in self.todos if t["status"] == "in_progress"])
+        counts = self.store.status_counts()
+        total = sum(counts.values())
+        completed = counts.get("completed", 0)
+        pending = counts.get("pending", 0)
+        in_progress = counts.get("in_progress", 0)
         
         print(f"{Fore.CYAN}📊 Todo Statistics:")
         print(f"{Fore.WHITE}Total todos: {Fore.CYAN}{total}")
@@ -318,7 +322,12 @@ Return only the JSON object, no additional text."""
                 )
             
             elif action == "list":
-                self.list_todos()
+                self.list_todos(
+                    filter_status=parsed.get("status"),
+                    filter_category=parsed.get("category"),
+                    filter_priority=parsed.get("priority"),
+                    filter_due=parsed.get("due_filter")
+                )
             
             elif action == "update":
                 if parsed["task_id"]:
@@ -327,6 +336,7 @@ Return only the JSON object, no additional text."""
                     if parsed["priority"]: update_data["priority"] = parsed["priority"]
                     if parsed["category"]: update_data["category"] = parsed["category"]
                     if parsed["due_date"]: update_data["due_date"] = parsed["due_date"]
+                    if parsed["status"]: update_data["status"] = parsed["status"]
                     
                     self.update_todo(parsed["task_id"], **update_data)
                 else:
@@ -403,6 +413,9 @@ Return only the JSON object, no additional text."""
         print(f"  {Fore.GREEN}• delete task 3")
         print(f"  {Fore.GREEN}• search groceries")
         print(f"  {Fore.GREEN}• update task 2 priority high due_date 2024-01-20")
+        print(f"  {Fore.GREEN}• move task 2 to friday")
+        print(f"  {Fore.GREEN}• list high priority work tasks")
+        print(f"  {Fore.GREEN}• list overdue / what's due today / show tasks due this week")
         print()
         print(f"{Fore.WHITE}Direct Commands:")
         print(f"  {Fore.YELLOW}• list - Show all todos")
@@ -414,8 +427,8 @@ Return only the JSON object, no additional text."""
         print(f"  {Fore.MAGENTA}• Priority levels: high, medium, low")
         print(f"  {Fore.MAGENTA}• Categories: work, personal, shopping, health, learning, other")
         print(f"  {Fore.MAGENTA}• Status: pending, in_progress, completed")
-        print(f"  {Fore.MAGENTA}• Due dates: YYYY-MM-DD format")
-        print(f"  {Fore.MAGENTA}• Persistent storage in todos.json")
+        print(f"  {Fore.MAGENTA}• Due dates: YYYY-MM-DD, today, tomorrow, friday, next week, jan 20, in 3 days")
+        print(f"  {Fore.MAGENTA}• Persistent storage in {self.store.db_path}")
 
 
 def main():
@@ -11,8 +11,12 @@ Usage:
 
 import json
 import os
-from datetime import datetime
+import shutil
+import tempfile
+from datetime import date, datetime
 from main import TodoAgent
+from command_parser import parse_command
+from todo_store import TodoStore
 
 def test_todo_agent():
     """Test the TodoAgent functionality."""
@@ -21,6 +25,11 @@ def test_todo_agent():
     # Create a test API key (this won't actually be used for API calls)
     test_api_key = "test_key_for_local_testing"
     
+    # Work in a scratch directory so real todos are never touched
+    original_dir = os.getcwd()
+    test_dir = tempfile.mkdtemp()
+    os.chdir(test_dir)
+    
     try:
         # Initialize the agent
         agent = TodoAgent(test_api_key)
@@ -76,19 +85,122 @@ def test_todo_agent():
         print("\n📊 Final statistics:")
         agent.get_statistics()
         
-        # Clean up test file
-        if os.path.exists("todos.json"):
-            os.remove("todos.json")
-            print("\n🧹 Cleaned up test file")
+        # Test local command parsing (no API call)
+        print("\n⚡ Testing local command handling...")
+        agent.process_command("add renew passport high priority due tomorrow")
+        todo = agent.todos[-1]
+        assert todo["task"] == "renew passport" and todo["priority"] == "high"
+        agent.process_command("mark task 1 as completed")
+        assert agent.store.get(1)["status"] == "completed"
+        
+        # GPT fills in "status": "pending" by default; an update that does not mention a status keeps it
+        agent.parse_with_gpt = lambda command: {
+            "action": "update", "task": "Buy groceries and milk", "priority": None, "category": None,
+            "due_date": None, "status": "pending", "task_id": 1, "search_term": None}
+        agent.process_command("update task 1 to say buy groceries and milk")
+        assert agent.store.get(1)["task"] == "Buy groceries and milk"
+        assert agent.store.get(1)["status"] == "completed", "GPT update reopened a completed task"
         
+        agent.store.close()
         print("\n🎉 All tests completed successfully!")
         
     except Exception as e:
         print(f"❌ Test failed: {e}")
         return False
     
+    finally:
+        # Clean up test files
+        os.chdir(original_dir)
+        shutil.rmtree(test_dir, ignore_errors=True)
+        print("\n🧹 Cleaned up test files")
+    
     return True
 
+def test_command_parser():
+    """Test that common commands are parsed locally, without GPT."""
+    print("\n⚡ Testing command parser...")
+    today = date(2024, 1, 15)  # a Monday
+    
+    cases = {
+        "add buy groceries": {"action": "add", "task": "buy groceries"},
+        "add urgent meeting with client tomorrow": {"action": "add", "task": "meeting with client",
+                                                    "priority": "high", "due_date": "2024-01-16"},
+        "add workout session high priority health category": {"action": "add", "task": "workout session",
+                                                               "priority": "high", "category": "health"},
+        "add pay rent by friday": {"action": "add", "task": "pay rent", "due_date": "2024-01-19"},
+        "mark task 1 as completed": {"action": "mark", "task_id": 1, "status": "completed"},
+        "task 4 is done": {"action": "mark", "task_id": 4, "status": "completed"},
+        "delete task 3": {"action": "delete", "task_id": 3},
+        "search groceries": {"action": "search", "search_term": "groceries"},
+        "set priority of task 2 to low": {"action": "update", "task_id": 2, "priority": "low"},
+        "update task 2 priority high due_date 2024-01-20": {"action": "update", "task_id": 2,
+                                                            "priority": "high", "due_date": "2024-01-20"},
+        "move task 5 to next week": {"action": "update", "task_id": 5, "due_date": "2024-01-22"},
+        "list high priority work tasks": {"action": "list", "priority": "high", "category": "work"},
+        "list overdue": {"action": "list", "due_filter": "overdue"},
+        "add fix urgent care form": {"action": "add", "task": "fix urgent care form", "priority": None},
+        "add call the bank, mark as important": {"action": "add", "task": "call the bank", "priority": "high"},
+        "add prepare talk for next week conference": {"action": "add", "task": "prepare talk for next week conference",
+                                                      "due_date": None},
+        "add call mom urgent tomorrow": {"action": "add", "task": "call mom", "priority": "high",
+                                         "due_date": "2024-01-16"},
+    }
+    
+    try:
+        for command, expected in cases.items():
+            parsed = parse_command(command, today)
+            assert parsed is not None, f"not parsed locally: {command}"
+            for key, value in expected.items():
+                assert parsed[key] == value, f"{command}: {key} = {parsed[key]!r}, expected {value!r}"
+        
+        # Commands the grammar cannot read are left for GPT
+        for command in ["what should I work on first", "update task 2 to say buy milk", "add",
+                        "add water plants every monday"]:
+            assert parse_command(command, today) is None, f"should fall back to GPT: {command}"
+        
+        print("✅ Command parser test passed")
+        return True
+        
+    except AssertionError as e:
+        print(f"❌ Command parser test failed: {e}")
+        return False
+
+def test_store_filters():
+    """Test the SQLite store's filtering and JSON import."""
+    print("\n🗄️ Testing todo store...")
+    test_dir = tempfile.mkdtemp()
+    
+    try:
+        json_file = os.path.join(test_dir, "todos.json")
+        with open(json_file, "w", encoding="utf-8") as f:
+            json.dump([{"id": 7, "task": "Imported task", "priority": "low", "category": "other",
+                        "due_date": None, "status": "pending", "created_at": "2024-01-01T00:00:00",
+                        "updated_at": "2024-01-01T00:00:00"}], f)
+        store = TodoStore(os.path.join(test_dir, "todos.db"), import_json=json_file)
+        assert store.get(7)["task"] == "Imported task"
+        
+        store.add("Due soon", "high", "work", "2024-01-16")
+        store.add("Due later", "high", "personal", "2024-02-01")
+        store.add("100% done_deal", "medium", "work", "2024-01-10", "completed")
+        
+        assert [t["task"] for t in store.query(priority="high")] == ["Due soon", "Due later"]
+        assert [t["task"] for t in store.query(due_by="2024-01-31")] == ["100% done_deal", "Due soon"]
+        assert [t["task"] for t in store.query(due_before="2024-01-16", status="completed")] == ["100% done_deal"]
+        assert [t["task"] for t in store.query(search="100%")] == ["100% done_deal"]
+        assert store.query(search="0%d") == []
+        assert store.status_counts() == {"pending": 3, "completed": 1}
+        store.close()
+        
+        print("✅ Store test passed")
+        return True
+        
+    except AssertionError as e:
+        print(f"❌ Store test failed: {e}")
+        return False
+    
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
 def test_data_structure():
     """Test the todo data structure."""
     print("\n🔧 Testing data structure...")
@@ -129,11 +241,15 @@ def main():
     # Test data structure
     structure_test = test_data_structure()
     
+    # Test command parsing and storage
+    parser_test = test_command_parser()
+    store_test = test_store_filters()
+    
     # Test agent functionality
     agent_test = test_todo_agent()
     
     print("\n" + "=" * 50)
-    if structure_test and agent_test:
+    if structure_test and parser_test and store_test and agent_test:
         print("🎉 All tests passed! TodoAgent is ready to use.")
         print("\nTo use the agent with OpenAI:")
         print("1. Set your OpenAI API key: export OPENAI_API_KEY=your_key")
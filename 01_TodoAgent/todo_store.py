@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+SQLite storage for TodoAgent
+
+Each change writes one row instead of rewriting a JSON file, and indexes on
+status, priority, category and due date keep listing and filtering fast with
+thousands of todos. An existing todos.json is imported on first use.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+FIELDS = ["id", "task", "priority", "category", "due_date", "status", "created_at", "updated_at"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS todos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task TEXT NOT NULL,
+    priority TEXT NOT NULL DEFAULT 'medium',
+    category TEXT NOT NULL DEFAULT 'other',
+    due_date TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_todos_due_date ON todos (due_date);
+CREATE INDEX IF NOT EXISTS idx_todos_priority ON todos (priority, due_date);
+CREATE INDEX IF NOT EXISTS idx_todos_status ON todos (status, due_date);
+CREATE INDEX IF NOT EXISTS idx_todos_category ON todos (category);
+"""
+
+
+class TodoStore:
+    """Todos in a SQLite database; rows are returned as dicts with the same keys as the old JSON entries."""
+
+    def __init__(self, db_path: str = "todos.db", import_json: Optional[str] = "todos.json"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        if import_json and os.path.exists(import_json) and not self.count():
+            self.import_json(import_json)
+
+    def import_json(self, path: str) -> int:
+        """Copies todos from a todos.json file, keeping their IDs. Returns how many were imported."""
+        with open(path, "r", encoding="utf-8") as f:
+            todos = json.load(f)
+        rows = [tuple(todo.get(field) for field in FIELDS) for todo in todos]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO todos ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})", rows)
+        return len(rows)
+
+    def add(self, task: str, priority: str = "medium", category: str = "other",
+            due_date: Optional[str] = None, status: str = "pending") -> Dict[str, Any]:
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO todos (task, priority, category, due_date, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", (task, priority, category, due_date, status, now, now))
+        return self.get(cursor.lastrowid)
+
+    def get(self, todo_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT * FROM todos WHERE id = ?", (todo_id,)).fetchone()
+        return dict(row) if row else None
+
+    def update(self, todo_id: int, **fields: Any) -> Optional[Dict[str, Any]]:
+        """Sets the given fields (None values are skipped); returns the updated todo, or None if it does not exist."""
+        changes = {key: value for key, value in fields.items() if key in FIELDS[1:-2] and value is not None}
+        changes["updated_at"] = datetime.now().isoformat()
+        assignments = ", ".join(f"{key} = ?" for key in changes)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(f"UPDATE todos SET {assignments} WHERE id = ?", (*changes.values(), todo_id))
+        return self.get(todo_id) if cursor.rowcount else None
+
+    def delete(self, todo_id: int) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM todos WHERE id = ?", (todo_id,))
+        return cursor.rowcount > 0
+
+    def query(self, status: Optional[str] = None, category: Optional[str] = None, priority: Optional[str] = None,
+              due_on: Optional[str] = None, due_before: Optional[str] = None, due_by: Optional[str] = None,
+              search: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Todos matching every given filter, by ID. Due-date filters take
+        YYYY-MM-DD strings (which sort as dates) and order by due date:
+        due_on is that day, due_before is strictly earlier, due_by up to and
+        including it.
+        """
+        clauses, params = [], []
+        for column, value in (("status", status), ("category", category), ("priority", priority)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        for operator, value in (("=", due_on), ("<", due_before), ("<=", due_by)):
+            if value:
+                clauses.append(f"due_date {operator} ?")
+                params.append(value)
+        if search:
+            clauses.append("task LIKE ? ESCAPE '\\'")
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        sql = "SELECT * FROM todos"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY due_date, id" if (due_on or due_before or due_by) else " ORDER BY id"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def all(self) -> List[Dict[str, Any]]:
+        return self.query()
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM todos").fetchone()[0]
+
+    def status_counts(self) -> Dict[str, int]:
+        return dict(self._conn.execute("SELECT status, COUNT(*) FROM todos GROUP BY status").fetchall())
+
+    def close(self):
+        self._conn.close()
@@ -12,6 +12,21 @@ import os
 import sys
 from colorama import Fore, Style
 
+# Storage
+NOTES_DB = os.getenv('VOICE_NOTES_DB', 'voice_notes.db')  # SQLite with full-text index; voice_notes.json is imported once
+
+# Streaming recording (voice-activity detection)
+STREAM_FRAME_MS = 30             # VAD frame size
+STREAM_END_SILENCE_MS = 600      # silence that closes a speech segment (segments are transcribed as they close)
+STREAM_MAX_SEGMENT_SECONDS = 15  # long monologues are cut into segments of at most this length
+STREAM_STOP_AFTER_SILENCE = 2.0  # seconds of silence after speech that end the note
+STREAM_START_TIMEOUT = 10.0      # give up if nobody speaks within this many seconds
+STREAM_MAX_DURATION = 300        # hard limit for one note, in seconds
+
+# Transcription engine order; "sphinx" is offline, "google" needs internet
+TRANSCRIPTION_ENGINES = ['google', 'sphinx']
+ENGINE_RETRY_SECONDS = 60        # after a network/engine failure, skip that engine for this long
+
 def setup_instructions():
     """Display setup instructions for VoiceNoteAgent."""
     print(f"{Fore.CYAN}🤖 VoiceNoteAgent Setup Instructions")
@@ -67,7 +82,7 @@ def setup_instructions():
     print()
     
     print(f"{Fore.YELLOW}📁 File Storage:")
-    print(f"{Fore.WHITE}   - Notes are saved in 'voice_notes.json'")
+    print(f"{Fore.WHITE}   - Notes are saved in 'voice_notes.db' (SQLite, full-text indexed)")
     print(f"{Fore.WHITE}   - Individual TXT files in 'voice_notes/' directory")
     print(f"{Fore.WHITE}   - All data is stored locally")
     print()
@@ -7,8 +7,9 @@ Features include voice-to-text transcription, text-to-speech playback, and local
 
 Features:
 - Voice recording and transcription using speech_recognition
+- Streaming mode: speech is segmented and transcribed while you talk
 - Text-to-speech playback of saved notes
-- Local file storage in JSON and TXT formats
+- Local storage in SQLite (full-text search) and TXT files
 - Timestamp-based organization
 - Search and filter capabilities
 - Interactive CLI interface
@@ -17,7 +18,6 @@ Features:
 Author: Muhammad Sami Asghar Mughal
 """
 
-import json
 import os
 import sys
 import time
@@ -26,7 +26,13 @@ from typing import Dict, List, Optional, Any
 import speech_recognition as sr
 import pyttsx3
 from colorama import init, Fore, Back, Style
-from config import setup_instructions
+from config import (
+    setup_instructions, NOTES_DB, STREAM_FRAME_MS, STREAM_END_SILENCE_MS, STREAM_MAX_SEGMENT_SECONDS,
+    STREAM_STOP_AFTER_SILENCE, STREAM_START_TIMEOUT, STREAM_MAX_DURATION, TRANSCRIPTION_ENGINES,
+    ENGINE_RETRY_SECONDS
+)
+from note_store import NoteStore
+from streaming_capture import VoiceActivitySegmenter, StreamingTranscriber
 
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
@@ -34,7 +40,7 @@ init(autoreset=True)
 class VoiceNoteAgent:
     def __init__(self):
         """Initialize the VoiceNoteAgent with speech recognition and TTS engines."""
-        self.notes_file = "voice_notes.json"
+        self.notes_file = "voice_notes.json"  # imported into the database on first run
         self.notes_dir = "voice_notes"
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
@@ -44,8 +50,10 @@ class VoiceNoteAgent:
         if not os.path.exists(self.notes_dir):
             os.makedirs(self.notes_dir)
         
-        # Load existing notes
-        self.notes = self.load_notes()
+        # Open the notes database
+        self.store = NoteStore(NOTES_DB, import_json=self.notes_file)
+        # Engine -> time before which it is skipped after failing (no network, not installed)
+        self._engine_skip_until: Dict[str, float] = {}
         
         # Configure TTS engine
         self.setup_tts()
@@ -84,23 +92,10 @@ class VoiceNoteAgent:
             print(f"{Fore.RED}❌ Error calibrating microphone: {e}")
             print(f"{Fore.YELLOW}⚠️  Continuing without calibration...")
     
-    def load_notes(self) -> List[Dict[str, Any]]:
-        """Load voice notes from JSON file."""
-        try:
-            if os.path.exists(self.notes_file):
-                with open(self.notes_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"{Fore.RED}❌ Error loading notes: {e}")
-        return []
-    
-    def save_notes(self):
-        """Save voice notes to JSON file."""
-        try:
-            with open(self.notes_file, 'w', encoding='utf-8') as f:
-                json.dump(self.notes, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"{Fore.RED}❌ Error saving notes: {e}")
+    @property
+    def notes(self) -> List[Dict[str, Any]]:
+        """All voice notes, oldest first."""
+        return self.store.all()
     
     def record_audio(self, duration: int = 10) -> Optional[sr.AudioData]:
         """Record audio from microphone."""
@@ -124,42 +119,101 @@ class VoiceNoteAgent:
             print(f"{Fore.RED}❌ Error recording audio: {e}")
             return None
     
+    def recognize(self, audio: sr.AudioData, verbose: bool = False) -> Optional[str]:
+        """
+        Try each engine in TRANSCRIPTION_ENGINES order. An engine that fails
+        for reasons other than unclear audio (no internet, not installed) is
+        skipped for ENGINE_RETRY_SECONDS, so later segments do not wait on it.
+        """
+        engines = {
+            'google': ("Google Speech Recognition", self.recognizer.recognize_google),
+            'sphinx': ("Sphinx", self.recognizer.recognize_sphinx),
+        }
+        for engine in TRANSCRIPTION_ENGINES:
+            if time.monotonic() < self._engine_skip_until.get(engine, 0):
+                continue
+            name, recognize = engines[engine]
+            try:
+                text = recognize(audio)
+                if verbose:
+                    print(f"{Fore.GREEN}✅ Transcription successful ({name})!")
+                return text
+            except sr.UnknownValueError:
+                if verbose:
+                    print(f"{Fore.YELLOW}⚠️  {name} could not understand audio")
+            except Exception as e:  # RequestError: service unreachable or engine missing
+                self._engine_skip_until[engine] = time.monotonic() + ENGINE_RETRY_SECONDS
+                if verbose:
+                    print(f"{Fore.YELLOW}⚠️  {name} not available: {e}")
+        return None
+    
     def transcribe_audio(self, audio: sr.AudioData) -> Optional[str]:
         """Transcribe audio to text using speech recognition."""
         try:
             print(f"{Fore.CYAN}🔄 Transcribing audio...")
-            
-            # Try multiple recognition engines
-            text = None
-            
-            # Try Google Speech Recognition (requires internet)
-            try:
-                text = self.recognizer.recognize_google(audio)
-                print(f"{Fore.GREEN}✅ Transcription successful!")
-                return text
-            except sr.UnknownValueError:
-                print(f"{Fore.YELLOW}⚠️  Google Speech Recognition could not understand audio")
-            except sr.RequestError as e:
-                print(f"{Fore.YELLOW}⚠️  Google Speech Recognition service error: {e}")
-            
-            # Try Sphinx (offline, requires pocketsphinx package)
-            try:
-                text = self.recognizer.recognize_sphinx(audio)
-                print(f"{Fore.GREEN}✅ Offline transcription successful!")
-                return text
-            except sr.UnknownValueError:
-                print(f"{Fore.YELLOW}⚠️  Sphinx could not understand audio")
-            except Exception as e:
-                print(f"{Fore.YELLOW}⚠️  Sphinx not available: {e}")
-            
+            text = self.recognize(audio, verbose=True)
             if not text:
                 print(f"{Fore.RED}❌ Could not transcribe audio with any available engine")
-                return None
+            return text
                 
         except Exception as e:
             print(f"{Fore.RED}❌ Error transcribing audio: {e}")
             return None
     
+    def record_streaming(self, max_duration: float = STREAM_MAX_DURATION) -> Optional[str]:
+        """
+        Record until the speaker stops, transcribing each speech segment in the
+        background as soon as it ends. Returns the transcript moments after
+        recording stops, since only the last segment is still being processed.
+        """
+        transcriber = None
+        try:
+            with self.microphone as source:
+                sample_rate, sample_width = source.SAMPLE_RATE, source.SAMPLE_WIDTH
+                segmenter = VoiceActivitySegmenter(
+                    sample_rate, sample_width, frame_ms=STREAM_FRAME_MS,
+                    energy_threshold=self.recognizer.energy_threshold,
+                    end_silence_ms=STREAM_END_SILENCE_MS, max_segment_s=STREAM_MAX_SEGMENT_SECONDS)
+                transcriber = StreamingTranscriber(
+                    lambda pcm: self.recognize(sr.AudioData(pcm, sample_rate, sample_width)),
+                    on_text=lambda index, text: print(f"{Fore.GREEN}   📝 {text}"))
+                stop_frames = STREAM_STOP_AFTER_SILENCE * 1000 / STREAM_FRAME_MS
+                chunk_seconds = source.CHUNK / sample_rate
+                
+                print(f"{Fore.CYAN}🎤 Listening... speak now. Recording stops after "
+                      f"{STREAM_STOP_AFTER_SILENCE:g}s of silence (Ctrl+C to stop).")
+                elapsed = 0.0
+                try:
+                    while elapsed < max_duration:
+                        data = source.stream.read(source.CHUNK)
+                        elapsed += chunk_seconds
+                        for segment in segmenter.feed(data):
+                            transcriber.submit(segment)
+                        if segmenter.heard_speech:
+                            if segmenter.silent_frames >= stop_frames:
+                                break
+                        elif elapsed >= STREAM_START_TIMEOUT:
+                            print(f"{Fore.YELLOW}⚠️  No speech detected within timeout period")
+                            break
+                except KeyboardInterrupt:
+                    print(f"{Fore.YELLOW}⚠️  Recording stopped by user")
+                
+                segment = segmenter.flush()
+                if segment:
+                    transcriber.submit(segment)
+            
+            print(f"{Fore.GREEN}✅ Recording completed!")
+            if transcriber.pending:
+                print(f"{Fore.CYAN}🔄 Finishing transcription...")
+            text = transcriber.finish()
+            return text or None
+            
+        except Exception as e:
+            print(f"{Fore.RED}❌ Error during streaming recording: {e}")
+            if transcriber:
+                transcriber.finish(timeout=0)
+            return None
+    
     def speak_text(self, text: str):
         """Convert text to speech and play it."""
         try:
@@ -174,7 +228,7 @@ class VoiceNoteAgent:
     def create_note(self, text: str, title: Optional[str] = None) -> Dict[str, Any]:
         """Create a new voice note entry."""
         timestamp = datetime.now().isoformat()
-        note_id = len(self.notes) + 1
+        note_id = self.store.next_id()
         
         note = {
             "id": note_id,
@@ -192,9 +246,7 @@ class VoiceNoteAgent:
     def add_note(self, text: str, title: Optional[str] = None) -> bool:
         """Add a new voice note."""
         try:
-            note = self.create_note(text, title)
-            self.notes.append(note)
-            self.save_notes()
+            note = self.store.add(self.create_note(text, title))
             
             # Save as individual TXT file
             txt_filename = f"{self.notes_dir}/note_{note['id']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
@@ -218,13 +270,14 @@ class VoiceNoteAgent:
     
     def list_notes(self, limit: Optional[int] = None):
         """List all voice notes."""
-        if not self.notes:
+        total = self.store.count()
+        if not total:
             print(f"{Fore.YELLOW}📝 No voice notes found.")
             return
         
-        notes_to_show = self.notes[-limit:] if limit else self.notes
+        notes_to_show = self.store.all(limit)
         
-        print(f"{Fore.CYAN}📝 Voice Notes ({len(notes_to_show)} of {len(self.notes)}):")
+        print(f"{Fore.CYAN}📝 Voice Notes ({len(notes_to_show)} of {total}):")
         print("-" * 80)
         
         for note in notes_to_show:
@@ -248,10 +301,7 @@ class VoiceNoteAgent:
     
     def get_note_by_id(self, note_id: int) -> Optional[Dict[str, Any]]:
         """Get a note by its ID."""
-        for note in self.notes:
-            if note['id'] == note_id:
-                return note
-        return None
+        return self.store.get(note_id)
     
     def play_note(self, note_id: int):
         """Play a note using text-to-speech."""
@@ -264,18 +314,12 @@ class VoiceNoteAgent:
         self.speak_text(note['content'])
     
     def search_notes(self, search_term: str):
-        """Search notes by content or title."""
-        if not self.notes:
+        """Search notes by content or title (full-text index, best matches first)."""
+        if not self.store.count():
             print(f"{Fore.YELLOW}📝 No voice notes to search.")
             return
         
-        search_term = search_term.lower()
-        matching_notes = []
-        
-        for note in self.notes:
-            if (search_term in note['content'].lower() or 
-                search_term in note['title'].lower()):
-                matching_notes.append(note)
+        matching_notes = self.store.search(search_term)
         
         if not matching_notes:
             print(f"{Fore.YELLOW}🔍 No notes found matching '{search_term}'")
@@ -296,8 +340,7 @@ class VoiceNoteAgent:
             return False
         
         try:
-            self.notes = [n for n in self.notes if n['id'] != note_id]
-            self.save_notes()
+            self.store.delete(note_id)
             
             # Delete corresponding TXT file
             txt_files = [f for f in os.listdir(self.notes_dir) if f.startswith(f"note_{note_id}_")]
@@ -313,19 +356,17 @@ class VoiceNoteAgent:
     
     def get_statistics(self):
         """Get statistics about voice notes."""
-        if not self.notes:
+        stats = self.store.statistics()
+        if not stats['total_notes']:
             print(f"{Fore.YELLOW}📊 No voice notes to analyze.")
             return
         
-        total_notes = len(self.notes)
-        total_words = sum(note['length'] for note in self.notes)
+        total_notes = stats['total_notes']
+        total_words = stats['total_words']
         avg_words = total_words / total_notes if total_notes > 0 else 0
         
-        # Group by date
-        dates = {}
-        for note in self.notes:
-            date = note['date']
-            dates[date] = dates.get(date, 0) + 1
+        # Grouped by date in the database
+        dates = stats['by_date']
         
         print(f"{Fore.CYAN}📊 Voice Notes Statistics:")
         print(f"{Fore.WHITE}   📝 Total Notes: {total_notes}")
@@ -362,6 +403,23 @@ class VoiceNoteAgent:
         # Save note
         return self.add_note(text, title)
     
+    def stream_and_save_note(self):
+        """Record in streaming mode (transcribed while speaking) and save as a note."""
+        print(f"{Fore.CYAN}🎤 Starting streaming voice note...")
+        
+        text = self.record_streaming()
+        if not text:
+            print(f"{Fore.RED}❌ Failed to transcribe audio")
+            return False
+        
+        print(f"{Fore.GREEN}✅ Transcription: {text}")
+        
+        title = input(f"{Fore.CYAN}📝 Enter a title for this note (or press Enter for auto-title): ").strip()
+        if not title:
+            title = f"Voice Note - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        
+        return self.add_note(text, title)
+    
     def process_command(self, command: str):
         """Process user commands."""
         command = command.lower().strip()
@@ -370,6 +428,9 @@ class VoiceNoteAgent:
             duration = int(input(f"{Fore.CYAN}⏱️  Enter recording duration in seconds (default 10): ") or "10")
             self.record_and_save_note(duration)
             
+        elif command in ['stream', 's']:
+            self.stream_and_save_note()
+            
         elif command in ['list', 'l', 'show']:
             limit = input(f"{Fore.CYAN}📝 Enter number of notes to show (or press Enter for all): ").strip()
             limit = int(limit) if limit.isdigit() else None
@@ -429,6 +490,7 @@ class VoiceNoteAgent:
         print("-" * 50)
         print(f"{Fore.WHITE}Available Commands:")
         print(f"{Fore.GREEN}  record, r, new     {Fore.WHITE}Record a new voice note")
+        print(f"{Fore.GREEN}  stream, s          {Fore.WHITE}Record until you stop talking, transcribing as you speak")
         print(f"{Fore.GREEN}  list, l, show      {Fore.WHITE}List all voice notes")
         print(f"{Fore.GREEN}  play <id>          {Fore.WHITE}Play a note using TTS")
         print(f"{Fore.GREEN}  show <id>          {Fore.WHITE}Display full note content")
@@ -445,8 +507,9 @@ class VoiceNoteAgent:
         print(f"{Fore.CYAN}🎙️  Voice Note Taking Agent")
         print("-" * 50)
         
-        if self.notes:
-            print(f"{Fore.GREEN}📝 Loaded {len(self.notes)} existing voice notes")
+        note_count = self.store.count()
+        if note_count:
+            print(f"{Fore.GREEN}📝 Loaded {note_count} existing voice notes")
         else:
             print(f"{Fore.YELLOW}📝 No existing voice notes found")
         
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Indexed note storage for VoiceNoteAgent
+
+Notes live in SQLite with an FTS5 full-text index over title and content,
+so search is an index lookup ranked by relevance instead of a scan of every
+note. Existing voice_notes.json notes are imported on first use.
+
+Author: Muhammad Sami Asghar Mughal
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    tags TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_notes_date ON notes (date);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    title, content, content='notes', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_au AFTER UPDATE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    INSERT INTO notes_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+"""
+
+COLUMNS = ["id", "title", "content", "timestamp", "date", "time", "length", "tags"]
+
+
+class NoteStore:
+    """Voice notes in SQLite; notes are returned as dicts with the same keys as the JSON entries."""
+
+    def __init__(self, db_path: str = "voice_notes.db", import_json: Optional[str] = "voice_notes.json"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError:  # SQLite built without FTS5: fall back to LIKE
+            self.full_text = False
+        if import_json and os.path.exists(import_json) and not self.count():
+            self.import_json(import_json)
+
+    def import_json(self, path: str) -> int:
+        """Copies notes from a voice_notes.json file, keeping their IDs."""
+        with open(path, 'r', encoding='utf-8') as f:
+            notes = json.load(f)
+        with self._lock, self._conn:
+            for note in notes:
+                self._conn.execute(
+                    f"INSERT OR IGNORE INTO notes ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                    self._row(note))
+        return len(notes)
+
+    @staticmethod
+    def _row(note: Dict[str, Any]) -> tuple:
+        return tuple(json.dumps(note.get(c) or []) if c == "tags" else note.get(c) for c in COLUMNS)
+
+    @staticmethod
+    def _note(row: sqlite3.Row) -> Dict[str, Any]:
+        note = {c: row[c] for c in COLUMNS}
+        note["tags"] = json.loads(note["tags"] or "[]")
+        return note
+
+    def next_id(self) -> int:
+        """The ID the next note will get (IDs are never reused, even after deletes)."""
+        return self._conn.execute(
+            "SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'notes'), 0) + 1").fetchone()[0]
+
+    def add(self, note: Dict[str, Any]) -> Dict[str, Any]:
+        """Inserts a note, with its "id" if it has one, and returns it as stored."""
+        fields = COLUMNS if note.get("id") else COLUMNS[1:]
+        values = self._row(note)[len(COLUMNS) - len(fields):]
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO notes ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})", values)
+        return self.get(cursor.lastrowid)
+
+    def update(self, note_id: int, **fields: Any) -> Optional[Dict[str, Any]]:
+        changes = {k: json.dumps(v) if k == "tags" else v for k, v in fields.items() if k in COLUMNS[1:]}
+        if changes:
+            with self._lock, self._conn:
+                self._conn.execute(f"UPDATE notes SET {', '.join(f'{k} = ?' for k in changes)} WHERE id = ?",
+                                   (*changes.values(), note_id))
+        return self.get(note_id)
+
+    def get(self, note_id: int) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT * FROM notes WHERE id = ?", (note_id,)).fetchone()
+        return self._note(row) if row else None
+
+    def delete(self, note_id: int) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+        return cursor.rowcount > 0
+
+    def all(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Notes oldest first; with a limit, the most recent `limit` notes."""
+        if limit:
+            rows = self._conn.execute(
+                "SELECT * FROM (SELECT * FROM notes ORDER BY id DESC LIMIT ?) ORDER BY id", (limit,))
+        else:
+            rows = self._conn.execute("SELECT * FROM notes ORDER BY id")
+        return [self._note(row) for row in rows]
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    @staticmethod
+    def fts_query(search_term: str) -> Optional[str]:
+        """User words to an FTS5 query: every word must appear, the last one as a prefix ("meet" finds "meeting")."""
+        words = re.findall(r"\w+", search_term, re.UNICODE)
+        if not words:
+            return None
+        terms = [f'"{w}"' for w in words]
+        terms[-1] += "*"
+        return " ".join(terms)
+
+    def search(self, search_term: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Notes matching all words of the search term, best matches first (title matches weigh more)."""
+        if self.full_text:
+            query = self.fts_query(search_term)
+            if not query:
+                return []
+            sql = ("SELECT notes.* FROM notes_fts JOIN notes ON notes.id = notes_fts.rowid "
+                   "WHERE notes_fts MATCH ? ORDER BY bm25(notes_fts, 2.0, 1.0)")
+            params: list = [query]
+        else:
+            escaped = search_term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            pattern = f"%{escaped}%"
+            sql = ("SELECT * FROM notes WHERE lower(content) LIKE ? ESCAPE '\\' OR lower(title) LIKE ? ESCAPE '\\' "
+                   "ORDER BY id")
+            params = [pattern, pattern]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._note(row) for row in self._conn.execute(sql, params)]
+
+    def statistics(self) -> Dict[str, Any]:
+        total, words = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM notes").fetchone()
+        by_date = dict(self._conn.execute("SELECT date, COUNT(*) FROM notes GROUP BY date ORDER BY date").fetchall())
+        return {"total_notes": total, "total_words": words, "by_date": by_date}
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Streaming capture for VoiceNoteAgent
+
+Voice-activity detection splits microphone audio into speech segments while
+recording, and a worker thread transcribes each segment as soon as it
+closes. By the time the speaker stops, most of the note is already text.
+
+Uses webrtcvad for speech detection when it is installed, otherwise an
+energy threshold (the one the recognizer calibrates on startup).
+
+Author: Muhammad Sami Asghar Mughal
+"""
+
+import math
+import queue
+import threading
+from array import array
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+try:
+    import webrtcvad
+except ImportError:  # optional: energy-based detection is used instead
+    webrtcvad = None
+
+
+def frame_rms(frame: bytes) -> float:
+    """Root-mean-square level of a frame of 16-bit little-endian PCM."""
+    samples = array('h', frame[:len(frame) - len(frame) % 2])
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class VoiceActivitySegmenter:
+    """
+    Turns a stream of fixed-size PCM frames into speech segments.
+
+    A segment opens after `start_frames` consecutive speech frames (keeping
+    `pre_roll_ms` of audio from before it so first syllables are not clipped)
+    and closes after `end_silence_ms` of silence or at `max_segment_s`.
+    """
+
+    def __init__(self, sample_rate: int = 16000, sample_width: int = 2, frame_ms: int = 30,
+                 energy_threshold: float = 300.0, start_frames: int = 3, end_silence_ms: int = 600,
+                 pre_roll_ms: int = 300, max_segment_s: float = 15.0, vad_mode: int = 2):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.frame_ms = frame_ms
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * sample_width
+        self.energy_threshold = energy_threshold
+        self.start_frames = start_frames
+        self.end_silence_frames = max(1, end_silence_ms // frame_ms)
+        self.max_segment_frames = max(1, int(max_segment_s * 1000 / frame_ms))
+
+        # webrtcvad only handles 16-bit audio at these rates in 10/20/30 ms frames
+        self._vad = None
+        if webrtcvad and sample_width == 2 and sample_rate in (8000, 16000, 32000, 48000) and frame_ms in (10, 20, 30):
+            self._vad = webrtcvad.Vad(vad_mode)
+
+        self._pre_roll = deque(maxlen=max(1, pre_roll_ms // frame_ms))
+        self._segment: List[bytes] = []
+        self._speech_run = 0
+        self._silence_run = 0
+        self._buffer = b""
+        self.in_speech = False
+        self.silent_frames = 0  # consecutive silent frames, in or out of a segment
+        self.heard_speech = False
+
+    def is_speech(self, frame: bytes) -> bool:
+        if self._vad is not None:
+            return self._vad.is_speech(frame, self.sample_rate)
+        return frame_rms(frame) > self.energy_threshold
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Adds audio of any length; returns the segments that closed."""
+        self._buffer += data
+        closed = []
+        while len(self._buffer) >= self.frame_bytes:
+            frame, self._buffer = self._buffer[:self.frame_bytes], self._buffer[self.frame_bytes:]
+            segment = self._feed_frame(frame)
+            if segment:
+                closed.append(segment)
+        return closed
+
+    def _feed_frame(self, frame: bytes) -> Optional[bytes]:
+        speech = self.is_speech(frame)
+        self.silent_frames = 0 if speech else self.silent_frames + 1
+
+        if not self.in_speech:
+            self._pre_roll.append(frame)
+            self._speech_run = self._speech_run + 1 if speech else 0
+            if self._speech_run >= self.start_frames:
+                self.in_speech = self.heard_speech = True
+                self._segment = list(self._pre_roll)
+                self._pre_roll.clear()
+                self._silence_run = 0
+            return None
+
+        self._segment.append(frame)
+        self._silence_run = 0 if speech else self._silence_run + 1
+        if self._silence_run >= self.end_silence_frames or len(self._segment) >= self.max_segment_frames:
+            return self._close()
+        return None
+
+    def _close(self) -> Optional[bytes]:
+        segment = b"".join(self._segment)
+        self._segment = []
+        self._speech_run = 0
+        self.in_speech = False
+        return segment or None
+
+    def flush(self) -> Optional[bytes]:
+        """Closes the open segment, if any (call when recording stops)."""
+        if self.in_speech:
+            if self._buffer:
+                self._segment.append(self._buffer)
+                self._buffer = b""
+            return self._close()
+        return None
+
+
+class StreamingTranscriber:
+    """
+    Transcribes segments on a worker thread in the order they were recorded.
+    `transcribe` takes raw PCM bytes and returns text (or None if nothing
+    was recognised).
+    """
+
+    def __init__(self, transcribe: Callable[[bytes], Optional[str]],
+                 on_text: Optional[Callable[[int, str], None]] = None):
+        self.transcribe = transcribe
+        self.on_text = on_text
+        self.results: Dict[int, Optional[str]] = {}
+        self.errors: Dict[int, str] = {}
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._count = 0
+        self._thread = threading.Thread(target=self._work, name="segment-transcriber", daemon=True)
+        self._thread.start()
+
+    def submit(self, segment: bytes) -> int:
+        index = self._count
+        self._count += 1
+        self._queue.put((index, segment))
+        return index
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            index, segment = item
+            try:
+                text = self.transcribe(segment)
+            except Exception as e:
+                text = None
+                self.errors[index] = str(e)
+            self.results[index] = text
+            if text and self.on_text:
+                self.on_text(index, text)
+
+    def finish(self, timeout: Optional[float] = None) -> str:
+        """Waits for outstanding segments and returns the whole transcript."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+        return " ".join(self.results[i] for i in sorted(self.results) if self.results[i]).strip()
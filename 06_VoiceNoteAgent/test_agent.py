@@ -9,8 +9,13 @@ Author: Muhammad Sami Asghar Mughal
 """
 
 import json
+import math
 import os
+import shutil
+import struct
 import sys
+import tempfile
+import time
 from datetime import datetime
 from colorama import init, Fore, Style
 
@@ -133,6 +138,127 @@ def test_search_functionality():
     
     return True
 
+def test_indexed_search():
+    """Test full-text search in the SQLite note store."""
+    print(f"{Fore.CYAN}🧪 Testing Indexed Search...")
+    from note_store import NoteStore
+    
+    test_dir = tempfile.mkdtemp()
+    try:
+        json_file = os.path.join(test_dir, "voice_notes.json")
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump([{"id": 4, "title": "Python Programming", "content": "Learn Python basics and advanced concepts",
+                        "timestamp": "2024-01-15T10:00:00", "date": "2024-01-15", "time": "10:00:00",
+                        "length": 6, "tags": ["study"]}], f)
+        store = NoteStore(os.path.join(test_dir, "voice_notes.db"), import_json=json_file)
+        
+        # Imported notes keep their IDs; new IDs continue after them
+        assert store.get(4)["tags"] == ["study"], "JSON import failed"
+        assert store.next_id() == 5, f"Expected next ID 5, got {store.next_id()}"
+        
+        for title, content in [("Meeting Notes", "Discuss AI project timeline"),
+                               ("Shopping List", "Buy groceries and household items"),
+                               ("Project ideas", "A meeting room booking bot")]:
+            store.add({"title": title, "content": content, "timestamp": datetime.now().isoformat(),
+                       "date": "2024-01-16", "time": "09:00:00", "length": len(content.split()), "tags": []})
+        
+        assert [n["id"] for n in store.search("python")] == [4], "Search by word failed"
+        assert [n["title"] for n in store.search("meet")] == ["Meeting Notes", "Project ideas"], \
+            "Prefix search or title ranking failed"
+        assert [n["title"] for n in store.search("project timeline")] == ["Meeting Notes"], "Multi-word search failed"
+        assert store.search('"; DROP TABLE notes; --') == [], "Search input not sanitised"
+        
+        store.delete(5)
+        assert [n["title"] for n in store.search("meeting")] == ["Project ideas"], "Index not updated on delete"
+        assert store.statistics()["by_date"] == {"2024-01-15": 1, "2024-01-16": 2}, "Statistics mismatch"
+        
+        # Without FTS5 the LIKE fallback treats % and _ literally
+        store.full_text = False
+        assert [n["id"] for n in store.search("python")] == [4], "LIKE fallback search failed"
+        assert store.search("100%") == [] and store.search("_") == [], "LIKE wildcards not escaped"
+        store.close()
+        
+        print(f"{Fore.GREEN}✅ Indexed search working correctly")
+        return True
+    
+    except AssertionError as e:
+        print(f"{Fore.RED}❌ Indexed search failed: {e}")
+        return False
+    
+    finally:
+        shutil.rmtree(test_dir, ignore_errors=True)
+
+def _synthetic_audio(pattern, rate=16000):
+    """16-bit PCM: ('tone', seconds) for speech-like sound, ('silence', seconds) for quiet."""
+    audio = b""
+    for kind, seconds in pattern:
+        samples = int(seconds * rate)
+        if kind == 'tone':
+            audio += b"".join(struct.pack('<h', int(3000 * math.sin(2 * math.pi * 220 * i / rate)))
+                              for i in range(samples))
+        else:
+            audio += b"\x00\x00" * samples
+    return audio
+
+def test_vad_segmentation():
+    """Test voice-activity segmentation with synthetic audio."""
+    print(f"{Fore.CYAN}🧪 Testing Voice Activity Segmentation...")
+    from streaming_capture import VoiceActivitySegmenter, frame_rms
+    
+    assert frame_rms(b"\x00\x00" * 480) == 0.0, "Silence should have zero level"
+    
+    segmenter = VoiceActivitySegmenter(16000, 2, frame_ms=30, end_silence_ms=600)
+    segmenter._vad = None  # exercise the energy detector even if webrtcvad is installed
+    audio = _synthetic_audio([('silence', 0.5), ('tone', 1.0), ('silence', 1.0), ('tone', 0.6), ('silence', 0.2)])
+    
+    segments = []
+    for start in range(0, len(audio), 2048):  # microphone-sized chunks
+        segments.extend(segmenter.feed(audio[start:start + 2048]))
+    assert len(segments) == 1, f"Expected 1 closed segment, got {len(segments)}"
+    assert segmenter.in_speech, "Second utterance should still be open"
+    
+    last = segmenter.flush()
+    assert last, "Flush should close the open segment"
+    seconds = len(segments[0]) / 32000
+    assert 1.0 <= seconds <= 2.0, f"First segment should hold the utterance plus padding, got {seconds:.2f}s"
+    
+    # Long speech is cut at the segment limit
+    segmenter = VoiceActivitySegmenter(16000, 2, max_segment_s=1.0)
+    segmenter._vad = None
+    assert len(segmenter.feed(_synthetic_audio([('tone', 2.5)]))) == 2, "Long speech should be split"
+    
+    print(f"{Fore.GREEN}✅ Voice activity segmentation working correctly")
+    return True
+
+def test_streaming_transcription():
+    """Test that segments are transcribed in the background and joined in order."""
+    print(f"{Fore.CYAN}🧪 Testing Streaming Transcription...")
+    from streaming_capture import StreamingTranscriber
+    
+    def fake_transcribe(segment):
+        time.sleep(0.05)
+        if segment == b"noise":
+            return None
+        if segment == b"broken":
+            raise RuntimeError("engine failed")
+        return segment.decode()
+    
+    heard = []
+    transcriber = StreamingTranscriber(fake_transcribe, on_text=lambda index, text: heard.append(text))
+    start = time.monotonic()
+    for segment in [b"remember to", b"noise", b"call", b"broken", b"the dentist"]:
+        transcriber.submit(segment)
+    submitted = time.monotonic() - start
+    
+    assert submitted < 0.05, "Submitting should not wait for transcription"
+    text = transcriber.finish(timeout=5)
+    assert text == "remember to call the dentist", f"Unexpected transcript: {text!r}"
+    assert heard == ["remember to", "call", "the dentist"], "Partial results not reported in order"
+    assert transcriber.errors == {3: "engine failed"}, "Engine errors not recorded"
+    
+    print(f"{Fore.GREEN}✅ Streaming transcription working correctly")
+    return True
+
 def test_statistics_calculation():
     """Test statistics calculation with mock data."""
     print(f"{Fore.CYAN}🧪 Testing Statistics Calculation...")
@@ -210,6 +336,9 @@ def run_all_tests():
         ("Note Creation", test_note_creation),
         ("Directory Operations", test_directory_operations),
         ("Search Functionality", test_search_functionality),
+        ("Indexed Search", test_indexed_search),
+        ("Voice Activity Segmentation", test_vad_segmentation),
+        ("Streaming Transcription", test_streaming_transcription),
         ("Statistics Calculation", test_statistics_calculation)
     ]
     
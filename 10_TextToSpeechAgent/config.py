@@ -22,3 +22,15 @@ DEFAULT_VOICE_MALE = "echo"      # OpenAI TTS voice
 MAX_CHARACTERS = 8000
 
 
+
+# Long inputs are split at sentence boundaries into chunks of roughly this size
+# and synthesized concurrently; playback can start once the first chunk is ready.
+CHUNK_CHARACTERS = int(get_env("TTS_CHUNK_CHARACTERS", "1200"))
+MAX_WORKERS = int(get_env("TTS_MAX_WORKERS", "4"))
+
+# Content-addressed audio cache (keyed by text, voice, language and engine)
+AUDIO_CACHE_DIR = get_env(
+    "TTS_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio_cache"),
+)
+AUDIO_CACHE_ENABLED = (get_env("TTS_CACHE_ENABLED", "true") or "true").lower() == "true"
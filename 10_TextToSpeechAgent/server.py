@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-import io
 import os
+from itertools import chain
 from typing import Optional
 
 import httpx
@@ -9,9 +9,10 @@ from fastapi import FastAPI, Form, File, UploadFile, Request
 from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 
 from config import PORT, MAX_CHARACTERS
-from tts_service import synthesize_speech, TextToSpeechError, SUPPORTED_LANGUAGES
+from tts_service import iter_speech_chunks, TextToSpeechError, SUPPORTED_LANGUAGES
 
 try:
     import trafilatura
@@ -55,17 +56,20 @@ async def tts_endpoint(
         input_text = await _resolve_input_text(text=text, file=file, url=url)
         print(f"Resolved input text length: {len(input_text)}")
         
-        audio_bytes = synthesize_speech(
+        chunks = iter_speech_chunks(
             input_text,
             language=language,
             gender=gender,
             max_chars=MAX_CHARACTERS,
         )
-        print(f"Generated audio bytes length: {len(audio_bytes)}")
-        
+        # Wait for the first chunk before responding so errors still map to a JSON
+        # status; the remaining chunks stream to the client as they finish.
+        first_chunk = await run_in_threadpool(next, chunks)
+        print(f"First audio chunk ready: {len(first_chunk)} bytes")
+
         filename = "speech.mp3"
         headers = {"Content-Disposition": f"attachment; filename={filename}"}
-        return StreamingResponse(io.BytesIO(audio_bytes), media_type="audio/mpeg", headers=headers)
+        return StreamingResponse(chain([first_chunk], chunks), media_type="audio/mpeg", headers=headers)
     except TextToSpeechError as e:
         print(f"TTS Error: {e}")
         return JSONResponse({"error": str(e)}, status_code=400)
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
+import hashlib
 import io
-from typing import Optional
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
 
 from gtts import gTTS
 from openai import OpenAI
 
-from config import OPENAI_API_KEY, TTS_ENGINE, DEFAULT_VOICE_FEMALE, DEFAULT_VOICE_MALE
+from config import (
+    OPENAI_API_KEY,
+    TTS_ENGINE,
+    DEFAULT_VOICE_FEMALE,
+    DEFAULT_VOICE_MALE,
+    CHUNK_CHARACTERS,
+    MAX_WORKERS,
+    AUDIO_CACHE_DIR,
+    AUDIO_CACHE_ENABLED,
+)
 
 
 SUPPORTED_LANGUAGES = {
@@ -16,6 +30,12 @@ SUPPORTED_LANGUAGES = {
     "ur": "Urdu",
 }
 
+# Sentence terminators for Latin scripts plus the Devanagari danda and Urdu full stop
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?।۔])\s+|\n{2,}")
+
+# Model candidates for OpenAI TTS, in order of preference
+_OPENAI_MODELS = ["tts-1", "tts-1-hd"]
+
 
 class TextToSpeechError(Exception):
     pass
@@ -30,18 +50,157 @@ def _sanitize_text(text: str, max_chars: int) -> str:
     return text
 
 
-def synthesize_speech(
+def split_into_chunks(text: str, max_chunk_chars: int = CHUNK_CHARACTERS) -> List[str]:
+    """Split text at sentence boundaries into chunks of at most max_chunk_chars.
+
+    Sentences longer than the limit are split on whitespace so no chunk exceeds it.
+    """
+    chunks: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_END_RE.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        while len(sentence) > max_chunk_chars:
+            cut = sentence.rfind(" ", 0, max_chunk_chars)
+            if cut <= 0:
+                cut = max_chunk_chars
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if not current:
+            current = sentence
+        elif len(current) + 1 + len(sentence) <= max_chunk_chars:
+            current = f"{current} {sentence}"
+        else:
+            chunks.append(current)
+            current = sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class AudioCache:
+    """On-disk, content-addressed cache of synthesized audio chunks."""
+
+    def __init__(self, cache_dir: str = AUDIO_CACHE_DIR, enabled: bool = AUDIO_CACHE_ENABLED):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(text: str, voice: str, language: str, engine: str) -> str:
+        payload = "\x1f".join([engine, voice, language, text])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        # Two-level fan-out keeps directories small for large caches
+        return os.path.join(self.cache_dir, key[:2], f"{key}.mp3")
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(key), "rb") as fh:
+                return fh.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, audio: bytes) -> None:
+        if not self.enabled or not audio:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so concurrent readers never see partial audio
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(audio)
+        os.replace(tmp_path, path)
+
+
+audio_cache = AudioCache()
+
+_client_lock = threading.Lock()
+_openai_client: Optional[OpenAI] = None
+_preferred_model: Optional[str] = None
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="tts")
+
+
+def _get_openai_client() -> OpenAI:
+    """Return a process-wide OpenAI client so HTTP connections are reused."""
+    global _openai_client
+    if _openai_client is None:
+        with _client_lock:
+            if _openai_client is None:
+                _openai_client = OpenAI(api_key=OPENAI_API_KEY)
+    return _openai_client
+
+
+def _use_openai() -> bool:
+    return TTS_ENGINE == "openai" and bool(OPENAI_API_KEY)
+
+
+def _voice_for(gender: str, use_openai: bool) -> str:
+    if not use_openai:
+        return "gtts"
+    return DEFAULT_VOICE_FEMALE if gender.lower() == "female" else DEFAULT_VOICE_MALE
+
+
+def _synthesize_chunk(text: str, language: str, gender: str, use_openai: bool) -> bytes:
+    engine = "openai" if use_openai else "gtts"
+    key = AudioCache.make_key(text, _voice_for(gender, use_openai), language, engine)
+    cached = audio_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if use_openai:
+        audio = _synthesize_openai(text, language=language, gender=gender)
+    else:
+        audio = _synthesize_gtts(text, language=language)
+    audio_cache.put(key, audio)
+    return audio
+
+
+def iter_speech_chunks(
     text: str,
     language: str = "auto",
     gender: str = "female",
     max_chars: int = 8000,
-) -> bytes:
+) -> Iterator[bytes]:
+    """Synthesize text chunk by chunk, yielding MP3 segments in order.
+
+    All chunks are submitted to a bounded thread pool up front, so later chunks are
+    synthesized while earlier ones are being consumed.
+    """
     text = _sanitize_text(text, max_chars)
+    use_openai = _use_openai()
+    chunks = split_into_chunks(text)
+
+    futures = [
+        _executor.submit(_synthesize_chunk, chunk, language, gender, use_openai)
+        for chunk in chunks
+    ]
+    try:
+        for future in futures:
+            yield future.result()
+    finally:
+        # Client went away or a chunk failed: drop work that has not started yet
+        for future in futures:
+            future.cancel()
+
 
-    # Prefer OpenAI if configured; else gTTS
-    if TTS_ENGINE == "openai" and OPENAI_API_KEY:
-        return _synthesize_openai(text, language=language, gender=gender)
-    return _synthesize_gtts(text, language=language)
+def synthesize_speech(
+    text: str,
+    language: str = "auto",
+    gender: str = "female",
+    max_chars: int = 8000,
+) -> bytes:
+    # MP3 frames are self-delimiting, so segments can be concatenated directly
+    return b"".join(iter_speech_chunks(text, language=language, gender=gender, max_chars=max_chars))
 
 
 def _synthesize_gtts(text: str, language: str = "auto") -> bytes:
@@ -55,25 +214,28 @@ def _synthesize_gtts(text: str, language: str = "auto") -> bytes:
 
 
 def _synthesize_openai(text: str, language: str = "auto", gender: str = "female") -> bytes:
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    global _preferred_model
+    client = _get_openai_client()
 
     # The OpenAI TTS API does not require language code explicitly; we can prepend a brief instruction
     # to encourage correct pronunciation for non-English text.
-    voice = DEFAULT_VOICE_FEMALE if gender.lower() == "female" else DEFAULT_VOICE_MALE
+    voice = _voice_for(gender, use_openai=True)
 
-    # Use the correct TTS model names
-    model_candidates = ["tts-1", "tts-1-hd"]
+    # Try the model that last succeeded first so chunks don't each repeat a failing call
+    model_candidates = list(_OPENAI_MODELS)
+    if _preferred_model in model_candidates:
+        model_candidates.remove(_preferred_model)
+        model_candidates.insert(0, _preferred_model)
 
     last_error: Optional[Exception] = None
     for model_name in model_candidates:
         try:
-            print(f"Trying OpenAI TTS with model: {model_name}, voice: {voice}")
             audio = client.audio.speech.create(
                 model=model_name,
                 voice=voice,
                 input=text,
             )
-            print(f"Successfully created audio with model: {model_name}")
+            _preferred_model = model_name
             return audio.read()
         except Exception as e:  # noqa: BLE001
             print(f"Failed with model {model_name}: {e}")
@@ -81,5 +243,3 @@ def _synthesize_openai(text: str, language: str = "auto", gender: str = "female"
             continue
 
     raise TextToSpeechError(f"OpenAI TTS failed: {last_error}")
-
-
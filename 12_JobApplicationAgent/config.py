@@ -283,7 +283,9 @@ ERROR_MESSAGES = {
     "generation_failed": "Application generation failed. Please try again.",
     "invalid_language": "Unsupported language selected.",
     "missing_resume": "Please upload a resume file.",
-    "missing_job_description": "Please enter a job description."
+    "missing_job_description": "Please enter a job description.",
+    "profile_not_found": "Resume profile not found. Please upload your resume again.",
+    "too_many_jobs": "Too many job descriptions in one batch."
 }
 
 # Success Messages
@@ -306,6 +308,7 @@ TEMPLATE_DIR = "templates"
 STATIC_DIR = "static"
 UPLOAD_DIR = "uploads"
 OUTPUT_DIR = "outputs"
+PROFILE_DIR = os.path.join(OUTPUT_DIR, "profiles")
 
 # Create necessary directories
 for directory in [UPLOAD_DIR, OUTPUT_DIR]:
@@ -323,6 +326,13 @@ CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
 # Performance Settings
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", 300))  # 5 minutes
 MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", 10))
+# Sections (resume, cover letter, fit analysis, extra documents) generated in parallel per request
+GENERATION_MAX_WORKERS = int(os.getenv("GENERATION_MAX_WORKERS", 6))
+# Parsed resumes / job analyses kept in memory (all of them are also stored under PROFILE_DIR)
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", 256))
+# Job descriptions processed at once by the batch endpoint, and the most accepted per request
+BATCH_MAX_JOBS = int(os.getenv("BATCH_MAX_JOBS", 3))
+BATCH_MAX_DESCRIPTIONS = int(os.getenv("BATCH_MAX_DESCRIPTIONS", 20))
 
 # Feature Flags
 ENABLE_VOICE_INPUT = os.getenv("ENABLE_VOICE_INPUT", "False").lower() == "true"
@@ -19,6 +19,7 @@ except ImportError:
     Document = None
 
 from config import ALLOWED_EXTENSIONS, ERROR_MESSAGES
+from skill_matcher import TECHNICAL_CATEGORIES, get_skill_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -178,26 +179,7 @@ class DocumentProcessor:
     
     def _extract_skills(self, text: str) -> List[str]:
         """Extract skills from resume text"""
-        # Common skill keywords
-        skill_keywords = [
-            "python", "javascript", "java", "c++", "c#", "php", "ruby", "go", "rust",
-            "html", "css", "react", "angular", "vue", "node.js", "express",
-            "django", "flask", "spring", "laravel", "asp.net",
-            "sql", "mysql", "postgresql", "mongodb", "redis", "elasticsearch",
-            "aws", "azure", "gcp", "docker", "kubernetes", "jenkins",
-            "git", "github", "gitlab", "jira", "agile", "scrum",
-            "machine learning", "ai", "data science", "statistics",
-            "project management", "leadership", "communication", "teamwork"
-        ]
-        
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in skill_keywords:
-            if skill in text_lower:
-                found_skills.append(skill.title())
-        
-        return list(set(found_skills))  # Remove duplicates
+        return get_skill_matcher().find(text)
     
     def _extract_experience(self, experience_text: str) -> List[Dict]:
         """Extract work experience information"""
@@ -317,25 +299,7 @@ class JobDescriptionProcessor:
     
     def _extract_skills_from_line(self, line: str) -> List[str]:
         """Extract skills from a specific line"""
-        # Common technical skills
-        technical_skills = [
-            "python", "javascript", "java", "c++", "c#", "php", "ruby", "go", "rust",
-            "html", "css", "react", "angular", "vue", "node.js", "express",
-            "django", "flask", "spring", "laravel", "asp.net",
-            "sql", "mysql", "postgresql", "mongodb", "redis", "elasticsearch",
-            "aws", "azure", "gcp", "docker", "kubernetes", "jenkins",
-            "git", "github", "gitlab", "jira", "agile", "scrum",
-            "machine learning", "ai", "data science", "statistics"
-        ]
-        
-        found_skills = []
-        line_lower = line.lower()
-        
-        for skill in technical_skills:
-            if skill in line_lower:
-                found_skills.append(skill.title())
-        
-        return found_skills
+        return get_skill_matcher().find(line, categories=TECHNICAL_CATEGORIES)
     
     def _extract_responsibilities(self, text: str) -> List[str]:
         """Extract job responsibilities"""
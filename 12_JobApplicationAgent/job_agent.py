@@ -4,20 +4,37 @@ Main AI agent for job application generation
 
 import json
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import openai
 from openai import OpenAI
 
 from config import (
     OPENAI_API_KEY, OPENAI_MODEL, OPENAI_TEMPERATURE, OPENAI_MAX_TOKENS,
-    PROMPT_TEMPLATES, ERROR_MESSAGES, SUPPORTED_LANGUAGES, ADDITIONAL_DOCUMENTS
+    PROMPT_TEMPLATES, ERROR_MESSAGES, SUPPORTED_LANGUAGES, ADDITIONAL_DOCUMENTS,
+    GENERATION_MAX_WORKERS, BATCH_MAX_JOBS, BATCH_MAX_DESCRIPTIONS
 )
 from document_processor import DocumentProcessor, JobDescriptionProcessor
+from profile_store import ProfileStore, file_key, text_key
 from url_extractor import JobURLExtractor
 
 logger = logging.getLogger(__name__)
 
 
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def _timed(func: Callable, *args) -> Tuple[Any, Optional[Exception], float]:
+    """Run func(*args) and return (result, error, latency_ms) instead of raising"""
+    started = time.perf_counter()
+    try:
+        return func(*args), None, _elapsed_ms(started)
+    except Exception as e:
+        return None, e, _elapsed_ms(started)
+
+
 class JobApplicationAgent:
     """Main AI agent for generating job applications"""
     
@@ -29,6 +46,7 @@ class JobApplicationAgent:
         self.document_processor = DocumentProcessor()
         self.job_processor = JobDescriptionProcessor()
         self.url_extractor = JobURLExtractor()
+        self.profile_store = ProfileStore()
         
     def generate_application(
         self,
@@ -36,73 +54,232 @@ class JobApplicationAgent:
         job_description: str,
         language: str = "en",
         cover_letter_length: str = "medium",
-        additional_documents: List[str] = None
+        additional_documents: List[str] = None,
+        resume_profile_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Generate complete job application package"""
+        data = {"additional_documents": {}}
+        for event in self.iter_application(
+            resume_file_path, job_description, language, cover_letter_length, additional_documents,
+            resume_profile_id=resume_profile_id
+        ):
+            if event["type"] == "error":
+                return {
+                    "success": False,
+                    "error": event["error"]
+                }
+            if event["type"] == "analysis":
+                data["profile_id"] = event["profile_id"]
+                data["resume_analysis"] = event["resume_analysis"]
+                data["job_analysis"] = event["job_analysis"]
+            elif event["type"] == "section":
+                if event["section"] == "additional_document":
+                    data["additional_documents"][event["document_type"]] = event["content"]
+                else:
+                    data[event["section"]] = event["content"]
+            elif event["type"] == "done":
+                data["timings"] = event["timings"]
+        
+        return {
+            "success": True,
+            "data": data
+        }
+    
+    def iter_application(
+        self,
+        resume_file_path: str,
+        job_description: str,
+        language: str = "en",
+        cover_letter_length: str = "medium",
+        additional_documents: List[str] = None,
+        resume_profile_id: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Generate the application package, yielding each section as it completes.
+        
+        The customized resume, cover letter, fit analysis and each additional
+        document depend only on the resume and job analyses, so they are generated
+        concurrently on a bounded thread pool and the package takes about as long
+        as the slowest call. Pass resume_profile_id (from load_resume_profile)
+        instead of a file to reuse a stored resume analysis. Yields dicts with a
+        "type" of:
+        
+        - "analysis": profile_id, resume_analysis and job_analysis
+        - "section": section name, content and latency_ms (additional documents
+          use section "additional_document" plus document_type)
+        - "error": a required section failed; nothing follows
+        - "done": per-section timings, total_ms and the sequential_ms it would
+          have taken one call at a time
+        """
+        started = time.perf_counter()
+        timings = {}
         try:
             # Validate inputs
-            self._validate_inputs(resume_file_path, job_description, language)
+            self._validate_inputs(resume_profile_id or resume_file_path, job_description, language)
             
-            # Process resume
+            # Process resume (parsed once per distinct file)
             logger.info("Processing resume...")
-            resume_text = self.document_processor.extract_text_from_file(resume_file_path)
-            resume_analysis = self.document_processor.analyze_resume(resume_text)
+            step = time.perf_counter()
+            if resume_profile_id:
+                resume_analysis = self.get_resume_profile(resume_profile_id)
+            else:
+                profile = self.load_resume_profile(resume_file_path)
+                resume_profile_id = profile["profile_id"]
+                resume_analysis = profile["analysis"]
+            timings["resume_analysis"] = _elapsed_ms(step)
             
             # Process job description
             logger.info("Processing job description...")
-            job_analysis = self.job_processor.analyze_job_description(job_description)
-            
-            # Generate customized resume
-            logger.info("Generating customized resume...")
-            customized_resume = self._generate_customized_resume(
-                resume_analysis, job_analysis, language
-            )
-            
-            # Generate cover letter
-            logger.info("Generating cover letter...")
-            cover_letter = self._generate_cover_letter(
-                resume_analysis, job_analysis, language, cover_letter_length
-            )
-            
-            # Generate additional documents
-            additional_content = {}
-            if additional_documents:
-                logger.info("Generating additional documents...")
-                for doc_type in additional_documents:
-                    if doc_type in ADDITIONAL_DOCUMENTS:
-                        try:
-                            content = self._generate_additional_document(
-                                doc_type, resume_analysis, job_analysis, language, cover_letter_length
-                            )
-                            additional_content[doc_type] = content
-                        except Exception as e:
-                            logger.error(f"Failed to generate {doc_type}: {e}")
-                            additional_content[doc_type] = f"Error generating {ADDITIONAL_DOCUMENTS[doc_type]}: {str(e)}"
-            
-            # Generate fit analysis
-            logger.info("Generating fit analysis...")
-            fit_summary = self._generate_fit_analysis(
-                resume_analysis, job_analysis, language
-            )
-            
-            return {
-                "success": True,
-                "data": {
-                    "customized_resume": customized_resume,
-                    "cover_letter": cover_letter,
-                    "additional_documents": additional_content,
-                    "fit_summary": fit_summary,
-                    "resume_analysis": resume_analysis,
-                    "job_analysis": job_analysis
-                }
-            }
-            
+            step = time.perf_counter()
+            job_analysis = self.analyze_job_description_cached(job_description)
+            timings["job_analysis"] = _elapsed_ms(step)
         except Exception as e:
             logger.error(f"Application generation failed: {e}")
+            yield {"type": "error", "error": str(e)}
+            return
+        
+        yield {
+            "type": "analysis",
+            "profile_id": resume_profile_id,
+            "resume_analysis": resume_analysis,
+            "job_analysis": job_analysis,
+            "latency_ms": dict(timings)
+        }
+        
+        sections = {
+            "customized_resume": (self._generate_customized_resume, (resume_analysis, job_analysis, language)),
+            "cover_letter": (self._generate_cover_letter, (resume_analysis, job_analysis, language, cover_letter_length)),
+            "fit_summary": (self._generate_fit_analysis, (resume_analysis, job_analysis, language)),
+        }
+        for doc_type in additional_documents or []:
+            if doc_type in ADDITIONAL_DOCUMENTS:
+                sections[doc_type] = (
+                    self._generate_additional_document,
+                    (doc_type, resume_analysis, job_analysis, language, cover_letter_length)
+                )
+        
+        logger.info(f"Generating {len(sections)} sections concurrently...")
+        pool = ThreadPoolExecutor(max_workers=min(GENERATION_MAX_WORKERS, len(sections)))
+        try:
+            futures = {
+                pool.submit(_timed, generate, *args): name
+                for name, (generate, args) in sections.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                content, error, latency_ms = future.result()
+                timings[name] = latency_ms
+                
+                if name in ADDITIONAL_DOCUMENTS:
+                    if error:
+                        logger.error(f"Failed to generate {name}: {error}")
+                        content = f"Error generating {ADDITIONAL_DOCUMENTS[name]}: {str(error)}"
+                    event = {"type": "section", "section": "additional_document", "document_type": name}
+                else:
+                    if error:
+                        logger.error(f"Application generation failed: {error}")
+                        yield {"type": "error", "section": name, "error": str(error)}
+                        return
+                    event = {"type": "section", "section": name}
+                
+                event.update(content=content, latency_ms=latency_ms)
+                yield event
+        finally:
+            # Also runs when the consumer stops early (e.g. the client disconnected)
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        yield {
+            "type": "done",
+            "timings": timings,
+            "total_ms": _elapsed_ms(started),
+            "sequential_ms": round(sum(timings.values()), 1)
+        }
+    
+    def generate_batch(
+        self,
+        resume_profile_id: str,
+        job_descriptions: List[str],
+        language: str = "en",
+        cover_letter_length: str = "medium",
+        additional_documents: List[str] = None
+    ) -> Dict[str, Any]:
+        """Generate one application per job description from a stored resume profile.
+        
+        Jobs run concurrently (BATCH_MAX_JOBS at a time, each with its own
+        section pool). A failed job is reported in its result and does not stop
+        the others; results keep the order of job_descriptions.
+        """
+        started = time.perf_counter()
+        try:
+            if not job_descriptions:
+                raise ValueError(ERROR_MESSAGES["missing_job_description"])
+            if len(job_descriptions) > BATCH_MAX_DESCRIPTIONS:
+                raise ValueError(ERROR_MESSAGES["too_many_jobs"])
+            # Fail fast on an unknown profile instead of once per job
+            self.get_resume_profile(resume_profile_id)
+        except Exception as e:
+            logger.error(f"Batch generation failed: {e}")
             return {
                 "success": False,
                 "error": str(e)
             }
+        
+        def generate(job_description: str) -> Dict[str, Any]:
+            return self.generate_application(
+                None, job_description, language, cover_letter_length, additional_documents,
+                resume_profile_id=resume_profile_id
+            )
+        
+        logger.info(f"Generating {len(job_descriptions)} applications for profile {resume_profile_id}...")
+        with ThreadPoolExecutor(max_workers=min(BATCH_MAX_JOBS, len(job_descriptions))) as pool:
+            results = [
+                {"index": index, **result}
+                for index, result in enumerate(pool.map(generate, job_descriptions))
+            ]
+        
+        return {
+            "success": True,
+            "data": {
+                "profile_id": resume_profile_id,
+                "results": results,
+                "succeeded": sum(1 for result in results if result["success"]),
+                "total_ms": _elapsed_ms(started)
+            }
+        }
+    
+    def load_resume_profile(self, resume_file_path: str) -> Dict[str, Any]:
+        """Parse a resume file once and store the analysis under a content hash.
+        
+        Returns profile_id, analysis and whether it was already stored.
+        """
+        profile_id = file_key(resume_file_path)
+        record = self.profile_store.get("resumes", profile_id)
+        if record:
+            return {"profile_id": profile_id, "analysis": record["analysis"], "cached": True}
+        
+        resume_text = self.document_processor.extract_text_from_file(resume_file_path)
+        analysis = self.document_processor.analyze_resume(resume_text)
+        if "error" not in analysis:
+            self.profile_store.put("resumes", profile_id, {"analysis": analysis, "created_at": time.time()})
+        return {"profile_id": profile_id, "analysis": analysis, "cached": False}
+    
+    def get_resume_profile(self, resume_profile_id: str) -> Dict[str, Any]:
+        """Stored resume analysis for a profile id"""
+        record = self.profile_store.get("resumes", resume_profile_id)
+        if not record:
+            raise ValueError(ERROR_MESSAGES["profile_not_found"])
+        return record["analysis"]
+    
+    def analyze_job_description_cached(self, job_description: str) -> Dict[str, Any]:
+        """Job description analysis, reused for identical descriptions"""
+        key = text_key(job_description)
+        record = self.profile_store.get("jobs", key)
+        if record:
+            return record["analysis"]
+        
+        analysis = self.job_processor.analyze_job_description(job_description)
+        if "error" not in analysis:
+            self.profile_store.put("jobs", key, {"analysis": analysis, "created_at": time.time()})
+        return analysis
     
     def extract_job_from_url(self, url: str) -> Dict[str, Any]:
         """Extract job description from URL"""
@@ -344,12 +521,12 @@ class JobApplicationAgent:
     def analyze_resume_only(self, resume_file_path: str) -> Dict[str, Any]:
         """Analyze resume without job description"""
         try:
-            resume_text = self.document_processor.extract_text_from_file(resume_file_path)
-            analysis = self.document_processor.analyze_resume(resume_text)
+            profile = self.load_resume_profile(resume_file_path)
             
             return {
                 "success": True,
-                "data": analysis
+                "data": profile["analysis"],
+                "profile_id": profile["profile_id"]
             }
             
         except Exception as e:
@@ -362,7 +539,7 @@ class JobApplicationAgent:
     def analyze_job_only(self, job_description: str) -> Dict[str, Any]:
         """Analyze job description without resume"""
         try:
-            analysis = self.job_processor.analyze_job_description(job_description)
+            analysis = self.analyze_job_description_cached(job_description)
             
             return {
                 "success": True,
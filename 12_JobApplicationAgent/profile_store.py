@@ -0,0 +1,102 @@
+"""
+Content-hash keyed store for parsed resumes and job analyses
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from config import PROFILE_DIR, PROFILE_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Bump when the parsers or skill taxonomy change so stale analyses are not reused
+PROFILE_VERSION = "1"
+
+
+def content_key(content: bytes) -> str:
+    """Stable id for a resume file or job description"""
+    digest = hashlib.sha256(PROFILE_VERSION.encode("utf-8"))
+    digest.update(content)
+    return digest.hexdigest()[:32]
+
+
+def file_key(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        return content_key(f.read())
+
+
+def text_key(text: str) -> str:
+    # Whitespace-only differences (e.g. pasted from another page) map to the same analysis
+    return content_key(" ".join(text.split()).encode("utf-8"))
+
+
+class ProfileStore:
+    """Parsed resumes and job analyses, in memory (LRU) and as JSON on disk.
+
+    Resumes are keyed by a hash of the uploaded file bytes, so uploading the same
+    resume again skips text extraction and analysis; the key doubles as the
+    profile id clients send back instead of re-uploading.
+    """
+
+    KINDS = ("resumes", "jobs")
+
+    def __init__(self, root: str = PROFILE_DIR, cache_size: int = PROFILE_CACHE_SIZE):
+        self.root = root
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        for kind in self.KINDS:
+            os.makedirs(os.path.join(root, kind), exist_ok=True)
+
+    def get(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if (kind, key) in self._cache:
+                self._cache.move_to_end((kind, key))
+                return self._cache[(kind, key)]
+
+        path = self._path(kind, key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable profile {path}: {e}")
+            return None
+
+        with self._lock:
+            self._remember((kind, key), record)
+        return record
+
+    def put(self, kind: str, key: str, record: Dict[str, Any]) -> None:
+        path = self._path(kind, key)
+        if not path:
+            raise ValueError(f"Invalid profile key: {key}")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # The in-memory copy still serves this process
+            logger.warning(f"Could not persist profile {path}: {e}")
+
+        with self._lock:
+            self._remember((kind, key), record)
+
+    def _path(self, kind: str, key: str) -> Optional[str]:
+        # Keys come back from clients as profile ids, so never let them name other files
+        if kind not in self.KINDS or not key.isalnum():
+            return None
+        return os.path.join(self.root, kind, f"{key}.json")
+
+    def _remember(self, key: tuple, record: Dict[str, Any]) -> None:
+        self._cache[key] = record
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
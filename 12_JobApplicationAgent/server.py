@@ -3,9 +3,10 @@ FastAPI server for JobApplicationAgent
 """
 
 import os
+import json
 import logging
 import tempfile
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
 
 from fastapi import FastAPI, File, Form, UploadFile, Request, HTTPException
@@ -13,11 +14,13 @@ from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
 
 from config import (
     PORT, HOST, DEBUG, MAX_FILE_SIZE, ALLOWED_EXTENSIONS,
     SUPPORTED_LANGUAGES, COVER_LETTER_LENGTHS, ADDITIONAL_DOCUMENTS, ERROR_MESSAGES,
-    SUCCESS_MESSAGES, TEMPLATE_DIR, STATIC_DIR, UPLOAD_DIR
+    SUCCESS_MESSAGES, TEMPLATE_DIR, STATIC_DIR, UPLOAD_DIR, BATCH_MAX_DESCRIPTIONS
 )
 from job_agent import JobApplicationAgent
 from document_generator import DocumentGenerator
@@ -83,66 +86,107 @@ async def index(request: Request) -> HTMLResponse:
     )
 
 
+def _validate_application_form(
+    resume_file: Optional[UploadFile],
+    resume_profile_id: str,
+    job_description: str,
+    language: str,
+    additional_documents: str
+) -> List[str]:
+    """Validate a generate-application form and return the additional document types
+    
+    Either a resume file or the profile_id of a previously analyzed resume is required.
+    """
+    if not job_agent:
+        raise HTTPException(status_code=500, detail="Job agent not initialized")
+    
+    if resume_file:
+        # Validate file
+        file_extension = Path(resume_file.filename).suffix.lower()
+        if file_extension not in ALLOWED_EXTENSIONS:
+            raise HTTPException(status_code=400, detail=ERROR_MESSAGES["invalid_file"])
+        
+        if resume_file.size > MAX_FILE_SIZE:
+            raise HTTPException(status_code=400, detail=ERROR_MESSAGES["file_too_large"])
+    elif resume_profile_id:
+        _require_profile(resume_profile_id)
+    else:
+        raise HTTPException(status_code=400, detail=ERROR_MESSAGES["missing_resume"])
+    
+    if not job_description or len(job_description.strip()) < 50:
+        raise HTTPException(status_code=400, detail=ERROR_MESSAGES["missing_job_description"])
+    
+    return _validate_generation_options(language, additional_documents)
+
+
+def _validate_generation_options(language: str, additional_documents: str) -> List[str]:
+    """Validate the language and return the parsed additional document types"""
+    # Validate language
+    if language not in SUPPORTED_LANGUAGES:
+        raise HTTPException(status_code=400, detail=ERROR_MESSAGES["invalid_language"])
+    
+    # Parse additional documents
+    additional_docs = []
+    if additional_documents:
+        additional_docs = [doc.strip() for doc in additional_documents.split(',') if doc.strip()]
+        # Validate additional document types
+        for doc_type in additional_docs:
+            if doc_type not in ADDITIONAL_DOCUMENTS:
+                raise HTTPException(status_code=400, detail=f"Invalid document type: {doc_type}")
+    return additional_docs
+
+
+def _require_profile(resume_profile_id: str) -> dict:
+    """Stored resume analysis for a profile id, or 404 so the client re-uploads"""
+    try:
+        return job_agent.get_resume_profile(resume_profile_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail=ERROR_MESSAGES["profile_not_found"])
+
+
+async def _save_upload(upload: UploadFile) -> str:
+    """Save an uploaded file to a temporary path and return the path"""
+    temp_fd, temp_file_path = tempfile.mkstemp(suffix=Path(upload.filename).suffix.lower())
+    os.close(temp_fd)
+    with open(temp_file_path, "wb") as buffer:
+        buffer.write(await upload.read())
+    return temp_file_path
+
+
 @app.post("/api/generate-application")
 async def generate_application(
-    resume_file: UploadFile = File(...),
+    resume_file: Optional[UploadFile] = File(default=None),
+    resume_profile_id: str = Form(default=""),
     job_description: str = Form(...),
     language: str = Form(default="en"),
     cover_letter_length: str = Form(default="medium"),
     additional_documents: str = Form(default="")
 ):
-    """Generate complete job application package"""
+    """Generate complete job application package
+    
+    Send resume_profile_id (returned by earlier requests) instead of resume_file
+    to reuse the stored resume analysis.
+    """
     try:
-        # Validate inputs
-        if not job_agent:
-            raise HTTPException(status_code=500, detail="Job agent not initialized")
-        
-        if not resume_file:
-            raise HTTPException(status_code=400, detail=ERROR_MESSAGES["missing_resume"])
-        
-        if not job_description or len(job_description.strip()) < 50:
-            raise HTTPException(status_code=400, detail=ERROR_MESSAGES["missing_job_description"])
-        
-        # Validate file
-        file_extension = Path(resume_file.filename).suffix.lower()
-        if file_extension not in ALLOWED_EXTENSIONS:
-            raise HTTPException(status_code=400, detail=ERROR_MESSAGES["invalid_file"])
-        
-        if resume_file.size > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail=ERROR_MESSAGES["file_too_large"])
-        
-        # Validate language
-        if language not in SUPPORTED_LANGUAGES:
-            raise HTTPException(status_code=400, detail=ERROR_MESSAGES["invalid_language"])
-        
-        # Parse additional documents
-        additional_docs = []
-        if additional_documents:
-            additional_docs = [doc.strip() for doc in additional_documents.split(',') if doc.strip()]
-            # Validate additional document types
-            for doc_type in additional_docs:
-                if doc_type not in ADDITIONAL_DOCUMENTS:
-                    raise HTTPException(status_code=400, detail=f"Invalid document type: {doc_type}")
+        additional_docs = _validate_application_form(
+            resume_file, resume_profile_id, job_description, language, additional_documents
+        )
         
         # Save uploaded file temporarily
         temp_file_path = None
         try:
-            # Create temporary file
-            temp_fd, temp_file_path = tempfile.mkstemp(suffix=file_extension)
-            os.close(temp_fd)
-            
-            # Save uploaded file
-            with open(temp_file_path, "wb") as buffer:
-                content = await resume_file.read()
-                buffer.write(content)
+            if resume_file:
+                temp_file_path = await _save_upload(resume_file)
             
-            # Generate application
-            result = job_agent.generate_application(
+            # Generate application off the event loop so other requests keep being served
+            result = await run_in_threadpool(
+                job_agent.generate_application,
                 resume_file_path=temp_file_path,
                 job_description=job_description,
                 language=language,
                 cover_letter_length=cover_letter_length,
-                additional_documents=additional_docs if additional_docs else None
+                additional_documents=additional_docs if additional_docs else None,
+                resume_profile_id=None if resume_file else resume_profile_id
             )
             
             if not result["success"]:
@@ -162,6 +206,114 @@ async def generate_application(
         raise HTTPException(status_code=500, detail=ERROR_MESSAGES["generation_failed"])
 
 
+@app.post("/api/generate-application/stream")
+async def generate_application_stream(
+    resume_file: Optional[UploadFile] = File(default=None),
+    resume_profile_id: str = Form(default=""),
+    job_description: str = Form(...),
+    language: str = Form(default="en"),
+    cover_letter_length: str = Form(default="medium"),
+    additional_documents: str = Form(default="")
+):
+    """Generate the application package, streaming each section as NDJSON when it is ready
+    
+    Each line is one event from JobApplicationAgent.iter_application: "analysis",
+    then one "section" per document in completion order with its latency, then
+    "done" with per-section timings (or "error").
+    """
+    additional_docs = _validate_application_form(
+        resume_file, resume_profile_id, job_description, language, additional_documents
+    )
+    temp_file_path = await _save_upload(resume_file) if resume_file else None
+    
+    def events():
+        try:
+            for event in job_agent.iter_application(
+                resume_file_path=temp_file_path,
+                job_description=job_description,
+                language=language,
+                cover_letter_length=cover_letter_length,
+                additional_documents=additional_docs or None,
+                resume_profile_id=None if resume_file else resume_profile_id
+            ):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        finally:
+            if temp_file_path and os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
+    
+    # Starlette iterates sync generators in its threadpool
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+class BatchApplicationRequest(BaseModel):
+    resume_profile_id: str
+    job_descriptions: List[str]
+    language: str = "en"
+    cover_letter_length: str = "medium"
+    additional_documents: List[str] = []
+
+
+@app.post("/api/generate-batch")
+async def generate_batch(request: BatchApplicationRequest):
+    """Generate one application per job description from a stored resume profile
+    
+    The resume is analyzed once (POST /api/analyze-resume returns its profile_id)
+    and the jobs are generated concurrently. Each result carries its own success
+    flag, so one failed job does not fail the batch.
+    """
+    try:
+        if not job_agent:
+            raise HTTPException(status_code=500, detail="Job agent not initialized")
+        
+        _require_profile(request.resume_profile_id)
+        additional_docs = _validate_generation_options(request.language, ",".join(request.additional_documents))
+        
+        if not request.job_descriptions:
+            raise HTTPException(status_code=400, detail=ERROR_MESSAGES["missing_job_description"])
+        if len(request.job_descriptions) > BATCH_MAX_DESCRIPTIONS:
+            raise HTTPException(status_code=400, detail=ERROR_MESSAGES["too_many_jobs"])
+        for job_description in request.job_descriptions:
+            if len(job_description.strip()) < 50:
+                raise HTTPException(status_code=400, detail=ERROR_MESSAGES["missing_job_description"])
+        
+        result = await run_in_threadpool(
+            job_agent.generate_batch,
+            resume_profile_id=request.resume_profile_id,
+            job_descriptions=request.job_descriptions,
+            language=request.language,
+            cover_letter_length=request.cover_letter_length,
+            additional_documents=additional_docs or None
+        )
+        
+        if not result["success"]:
+            raise HTTPException(status_code=500, detail=result["error"])
+        
+        return JSONResponse(content=result)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch generation failed: {e}")
+        raise HTTPException(status_code=500, detail=ERROR_MESSAGES["generation_failed"])
+
+
+@app.get("/api/resume-profile/{resume_profile_id}")
+async def get_resume_profile(resume_profile_id: str):
+    """Stored analysis of a previously uploaded resume"""
+    if not job_agent:
+        raise HTTPException(status_code=500, detail="Job agent not initialized")
+    
+    return JSONResponse(content={
+        "success": True,
+        "profile_id": resume_profile_id,
+        "data": _require_profile(resume_profile_id)
+    })
+
+
 @app.post("/api/extract-job-from-url")
 async def extract_job_from_url(url: str = Form(...)):
     """Extract job description from URL"""
@@ -214,7 +366,7 @@ async def analyze_resume(resume_file: UploadFile = File(...)):
                 content = await resume_file.read()
                 buffer.write(content)
             
-            result = job_agent.analyze_resume_only(temp_file_path)
+            result = await run_in_threadpool(job_agent.analyze_resume_only, temp_file_path)
             
             if not result["success"]:
                 raise HTTPException(status_code=500, detail=result["error"])
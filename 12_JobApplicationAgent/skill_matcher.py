@@ -0,0 +1,175 @@
+"""
+Compiled multi-pattern skill matcher for resumes and job descriptions
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# Canonical skill name -> aliases (matched case-insensitively on word boundaries).
+# The canonical name is an alias too, except for the ambiguous names below.
+SKILL_TAXONOMY: Dict[str, Dict[str, List[str]]] = {
+    "languages": {
+        "Python": [], "JavaScript": ["js", "ecmascript"], "TypeScript": [],
+        "Java": [], "C++": ["cpp"], "C#": ["csharp", "c sharp"], "C": ["c language", "ansi c"],
+        "PHP": [], "Ruby": [], "Go": ["golang"], "Rust": [], "Kotlin": [], "Swift": ["swift programming", "swiftui", "swift 5"],
+        "Objective-C": ["objective c", "objc"], "Scala": [], "R": ["r language", "rstudio"],
+        "MATLAB": [], "Perl": [], "Haskell": [], "Elixir": [], "Erlang": [], "Clojure": [],
+        "F#": ["fsharp"], "Dart": [], "Lua": [], "Julia": [], "Groovy": [], "Fortran": [],
+        "COBOL": [], "Visual Basic": ["vb.net", "vba"], "Assembly": ["asm"], "Solidity": [],
+        "Bash": ["shell scripting", "shell script"], "PowerShell": [], "SQL": ["t-sql", "pl/sql", "tsql", "plsql"],
+        "HTML": ["html5"], "CSS": ["css3"], "Sass": ["scss"], "Less": [], "GraphQL": [],
+        "WebAssembly": ["wasm"], "Zig": [], "OCaml": [], "Prolog": [],
+    },
+    "frameworks": {
+        "React": ["react.js", "reactjs"], "Angular": ["angularjs", "angular.js"], "Vue": ["vue.js", "vuejs"],
+        "Svelte": [], "Next.js": ["nextjs"], "Nuxt.js": ["nuxt", "nuxtjs"], "Gatsby": [],
+        "Node.js": ["nodejs"], "Express": ["express.js", "expressjs"], "NestJS": ["nest.js"],
+        "Django": [], "Flask": [], "FastAPI": [], "Pyramid": [], "Tornado": [],
+        "Spring": ["spring boot", "spring framework", "springboot", "spring mvc"], "Hibernate": [],
+        "Laravel": [], "Symfony": [], "CodeIgniter": [], "Ruby on Rails": ["rails", "ror"],
+        "ASP.NET": ["asp.net core", "asp.net mvc"], ".NET": ["dotnet", ".net core", ".net framework"],
+        "Entity Framework": [], "Blazor": [], "Xamarin": [], "Flutter": [], "React Native": [],
+        "Ionic": [], "Electron": [], "Qt": [], "jQuery": [], "Bootstrap": [], "Tailwind CSS": ["tailwind"],
+        "Material UI": ["mui"], "Redux": [], "MobX": [], "RxJS": [], "Webpack": [], "Vite": [], "Babel": [],
+        "Jest": [], "Mocha": [], "Cypress": [], "Playwright": [], "Selenium": [], "Pytest": [],
+        "JUnit": [], "TestNG": [], "Cucumber": [], "Storybook": [], "Three.js": ["threejs"], "D3.js": ["d3"],
+        "Unity": [], "Unreal Engine": ["unreal"], "Celery": [], "SQLAlchemy": [], "Pandas": [],
+        "NumPy": [], "SciPy": [], "Matplotlib": [], "Seaborn": [], "Plotly": [], "Jupyter": [],
+    },
+    "data": {
+        "MySQL": [], "PostgreSQL": ["postgres"], "SQLite": [], "Oracle Database": ["oracle db", "oracle"],
+        "Microsoft SQL Server": ["sql server", "mssql"], "MongoDB": ["mongo"], "Redis": [],
+        "Cassandra": [], "DynamoDB": [], "Couchbase": [], "CouchDB": [], "Neo4j": [],
+        "Elasticsearch": ["elastic search", "elk"], "OpenSearch": [], "Solr": [], "MariaDB": [],
+        "Snowflake": [], "BigQuery": [], "Redshift": [], "Databricks": [], "Apache Spark": ["spark", "pyspark"],
+        "Hadoop": ["hdfs", "mapreduce"], "Hive": [], "Kafka": ["apache kafka"], "RabbitMQ": [],
+        "Apache Flink": ["flink"], "Apache Airflow": ["airflow"], "dbt": [], "ETL": ["elt"],
+        "Data Warehousing": ["data warehouse"], "Data Modeling": ["data modelling"], "Power BI": ["powerbi"],
+        "Tableau": [], "Looker": [], "Excel": ["microsoft excel", "ms excel"], "Data Analysis": ["data analytics"],
+        "Data Visualization": ["data visualisation"], "Data Engineering": [], "Big Data": [],
+        "Statistics": ["statistical analysis"], "A/B Testing": ["ab testing", "split testing"],
+    },
+    "ai": {
+        "Machine Learning": ["ml"], "Deep Learning": [], "Artificial Intelligence": ["ai"],
+        "Data Science": [], "Natural Language Processing": ["nlp"], "Computer Vision": [],
+        "Reinforcement Learning": [], "Generative AI": ["genai", "gen ai"], "Large Language Models": ["llm", "llms"],
+        "Prompt Engineering": [], "TensorFlow": [], "PyTorch": [], "Keras": [], "scikit-learn": ["sklearn", "scikit learn"],
+        "XGBoost": [], "LightGBM": [], "Hugging Face": ["huggingface", "transformers"], "LangChain": [],
+        "OpenAI API": ["openai"], "OpenCV": [], "spaCy": [], "NLTK": [], "MLOps": [], "MLflow": [],
+        "Kubeflow": [], "Feature Engineering": [], "Time Series Analysis": ["time series"],
+        "Recommender Systems": ["recommendation systems"], "Neural Networks": ["neural network"],
+    },
+    "cloud": {
+        "AWS": ["amazon web services"], "Azure": ["microsoft azure"], "GCP": ["google cloud", "google cloud platform"],
+        "Docker": [], "Kubernetes": ["k8s"], "OpenShift": [], "Helm": [], "Terraform": [], "Pulumi": [],
+        "Ansible": [], "Chef": [], "Puppet": [], "CloudFormation": [], "Serverless": ["aws lambda", "lambda functions"],
+        "Jenkins": [], "GitHub Actions": [], "GitLab CI": ["gitlab ci/cd"], "CircleCI": [], "Travis CI": [],
+        "Argo CD": ["argocd"], "CI/CD": ["continuous integration", "continuous delivery", "continuous deployment"],
+        "DevOps": [], "Site Reliability Engineering": ["sre"], "Linux": ["unix"], "Nginx": [], "Apache HTTP Server": ["apache httpd"],
+        "Prometheus": [], "Grafana": [], "Datadog": [], "New Relic": [], "Splunk": [], "ELK Stack": ["logstash", "kibana"],
+        "Microservices": ["microservice"], "Service Mesh": ["istio", "linkerd"], "Heroku": [], "Vercel": [],
+        "Netlify": [], "Firebase": [], "Supabase": [], "Cloudflare": [], "Networking": ["tcp/ip", "dns"],
+    },
+    "tools": {
+        "Git": [], "GitHub": [], "GitLab": [], "Bitbucket": [], "SVN": ["subversion"], "Jira": [],
+        "Confluence": [], "Trello": [], "Asana": [], "Notion": [], "Slack": [], "Figma": [], "Sketch": [],
+        "Adobe XD": [], "Photoshop": ["adobe photoshop"], "Illustrator": ["adobe illustrator"], "InDesign": [],
+        "Postman": [], "Swagger": ["openapi"], "VS Code": ["visual studio code"], "Visual Studio": [],
+        "IntelliJ": ["intellij idea"], "Eclipse": [], "Xcode": [], "Android Studio": [], "Salesforce": [],
+        "SAP": [], "HubSpot": [], "Zendesk": [], "ServiceNow": [], "WordPress": [], "Shopify": [],
+        "Google Analytics": [], "SEO": ["search engine optimization"], "SEM": ["search engine marketing"],
+    },
+    "practices": {
+        "Agile": [], "Scrum": [], "Kanban": [], "Lean": [], "Waterfall": [], "TDD": ["test-driven development", "test driven development"],
+        "BDD": ["behavior-driven development"], "Unit Testing": ["unit tests"], "Integration Testing": [],
+        "QA": ["quality assurance"], "Test Automation": ["automated testing"], "Code Review": ["code reviews"],
+        "REST APIs": ["restful", "rest api", "restful apis"], "gRPC": [], "SOAP": [], "WebSockets": ["websocket"],
+        "OAuth": ["oauth2", "oauth 2.0"], "JWT": [], "Object-Oriented Programming": ["oop", "object oriented programming"],
+        "Functional Programming": [], "Design Patterns": [], "System Design": [], "Distributed Systems": [],
+        "Software Architecture": [], "Domain-Driven Design": ["ddd"], "Event-Driven Architecture": [],
+        "Performance Optimization": ["performance tuning"], "Cybersecurity": ["information security", "infosec"],
+        "Penetration Testing": ["pen testing"], "OWASP": [], "Cryptography": [], "Blockchain": [],
+        "Embedded Systems": ["embedded software", "firmware"], "IoT": ["internet of things"], "Mobile Development": [],
+        "iOS Development": ["ios"], "Android Development": ["android"], "Web Development": [],
+        "Frontend Development": ["front-end", "frontend"], "Backend Development": ["back-end", "backend"],
+        "Full Stack Development": ["full stack", "full-stack"], "UI/UX Design": ["ui/ux", "ux design", "ui design", "user experience"],
+        "Accessibility": ["wcag", "a11y"], "Responsive Design": [],
+    },
+    "business": {
+        "Project Management": [], "Product Management": [], "Program Management": [], "PMP": [],
+        "Stakeholder Management": [], "Risk Management": [], "Budgeting": ["budget management"],
+        "Business Analysis": [], "Requirements Gathering": [], "Strategic Planning": [],
+        "Digital Marketing": [], "Content Marketing": [], "Social Media Marketing": ["social media"],
+        "Sales": [], "Business Development": [], "Customer Service": ["customer support"],
+        "Account Management": [], "Financial Analysis": [], "Accounting": [], "Operations Management": [],
+        "Supply Chain Management": ["supply chain"], "Six Sigma": [], "ITIL": [], "Recruiting": ["talent acquisition"],
+        "Copywriting": [], "Technical Writing": ["technical documentation"],
+        "Research": ["user research", "market research", "research methods", "research skills"],
+    },
+    "soft": {
+        "Leadership": ["team leadership"], "Communication": ["communication skills"], "Teamwork": ["team player"],
+        "Problem Solving": ["problem-solving"], "Critical Thinking": [], "Time Management": [],
+        "Mentoring": ["coaching"], "Negotiation": [], "Public Speaking": ["presentation skills"],
+        "Adaptability": [], "Creativity": [], "Attention to Detail": [], "Conflict Resolution": [],
+        "Decision Making": ["decision-making"], "Emotional Intelligence": [], "Customer Focus": [],
+        "Multitasking": [], "Self-Motivation": ["self-motivated", "self motivated"],
+    },
+}
+
+# Everyday words that are only matched through their unambiguous aliases
+AMBIGUOUS_NAMES = {"C", "Go", "R", "Less", "Lean", "Chef", "Swift", "Spring", "Excel", "Research"}
+
+# Characters that continue a token, so "java" does not match inside "javascript"
+# and "c" does not match "c++" or "c#"
+_TOKEN_CHARS = r"\w+#"
+
+
+class SkillMatcher:
+    """Find skills in text with one compiled regex over every alias.
+
+    A single alternation (longest aliases first) scans the text once, so cost
+    grows with text length rather than taxonomy size, and explicit token
+    boundaries avoid substring hits such as "ai" in "maintain".
+    """
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, List[str]]] = SKILL_TAXONOMY):
+        self.categories: Dict[str, str] = {}
+        self._canonical: Dict[str, str] = {}
+        for category, skills in taxonomy.items():
+            for name, aliases in skills.items():
+                self.categories[name] = category
+                names = aliases if name in AMBIGUOUS_NAMES else [name, *aliases]
+                for alias in names:
+                    self._canonical.setdefault(alias.lower(), name)
+
+        alternation = "|".join(
+            re.escape(alias) for alias in sorted(self._canonical, key=len, reverse=True)
+        )
+        self._pattern = re.compile(
+            rf"(?<![{_TOKEN_CHARS}])(?:{alternation})(?![{_TOKEN_CHARS}]|\+\+)",
+            re.IGNORECASE,
+        )
+
+    def find(self, text: str, categories: Optional[Iterable[str]] = None) -> List[str]:
+        """Canonical skills found in text, in order of first appearance"""
+        wanted = set(categories) if categories is not None else None
+        found: Dict[str, None] = {}
+        for match in self._pattern.finditer(text):
+            name = self._canonical[match.group(0).lower()]
+            if wanted is None or self.categories[name] in wanted:
+                found.setdefault(name, None)
+        return list(found)
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+
+# Categories counted as technical skills in job descriptions
+TECHNICAL_CATEGORIES = ("languages", "frameworks", "data", "ai", "cloud", "tools", "practices")
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    """Shared matcher; compiling the pattern once is the expensive part"""
+    return SkillMatcher()
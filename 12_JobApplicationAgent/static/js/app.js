@@ -3,6 +3,8 @@
 class JobApplicationAgent {
     constructor() {
         this.selectedFile = null;
+        // Server-side id of the analyzed resume; sent instead of re-uploading the file
+        this.resumeProfileId = null;
         this.generatedData = null;
         this.currentInputMode = 'text';
         this.init();
@@ -153,6 +155,7 @@ class JobApplicationAgent {
         }
 
         this.selectedFile = file;
+        this.resumeProfileId = null;
         this.updateFileInfo(file);
         this.updateGenerateButton();
         this.hideError();
@@ -227,7 +230,11 @@ class JobApplicationAgent {
 
         try {
             const formData = new FormData();
-            formData.append('resume_file', this.selectedFile);
+            if (this.resumeProfileId) {
+                formData.append('resume_profile_id', this.resumeProfileId);
+            } else {
+                formData.append('resume_file', this.selectedFile);
+            }
             formData.append('job_description', jobDescription);
             formData.append('language', document.getElementById('language').value);
             formData.append('cover_letter_length', document.getElementById('coverLetterLength').value);
@@ -238,20 +245,53 @@ class JobApplicationAgent {
                 formData.append('additional_documents', additionalDocs.join(','));
             }
 
-            const response = await fetch('/api/generate-application', {
+            // Sections arrive as NDJSON events in the order they finish
+            let response = await fetch('/api/generate-application/stream', {
                 method: 'POST',
                 body: formData
             });
 
-            const result = await response.json();
+            if (response.status === 404 && this.resumeProfileId) {
+                // The stored profile is gone; upload the file again
+                this.resumeProfileId = null;
+                formData.delete('resume_profile_id');
+                formData.append('resume_file', this.selectedFile);
+                response = await fetch('/api/generate-application/stream', {
+                    method: 'POST',
+                    body: formData
+                });
+            }
 
-            if (response.ok && result.success) {
-                this.generatedData = result.data;
-                this.displayResults(result.data);
-                this.showSuccess();
-            } else {
-                throw new Error(result.error || 'Failed to generate application');
+            if (!response.ok) {
+                const result = await response.json().catch(() => ({}));
+                throw new Error(result.detail || result.error || 'Failed to generate application');
+            }
+
+            this.generatedData = { additional_documents: {} };
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let finished = false;
+
+            while (!finished) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+
+                let newline;
+                while ((newline = buffer.indexOf('\n')) >= 0) {
+                    const line = buffer.slice(0, newline).trim();
+                    buffer = buffer.slice(newline + 1);
+                    if (line && this.handleApplicationEvent(JSON.parse(line))) {
+                        finished = true;
+                    }
+                }
             }
+
+            if (!finished) {
+                throw new Error('Generation was interrupted');
+            }
+            this.showSuccess();
         } catch (error) {
             console.error('Generation error:', error);
             this.showError(error.message || 'An error occurred while generating your application.');
@@ -260,6 +300,42 @@ class JobApplicationAgent {
         }
     }
 
+    // Apply one streamed event; returns true once generation has finished
+    handleApplicationEvent(event) {
+        const data = this.generatedData;
+
+        if (event.type === 'error') {
+            throw new Error(event.error || 'Failed to generate application');
+        }
+
+        if (event.type === 'analysis') {
+            this.resumeProfileId = event.profile_id;
+            data.resume_analysis = event.resume_analysis;
+            data.job_analysis = event.job_analysis;
+            document.getElementById('resultsSection').classList.remove('hidden');
+            document.getElementById('resultsSection').scrollIntoView({ behavior: 'smooth', block: 'start' });
+        } else if (event.type === 'section') {
+            if (event.section === 'additional_document') {
+                data.additional_documents[event.document_type] = event.content;
+                this.displayAdditionalDocuments({ [event.document_type]: event.content });
+            } else if (event.section === 'fit_summary') {
+                data.fit_summary = event.content;
+                this.displayFitSummary(event.content);
+            } else if (event.section === 'customized_resume') {
+                data.customized_resume = event.content;
+                document.getElementById('customizedResume').textContent = event.content;
+            } else if (event.section === 'cover_letter') {
+                data.cover_letter = event.content;
+                document.getElementById('coverLetter').textContent = event.content;
+            }
+        } else if (event.type === 'done') {
+            data.timings = event.timings;
+            console.info(`Application generated in ${event.total_ms} ms (sequential would be ~${event.sequential_ms} ms)`, event.timings);
+            return true;
+        }
+        return false;
+    }
+
     displayResults(data) {
         // Display fit summary
         this.displayFitSummary(data.fit_summary);
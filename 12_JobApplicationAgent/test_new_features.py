@@ -134,6 +134,33 @@ def test_job_agent():
         print(f"❌ Job agent test failed: {e}")
         return False
 
+def test_skill_matcher():
+    """Test skill extraction, including words that are only skills in context"""
+    print("\nTesting skill matcher...")
+    
+    try:
+        from skill_matcher import SkillMatcher
+        
+        matcher = SkillMatcher()
+        found = matcher.find("Built Spring Boot services in Java and JavaScript; SwiftUI apps; MS Excel reports")
+        assert found == ["Spring", "Java", "JavaScript", "Swift", "Excel"], found
+        assert matcher.find("Led user research and wrote technical documentation as a team player") == \
+            ["Research", "Technical Writing", "Teamwork"]
+        print("✅ Skills and their aliases matched")
+        
+        # Ordinary prose must not turn into skills
+        for text in ["I excel at research and joined in spring 2023",
+                     "Wrote documentation on strategy in close collaboration with an embedded team",
+                     "Maintained a swift turnaround; go and learn"]:
+            assert matcher.find(text) == [], f"{text!r} -> {matcher.find(text)}"
+        print("✅ Everyday words are not taken for skills")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Skill matcher test failed: {e!r}")
+        return False
+
 def main():
     """Run all new feature tests"""
     print("=" * 50)
@@ -144,7 +171,8 @@ def main():
         ("URL Extraction", test_url_extractor),
         ("Additional Documents", test_additional_documents),
         ("Document Generator", test_document_generator),
-        ("Job Agent Features", test_job_agent)
+        ("Job Agent Features", test_job_agent),
+        ("Skill Matcher", test_skill_matcher)
     ]
     
     results = []
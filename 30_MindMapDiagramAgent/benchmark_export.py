@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark diagram export latency by node count
+
+Renders synthetic mind maps of increasing size with the same functions the server
+uses, cold and then from the render cache. No OpenAI API key is needed.
+
+    python benchmark_export.py
+    python benchmark_export.py --sizes 100 1000 10000 --formats mermaid svg png
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from typing import Any, Dict
+
+import diagram_renderer
+from config import DEFAULT_THEMES
+from diagram_renderer import RenderCache
+
+FORMATS = ["mermaid", "svg", "png", "pdf"]
+
+
+def synthetic_diagram(node_count: int, branching: int = 6, seed: int = 30) -> Dict[str, Any]:
+    """Random tree where each node has at most `branching` children"""
+    rng = random.Random(seed)
+    nodes = [{"id": "n0", "label": "Central Topic", "level": 1, "parent": None}]
+    open_parents = [nodes[0]]
+    child_counts = {"n0": 0}
+    for i in range(1, node_count):
+        parent = rng.choice(open_parents)
+        node = {
+            "id": f"n{i}",
+            "label": f"Idea {i}",
+            "level": parent["level"] + 1,
+            "parent": parent["id"],
+        }
+        nodes.append(node)
+        open_parents.append(node)
+        child_counts[node["id"]] = 0
+        child_counts[parent["id"]] += 1
+        if child_counts[parent["id"]] >= branching:
+            open_parents.remove(parent)
+    relationships = [{"from": n["parent"], "to": n["id"]} for n in nodes if n["parent"]]
+    return {"title": f"Benchmark {node_count}", "nodes": nodes, "relationships": relationships}
+
+
+def render(data: Dict[str, Any], export_format: str) -> bytes:
+    if export_format == "mermaid":
+        return diagram_renderer.mermaid_mindmap(data, DEFAULT_THEMES["light"]).encode("utf-8")
+    if export_format == "svg":
+        return diagram_renderer.render_svg(data).encode("utf-8")
+    if export_format == "png":
+        return diagram_renderer.render_png(data)
+    return diagram_renderer.render_pdf(data)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark diagram export latency")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = RenderCache(cache_dir)
+        print(f"{'nodes':>7}  {'format':<8} {'cold ms':>10} {'cached ms':>10} {'size':>10}")
+        print("-" * 50)
+        for size in args.sizes:
+            data = synthetic_diagram(size)
+            for export_format in args.formats:
+                content, cold_ms = timed(render, data, export_format)
+                cached_col = "-"
+                if export_format != "mermaid":
+                    # The server caches file exports only; Mermaid code is cheap to rebuild
+                    def cached_lookup():
+                        return cache.get(cache.key(data, export_format), export_format)
+
+                    cache.put(cache.key(data, export_format), export_format, content)
+                    cached, cached_ms = timed(cached_lookup)
+                    assert cached == content
+                    cached_col = f"{cached_ms:.1f}"
+                print(f"{size:>7}  {export_format:<8} {cold_ms:>10.1f} {cached_col:>10} {len(content):>10,}")
+
+
+if __name__ == "__main__":
+    main()
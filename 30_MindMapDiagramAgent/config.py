@@ -35,6 +35,11 @@ class Config:
         self.EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
         self.TEMP_DIR = os.getenv("TEMP_DIR", "temp")
         
+        # Rendering Configuration
+        self.RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))
+        self.RENDER_CACHE_ENABLED = os.getenv("RENDER_CACHE_ENABLED", "true").lower() == "true"
+        self.RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", os.path.join(self.TEMP_DIR, "render_cache"))
+        
         # Session Configuration
         self.SESSION_TIMEOUT = int(os.getenv("SESSION_TIMEOUT", "3600"))  # 1 hour
         self.MAX_SESSIONS_PER_USER = int(os.getenv("MAX_SESSIONS_PER_USER", "10"))
@@ -0,0 +1,343 @@
+"""
+Diagram rendering and render cache for MindMapDiagramAgent
+
+The functions in this module are pure (data in, bytes/str out) and live at module
+level so they can be pickled into a process pool: matplotlib rendering is CPU-bound
+and must not run on the FastAPI event loop.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever rendering output changes so stale cache entries are ignored
+RENDER_VERSION = "2"
+
+# Spring layout is quadratic; above this many nodes use the tree layout instead
+SPRING_LAYOUT_MAX_NODES = 300
+
+
+def mermaid_init_line(theme_colors: Dict[str, str]) -> str:
+    """Mermaid theme directive shared by every diagram type"""
+    return (
+        "%%{init: {'theme': 'base', 'themeVariables': { "
+        f"'primaryColor': '{theme_colors['primary']}', "
+        f"'primaryTextColor': '{theme_colors['text']}', "
+        f"'primaryBorderColor': '{theme_colors['primary']}', "
+        f"'lineColor': '{theme_colors['secondary']}', "
+        f"'secondaryColor': '{theme_colors['secondary']}', "
+        f"'tertiaryColor': '{theme_colors['accent']}' }}}}}}%%"
+    )
+
+
+def children_by_parent(nodes: List[Dict[str, Any]]) -> Dict[Optional[str], List[Dict[str, Any]]]:
+    """Group nodes by parent id, preserving input order"""
+    groups: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for node in nodes:
+        groups.setdefault(node.get('parent'), []).append(node)
+    return groups
+
+
+def walk_tree(nodes: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], int]]:
+    """Depth-first (node, depth) pairs in document order, using an explicit stack.
+
+    Roots are nodes without a parent or whose parent is unknown. Nodes that are
+    only reachable through a cycle are appended at depth 0 so nothing is lost.
+    """
+    known_ids = {node['id'] for node in nodes}
+    groups = children_by_parent(nodes)
+    roots = [n for n in nodes if n.get('parent') is None or n.get('parent') not in known_ids]
+
+    order: List[Tuple[Dict[str, Any], int]] = []
+    visited = set()
+    stack = [(node, 0) for node in reversed(roots)]
+    while stack:
+        node, depth = stack.pop()
+        if node['id'] in visited:
+            continue
+        visited.add(node['id'])
+        order.append((node, depth))
+        for child in reversed(groups.get(node['id'], [])):
+            stack.append((child, depth + 1))
+
+    for node in nodes:
+        if node['id'] not in visited:
+            visited.add(node['id'])
+            order.append((node, 0))
+    return order
+
+
+def mermaid_mindmap(data: Dict[str, Any], theme_colors: Dict[str, str]) -> str:
+    """Mermaid mindmap code built iteratively (no recursion limit on deep trees)"""
+    title = data.get('title', 'Main Topic')
+    lines = [mermaid_init_line(theme_colors), "mindmap", f"  root(({title}))"]
+    for node, depth in walk_tree(data.get('nodes', [])):
+        lines.append(f"{'  ' * (depth + 2)}{node['label']}")
+    return "\n".join(lines)
+
+
+def _mermaid_edges(data: Dict[str, Any]) -> List[str]:
+    lines = []
+    for rel in data.get('relationships', []):
+        from_node = rel.get('from')
+        to_node = rel.get('to')
+        label = rel.get('label', '')
+        if from_node and to_node:
+            if label:
+                lines.append(f"    {from_node} -->|{label}| {to_node}")
+            else:
+                lines.append(f"    {from_node} --> {to_node}")
+    return lines
+
+
+def mermaid_flowchart(data: Dict[str, Any], theme_colors: Dict[str, str]) -> str:
+    """Mermaid flowchart code"""
+    lines = [mermaid_init_line(theme_colors), "flowchart TD"]
+    for node in data.get('nodes', []):
+        node_id = node['id']
+        label = node['label']
+        node_type = node.get('type', 'default')
+        if node_type in ('start', 'end'):
+            lines.append(f"    {node_id}([{label}])")
+        elif node_type == 'decision':
+            lines.append(f"    {node_id}{{{label}}}")
+        else:
+            lines.append(f"    {node_id}[{label}]")
+    lines.extend(_mermaid_edges(data))
+    return "\n".join(lines)
+
+
+def mermaid_graph(data: Dict[str, Any], theme_colors: Dict[str, str]) -> str:
+    """Mermaid graph code for org charts and networks"""
+    lines = [mermaid_init_line(theme_colors), "graph TD"]
+    for node in data.get('nodes', []):
+        node_id = node['id']
+        label = node['label']
+        level = node.get('level', 1)
+        node_type = node.get('type', 'default')
+        # Different node styles based on level and type
+        if level == 1 or node_type in ('executive', 'manager'):
+            lines.append(f"    {node_id}([{label}])")
+        else:
+            lines.append(f"    {node_id}[{label}]")
+    lines.extend(_mermaid_edges(data))
+    return "\n".join(lines)
+
+
+def tree_layout(nodes: List[Dict[str, Any]]) -> Dict[str, Tuple[float, int]]:
+    """Tidy tree layout: leaves get consecutive x slots, parents sit centred above.
+
+    Returns {node_id: (x_slot, depth)}. Runs in O(n) with no recursion.
+    """
+    order = walk_tree(nodes)
+    depth_of = {node['id']: depth for node, depth in order}
+    tree_children: Dict[str, List[str]] = {}
+    for node, depth in order:
+        parent = node.get('parent')
+        if parent in depth_of and depth_of[parent] == depth - 1:
+            tree_children.setdefault(parent, []).append(node['id'])
+
+    positions: Dict[str, Tuple[float, int]] = {}
+    next_leaf = 0
+    for node, depth in order:
+        if node['id'] not in tree_children:
+            positions[node['id']] = (float(next_leaf), depth)
+            next_leaf += 1
+    # Reverse pre-order visits every child before its parent
+    for node, depth in reversed(order):
+        children = tree_children.get(node['id'])
+        if children:
+            xs = [positions[child][0] for child in children]
+            positions[node['id']] = ((min(xs) + max(xs)) / 2, depth)
+    return positions
+
+
+def render_svg(data: Dict[str, Any]) -> str:
+    """SVG document for the diagram, built as a list of parts and joined once"""
+    title = escape(str(data.get('title', 'Diagram')))
+    nodes = data.get('nodes', [])
+    positions = tree_layout(nodes)
+
+    x_step, y_step, margin, top = 120, 100, 60, 90
+    max_x = max((x for x, _ in positions.values()), default=0)
+    max_depth = max((d for _, d in positions.values()), default=0)
+    width = max(800, int(max_x * x_step) + 2 * margin)
+    height = max(600, int(max_depth * y_step) + top + 2 * margin)
+
+    def point(node_id: str) -> Tuple[int, int]:
+        x, depth = positions[node_id]
+        return margin + int(x * x_step), top + margin + depth * y_step
+
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">',
+        '    <defs>',
+        '        <style>',
+        '            .node { fill: #3b82f6; stroke: #1d4ed8; stroke-width: 2; }',
+        '            .node-text { fill: white; font-family: Arial, sans-serif; font-size: 12px; text-anchor: middle; }',
+        '            .connection { stroke: #6b7280; stroke-width: 2; fill: none; }',
+        '            .title { fill: #1f2937; font-family: Arial, sans-serif; font-size: 24px; font-weight: bold; text-anchor: middle; }',
+        '        </style>',
+        '    </defs>',
+        f'    <rect width="{width}" height="{height}" fill="white"/>',
+        f'    <text x="{width // 2}" y="40" class="title">{title}</text>',
+    ]
+
+    # Edges first so nodes are drawn on top of them
+    for node in nodes:
+        parent = node.get('parent')
+        if parent in positions:
+            x1, y1 = point(parent)
+            x2, y2 = point(node['id'])
+            parts.append(f'    <line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" class="connection"/>')
+
+    for node in nodes:
+        x, y = point(node['id'])
+        label = escape(str(node['label'])[:10])
+        parts.append(f'    <circle cx="{x}" cy="{y}" r="30" class="node"/>')
+        parts.append(f'    <text x="{x}" y="{y + 4}" class="node-text">{label}</text>')
+
+    parts.append('</svg>')
+    return "\n".join(parts)
+
+
+def render_png(data: Dict[str, Any]) -> bytes:
+    """PNG image of the diagram rendered with matplotlib/networkx; raises if rendering fails"""
+    import matplotlib
+    matplotlib.use('Agg')  # Use non-interactive backend
+    import matplotlib.pyplot as plt
+    import networkx as nx
+
+    try:
+        title = data.get('title', 'Diagram')
+        nodes = data.get('nodes', [])
+
+        # Scale the canvas with the diagram so large maps stay legible
+        scale = max(1.0, (len(nodes) / 50) ** 0.5)
+        fig, ax = plt.subplots(figsize=(12 * scale, 8 * scale))
+        ax.axis('off')
+        ax.set_title(title, fontsize=20, fontweight='bold')
+
+        G = nx.Graph()
+        for node in nodes:
+            G.add_node(node['id'], label=node['label'], level=node.get('level', 1))
+        for node in nodes:
+            if node.get('parent') in G:
+                G.add_edge(node['parent'], node['id'])
+
+        if len(nodes) <= SPRING_LAYOUT_MAX_NODES:
+            pos = nx.spring_layout(G, k=1, iterations=50)
+        else:
+            pos = {node_id: (x, -depth) for node_id, (x, depth) in tree_layout(nodes).items()}
+
+        node_size = 2000 if len(nodes) <= 100 else max(50, 200000 // len(nodes))
+        nx.draw_networkx_nodes(G, pos, node_color='lightblue', node_size=node_size, ax=ax)
+        nx.draw_networkx_edges(G, pos, edge_color='gray', width=2 if len(nodes) <= 100 else 0.5, ax=ax)
+        if len(nodes) <= 1000:
+            labels = {node: G.nodes[node]['label'][:15] for node in G.nodes()}
+            nx.draw_networkx_labels(G, pos, labels, font_size=8, font_weight='bold', ax=ax)
+
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=150 if len(nodes) <= 1000 else 72,
+                    bbox_inches='tight', facecolor='white')
+        plt.close(fig)
+        return buf.getvalue()
+
+    except Exception as e:
+        logger.error(f"Error generating PNG: {str(e)}")
+        raise
+
+
+def render_pdf(data: Dict[str, Any]) -> bytes:
+    """PDF outline of the diagram; raises if rendering fails"""
+    try:
+        from reportlab.pdfgen import canvas
+        from reportlab.lib.pagesizes import letter
+
+        buf = io.BytesIO()
+        c = canvas.Canvas(buf, pagesize=letter)
+
+        c.setFont("Helvetica-Bold", 24)
+        c.drawString(100, 750, data.get('title', 'Diagram'))
+
+        c.setFont("Helvetica", 12)
+        y = 700
+        for node in data.get('nodes', [])[:20]:  # Limit to 20 nodes
+            c.drawString(100, y, f"• {node['label']}")
+            y -= 20
+            if y < 50:
+                break
+
+        c.save()
+        return buf.getvalue()
+
+    except Exception as e:
+        logger.error(f"Error generating PDF: {str(e)}")
+        raise
+
+
+def render_fallback(export_format: str) -> bytes:
+    """Content served when rendering fails: an error image for PNG, nothing otherwise"""
+    return render_error_image() if export_format == 'png' else b''
+
+
+def render_error_image() -> bytes:
+    """Simple placeholder image used when PNG rendering fails"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots(figsize=(8, 6))
+        ax.text(0.5, 0.5, 'Error generating diagram',
+                ha='center', va='center', fontsize=16, transform=ax.transAxes)
+        ax.axis('off')
+
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=100, bbox_inches='tight')
+        plt.close(fig)
+        return buf.getvalue()
+    except Exception:
+        return b''
+
+
+class RenderCache:
+    """Content-addressed on-disk cache of rendered exports.
+
+    The key is a SHA-256 of the canonical JSON of the diagram data plus the export
+    format and RENDER_VERSION, so identical diagrams are rendered only once.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(data: Dict[str, Any], export_format: str) -> str:
+        canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(f"{RENDER_VERSION}|{export_format}|{canonical}".encode('utf-8')).hexdigest()
+
+    def path(self, key: str, export_format: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{export_format}")
+
+    def get(self, key: str, export_format: str) -> Optional[bytes]:
+        try:
+            with open(self.path(key, export_format), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, export_format: str, content: bytes) -> None:
+        if not content:
+            return
+        path = self.path(key, export_format)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
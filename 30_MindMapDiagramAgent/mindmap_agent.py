@@ -1,25 +1,30 @@
 import openai
+import asyncio
 import json
 import re
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 import base64
 import os
 from datetime import datetime
 import uuid
-import io
 from PIL import Image, ImageDraw, ImageFont
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import FancyBboxPatch
-import networkx as nx
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
 
 from config import Config, DEFAULT_THEMES, DIAGRAM_TYPES, EXPORT_FORMATS
+import diagram_renderer
+from diagram_renderer import RenderCache
 
 logger = logging.getLogger(__name__)
 
+# Export formats rendered from the diagram data; JSON is written as-is
+_RENDERERS = {
+    "svg": diagram_renderer.render_svg,
+    "png": diagram_renderer.render_png,
+    "pdf": diagram_renderer.render_pdf,
+}
+
 class MindMapAgent:
     """AI-powered mind map diagram generator"""
     
@@ -29,6 +34,11 @@ class MindMapAgent:
         
         # Create necessary directories
         self._create_directories()
+        
+        # Rendered exports keyed by content hash, and a lazily started render pool
+        self.render_cache = RenderCache(self.config.RENDER_CACHE_DIR) if self.config.RENDER_CACHE_ENABLED else None
+        self._render_pool: Optional[ProcessPoolExecutor] = None
+        self._render_pool_lock = threading.Lock()
     
     def _create_directories(self):
         """Create necessary directories for file storage"""
@@ -528,31 +538,7 @@ Ensure the JSON is valid and follows the exact structure above.
         """
         Generate Mermaid mindmap code
         """
-        title = data.get('title', 'Main Topic')
-        
-        # Build the mindmap structure
-        nodes_by_parent = {}
-        for node in data.get('nodes', []):
-            parent = node.get('parent')
-            if parent not in nodes_by_parent:
-                nodes_by_parent[parent] = []
-            nodes_by_parent[parent].append(node)
-        
-        # Start with basic mindmap structure
-        mermaid_code = "%%{init: {'theme': 'base', 'themeVariables': { 'primaryColor': '" + theme_colors["primary"] + "', 'primaryTextColor': '" + theme_colors["text"] + "', 'primaryBorderColor': '" + theme_colors["primary"] + "', 'lineColor': '" + theme_colors["secondary"] + "', 'secondaryColor': '" + theme_colors["secondary"] + "', 'tertiaryColor': '" + theme_colors["accent"] + "' }}}%%\n"
-        mermaid_code += "mindmap\n"
-        mermaid_code += f"  root(({title}))"
-        
-        # Add child nodes recursively
-        def add_children(parent_id, indent=2):
-            nonlocal mermaid_code
-            children = nodes_by_parent.get(parent_id, [])
-            for child in children:
-                mermaid_code += f"\n{'  ' * indent}{child['label']}"
-                add_children(child['id'], indent + 1)
-        
-        add_children(None)
-        return mermaid_code
+        return diagram_renderer.mermaid_mindmap(data, theme_colors)
     
     def _generate_mermaid_flowchart(
         self,
@@ -562,36 +548,7 @@ Ensure the JSON is valid and follows the exact structure above.
         """
         Generate Mermaid flowchart code
         """
-        mermaid_code = "%%{init: {'theme': 'base', 'themeVariables': { 'primaryColor': '" + theme_colors["primary"] + "', 'primaryTextColor': '" + theme_colors["text"] + "', 'primaryBorderColor': '" + theme_colors["primary"] + "', 'lineColor': '" + theme_colors["secondary"] + "', 'secondaryColor': '" + theme_colors["secondary"] + "', 'tertiaryColor': '" + theme_colors["accent"] + "' }}}%%\n"
-        mermaid_code += "flowchart TD"
-        
-        # Add nodes
-        for node in data.get('nodes', []):
-            node_id = node['id']
-            label = node['label']
-            node_type = node.get('type', 'default')
-            
-            if node_type == 'start':
-                mermaid_code += f"\n    {node_id}([{label}])"
-            elif node_type == 'decision':
-                mermaid_code += f"\n    {node_id}{{{label}}}"
-            elif node_type == 'end':
-                mermaid_code += f"\n    {node_id}([{label}])"
-            else:
-                mermaid_code += f"\n    {node_id}[{label}]"
-        
-        # Add relationships
-        for rel in data.get('relationships', []):
-            from_node = rel.get('from')
-            to_node = rel.get('to')
-            label = rel.get('label', '')
-            if from_node and to_node:
-                if label:
-                    mermaid_code += f"\n    {from_node} -->|{label}| {to_node}"
-                else:
-                    mermaid_code += f"\n    {from_node} --> {to_node}"
-        
-        return mermaid_code
+        return diagram_renderer.mermaid_flowchart(data, theme_colors)
     
     def _generate_mermaid_graph(
         self,
@@ -601,36 +558,7 @@ Ensure the JSON is valid and follows the exact structure above.
         """
         Generate Mermaid graph code for org charts and networks
         """
-        mermaid_code = "%%{init: {'theme': 'base', 'themeVariables': { 'primaryColor': '" + theme_colors["primary"] + "', 'primaryTextColor': '" + theme_colors["text"] + "', 'primaryBorderColor': '" + theme_colors["primary"] + "', 'lineColor': '" + theme_colors["secondary"] + "', 'secondaryColor': '" + theme_colors["secondary"] + "', 'tertiaryColor': '" + theme_colors["accent"] + "' }}}%%\n"
-        mermaid_code += "graph TD"
-        
-        # Add nodes
-        for node in data.get('nodes', []):
-            node_id = node['id']
-            label = node['label']
-            level = node.get('level', 1)
-            node_type = node.get('type', 'default')
-            
-            # Different node styles based on level and type
-            if level == 1 or node_type == 'executive':
-                mermaid_code += f"\n    {node_id}([{label}])"
-            elif node_type == 'manager':
-                mermaid_code += f"\n    {node_id}([{label}])"
-            else:
-                mermaid_code += f"\n    {node_id}[{label}]"
-        
-        # Add relationships
-        for rel in data.get('relationships', []):
-            from_node = rel.get('from')
-            to_node = rel.get('to')
-            label = rel.get('label', '')
-            if from_node and to_node:
-                if label:
-                    mermaid_code += f"\n    {from_node} -->|{label}| {to_node}"
-                else:
-                    mermaid_code += f"\n    {from_node} --> {to_node}"
-        
-        return mermaid_code
+        return diagram_renderer.mermaid_graph(data, theme_colors)
     
     def _generate_mindmap_code(
         self,
@@ -683,12 +611,8 @@ Ensure the JSON is valid and follows the exact structure above.
             # Generate export
             if export_format == "json":
                 return await self._export_json(data, filename)
-            elif export_format == "svg":
-                return await self._export_svg(data, filename)
-            elif export_format == "png":
-                return await self._export_png(data, filename)
-            elif export_format == "pdf":
-                return await self._export_pdf(data, filename)
+            elif export_format in _RENDERERS:
+                return await self._export_rendered(data, export_format, filename)
             else:
                 raise ValueError(f"Unsupported export format: {export_format}")
                 
@@ -718,222 +642,100 @@ Ensure the JSON is valid and follows the exact structure above.
             "download_url": f"/exports/{filename}.json"
         }
     
-    async def _export_svg(
+    async def _export_rendered(
         self,
         data: Dict[str, Any],
+        export_format: str,
         filename: str
     ) -> Dict[str, Any]:
-        """Export as SVG file"""
+        """Export as SVG/PNG/PDF, reusing a cached render of identical content"""
         try:
-            # Create a simple SVG representation
-            svg_content = self._generate_svg_content(data)
-            file_path = os.path.join(self.config.EXPORT_DIR, f"{filename}.svg")
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(svg_content)
-            
-            return {
-                "success": True,
-                "format": "svg",
-                "filename": f"{filename}.svg",
-                "file_path": file_path,
-                "download_url": f"/exports/{filename}.svg"
-            }
-        except Exception as e:
-            logger.error(f"Error generating SVG: {str(e)}")
-            return {
-                "success": False,
-                "error": f"Failed to generate SVG: {str(e)}"
-            }
-    
-    async def _export_png(
-        self,
-        data: Dict[str, Any],
-        filename: str
-    ) -> Dict[str, Any]:
-        """Export as PNG file"""
-        try:
-            # Create a matplotlib-based diagraExport Your Diagramm
-            img_data = self._generate_png_content(data)
-            file_path = os.path.join(self.config.EXPORT_DIR, f"{filename}.png")
+            content, cached = await self.render(data, export_format)
+            file_path = os.path.join(self.config.EXPORT_DIR, f"{filename}.{export_format}")
             
             with open(file_path, 'wb') as f:
-                f.write(img_data)
+                f.write(content)
             
             return {
                 "success": True,
-                "format": "png",
-                "filename": f"{filename}.png",
+                "format": export_format,
+                "filename": f"{filename}.{export_format}",
                 "file_path": file_path,
-                "download_url": f"/exports/{filename}.png"
+                "download_url": f"/exports/{filename}.{export_format}",
+                "cached": cached
             }
         except Exception as e:
-            logger.error(f"Error generating PNG: {str(e)}")
+            logger.error(f"Error generating {export_format.upper()}: {str(e)}")
             return {
                 "success": False,
-                "error": f"Failed to generate PNG: {str(e)}"
+                "error": f"Failed to generate {export_format.upper()}: {str(e)}"
             }
     
-    async def _export_pdf(
-        self,
-        data: Dict[str, Any],
-        filename: str
-    ) -> Dict[str, Any]:
-        """Export as PDF file"""
-        try:
-            # Create a simple PDF representation
-            pdf_content = self._generate_pdf_content(data)
-            file_path = os.path.join(self.config.EXPORT_DIR, f"{filename}.pdf")
-            
-            with open(file_path, 'wb') as f:
-                f.write(pdf_content)
-            
-            return {
-                "success": True,
-                "format": "pdf",
-                "filename": f"{filename}.pdf",
-                "file_path": file_path,
-                "download_url": f"/exports/{filename}.pdf"
-            }
-        except Exception as e:
-            logger.error(f"Error generating PDF: {str(e)}")
-            return {
-                "success": False,
-                "error": f"Failed to generate PDF: {str(e)}"
-            }
+    async def render(self, data: Dict[str, Any], export_format: str) -> Tuple[bytes, bool]:
+        """
+        Render the diagram to bytes, returning (content, served_from_cache).
+        
+        matplotlib/reportlab rendering runs in a process pool so a large export
+        does not block the event loop or hold the GIL for other requests; SVG is
+        plain string building and runs in a thread.
+        """
+        key = None
+        if self.render_cache:
+            key = self.render_cache.key(data, export_format)
+            content = await asyncio.to_thread(self.render_cache.get, key, export_format)
+            if content is not None:
+                return content, True
+        
+        loop = asyncio.get_running_loop()
+        renderer = _RENDERERS[export_format]
+        if export_format == "svg":
+            content = await asyncio.to_thread(renderer, data)
+        else:
+            try:
+                content = await loop.run_in_executor(self._get_render_pool(), renderer, data)
+            except Exception as e:
+                # Serve the placeholder but keep it out of the cache so the next request renders again
+                logger.error(f"Rendering {export_format.upper()} failed: {str(e)}")
+                return diagram_renderer.render_fallback(export_format), False
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        
+        if key is not None:
+            await asyncio.to_thread(self.render_cache.put, key, export_format, content)
+        return content, False
+    
+    def _get_render_pool(self) -> ProcessPoolExecutor:
+        """Create the render process pool on first use"""
+        with self._render_pool_lock:
+            if self._render_pool is None:
+                self._render_pool = ProcessPoolExecutor(max_workers=self.config.RENDER_WORKERS)
+            return self._render_pool
+    
+    def shutdown(self):
+        """Stop the render process pool"""
+        with self._render_pool_lock:
+            if self._render_pool is not None:
+                self._render_pool.shutdown(wait=False, cancel_futures=True)
+                self._render_pool = None
     
     def _generate_svg_content(self, data: Dict[str, Any]) -> str:
         """Generate SVG content for the diagram"""
-        title = data.get('title', 'Diagram')
-        nodes = data.get('nodes', [])
-        
-        # Calculate dimensions
-        width = 800
-        height = 600
-        
-        svg = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">
-    <defs>
-        <style>
-            .node {{ fill: #3b82f6; stroke: #1d4ed8; stroke-width: 2; }}
-            .node-text {{ fill: white; font-family: Arial, sans-serif; font-size: 12px; text-anchor: middle; }}
-            .connection {{ stroke: #6b7280; stroke-width: 2; fill: none; }}
-            .title {{ fill: #1f2937; font-family: Arial, sans-serif; font-size: 24px; font-weight: bold; text-anchor: middle; }}
-        </style>
-    </defs>
-    
-    <rect width="{width}" height="{height}" fill="white"/>
-    <text x="{width//2}" y="40" class="title">{title}</text>
-'''
-        
-        # Add nodes
-        for i, node in enumerate(nodes[:10]):  # Limit to 10 nodes for SVG
-            x = 100 + (i % 3) * 200
-            y = 100 + (i // 3) * 100
-            svg += f'''
-    <circle cx="{x}" cy="{y}" r="30" class="node"/>
-    <text x="{x}" y="{y+4}" class="node-text">{node['label'][:10]}</text>'''
-        
-        svg += '''
-</svg>'''
-        
-        return svg
+        return diagram_renderer.render_svg(data)
     
     def _generate_png_content(self, data: Dict[str, Any]) -> bytes:
         """Generate PNG content for the diagram"""
         try:
-            title = data.get('title', 'Diagram')
-            nodes = data.get('nodes', [])
-            
-            # Create figure
-            fig, ax = plt.subplots(figsize=(12, 8))
-            ax.set_xlim(0, 10)
-            ax.set_ylim(0, 8)
-            ax.axis('off')
-            
-            # Add title
-            ax.text(5, 7.5, title, fontsize=20, fontweight='bold', ha='center', va='center')
-            
-            # Create network graph
-            G = nx.Graph()
-            
-            # Add nodes
-            for node in nodes:
-                G.add_node(node['id'], label=node['label'], level=node.get('level', 1))
-            
-            # Add edges based on parent-child relationships
-            for node in nodes:
-                if node.get('parent'):
-                    G.add_edge(node['parent'], node['id'])
-            
-            # Position nodes using spring layout
-            pos = nx.spring_layout(G, k=1, iterations=50)
-            
-            # Draw nodes
-            nx.draw_networkx_nodes(G, pos, node_color='lightblue', node_size=2000, ax=ax)
-            nx.draw_networkx_edges(G, pos, edge_color='gray', width=2, ax=ax)
-            
-            # Add labels
-            labels = {node: G.nodes[node]['label'][:15] for node in G.nodes()}
-            nx.draw_networkx_labels(G, pos, labels, font_size=8, font_weight='bold', ax=ax)
-            
-            # Save to bytes
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=150, bbox_inches='tight', facecolor='white')
-            buf.seek(0)
-            plt.close()
-            
-            return buf.getvalue()
-            
-        except Exception as e:
-            logger.error(f"Error generating PNG: {str(e)}")
-            # Return a simple error image
-            return self._generate_error_image()
+            return diagram_renderer.render_png(data)
+        except Exception:
+            return diagram_renderer.render_fallback("png")
     
     def _generate_pdf_content(self, data: Dict[str, Any]) -> bytes:
         """Generate PDF content for the diagram"""
         try:
-            # For now, return a simple PDF with text
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.pagesizes import letter
-            
-            buf = io.BytesIO()
-            c = canvas.Canvas(buf, pagesize=letter)
-            
-            # Add title
-            c.setFont("Helvetica-Bold", 24)
-            c.drawString(100, 750, data.get('title', 'Diagram'))
-            
-            # Add nodes
-            c.setFont("Helvetica", 12)
-            y = 700
-            for node in data.get('nodes', [])[:20]:  # Limit to 20 nodes
-                c.drawString(100, y, f"• {node['label']}")
-                y -= 20
-                if y < 50:
-                    break
-            
-            c.save()
-            buf.seek(0)
-            return buf.getvalue()
-            
-        except Exception as e:
-            logger.error(f"Error generating PDF: {str(e)}")
-            return b''
+            return diagram_renderer.render_pdf(data)
+        except Exception:
+            return diagram_renderer.render_fallback("pdf")
     
     def _generate_error_image(self) -> bytes:
         """Generate a simple error image"""
-        try:
-            fig, ax = plt.subplots(figsize=(8, 6))
-            ax.text(0.5, 0.5, 'Error generating diagram', 
-                   ha='center', va='center', fontsize=16, transform=ax.transAxes)
-            ax.axis('off')
-            
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-            buf.seek(0)
-            plt.close()
-            
-            return buf.getvalue()
-        except:
-            return b''
+        return diagram_renderer.render_error_image()
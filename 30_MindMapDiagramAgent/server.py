@@ -41,6 +41,11 @@ app.mount("/exports", StaticFiles(directory="exports"), name="exports")
 # Initialize the mind map agent
 mindmap_agent = MindMapAgent()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the render process pool"""
+    mindmap_agent.shutdown()
+
 @app.get("/", response_class=HTMLResponse)
 async def read_root():
     """Serve the main web interface"""
@@ -21,7 +21,7 @@ from rich.markdown import Markdown
 from monitor import SystemMonitor
 from ai_assistant import AIAssistant
 from utils import print_header, export_data, get_system_info, Colors, format_percentage
-from config import DEFAULT_REFRESH_INTERVAL, DEFAULT_ALERT_THRESHOLDS
+from config import SAMPLE_INTERVAL, DEFAULT_REFRESH_INTERVAL, DEFAULT_ALERT_THRESHOLDS
 
 # Initialize Rich console
 console = Console()
@@ -93,7 +93,7 @@ class SystemMonitorAgentCLI:
         # Get monitoring options
         interval = Prompt.ask("Refresh interval (seconds)", default=str(DEFAULT_REFRESH_INTERVAL))
         try:
-            interval = int(interval)
+            interval = float(interval)
         except ValueError:
             interval = DEFAULT_REFRESH_INTERVAL
         
@@ -337,10 +337,12 @@ class SystemMonitorAgentCLI:
         except Exception as e:
             console.print(f"❌ Export failed: {e}", style="red")
     
-    def run_monitoring_loop(self, interval: int, show_processes: bool = True):
+    def run_monitoring_loop(self, interval: float, show_processes: bool = True):
         """Run continuous monitoring loop"""
         self.running = True
         iteration = 0
+        # Collection runs in the background; the loop only redraws
+        self.monitor.start_sampler(min(interval, SAMPLE_INTERVAL))
         
         try:
             while self.running:
@@ -372,6 +374,8 @@ class SystemMonitorAgentCLI:
             self.running = False
         except Exception as e:
             console.print(f"\n❌ Monitoring error: {e}", style="red")
+        finally:
+            self.monitor.stop_sampler()
     
     def run(self):
         """Main CLI loop"""
@@ -6,6 +6,23 @@ from typing import Dict, Any
 
 # System monitoring configuration
 DEFAULT_REFRESH_INTERVAL = 5  # seconds
+SAMPLE_INTERVAL = 1.0  # seconds between background samples (lowered for sub-second refresh)
+HISTORY_SECONDS = 2 * 24 * 3600  # per-sample history kept in memory; older data lives in rollups
+HISTORY_ROLLUPS = {  # name: (bucket seconds, seconds kept)
+    'minute': (60, 30 * 24 * 3600),
+    'hour': (3600, 365 * 24 * 3600),
+}
+DISK_REFRESH_INTERVAL = 5.0  # disk usage changes slowly
+PROCESS_REFRESH_INTERVAL = 2.0
+PROCESS_FULL_REFRESH_EVERY = 10  # re-read memory of idle processes every N process refreshes
+CPU_SAMPLE_WINDOW = 0.5  # seconds a one-shot snapshot (no sampler running) measures CPU usage over
+OVERHEAD_BUDGET_PERCENT = 1.0  # CPU the collectors may use, as % of one core; 0 disables adaptive scheduling
+MAX_SLOWDOWN = 8  # over budget, a collector's period may grow up to this many times its configured value
+ADAPT_EVERY = 10.0  # seconds between scheduling adjustments
+
+# Metrics endpoint (Prometheus text / OpenMetrics), started with main.py --metrics-port
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
 DEFAULT_ALERT_THRESHOLDS = {
     'cpu': 80.0,      # CPU usage percentage
     'ram': 85.0,      # RAM usage percentage
@@ -5,11 +5,12 @@ import argparse
 import signal
 import sys
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from monitor import SystemMonitor
 from ai_assistant import AIAssistant
 from utils import print_header, export_data, get_system_info, Colors
-from config import DEFAULT_REFRESH_INTERVAL, DEFAULT_EXPORT_FORMAT
+from config import SAMPLE_INTERVAL, DEFAULT_REFRESH_INTERVAL, DEFAULT_EXPORT_FORMAT, METRICS_PORT
+from metrics_exporter import MetricsExporter
 
 class SystemMonitorAgent:
     """Main application class for SystemMonitorAgent"""
@@ -41,10 +42,13 @@ class SystemMonitorAgent:
 Examples:
   python main.py                    # Monitor with default 5s interval
   python main.py -i 2              # Monitor with 2s interval
+  python main.py -i 0.5            # Sub-second refresh
   python main.py --export json     # Export current stats to JSON
   python main.py --suggest         # Get AI optimization suggestions
   python main.py --health          # Get AI health assessment
   python main.py --no-processes    # Hide process list
+  python main.py --metrics-port    # Also serve Prometheus metrics on :9108/metrics
+  python main.py --profile         # Show what each collector costs
   python main.py --log             # Enable logging mode
   python main.py --thresholds      # Set custom alert thresholds
             """
@@ -52,7 +56,7 @@ Examples:
         
         parser.add_argument(
             '-i', '--interval',
-            type=int,
+            type=float,
             default=DEFAULT_REFRESH_INTERVAL,
             help=f'Refresh interval in seconds (default: {DEFAULT_REFRESH_INTERVAL})'
         )
@@ -102,6 +106,22 @@ Examples:
             help='Show single snapshot and exit (no continuous monitoring)'
         )
         
+        parser.add_argument(
+            '--metrics-port',
+            nargs='?',
+            type=int,
+            const=METRICS_PORT,
+            default=None,
+            metavar='PORT',
+            help=f'Serve Prometheus/OpenMetrics metrics at /metrics while monitoring (default port: {METRICS_PORT})'
+        )
+        
+        parser.add_argument(
+            '--profile',
+            action='store_true',
+            help="Show the monitor's own overhead per collector"
+        )
+        
         parser.add_argument(
             '--summary',
             action='store_true',
@@ -171,7 +191,8 @@ Examples:
         
         print(f"\n{Colors.INFO}Total samples: {summary['samples']}{Colors.RESET}")
     
-    def run_monitoring_loop(self, interval: int, show_processes: bool = True):
+    def run_monitoring_loop(self, interval: float, show_processes: bool = True,
+                            metrics_port: Optional[int] = None, show_profile: bool = False):
         """Run continuous monitoring loop"""
         print_header("System Monitor - Live Mode")
         print(f"{Colors.INFO}Press Ctrl+C to stop monitoring{Colors.RESET}")
@@ -179,6 +200,16 @@ Examples:
         
         self.running = True
         iteration = 0
+        # Collection runs in the background; the loop only redraws
+        self.monitor.start_sampler(min(interval, SAMPLE_INTERVAL))
+        exporter = None
+        if metrics_port is not None:
+            try:
+                exporter = MetricsExporter(self.monitor, port=metrics_port)
+                exporter.start()
+                print(f"{Colors.INFO}Serving metrics at {exporter.url}{Colors.RESET}")
+            except OSError as e:
+                print(f"{Colors.ERROR}Could not start metrics endpoint on port {metrics_port}: {e}{Colors.RESET}")
         
         try:
             while self.running:
@@ -191,6 +222,8 @@ Examples:
                 # Get and display current stats
                 stats = self.monitor.get_system_stats()
                 self.monitor.display_stats(stats, show_processes)
+                if show_profile:
+                    self.monitor.display_overhead(self.monitor.get_overhead_stats())
                 
                 # Show active alerts
                 alerts = self.monitor.get_alerts(stats)
@@ -211,6 +244,10 @@ Examples:
         except Exception as e:
             print(f"\n{Colors.ERROR}Monitoring error: {e}{Colors.RESET}")
             # Continue monitoring instead of crashing
+        finally:
+            if exporter:
+                exporter.stop()
+            self.monitor.stop_sampler()
     
     def run(self):
         """Main application entry point"""
@@ -270,7 +307,7 @@ Examples:
             print(f"{Colors.INFO}Logging mode enabled - stats will be saved to exports/ directory{Colors.RESET}")
         
         # Start monitoring loop
-        self.run_monitoring_loop(args.interval, not args.no_processes)
+        self.run_monitoring_loop(args.interval, not args.no_processes, args.metrics_port, args.profile)
 
 def main():
     """Main entry point"""
@@ -0,0 +1,178 @@
+"""
+Prometheus text / OpenMetrics endpoint for the latest monitoring data
+"""
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import METRICS_HOST, METRICS_PORT
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# History column -> (metric name, help)
+_HISTORY_GAUGES = {
+    'cpu': ('system_cpu_usage_percent', 'CPU usage across all cores'),
+    'memory': ('system_memory_usage_percent', 'RAM in use'),
+    'disk': ('system_disk_usage_percent', 'Disk space in use on the root volume'),
+    'net_sent_rate': ('system_network_sent_bytes_per_second', 'Network send rate'),
+    'net_recv_rate': ('system_network_received_bytes_per_second', 'Network receive rate'),
+}
+
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+class _Family:
+    def __init__(self, name: str, kind: str, help_text: str, samples: Iterable[Sample]):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.samples = list(samples)
+
+    def render(self, openmetrics: bool) -> List[str]:
+        # Counter samples end in _total; OpenMetrics names the family without it, Prometheus text with it
+        sample_name = f"{self.name}_total" if self.kind == 'counter' else self.name
+        family_name = self.name if openmetrics else sample_name
+        lines = [f"# HELP {family_name} {self.help}", f"# TYPE {family_name} {self.kind}"]
+        for labels, value in self.samples:
+            label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            lines.append(f"{sample_name}{{{label_text}}} {_format_value(value)}" if label_text
+                         else f"{sample_name} {_format_value(value)}")
+        return lines
+
+
+def collect_families(monitor) -> List[_Family]:
+    """Metric families for the monitor's latest sample, top processes and its own overhead"""
+    families = []
+    latest = monitor.history.latest()
+    for column, (name, help_text) in _HISTORY_GAUGES.items():
+        value = latest.get(column)
+        if value is not None and not math.isnan(value):
+            families.append(_Family(name, 'gauge', help_text, [({}, value)]))
+    if latest:
+        families.append(_Family('system_monitor_last_sample_timestamp_seconds', 'gauge',
+                                'Unix time of the latest sample', [({}, latest['timestamp'])]))
+    families.append(_Family('system_monitor_history_samples', 'gauge',
+                            'Samples held in the per-sample history', [({}, len(monitor.history))]))
+
+    snapshot = monitor.sampler.latest(wait=0) if monitor.sampler and monitor.sampler.running else {}
+    network = snapshot.get('network', {})
+    if 'bytes_sent' in network:
+        families.append(_Family('system_network_sent_bytes', 'counter', 'Bytes sent since boot',
+                                [({}, network['bytes_sent'])]))
+        families.append(_Family('system_network_received_bytes', 'counter', 'Bytes received since boot',
+                                [({}, network['bytes_recv'])]))
+    processes = [p for p in snapshot.get('processes', []) if 'error' not in p]
+    if processes:
+        labels = [{'pid': str(p['pid']), 'name': p['name']} for p in processes]
+        families.append(_Family('system_process_cpu_percent', 'gauge', 'CPU usage of the top processes',
+                                [(l, p['cpu_percent']) for l, p in zip(labels, processes)]))
+        families.append(_Family('system_process_memory_bytes', 'gauge', 'Resident memory of the top processes',
+                                [(l, p['memory_bytes']) for l, p in zip(labels, processes)]))
+
+    overhead = monitor.get_overhead_stats()
+    collectors = overhead['collectors']
+    families.append(_Family('system_monitor_collector_calls', 'counter', 'Collector calls',
+                            [({'collector': n}, c['calls']) for n, c in collectors.items()]))
+    families.append(_Family('system_monitor_collector_errors', 'counter', 'Collector calls that failed',
+                            [({'collector': n}, c['errors']) for n, c in collectors.items()]))
+    families.append(_Family('system_monitor_collector_seconds', 'counter', 'Wall-clock time spent in collectors',
+                            [({'collector': n}, c['total_seconds']) for n, c in collectors.items()]))
+    families.append(_Family('system_monitor_collector_cpu_seconds', 'counter', 'CPU time spent in collectors',
+                            [({'collector': n}, c['total_cpu_seconds']) for n, c in collectors.items()]))
+    families.append(_Family('system_monitor_collector_latency_seconds', 'gauge',
+                            'Moving average of collector latency',
+                            [({'collector': n}, c['avg_ms'] / 1000) for n, c in collectors.items()]))
+    periods = [({'collector': n}, c['period']) for n, c in collectors.items() if 'period' in c]
+    if periods:
+        families.append(_Family('system_monitor_collector_period_seconds', 'gauge',
+                                'Current collection period, after adaptive slowdown', periods))
+    if overhead['collection_percent'] is not None:
+        families.append(_Family('system_monitor_overhead_ratio', 'gauge',
+                                'Estimated collection CPU as a fraction of one core',
+                                [({}, overhead['collection_percent'] / 100)]))
+    families.append(_Family('system_monitor_process_cpu_seconds', 'counter',
+                            'CPU time used by the monitor process itself', [({}, overhead['process_cpu_seconds'])]))
+    families.append(_Family('system_monitor_overhead_budget_ratio', 'gauge',
+                            'Configured collection CPU budget as a fraction of one core',
+                            [({}, overhead['budget_percent'] / 100)]))
+    return families
+
+
+def render_metrics(monitor, openmetrics: bool = False) -> str:
+    lines = []
+    for family in collect_families(monitor):
+        lines.extend(family.render(openmetrics))
+    if openmetrics:
+        lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    monitor = None  # set per server by MetricsExporter
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == '/':
+            self._send(200, 'text/html; charset=utf-8',
+                       '<html><body><a href="/metrics">Metrics</a></body></html>')
+        elif path == '/metrics':
+            openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+            try:
+                body = render_metrics(self.monitor, openmetrics)
+            except Exception as e:
+                self._send(500, 'text/plain; charset=utf-8', f"Error collecting metrics: {e}\n")
+                return
+            self._send(200, OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE, body)
+        else:
+            self._send(404, 'text/plain; charset=utf-8', 'Not found\n')
+
+    def _send(self, status: int, content_type: str, body: str):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any):
+        pass  # keep scrapes out of the console display
+
+
+class MetricsExporter:
+    """Serves /metrics from a background thread; rendering reads the latest data and never collects"""
+
+    def __init__(self, monitor, host: str = METRICS_HOST, port: int = METRICS_PORT):
+        handler = type('MetricsHandler', (_MetricsHandler,), {'monitor': monitor})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='metrics-exporter', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join(2.0)
+        self._thread = None
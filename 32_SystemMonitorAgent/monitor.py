@@ -5,24 +5,52 @@ import time
 import psutil
 from datetime import datetime
 from typing import Dict, Any, List, Optional
-from config import DEFAULT_ALERT_THRESHOLDS, PROCESS_LIMIT
+from config import (
+    DEFAULT_ALERT_THRESHOLDS, PROCESS_LIMIT, SAMPLE_INTERVAL, HISTORY_SECONDS, HISTORY_ROLLUPS,
+    DISK_REFRESH_INTERVAL, PROCESS_REFRESH_INTERVAL, PROCESS_FULL_REFRESH_EVERY, CPU_SAMPLE_WINDOW,
+    OVERHEAD_BUDGET_PERCENT, MAX_SLOWDOWN, ADAPT_EVERY
+)
 from utils import (
     format_bytes, format_percentage, format_resource_bar, 
     create_alert_message, Colors, print_section
 )
+from timeseries import MetricStore
+from sampler import ProcessTracker, Sampler
+from profiling import CollectorProfile
 
 class SystemMonitor:
     """Main system monitoring class"""
     
+    # Snapshot key -> collector method
+    COLLECTORS = {
+        'cpu': 'get_cpu_stats',
+        'memory': 'get_memory_stats',
+        'disk': 'get_disk_stats',
+        'network': 'get_network_stats',
+        'processes': 'get_top_processes',
+    }
+    
     def __init__(self, alert_thresholds: Optional[Dict[str, float]] = None):
         self.alert_thresholds = alert_thresholds or DEFAULT_ALERT_THRESHOLDS
-        self.history = []
-        self.max_history = 100  # Keep last 100 readings
+        # Per-second metrics for HISTORY_SECONDS, with minute/hour rollups beyond that
+        self.history = MetricStore(HISTORY_SECONDS, SAMPLE_INTERVAL, HISTORY_ROLLUPS)
+        self.process_tracker = ProcessTracker(PROCESS_FULL_REFRESH_EVERY)
+        self.sampler: Optional[Sampler] = None
+        self._last_network = None  # (monotonic time, counters) for transfer rates
+        # Latency and CPU time of every collector call, for the overhead report and budget
+        self.profiles = {name: CollectorProfile(name) for name in self.COLLECTORS}
+        self._process = psutil.Process()
+        self._process.cpu_percent(interval=None)
+        # cpu_percent(interval=None) measures since the previous call, so prime it
+        psutil.cpu_percent(interval=None)
+        self._cpu_read_at = time.monotonic()
         
     def get_cpu_stats(self) -> Dict[str, Any]:
         """Get CPU usage statistics"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Non-blocking: usage since the previous call instead of sleeping for a second
+            cpu_percent = psutil.cpu_percent(interval=None)
+            self._cpu_read_at = time.monotonic()
             cpu_count = psutil.cpu_count()
             cpu_freq = psutil.cpu_freq()
             
@@ -79,6 +107,15 @@ class SystemMonitor:
         """Get network interface statistics"""
         try:
             network = psutil.net_io_counters()
+            now = time.monotonic()
+            sent_rate = recv_rate = None
+            if self._last_network:
+                last_time, last = self._last_network
+                elapsed = now - last_time
+                if elapsed > 0:
+                    sent_rate = max(0, network.bytes_sent - last.bytes_sent) / elapsed
+                    recv_rate = max(0, network.bytes_recv - last.bytes_recv) / elapsed
+            self._last_network = (now, network)
             
             return {
                 'bytes_sent': network.bytes_sent,
@@ -86,7 +123,9 @@ class SystemMonitor:
                 'packets_sent': network.packets_sent,
                 'packets_recv': network.packets_recv,
                 'bytes_sent_human': format_bytes(network.bytes_sent),
-                'bytes_recv_human': format_bytes(network.bytes_recv)
+                'bytes_recv_human': format_bytes(network.bytes_recv),
+                'sent_bytes_per_sec': sent_rate,
+                'recv_bytes_per_sec': recv_rate
             }
         except Exception as e:
             return {'error': str(e)}
@@ -95,50 +134,112 @@ class SystemMonitor:
         """Get top processes by resource consumption"""
         try:
             limit = limit or PROCESS_LIMIT
-            processes = []
-            
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'memory_info']):
-                try:
-                    proc_info = proc.info
-                    if proc_info['cpu_percent'] is not None and proc_info['memory_percent'] is not None:
-                        processes.append({
-                            'pid': proc_info['pid'],
-                            'name': proc_info['name'],
-                            'cpu_percent': proc_info['cpu_percent'],
-                            'memory_percent': proc_info['memory_percent'],
-                            'memory_bytes': proc_info['memory_info'].rss if proc_info['memory_info'] else 0,
-                            'memory_human': format_bytes(proc_info['memory_info'].rss) if proc_info['memory_info'] else '0 B'
-                        })
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    continue
-            
-            # Sort by CPU usage first, then by memory usage
-            processes.sort(key=lambda x: (x['cpu_percent'], x['memory_percent']), reverse=True)
-            return processes[:limit]
+            # Incremental: only new or active processes are fully re-read
+            self.process_tracker.refresh()
+            return self.process_tracker.top(limit)
             
         except Exception as e:
             return [{'error': str(e)}]
     
     def get_system_stats(self) -> Dict[str, Any]:
         """Get comprehensive system statistics"""
+        if self.sampler and self.sampler.running:
+            # The background sampler keeps this current; reading it never blocks on psutil
+            return self.sampler.latest()
+        
+        self._wait_for_cpu_window()
         timestamp = datetime.now()
         
-        stats = {
-            'timestamp': timestamp.isoformat(),
-            'cpu': self.get_cpu_stats(),
-            'memory': self.get_memory_stats(),
-            'disk': self.get_disk_stats(),
-            'network': self.get_network_stats(),
-            'processes': self.get_top_processes()
-        }
+        stats = {'timestamp': timestamp.isoformat()}
+        for name in self.COLLECTORS:
+            stats[name] = self.collect(name)
         
         # Add to history
-        self.history.append(stats)
-        if len(self.history) > self.max_history:
-            self.history.pop(0)
+        self.record(stats)
         
         return stats
     
+    def _wait_for_cpu_window(self):
+        """
+        System and per-process CPU usage are measured since their previous read.
+        Without the sampler that read may have just happened (or, for processes,
+        never), which reports 0%; take a first reading and sleep out the rest of
+        CPU_SAMPLE_WINDOW so one-shot snapshots show real usage.
+        """
+        if self.process_tracker.last_refresh is None:
+            self.process_tracker.refresh()
+        elapsed = time.monotonic() - max(self._cpu_read_at, self.process_tracker.last_refresh)
+        if elapsed < CPU_SAMPLE_WINDOW:
+            time.sleep(CPU_SAMPLE_WINDOW - elapsed)
+    
+    def collect(self, name: str) -> Any:
+        """Runs one collector by snapshot key, timing it"""
+        return self.profiles[name].measure(getattr(self, self.COLLECTORS[name]))
+    
+    def record(self, stats: Dict[str, Any]):
+        """Add a snapshot's headline metrics to the history"""
+        network = stats.get('network', {})
+        self.history.append(time.time(), {
+            'cpu': stats.get('cpu', {}).get('usage_percent'),
+            'memory': stats.get('memory', {}).get('usage_percent'),
+            'disk': stats.get('disk', {}).get('usage_percent'),
+            'net_sent_rate': network.get('sent_bytes_per_sec'),
+            'net_recv_rate': network.get('recv_bytes_per_sec'),
+        })
+    
+    def start_sampler(self, interval: float = SAMPLE_INTERVAL) -> Sampler:
+        """Collect in the background every `interval` seconds; get_system_stats then returns instantly"""
+        if self.sampler and self.sampler.running:
+            self.sampler.stop()
+        # The sampler records one history row per tick, so keep HISTORY_SECONDS at its rate
+        self.history.set_resolution(interval)
+        self.sampler = Sampler(self, interval, {
+            'disk': DISK_REFRESH_INTERVAL,
+            'processes': PROCESS_REFRESH_INTERVAL,
+        }, budget=OVERHEAD_BUDGET_PERCENT / 100, max_slowdown=MAX_SLOWDOWN, adapt_every=ADAPT_EVERY)
+        self.sampler.start()
+        return self.sampler
+    
+    def stop_sampler(self):
+        if self.sampler:
+            self.sampler.stop()
+    
+    def get_overhead_stats(self) -> Dict[str, Any]:
+        """What monitoring itself costs: per-collector latency/CPU time and the agent's total CPU usage"""
+        scheduler = self.sampler.scheduler if self.sampler else None
+        collectors = {}
+        for name, profile in self.profiles.items():
+            collectors[name] = profile.to_dict()
+            if scheduler:
+                collectors[name]['period'] = scheduler.periods[name]
+                collectors[name]['base_period'] = scheduler.base_periods[name]
+        return {
+            'collectors': collectors,
+            # Estimated from the collectors' measured CPU time at their current periods
+            'collection_percent': scheduler.overhead(self.profiles) * 100 if scheduler else None,
+            'budget_percent': scheduler.budget * 100 if scheduler else OVERHEAD_BUDGET_PERCENT,
+            'adjustments': self.sampler.adjustments if self.sampler else 0,
+            # Whole process since the previous call: collection, display, exporter and all
+            'process_cpu_percent': self._process.cpu_percent(interval=None),
+            'process_cpu_seconds': sum(self._process.cpu_times()[:2]),
+        }
+    
+    def display_overhead(self, overhead: Dict[str, Any]):
+        """Display per-collector cost of monitoring"""
+        print_section("Monitor Overhead")
+        collection = overhead['collection_percent']
+        if collection is not None:
+            print(f"Collection: {collection:.2f}% of one core (budget {overhead['budget_percent']:.2f}%)")
+        print(f"Agent process CPU: {overhead['process_cpu_percent']:.1f}%")
+        print(f"{'Collector':<12} {'Calls':<8} {'Avg ms':<9} {'Max ms':<9} {'CPU ms':<9} {'Period'}")
+        print("-" * 60)
+        for name, c in overhead['collectors'].items():
+            period = f"{c['period']:g}s" if 'period' in c else '-'
+            if 'period' in c and c['period'] > c['base_period']:
+                period += f" (slowed from {c['base_period']:g}s)"
+            print(f"{name:<12} {c['calls']:<8} {c['avg_ms']:<9.2f} {c['max_ms']:<9.2f} "
+                  f"{c['avg_cpu_ms']:<9.2f} {period}")
+    
     def display_stats(self, stats: Dict[str, Any], show_processes: bool = True):
         """Display formatted system statistics"""
         print_section("CPU Usage")
@@ -224,30 +325,15 @@ class SystemMonitor:
         """Update alert thresholds"""
         self.alert_thresholds.update(thresholds)
     
-    def get_history_summary(self) -> Dict[str, Any]:
-        """Get summary statistics from history"""
-        if not self.history:
+    def get_history_summary(self, seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Get summary statistics from history (optionally only the last `seconds`)"""
+        if not len(self.history):
             return {}
         
-        cpu_values = [s['cpu']['usage_percent'] for s in self.history if 'error' not in s['cpu']]
-        memory_values = [s['memory']['usage_percent'] for s in self.history if 'error' not in s['memory']]
-        disk_values = [s['disk']['usage_percent'] for s in self.history if 'error' not in s['disk']]
-        
+        summary = self.history.summary(seconds)
         return {
-            'cpu': {
-                'min': min(cpu_values) if cpu_values else 0,
-                'max': max(cpu_values) if cpu_values else 0,
-                'avg': sum(cpu_values) / len(cpu_values) if cpu_values else 0
-            },
-            'memory': {
-                'min': min(memory_values) if memory_values else 0,
-                'max': max(memory_values) if memory_values else 0,
-                'avg': sum(memory_values) / len(memory_values) if memory_values else 0
-            },
-            'disk': {
-                'min': min(disk_values) if disk_values else 0,
-                'max': max(disk_values) if disk_values else 0,
-                'avg': sum(disk_values) / len(disk_values) if disk_values else 0
-            },
-            'samples': len(self.history)
+            'cpu': summary['cpu'],
+            'memory': summary['memory'],
+            'disk': summary['disk'],
+            'samples': summary['samples']
         }
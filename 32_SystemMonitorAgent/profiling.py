@@ -0,0 +1,117 @@
+"""
+Self-profiling of the monitor's collectors and an overhead-budget scheduler
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# Weight of the newest call in the moving averages
+_EWMA_ALPHA = 0.2
+
+
+class CollectorProfile:
+    """Wall-clock latency and CPU time of one collector, per call and in total"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.total_cpu_seconds = 0.0
+        self.last_seconds = 0.0
+        self.max_seconds = 0.0
+        self.avg_seconds = 0.0
+        self.avg_cpu_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def measure(self, collect: Callable[[], Any]) -> Any:
+        """Calls `collect`, recording how long it took and the CPU time the calling thread spent in it"""
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        failed = False
+        try:
+            result = collect()
+            # Collectors report their own failures as {'error': ...} (or [{'error': ...}])
+            failed = (isinstance(result, dict) and 'error' in result) or \
+                (isinstance(result, list) and bool(result) and 'error' in result[0])
+            return result
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.record(time.perf_counter() - wall_start, time.thread_time() - cpu_start, failed)
+
+    def record(self, seconds: float, cpu_seconds: float, failed: bool = False):
+        with self._lock:
+            self.calls += 1
+            self.errors += failed
+            self.total_seconds += seconds
+            self.total_cpu_seconds += cpu_seconds
+            self.last_seconds = seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            if self.calls == 1:
+                self.avg_seconds, self.avg_cpu_seconds = seconds, cpu_seconds
+            else:
+                self.avg_seconds += _EWMA_ALPHA * (seconds - self.avg_seconds)
+                self.avg_cpu_seconds += _EWMA_ALPHA * (cpu_seconds - self.avg_cpu_seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'errors': self.errors,
+                'total_seconds': self.total_seconds,
+                'total_cpu_seconds': self.total_cpu_seconds,
+                'last_ms': self.last_seconds * 1000,
+                'avg_ms': self.avg_seconds * 1000,
+                'max_ms': self.max_seconds * 1000,
+                'avg_cpu_ms': self.avg_cpu_seconds * 1000,
+            }
+
+
+class AdaptiveScheduler:
+    """
+    Keeps the collectors' combined CPU cost under a budget, expressed as a
+    fraction of one core. A collector costs (CPU time per call / period).
+
+    Over budget, the period of the collector costing the most is doubled, up
+    to `max_slowdown` times its configured period. Once the estimated cost
+    is comfortably under budget again, the most slowed-down collector is sped
+    back up, one step per adjustment, as long as that stays within budget.
+    """
+
+    def __init__(self, periods: Dict[str, float], budget: float, max_slowdown: float = 8.0):
+        self.base_periods = dict(periods)
+        self.periods = dict(periods)
+        self.budget = budget
+        self.max_slowdown = max_slowdown
+
+    def cost(self, name: str, profile: CollectorProfile, period: Optional[float] = None) -> float:
+        return profile.avg_cpu_seconds / (period or self.periods[name])
+
+    def overhead(self, profiles: Dict[str, CollectorProfile]) -> float:
+        """Estimated CPU share of all collectors at their current periods"""
+        return sum(self.cost(name, profiles[name]) for name in self.periods if profiles[name].calls)
+
+    def adjust(self, profiles: Dict[str, CollectorProfile]) -> Optional[str]:
+        """One adjustment step; returns the name of the collector whose period changed, if any"""
+        measured = [name for name in self.periods if profiles[name].calls]
+        load = self.overhead(profiles)
+
+        if load > self.budget:
+            slowable = [name for name in measured
+                        if self.periods[name] * 2 <= self.base_periods[name] * self.max_slowdown]
+            if not slowable:
+                return None
+            name = max(slowable, key=lambda n: self.cost(n, profiles[n]))
+            self.periods[name] *= 2
+            return name
+
+        if load < self.budget / 2:
+            slowed = [name for name in measured if self.periods[name] > self.base_periods[name]]
+            for name in sorted(slowed, key=lambda n: self.periods[n] / self.base_periods[n], reverse=True):
+                faster = max(self.base_periods[name], self.periods[name] / 2)
+                extra = self.cost(name, profiles[name], faster) - self.cost(name, profiles[name])
+                if load + extra <= self.budget * 0.8:
+                    self.periods[name] = faster
+                    return name
+        return None
@@ -0,0 +1,203 @@
+"""
+Background sampling and incremental process tracking
+"""
+import heapq
+import threading
+import time
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+import psutil
+
+from profiling import AdaptiveScheduler
+from utils import format_bytes
+
+_GONE = (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess)
+
+
+class ProcessTracker:
+    """
+    Keeps one entry per PID between refreshes and computes CPU usage from
+    the change in CPU time since the previous refresh.
+
+    Each refresh lists the PIDs (one directory read) and reads each known
+    process's CPU times, which is how changes are detected. Name and memory
+    are only read for new PIDs and for processes that used CPU since the last
+    refresh; idle processes keep their values and are fully re-read every
+    `full_refresh_every` refreshes.
+    """
+
+    def __init__(self, full_refresh_every: int = 10):
+        self.full_refresh_every = full_refresh_every
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._last_refresh: Optional[float] = None
+        self._refreshes = 0
+        self._total_memory = psutil.virtual_memory().total
+
+    def refresh(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refresh if self._last_refresh else None
+        self._last_refresh = now
+        self._refreshes += 1
+        full = self._refreshes % self.full_refresh_every == 0
+
+        pids = set(psutil.pids())
+        for pid in self._entries.keys() - pids:
+            del self._entries[pid]
+
+        for pid in pids:
+            entry = self._entries.get(pid)
+            try:
+                if entry is None:
+                    self._entries[pid] = self._new_entry(pid)
+                    continue
+                times = entry['process'].cpu_times()
+                cpu_total = times.user + times.system
+                delta = cpu_total - entry['cpu_total']
+                if delta < 0:  # PID reused by a new process
+                    self._entries[pid] = self._new_entry(pid)
+                    continue
+                entry['cpu_total'] = cpu_total
+                entry['cpu_percent'] = delta / elapsed * 100 if elapsed else 0.0
+                if delta > 0 or full:
+                    self._read_memory(entry)
+            except _GONE:
+                self._entries.pop(pid, None)
+
+    def _new_entry(self, pid: int) -> Dict[str, Any]:
+        process = psutil.Process(pid)
+        with process.oneshot():
+            times = process.cpu_times()
+            entry = {
+                'process': process,
+                'pid': pid,
+                'name': process.name(),
+                'cpu_total': times.user + times.system,
+                'cpu_percent': 0.0,  # known after the next refresh
+            }
+            self._read_memory(entry)
+        return entry
+
+    def _read_memory(self, entry: Dict[str, Any]):
+        rss = entry['process'].memory_info().rss
+        entry['memory_bytes'] = rss
+        entry['memory_percent'] = rss / self._total_memory * 100 if self._total_memory else 0.0
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        """Top processes by CPU, then memory, in get_top_processes' format"""
+        entries = heapq.nlargest(limit, self._entries.values(),
+                                 key=lambda e: (e['cpu_percent'], e['memory_percent']))
+        return [{
+            'pid': e['pid'],
+            'name': e['name'],
+            'cpu_percent': e['cpu_percent'],
+            'memory_percent': e['memory_percent'],
+            'memory_bytes': e['memory_bytes'],
+            'memory_human': format_bytes(e['memory_bytes']),
+        } for e in entries]
+
+    @property
+    def last_refresh(self) -> Optional[float]:
+        """monotonic() time of the previous refresh; CPU usage is measured from there"""
+        return self._last_refresh
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class Sampler:
+    """
+    Runs collectors on a background thread, each at its own period, and keeps
+    the latest snapshot so readers never wait on psutil. Every tick the
+    snapshot's headline metrics are recorded in the monitor's history.
+
+    With a `budget` (fraction of one core), collector periods are adjusted
+    every `adapt_every` seconds to keep the measured collection cost under it.
+    """
+
+    def __init__(self, monitor, interval: float, periods: Optional[Dict[str, float]] = None,
+                 budget: Optional[float] = None, max_slowdown: float = 8.0, adapt_every: float = 10.0):
+        self.monitor = monitor
+        self.interval = interval
+        periods = periods or {}
+        # Snapshots use the same keys as get_system_stats; every call is timed in monitor.profiles
+        self.collectors: Dict[str, Callable[[], Any]] = {
+            name: partial(monitor.collect, name) for name in monitor.COLLECTORS
+        }
+        self.scheduler = AdaptiveScheduler(
+            {name: max(interval, periods.get(name, 0)) for name in self.collectors}, budget or 0.0, max_slowdown)
+        self.adapt_every = adapt_every
+        self.adjustments = 0
+        self._next_adapt = time.monotonic() + adapt_every
+        self._next_due = {name: 0.0 for name in self.collectors}
+        self._latest: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='system-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def latest(self, wait: float = 5.0) -> Dict[str, Any]:
+        """The most recent snapshot; waits for the first one after start()"""
+        self._ready.wait(wait)
+        with self._lock:
+            return dict(self._latest)
+
+    def sample(self):
+        """Runs every collector that is due and records the merged snapshot"""
+        now = time.monotonic()
+        updates = {}
+        for name, collect in self.collectors.items():
+            if now >= self._next_due[name]:
+                updates[name] = collect()
+                # Half a tick of slack so scheduling jitter does not push a collector to the following tick
+                self._next_due[name] = now + self.scheduler.periods[name] - self.interval / 2
+        with self._lock:
+            self._latest.update(updates)
+            self._latest['timestamp'] = datetime.now().isoformat()
+            snapshot = dict(self._latest)
+        self.monitor.record(snapshot)
+        self._ready.set()
+
+        if self.scheduler.budget and now >= self._next_adapt:
+            self._next_adapt = now + self.adapt_every
+            changed = self.scheduler.adjust(self.monitor.profiles)
+            if changed:
+                self.adjustments += 1
+                self._next_due[changed] = min(self._next_due[changed], now + self.scheduler.periods[changed])
+
+    @property
+    def periods(self) -> Dict[str, float]:
+        """Current period of each collector in seconds"""
+        return dict(self.scheduler.periods)
+
+    def _run(self):
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception:
+                pass  # a failing collector must not kill the sampler; each collector reports its own errors
+            next_tick += self.interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:  # fell behind: skip the missed ticks rather than bursting
+                next_tick = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
@@ -0,0 +1,178 @@
+"""
+Fixed-size time-series storage for monitoring metrics
+"""
+import math
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+# Metrics kept per sample, in column order
+METRICS = ('cpu', 'memory', 'disk', 'net_sent_rate', 'net_recv_rate')
+
+
+class RingBuffer:
+    """Preallocated NumPy arrays used as a ring: appends never allocate, the oldest rows are overwritten"""
+
+    def __init__(self, capacity: int, width: int):
+        self.capacity = capacity
+        self.times = np.full(capacity, np.nan)
+        self.values = np.full((capacity, width), np.nan)
+        self.count = 0
+        self._next = 0
+
+    def append(self, timestamp: float, row: np.ndarray):
+        self.times[self._next] = timestamp
+        self.values[self._next] = row
+        self._next = (self._next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def ordered(self, since: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Copies of the rows oldest first, optionally only those at or after `since`"""
+        if self.count < self.capacity:
+            times, values = self.times[:self.count].copy(), self.values[:self.count].copy()
+        else:
+            times = np.concatenate((self.times[self._next:], self.times[:self._next]))
+            values = np.concatenate((self.values[self._next:], self.values[:self._next]))
+        if since is not None:
+            start = np.searchsorted(times, since)
+            times, values = times[start:], values[start:]
+        return times, values
+
+    def last(self) -> Tuple[float, np.ndarray]:
+        index = (self._next - 1) % self.capacity
+        return self.times[index], self.values[index]
+
+
+class Rollup:
+    """Downsampled min/mean/max per fixed-size time bucket, accumulated as samples arrive"""
+
+    def __init__(self, bucket_seconds: float, capacity: int, width: int):
+        self.bucket_seconds = bucket_seconds
+        # Columns: min of each metric, then mean, then max
+        self.buffer = RingBuffer(capacity, width * 3)
+        self._bucket = None
+        self._sum = np.zeros(width)
+        self._count = np.zeros(width)
+        self._min = np.full(width, np.inf)
+        self._max = np.full(width, -np.inf)
+
+    def add(self, timestamp: float, row: np.ndarray):
+        bucket = math.floor(timestamp / self.bucket_seconds)
+        if self._bucket is not None and bucket != self._bucket:
+            self.flush()
+        self._bucket = bucket
+        present = ~np.isnan(row)
+        self._sum[present] += row[present]
+        self._count[present] += 1
+        np.fmin(self._min, row, out=self._min)
+        np.fmax(self._max, row, out=self._max)
+
+    def flush(self):
+        if self._bucket is None or not self._count.any():
+            return
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self._sum / self._count
+        empty = self._count == 0
+        low, high = self._min.copy(), self._max.copy()
+        low[empty] = high[empty] = np.nan
+        self.buffer.append(self._bucket * self.bucket_seconds, np.concatenate((low, mean, high)))
+        self._sum[:] = 0
+        self._count[:] = 0
+        self._min[:] = np.inf
+        self._max[:] = -np.inf
+
+
+class MetricStore:
+    """
+    Per-sample metrics for the last `seconds` in a ring buffer, plus per-minute
+    and per-hour rollups for longer ranges. Two days of 1-second samples take
+    about 8 MB. Safe to use from the sampler thread and readers at once.
+    """
+
+    def __init__(self, seconds: float, resolution: float = 1.0,
+                 rollups: Optional[Dict[str, Tuple[float, float]]] = None,
+                 metrics: Iterable[str] = METRICS):
+        self.metrics = tuple(metrics)
+        self.seconds = seconds
+        self._columns = {name: i for i, name in enumerate(self.metrics)}
+        width = len(self.metrics)
+        self._samples = RingBuffer(max(1, int(seconds / resolution)), width)
+        rollups = rollups if rollups is not None else {'minute': (60, 30 * 86400), 'hour': (3600, 365 * 86400)}
+        self._rollups = {name: Rollup(bucket, max(1, int(keep / bucket)), width)
+                         for name, (bucket, keep) in rollups.items()}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._samples.count
+
+    def set_resolution(self, resolution: float):
+        """Resizes the per-sample buffer to still cover `seconds` at a new sample interval, keeping the newest samples"""
+        capacity = max(1, int(self.seconds / resolution))
+        with self._lock:
+            if capacity == self._samples.capacity:
+                return
+            times, values = self._samples.ordered()
+            samples = RingBuffer(capacity, len(self.metrics))
+            for timestamp, row in zip(times[-capacity:], values[-capacity:]):
+                samples.append(timestamp, row)
+            self._samples = samples
+
+    def append(self, timestamp: float, metrics: Dict[str, Optional[float]]):
+        row = np.array([np.nan if metrics.get(name) is None else metrics[name] for name in self.metrics], dtype=float)
+        with self._lock:
+            self._samples.append(timestamp, row)
+            for rollup in self._rollups.values():
+                rollup.add(timestamp, row)
+
+    def latest(self) -> Dict[str, float]:
+        with self._lock:
+            if not self._samples.count:
+                return {}
+            timestamp, row = self._samples.last()
+            latest = {name: float(row[i]) for name, i in self._columns.items()}
+        latest['timestamp'] = float(timestamp)
+        return latest
+
+    def window(self, seconds: Optional[float] = None, now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, values[n, metrics]) for the last `seconds`, or everything held"""
+        with self._lock:
+            if seconds is None or not self._samples.count:
+                return self._samples.ordered()
+            end = now if now is not None else self._samples.last()[0]
+            return self._samples.ordered(since=end - seconds)
+
+    def series(self, metric: str, seconds: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        times, values = self.window(seconds)
+        return times, values[:, self._columns[metric]]
+
+    def rollup(self, name: str, metric: str, seconds: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Bucket start times with min/mean/max of one metric, e.g. rollup('minute', 'cpu', 3600)"""
+        column = self._columns[metric]
+        width = len(self.metrics)
+        with self._lock:
+            buffer = self._rollups[name].buffer
+            if seconds is None or not buffer.count:
+                times, values = buffer.ordered()
+            else:
+                times, values = buffer.ordered(since=buffer.last()[0] - seconds)
+        return {
+            'time': times,
+            'min': values[:, column],
+            'mean': values[:, width + column],
+            'max': values[:, 2 * width + column],
+        }
+
+    def summary(self, seconds: Optional[float] = None) -> Dict[str, Any]:
+        """min/max/avg per metric over the window, ignoring gaps"""
+        times, values = self.window(seconds)
+        result = {}
+        for name, i in self._columns.items():
+            column = values[:, i]
+            column = column[~np.isnan(column)]
+            if column.size:
+                result[name] = {'min': float(column.min()), 'max': float(column.max()), 'avg': float(column.mean())}
+            else:
+                result[name] = {'min': 0.0, 'max': 0.0, 'avg': 0.0}
+        result['samples'] = int(times.size)
+        return result
@@ -25,12 +25,24 @@ OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
 # Flask Configuration
 FLASK_PORT = int(os.getenv('FLASK_PORT', 5000))
 FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
+# Set a fixed secret so the session's user id (and thus history) survives restarts
+FLASK_SECRET_KEY = os.getenv('FLASK_SECRET_KEY')
 
 # Quiz Configuration
 DEFAULT_QUESTIONS = int(os.getenv('DEFAULT_QUESTIONS', 5))
 DEFAULT_DIFFICULTY = os.getenv('DEFAULT_DIFFICULTY', 'medium')
 DEFAULT_FORMAT = os.getenv('DEFAULT_FORMAT', 'md')
 
+# Long-document mode: content longer than the threshold is split into chunks,
+# questions are generated per chunk in parallel, then deduplicated and repaired
+LONG_DOCUMENT_THRESHOLD = int(os.getenv('LONG_DOCUMENT_THRESHOLD', 12000))
+CHUNK_CHARACTERS = int(os.getenv('CHUNK_CHARACTERS', 6000))
+CHUNK_OVERLAP = int(os.getenv('CHUNK_OVERLAP', 300))
+QUIZ_MAX_WORKERS = int(os.getenv('QUIZ_MAX_WORKERS', 6))
+DUPLICATE_SIMILARITY = float(os.getenv('DUPLICATE_SIMILARITY', 0.8))
+MAX_QUESTIONS = int(os.getenv('MAX_QUESTIONS', 50))
+MAX_QUESTIONS_LONG = int(os.getenv('MAX_QUESTIONS_LONG', 100))
+
 # Supported formats and difficulties
 SUPPORTED_FORMATS = ['md', 'json', 'csv']
 SUPPORTED_DIFFICULTIES = ['easy', 'medium', 'hard']
@@ -44,6 +56,13 @@ QUIZES_DIR = os.path.join(os.path.dirname(__file__), 'quizzes')
 for directory in [UPLOADS_DIR, OUTPUTS_DIR, QUIZES_DIR]:
     os.makedirs(directory, exist_ok=True)
 
+# Quiz history (stored server-side; the session only holds a user id)
+HISTORY_DB = os.getenv('HISTORY_DB', os.path.join(QUIZES_DIR, 'history.db'))
+HISTORY_LIMIT = int(os.getenv('HISTORY_LIMIT', 200))
+HISTORY_CACHE_SIZE = int(os.getenv('HISTORY_CACHE_SIZE', 64))
+HISTORY_PAGE_SIZE = int(os.getenv('HISTORY_PAGE_SIZE', 12))
+MAX_HISTORY_PAGE_SIZE = 100
+
 def get_api_key():
     """Get the OpenAI API key from various sources."""
     # First check if it's set in this file
@@ -148,6 +167,53 @@ IMPORTANT: Follow this EXACT format for each question:
 
 Continue this pattern for all {num_questions} questions. Do not add any extra text, explanations, or formatting beyond the questions and answers."""
 
+def get_chunk_quiz_prompt_template():
+    """Get the prompt for generating questions from one excerpt of a long document."""
+    return """You are an expert quiz creator. Create {num_questions} multiple choice question(s) based ONLY on the following excerpt from a longer document (part {part} of {total_parts}).
+
+Excerpt:
+{content}
+
+Requirements:
+- Difficulty: {difficulty}
+- Each question should have 4 options (A, B, C, D)
+- Only one correct answer per question
+- Questions must be answerable from the excerpt and must not refer to "the excerpt" or "the text"
+- Ensure all options are plausible but only one is correct
+
+IMPORTANT: Follow this EXACT format for each question:
+
+1. [Question text here]
+   A) [Option A text here]
+   B) [Option B text here]
+   C) [Option C text here]
+   D) [Option D text here]
+   Answer: [A, B, C, or D]
+
+Do not add any extra text, explanations, or formatting beyond the questions and answers."""
+
+def get_question_repair_prompt():
+    """Get the prompt for fixing a single invalid question."""
+    return """The following multiple choice question has these issues:
+{issues}
+
+Question:
+{question}
+
+Source material:
+{content}
+
+Rewrite it as ONE valid {difficulty} question with exactly 4 options (A, B, C, D) and one correct answer, using this EXACT format:
+
+1. [Question text here]
+   A) [Option A text here]
+   B) [Option B text here]
+   C) [Option C text here]
+   D) [Option D text here]
+   Answer: [A, B, C, or D]
+
+Do not add any extra text."""
+
 def get_quiz_validation_prompt():
     """Get the prompt for validating quiz format."""
     return """You are a quiz validator. Review the following quiz and ensure it meets these requirements:
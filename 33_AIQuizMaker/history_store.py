@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Server-side Quiz History Store for AI Quiz Maker
+
+Quiz history used to live in the Flask session, which is serialised into a signed
+cookie on every response. This module keeps it in SQLite instead, so the session
+only carries a small user id. Recently opened quizzes are kept in an in-memory LRU
+so repeated loads and exports skip the database and JSON decoding.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import HISTORY_DB, HISTORY_LIMIT, HISTORY_CACHE_SIZE
+
+
+class QuizHistoryStore:
+    def __init__(self, db_path: str = HISTORY_DB, limit: int = HISTORY_LIMIT, cache_size: int = HISTORY_CACHE_SIZE):
+        """Open (or create) the history database."""
+        self.limit = limit
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS quizzes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL,
+                    owner TEXT NOT NULL,
+                    topic TEXT,
+                    difficulty TEXT,
+                    questions INTEGER,
+                    created_at TEXT,
+                    data TEXT NOT NULL,
+                    UNIQUE (owner, id)
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_quizzes_owner ON quizzes(owner, seq DESC)")
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add(self, owner: str, quiz_id: str, quiz_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a quiz and return its history summary; keeps only the newest `limit` per owner."""
+        entry = {
+            'id': quiz_id,
+            'topic': quiz_data['topic'],
+            'questions': quiz_data['questions'],
+            'difficulty': quiz_data['difficulty'],
+            'timestamp': quiz_data['generated_at'],
+        }
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO quizzes (id, owner, topic, difficulty, questions, created_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (quiz_id, owner, entry['topic'], entry['difficulty'], entry['questions'],
+                 entry['timestamp'], json.dumps(quiz_data, ensure_ascii=False)),
+            )
+            if self.limit:
+                pruned = self._conn.execute(
+                    "DELETE FROM quizzes WHERE owner = ? AND seq NOT IN "
+                    "(SELECT seq FROM quizzes WHERE owner = ? ORDER BY seq DESC LIMIT ?)",
+                    (owner, owner, self.limit),
+                ).rowcount
+                if pruned:
+                    # Pruned quizzes must not be served from the cache
+                    self._forget(owner)
+            self._remember((owner, quiz_id), quiz_data)
+        return entry
+
+    def clear(self, owner: str) -> int:
+        """Delete all of an owner's history."""
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM quizzes WHERE owner = ?", (owner,)).rowcount
+            self._forget(owner)
+        return deleted
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, owner: str, quiz_id: str) -> Optional[Dict[str, Any]]:
+        """Return the full quiz data, served from the LRU when possible."""
+        key = (owner, quiz_id)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            row = self._conn.execute(
+                "SELECT data FROM quizzes WHERE owner = ? AND id = ?", (owner, quiz_id)
+            ).fetchone()
+            if not row:
+                return None
+            quiz_data = json.loads(row['data'])
+            self._remember(key, quiz_data)
+            return quiz_data
+
+    def _remember(self, key: Tuple[str, str], quiz_data: Dict[str, Any]) -> None:
+        self._cache[key] = quiz_data
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _forget(self, owner: str) -> None:
+        for key in [key for key in self._cache if key[0] == owner]:
+            del self._cache[key]
+
+    def list_page(self, owner: str, page: int = 1, page_size: int = 12) -> Tuple[List[Dict[str, Any]], int]:
+        """Return one page of history summaries (newest first) and the total count.
+
+        Only the indexed summary columns are read; quiz bodies stay in the database.
+        """
+        offset = (max(1, page) - 1) * page_size
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM quizzes WHERE owner = ?", (owner,)).fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT id, topic, questions, difficulty, created_at FROM quizzes "
+                "WHERE owner = ? ORDER BY seq DESC LIMIT ? OFFSET ?",
+                (owner, page_size, offset),
+            ).fetchall()
+        history = [
+            {
+                'id': row['id'],
+                'topic': row['topic'],
+                'questions': row['questions'],
+                'difficulty': row['difficulty'],
+                'timestamp': row['created_at'],
+            }
+            for row in rows
+        ]
+        return history, total
+
+    def statistics(self, owner: str) -> Dict[str, Any]:
+        """Aggregate history statistics in SQL."""
+        with self._lock:
+            total, average, last_generated = self._conn.execute(
+                "SELECT COUNT(*), AVG(questions), MAX(created_at) FROM quizzes WHERE owner = ?", (owner,)
+            ).fetchone()
+            rows = self._conn.execute(
+                "SELECT difficulty, COUNT(*) FROM quizzes WHERE owner = ? GROUP BY difficulty", (owner,)
+            ).fetchall()
+
+        difficulty_distribution = {'easy': 0, 'medium': 0, 'hard': 0}
+        for difficulty, count in rows:
+            if difficulty in difficulty_distribution:
+                difficulty_distribution[difficulty] = count
+        return {
+            'total_quizzes': total,
+            'average_questions': round(average or 0, 1),
+            'difficulty_distribution': difficulty_distribution,
+            'last_generated': last_generated,
+        }
+
+    def iter_raw(self, owner: str, quiz_ids: Optional[List[str]] = None, batch_size: int = 50) -> Iterator[str]:
+        """Yield the stored JSON text of quizzes (newest first) without decoding it.
+
+        Rows are fetched in batches so exporting a large history never holds it all in memory.
+        """
+        where = "owner = ?"
+        params: List[Any] = [owner]
+        if quiz_ids:
+            where += f" AND id IN ({', '.join('?' for _ in quiz_ids)})"
+            params.extend(quiz_ids)
+
+        last_seq = None
+        while True:
+            page_where = where if last_seq is None else f"{where} AND seq < ?"
+            page_params = params if last_seq is None else [*params, last_seq]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT seq, data FROM quizzes WHERE {page_where} ORDER BY seq DESC LIMIT ?",
+                    [*page_params, batch_size],
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row['data']
+            last_seq = rows[-1]['seq']
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
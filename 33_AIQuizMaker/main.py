@@ -23,7 +23,7 @@ import sys
 import json
 from typing import Optional
 from colorama import init, Fore, Back, Style
-from config import get_api_key, setup_instructions, DEFAULT_QUESTIONS, DEFAULT_DIFFICULTY, DEFAULT_FORMAT, SUPPORTED_FORMATS, SUPPORTED_DIFFICULTIES
+from config import get_api_key, setup_instructions, DEFAULT_QUESTIONS, DEFAULT_DIFFICULTY, DEFAULT_FORMAT, SUPPORTED_FORMATS, SUPPORTED_DIFFICULTIES, MAX_QUESTIONS_LONG
 from quiz_generator import QuizGenerator
 
 # Initialize colorama for cross-platform colored output
@@ -243,11 +243,11 @@ class QuizMakerCLI:
                 elif command.lower().startswith('questions:'):
                     try:
                         num = int(command[9:].strip())
-                        if 1 <= num <= 50:
+                        if 1 <= num <= MAX_QUESTIONS_LONG:
                             self.default_questions = num
                             print(f"{Fore.GREEN}✅ Default questions set to: {num}")
                         else:
-                            print(f"{Fore.RED}❌ Please specify a number between 1 and 50")
+                            print(f"{Fore.RED}❌ Please specify a number between 1 and {MAX_QUESTIONS_LONG}")
                     except ValueError:
                         print(f"{Fore.RED}❌ Please specify a valid number")
                 
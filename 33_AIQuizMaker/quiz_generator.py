@@ -7,11 +7,58 @@ It provides methods to generate quizzes from topics, text files, or pasted conte
 """
 
 import json
+import math
 import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Tuple
 import openai
-from config import get_api_key, get_quiz_prompt_template, get_quiz_validation_prompt, OPENAI_MODEL
+from config import (
+    get_api_key, get_quiz_prompt_template, get_quiz_validation_prompt, OPENAI_MODEL,
+    get_chunk_quiz_prompt_template, get_question_repair_prompt, LONG_DOCUMENT_THRESHOLD,
+    CHUNK_CHARACTERS, CHUNK_OVERLAP, QUIZ_MAX_WORKERS, DUPLICATE_SIMILARITY
+)
+
+# Candidate questions generated per requested question in long-document mode,
+# so duplicates and unrepairable questions can be dropped without another round
+OVERSAMPLE = 1.3
+# Upper bound on questions asked of a single chunk; longer asks get truncated answers
+QUESTIONS_PER_CHUNK = 8
+MIN_CHUNK_CHARACTERS = 1500
+
+def split_into_chunks(text: str, max_chars: int = CHUNK_CHARACTERS, overlap: int = CHUNK_OVERLAP) -> List[str]:
+    """Split text into chunks of at most max_chars, breaking on paragraphs then sentences.
+
+    Each chunk after the first starts with the last `overlap` characters of the previous
+    one so questions near a boundary keep their context.
+    """
+    pieces = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+            # Hard-wrap sentences that alone exceed the limit
+            for start in range(0, len(sentence), max_chars):
+                pieces.append(sentence[start:start + max_chars])
+
+    chunks = []
+    current = []
+    size = 0
+    for piece in pieces:
+        if current and size + len(piece) + 2 > max_chars:
+            chunks.append("\n\n".join(current))
+            tail = chunks[-1][-overlap:] if overlap else ""
+            current, size = ([tail], len(tail)) if tail else ([], 0)
+        current.append(piece)
+        size += len(piece) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
 
 class QuizGenerator:
     def __init__(self, api_key: Optional[str] = None):
@@ -28,7 +75,8 @@ class QuizGenerator:
                      num_questions: int = 5,
                      difficulty: str = "medium",
                      include_answers: bool = True,
-                     validate: bool = True) -> Dict[str, Any]:
+                     validate: bool = True,
+                     long_document: Optional[bool] = None) -> Dict[str, Any]:
         """
         Generate a quiz from the given content.
         
@@ -38,10 +86,17 @@ class QuizGenerator:
             difficulty: Difficulty level (easy, medium, hard)
             include_answers: Whether to include answer key
             validate: Whether to validate the generated quiz
+            long_document: Use chunked generation; defaults to on for content
+                longer than LONG_DOCUMENT_THRESHOLD characters
             
         Returns:
             Dictionary containing the quiz data
         """
+        if long_document is None:
+            long_document = len(content) > LONG_DOCUMENT_THRESHOLD
+        if long_document:
+            return self.generate_long_quiz(content, num_questions, difficulty, include_answers, validate)
+        
         try:
             # Prepare the prompt
             prompt = get_quiz_prompt_template().format(
@@ -85,9 +140,8 @@ class QuizGenerator:
             if validate:
                 validation_result = self._validate_quiz(parsed_quiz, num_questions, difficulty)
                 if not validation_result["valid"]:
-                    # Try to regenerate with corrected prompt
-                    corrected_quiz = self._regenerate_quiz(content, num_questions, difficulty, validation_result["issues"])
-                    parsed_quiz = self._parse_quiz_content(corrected_quiz, num_questions)
+                    # Repair only the broken questions and top up any missing ones
+                    parsed_quiz = self._fix_quiz(parsed_quiz, content, num_questions, difficulty)
             
             # Prepare the result
             result = {
@@ -107,19 +161,30 @@ class QuizGenerator:
     
     def _parse_quiz_content(self, content: str, expected_questions: int) -> List[Dict[str, Any]]:
         """Parse the raw quiz content into structured format."""
-        questions = []
-        
-        # Split content into lines and process
         lines = content.strip().split('\n')
-        current_question = None
-        current_options = {}
-        current_answer = None
-        
         print(f"🔍 Parsing {len(lines)} lines...")
         for i, line in enumerate(lines):
             print(f"🔍 Line {i+1}: '{line}'")
         
-        for line in lines:
+        questions = self._parse_numbered_questions(content)
+        
+        # If we couldn't parse properly, try alternative parsing and keep whichever
+        # found more questions so valid ones are not thrown away before repair
+        if len(questions) != expected_questions:
+            alternative = self._alternative_parse(content, expected_questions)
+            if len(alternative) > len(questions):
+                questions = alternative
+        
+        return questions
+    
+    def _parse_numbered_questions(self, content: str) -> List[Dict[str, Any]]:
+        """Parse questions written in the numbered "1. / A) / Answer:" format."""
+        questions = []
+        current_question = None
+        current_options = {}
+        current_answer = None
+        
+        for line in content.strip().split('\n'):
             line = line.strip()
             if not line:
                 continue
@@ -159,10 +224,6 @@ class QuizGenerator:
                 "answer": current_answer
             })
         
-        # If we couldn't parse properly, try alternative parsing
-        if len(questions) != expected_questions:
-            questions = self._alternative_parse(content, expected_questions)
-        
         return questions
     
     def _alternative_parse(self, content: str, expected_questions: int) -> List[Dict[str, Any]]:
@@ -209,49 +270,269 @@ class QuizGenerator:
         
         # Validate each question
         for i, question in enumerate(quiz):
-            if not question.get("question"):
-                issues.append(f"Question {i+1} has no text")
-            
-            options = question.get("options", {})
-            if len(options) != 4:
-                issues.append(f"Question {i+1} has {len(options)} options instead of 4")
-            
-            if not question.get("answer"):
-                issues.append(f"Question {i+1} has no answer")
-            elif question["answer"] not in options:
-                issues.append(f"Question {i+1} answer '{question['answer']}' not found in options")
+            issues.extend(f"Question {i+1} {issue}" for issue in self._question_issues(question))
         
         return {
             "valid": len(issues) == 0,
             "issues": issues
         }
     
-    def _regenerate_quiz(self, content: str, num_questions: int, difficulty: str, issues: List[str]) -> str:
-        """Regenerate quiz with corrections based on validation issues."""
-        correction_prompt = f"""
-        The previous quiz generation had these issues:
-        {chr(10).join(f"- {issue}" for issue in issues)}
-        
-        Please regenerate the quiz for:
-        Topic: {content}
-        Questions: {num_questions}
-        Difficulty: {difficulty}
-        
-        Ensure all requirements are met this time.
-        """
-        
+    def _question_issues(self, question: Dict[str, Any]) -> List[str]:
+        """List what is wrong with a single question (empty if it is valid)."""
+        issues = []
+        if not question.get("question"):
+            issues.append("has no text")
+        
+        options = question.get("options", {})
+        if len(options) != 4:
+            issues.append(f"has {len(options)} options instead of 4")
+        
+        if not question.get("answer"):
+            issues.append("has no answer")
+        elif question["answer"] not in options:
+            issues.append(f"answer '{question['answer']}' not found in options")
+        return issues
+    
+    def _broken_questions(self, quiz: List[Dict[str, Any]]) -> List[Tuple[int, List[str]]]:
+        """(index, issues) for every invalid question."""
+        broken = []
+        for i, question in enumerate(quiz):
+            issues = self._question_issues(question)
+            if issues:
+                broken.append((i, issues))
+        return broken
+    
+    def _complete(self, system: str, prompt: str, temperature: float = 0.7, max_tokens: int = 2000) -> str:
+        """Run a single chat completion and return the stripped text."""
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[
-                {"role": "system", "content": "You are an expert quiz creator. Fix the previous issues."},
-                {"role": "user", "content": correction_prompt}
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
             ],
-            temperature=0.5,
-            max_tokens=2000
+            temperature=temperature,
+            max_tokens=max_tokens
         )
-        
         return response.choices[0].message.content.strip()
     
+    def _repair_question(self, question: Dict[str, Any], issues: List[str], source: str, difficulty: str) -> Optional[Dict[str, Any]]:
+        """Ask for a corrected version of one question; None if it is still invalid."""
+        original = question.get("question") or "(missing question text)"
+        for letter, text in sorted(question.get("options", {}).items()):
+            original += f"\n   {letter}) {text}"
+        original += f"\n   Answer: {question.get('answer') or '(missing)'}"
+        
+        prompt = get_question_repair_prompt().format(
+            issues="\n".join(f"- {issue}" for issue in issues),
+            question=original,
+            content=source[:CHUNK_CHARACTERS],
+            difficulty=difficulty
+        )
+        try:
+            reply = self._complete("You are an expert quiz creator. Fix the previous issues.", prompt, temperature=0.5, max_tokens=400)
+        except Exception as e:
+            print(f"⚠️ Question repair failed: {e}")
+            return None
+        
+        repaired = self._parse_numbered_questions(reply)
+        if repaired and not self._question_issues(repaired[0]):
+            return repaired[0]
+        return None
+    
+    def _fix_quiz(self, quiz: List[Dict[str, Any]], content: str, num_questions: int, difficulty: str) -> List[Dict[str, Any]]:
+        """Repair invalid questions individually and generate only the missing ones."""
+        quiz = quiz[:num_questions]
+        broken = self._broken_questions(quiz)
+        
+        with ThreadPoolExecutor(max_workers=QUIZ_MAX_WORKERS) as pool:
+            missing = num_questions - len(quiz)
+            top_up = None
+            if missing > 0:
+                prompt = get_quiz_prompt_template().format(
+                    num_questions=missing,
+                    content=content,
+                    difficulty=difficulty
+                )
+                top_up = pool.submit(self._complete, "You are an expert quiz creator.", prompt)
+            repairs = [pool.submit(self._repair_question, quiz[i], issues, content, difficulty) for i, issues in broken]
+            
+            fixed = {i: future.result() for (i, _), future in zip(broken, repairs)}
+            quiz = [fixed.get(i, q) for i, q in enumerate(quiz)]
+            quiz = [q for q in quiz if q is not None]
+            
+            if top_up is not None:
+                try:
+                    extra = self._parse_numbered_questions(top_up.result())
+                    quiz.extend(q for q in extra if not self._question_issues(q))
+                except Exception as e:
+                    print(f"⚠️ Could not generate missing questions: {e}")
+        
+        print(f"🔧 Repaired {sum(1 for q in fixed.values() if q)} of {len(broken)} invalid question(s)")
+        return quiz[:num_questions]
+    
+    def generate_long_quiz(self,
+                           content: str,
+                           num_questions: int = 50,
+                           difficulty: str = "medium",
+                           include_answers: bool = True,
+                           validate: bool = True) -> Dict[str, Any]:
+        """
+        Generate a question bank from a long document using map-reduce.
+        
+        The document is split into chunks and candidate questions are generated for
+        each chunk concurrently (map). Candidates are then deduplicated, invalid
+        questions are repaired one at a time, and a single top-up round fills any
+        shortfall (reduce). Wall time is bounded by three rounds of parallel
+        requests regardless of document length.
+        """
+        try:
+            started = time.perf_counter()
+            target = max(num_questions, math.ceil(num_questions * OVERSAMPLE))
+            # Smaller chunks when many questions are wanted from a short-ish text
+            chunk_chars = min(CHUNK_CHARACTERS, max(MIN_CHUNK_CHARACTERS, math.ceil(len(content) * QUESTIONS_PER_CHUNK / target)))
+            chunks = split_into_chunks(content, chunk_chars, CHUNK_OVERLAP)
+            if not chunks:
+                raise ValueError("Content is empty")
+            plan = self._plan_chunks(len(chunks), target)
+            print(f"🔍 Long document: {len(content)} characters, {len(chunks)} chunks, {len(plan)} requests")
+            
+            stats = {"chunks": len(chunks), "requests": len(plan), "repaired": 0, "dropped": 0}
+            with ThreadPoolExecutor(max_workers=QUIZ_MAX_WORKERS) as pool:
+                candidates = self._map_chunks(pool, chunks, plan, difficulty)
+                stats["candidates"] = len(candidates)
+                questions, duplicates = self._deduplicate(candidates)
+                stats["duplicates_removed"] = duplicates
+                
+                if validate:
+                    broken = self._broken_questions(questions)
+                    repairs = [
+                        pool.submit(self._repair_question, questions[i], issues, chunks[questions[i]["chunk"]], difficulty)
+                        for i, issues in broken
+                    ]
+                    for (i, _), future in zip(broken, repairs):
+                        repaired = future.result()
+                        if repaired:
+                            repaired["chunk"] = questions[i]["chunk"]
+                            stats["repaired"] += 1
+                        else:
+                            stats["dropped"] += 1
+                        questions[i] = repaired
+                    questions = [q for q in questions if q is not None]
+                    questions, duplicates = self._deduplicate(questions)
+                    stats["duplicates_removed"] += duplicates
+                
+                shortfall = num_questions - len(questions)
+                if shortfall > 0:
+                    # One top-up round, aimed at the chunks with the fewest questions
+                    per_chunk = [0] * len(chunks)
+                    for q in questions:
+                        per_chunk[q["chunk"]] += 1
+                    extra_plan = self._plan_top_up(per_chunk, math.ceil(shortfall * OVERSAMPLE))
+                    stats["requests"] += len(extra_plan)
+                    extra = self._map_chunks(pool, chunks, extra_plan, difficulty)
+                    if validate:
+                        extra = [q for q in extra if not self._question_issues(q)]
+                    questions, duplicates = self._deduplicate(questions + extra)
+                    stats["duplicates_removed"] += duplicates
+            
+            # Keep document order and spread the selection across the whole text
+            questions.sort(key=lambda q: q["chunk"])
+            if len(questions) > num_questions:
+                step = len(questions) / num_questions
+                questions = [questions[int((k + 0.5) * step)] for k in range(num_questions)]
+            for q in questions:
+                q.pop("chunk", None)
+            
+            stats["elapsed_seconds"] = round(time.perf_counter() - started, 2)
+            print(f"🔍 Long document quiz: {len(questions)} questions, {stats}")
+            
+            return {
+                "topic": self._extract_topic(content),
+                "difficulty": difficulty,
+                "questions": len(questions),
+                "quiz": questions,
+                "generated_at": self._get_timestamp(),
+                "model": self.model,
+                "include_answers": include_answers,
+                "mode": "long_document",
+                "generation": stats
+            }
+            
+        except Exception as e:
+            raise Exception(f"Failed to generate quiz: {str(e)}")
+    
+    def _plan_chunks(self, num_chunks: int, target: int) -> List[Tuple[int, int]]:
+        """Decide how many questions to ask of each chunk as (chunk_index, count) pairs."""
+        if target < num_chunks:
+            # Fewer questions than chunks: sample evenly spaced chunks, one question each
+            indices = sorted({int((k + 0.5) * num_chunks / target) for k in range(target)})
+            return [(i, 1) for i in indices]
+        per_chunk, remainder = divmod(target, num_chunks)
+        return [(i, per_chunk + (1 if i < remainder else 0)) for i in range(num_chunks)]
+    
+    def _plan_top_up(self, per_chunk: List[int], needed: int) -> List[Tuple[int, int]]:
+        """Spread `needed` extra questions over the chunks with the fewest questions."""
+        least_covered = sorted(range(len(per_chunk)), key=lambda i: (per_chunk[i], i))
+        counts: Dict[int, int] = {}
+        for k in range(needed):
+            chunk = least_covered[k % len(least_covered)]
+            counts[chunk] = counts.get(chunk, 0) + 1
+        return sorted(counts.items())
+    
+    def _map_chunks(self, pool: ThreadPoolExecutor, chunks: List[str], plan: List[Tuple[int, int]], difficulty: str) -> List[Dict[str, Any]]:
+        """Generate questions for each planned chunk concurrently, tagged with their chunk."""
+        futures = [
+            pool.submit(self._generate_chunk_questions, chunks[i], i, len(chunks), count, difficulty)
+            for i, count in plan
+        ]
+        candidates = []
+        for (i, _), future in zip(plan, futures):
+            try:
+                questions = future.result()
+            except Exception as e:
+                print(f"⚠️ Chunk {i+1} failed: {e}")
+                continue
+            for q in questions:
+                q["chunk"] = i
+                candidates.append(q)
+        return candidates
+    
+    def _generate_chunk_questions(self, chunk: str, index: int, total: int, count: int, difficulty: str) -> List[Dict[str, Any]]:
+        prompt = get_chunk_quiz_prompt_template().format(
+            num_questions=count,
+            part=index + 1,
+            total_parts=total,
+            content=chunk,
+            difficulty=difficulty
+        )
+        reply = self._complete("You are an expert quiz creator.", prompt, max_tokens=min(4000, 200 + 150 * count))
+        return self._parse_numbered_questions(reply)[:count]
+    
+    def _deduplicate(self, questions: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """Drop near-identical questions, keeping the first occurrence.
+
+        Two questions are duplicates when the Jaccard similarity of their word sets
+        reaches DUPLICATE_SIMILARITY. An inverted index over words limits comparisons
+        to questions that share at least one word.
+        """
+        kept: List[Dict[str, Any]] = []
+        kept_words: List[set] = []
+        index: Dict[str, List[int]] = {}
+        for question in questions:
+            words = set(re.findall(r"\w+", (question.get("question") or "").lower()))
+            if not words:
+                kept.append(question)
+                kept_words.append(words)
+                continue
+            candidates = {k for word in words for k in index.get(word, ())}
+            if any(len(words & kept_words[k]) / len(words | kept_words[k]) >= DUPLICATE_SIMILARITY for k in candidates):
+                continue
+            for word in words:
+                index.setdefault(word, []).append(len(kept))
+            kept.append(question)
+            kept_words.append(words)
+        return kept, len(questions) - len(kept)
+    
     def _extract_topic(self, content: str) -> str:
         """Extract a topic from the content."""
         if len(content) <= 100:
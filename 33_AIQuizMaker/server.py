@@ -11,15 +11,19 @@ import os
 import json
 import secrets
 from datetime import datetime
-from typing import Dict, Any, Optional
-from flask import Flask, jsonify, render_template, request, send_from_directory, session
+from flask import Flask, Response, jsonify, render_template, request, send_from_directory, session, stream_with_context
 from werkzeug.utils import secure_filename
-from config import FLASK_PORT, FLASK_DEBUG, UPLOADS_DIR, OUTPUTS_DIR, QUIZES_DIR, get_api_key
+from config import (
+    FLASK_PORT, FLASK_DEBUG, UPLOADS_DIR, OUTPUTS_DIR, QUIZES_DIR, get_api_key,
+    LONG_DOCUMENT_THRESHOLD, MAX_QUESTIONS, MAX_QUESTIONS_LONG, FLASK_SECRET_KEY,
+    HISTORY_PAGE_SIZE, MAX_HISTORY_PAGE_SIZE, SUPPORTED_FORMATS
+)
 from quiz_generator import QuizGenerator
+from history_store import QuizHistoryStore
 
 # Initialize Flask app
 app = Flask(__name__)
-app.secret_key = secrets.token_hex(16)
+app.secret_key = FLASK_SECRET_KEY or secrets.token_hex(16)
 
 # Configure upload settings
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
@@ -33,17 +37,18 @@ except Exception as e:
     print(f"❌ Failed to initialize Quiz Generator: {e}")
     quiz_generator = None
 
+# History lives server-side; the session cookie only carries a user id
+history_store = QuizHistoryStore()
+
 def allowed_file(filename: str) -> bool:
     """Check if file extension is allowed."""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def get_session_data() -> Dict[str, Any]:
-    """Get or create session data."""
-    if 'quiz_data' not in session:
-        session['quiz_data'] = {}
-    if 'history' not in session:
-        session['history'] = []
-    return session['quiz_data']
+def get_user_id() -> str:
+    """Get or create the id that keys this browser's history."""
+    if 'user_id' not in session:
+        session['user_id'] = secrets.token_hex(16)
+    return session['user_id']
 
 @app.route('/')
 def index():
@@ -80,8 +85,10 @@ def generate_quiz():
         if not content:
             return jsonify({'success': False, 'error': 'Content is required'}), 400
         
-        if not (1 <= num_questions <= 50):
-            return jsonify({'success': False, 'error': 'Questions must be between 1 and 50'}), 400
+        # Long documents are generated chunk by chunk and can support larger banks
+        max_questions = MAX_QUESTIONS_LONG if len(content) > LONG_DOCUMENT_THRESHOLD else MAX_QUESTIONS
+        if not (1 <= num_questions <= max_questions):
+            return jsonify({'success': False, 'error': f'Questions must be between 1 and {max_questions}'}), 400
         
         if difficulty not in ['easy', 'medium', 'hard']:
             return jsonify({'success': False, 'error': 'Invalid difficulty level'}), 400
@@ -94,29 +101,13 @@ def generate_quiz():
             include_answers=include_answers
         )
         
-        # Store in session
-        session_data = get_session_data()
-        session_data['current_quiz'] = quiz_data
-        session_data['last_generated'] = datetime.now().isoformat()
-        
         # Add to history
-        history_entry = {
-            'id': secrets.token_hex(8),
-            'topic': quiz_data['topic'],
-            'questions': quiz_data['questions'],
-            'difficulty': quiz_data['difficulty'],
-            'timestamp': quiz_data['generated_at'],
-            'quiz_data': quiz_data
-        }
-        session['history'].insert(0, history_entry)
-        
-        # Keep only last 10 entries
-        if len(session['history']) > 10:
-            session['history'] = session['history'][:10]
+        history_entry = history_store.add(get_user_id(), secrets.token_hex(8), quiz_data)
         
         return jsonify({
             'success': True,
             'quiz': quiz_data,
+            'history_id': history_entry['id'],
             'message': 'Quiz generated successfully!'
         })
         
@@ -266,29 +257,87 @@ def export_quiz():
 
 @app.route('/api/history')
 def get_history():
-    """Get quiz generation history."""
+    """Get one page of quiz generation history (newest first)."""
     try:
-        history = session.get('history', [])
+        page = max(1, request.args.get('page', 1, type=int))
+        page_size = request.args.get('page_size', HISTORY_PAGE_SIZE, type=int)
+        page_size = min(max(1, page_size), MAX_HISTORY_PAGE_SIZE)
+        
+        history, total = history_store.list_page(get_user_id(), page, page_size)
         return jsonify({
             'success': True,
-            'history': history
+            'history': history,
+            'page': page,
+            'page_size': page_size,
+            'total': total,
+            'has_more': page * page_size < total
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/history/export')
+def export_history():
+    """Download stored quizzes in bulk, streamed straight from the history store.
+    
+    Query parameters: ``format`` (json, ndjson, md or csv) and optional ``ids``
+    (comma-separated quiz ids; defaults to the whole history). JSON and NDJSON
+    reuse the stored JSON text as-is instead of re-serialising each quiz.
+    """
+    try:
+        format_type = request.args.get('format', 'json')
+        if format_type not in SUPPORTED_FORMATS + ['ndjson']:
+            return jsonify({'success': False, 'error': 'Invalid format'}), 400
+        if format_type in ('md', 'csv') and not quiz_generator:
+            return jsonify({'success': False, 'error': 'Quiz generator not available'}), 500
+        
+        quiz_ids = [quiz_id for quiz_id in request.args.get('ids', '').split(',') if quiz_id]
+        raw_quizzes = history_store.iter_raw(get_user_id(), quiz_ids or None)
+        
+        mimetypes = {
+            'json': 'application/json',
+            'ndjson': 'application/x-ndjson',
+            'md': 'text/markdown',
+            'csv': 'text/csv'
+        }
+        return Response(
+            stream_with_context(_export_chunks(raw_quizzes, format_type)),
+            mimetype=mimetypes[format_type],
+            headers={'Content-Disposition': f'attachment; filename=quiz_history.{format_type}'}
+        )
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def _export_chunks(raw_quizzes, format_type: str):
+    """Yield a bulk export one quiz at a time."""
+    if format_type == 'json':
+        yield '['
+        for i, raw in enumerate(raw_quizzes):
+            yield (',\n' if i else '\n') + raw
+        yield '\n]\n'
+    elif format_type == 'ndjson':
+        for raw in raw_quizzes:
+            yield raw + '\n'
+    elif format_type == 'md':
+        for i, raw in enumerate(raw_quizzes):
+            yield ('\n---\n\n' if i else '') + quiz_generator.export_quiz(json.loads(raw), 'md')
+    else:
+        # One header for the whole file, then each quiz's rows
+        for i, raw in enumerate(raw_quizzes):
+            lines = quiz_generator.export_quiz(json.loads(raw), 'csv').split('\n')
+            yield '\n'.join(lines if i == 0 else lines[1:]) + '\n'
+
 @app.route('/api/history/<quiz_id>')
 def get_quiz_from_history(quiz_id: str):
     """Get a specific quiz from history."""
     try:
-        history = session.get('history', [])
-        quiz_entry = next((entry for entry in history if entry['id'] == quiz_id), None)
+        quiz_data = history_store.get(get_user_id(), quiz_id)
         
-        if not quiz_entry:
+        if not quiz_data:
             return jsonify({'success': False, 'error': 'Quiz not found'}), 404
         
         return jsonify({
             'success': True,
-            'quiz': quiz_entry['quiz_data']
+            'quiz': quiz_data
         })
         
     except Exception as e:
@@ -298,7 +347,7 @@ def get_quiz_from_history(quiz_id: str):
 def clear_history():
     """Clear quiz generation history."""
     try:
-        session['history'] = []
+        history_store.clear(get_user_id())
         return jsonify({
             'success': True,
             'message': 'History cleared successfully!'
@@ -310,41 +359,9 @@ def clear_history():
 def get_statistics():
     """Get quiz generation statistics."""
     try:
-        session_data = get_session_data()
-        history = session.get('history', [])
-        
-        if not history:
-            return jsonify({
-                'success': True,
-                'statistics': {
-                    'total_quizzes': 0,
-                    'average_questions': 0,
-                    'difficulty_distribution': {'easy': 0, 'medium': 0, 'hard': 0},
-                    'last_generated': None
-                }
-            })
-        
-        # Calculate statistics
-        total_quizzes = len(history)
-        total_questions = sum(entry['questions'] for entry in history)
-        average_questions = total_questions / total_quizzes if total_quizzes > 0 else 0
-        
-        difficulty_distribution = {'easy': 0, 'medium': 0, 'hard': 0}
-        for entry in history:
-            difficulty = entry['difficulty']
-            if difficulty in difficulty_distribution:
-                difficulty_distribution[difficulty] += 1
-        
-        last_generated = session_data.get('last_generated')
-        
         return jsonify({
             'success': True,
-            'statistics': {
-                'total_quizzes': total_quizzes,
-                'average_questions': round(average_questions, 1),
-                'difficulty_distribution': difficulty_distribution,
-                'last_generated': last_generated
-            }
+            'statistics': history_store.statistics(get_user_id())
         })
         
     except Exception as e:
@@ -378,14 +395,15 @@ def validate_input():
             errors.append('Content is required')
         elif len(content) < 10:
             errors.append('Content is too short (minimum 10 characters)')
-        elif len(content) > 10000:
-            warnings.append('Content is very long, this may take longer to process')
+        elif len(content) > LONG_DOCUMENT_THRESHOLD:
+            warnings.append('Content is very long, it will be split into sections and processed in parallel')
         
         # Validate questions
+        max_questions = MAX_QUESTIONS_LONG if len(content) > LONG_DOCUMENT_THRESHOLD else MAX_QUESTIONS
         try:
             num_questions = int(num_questions)
-            if not (1 <= num_questions <= 50):
-                errors.append('Number of questions must be between 1 and 50')
+            if not (1 <= num_questions <= max_questions):
+                errors.append(f'Number of questions must be between 1 and {max_questions}')
             elif num_questions > 20:
                 warnings.append('Generating many questions may take longer')
         except (ValueError, TypeError):
@@ -418,11 +436,8 @@ def internal_error(error):
 @app.before_request
 def before_request():
     """Set up before each request."""
-    # Ensure session is initialized
-    if 'quiz_data' not in session:
-        session['quiz_data'] = {}
-    if 'history' not in session:
-        session['history'] = []
+    # Ensure the session carries a user id for the history store
+    get_user_id()
 
 if __name__ == '__main__':
     print("🚀 Starting AI Quiz Maker Web Server...")
@@ -6,6 +6,7 @@
 // Global variables
 let currentQuiz = null;
 let currentTab = 'topic';
+let historyPage = 1;
 
 // DOM elements
 const elements = {
@@ -45,6 +46,8 @@ const elements = {
     
     // History and stats
     historyList: document.getElementById('history-list'),
+    historyActions: document.getElementById('history-actions'),
+    historyMore: document.getElementById('history-more'),
     statsContent: document.getElementById('stats-content'),
     
     // Overlays
@@ -630,15 +633,19 @@ async function copyToClipboard() {
 }
 
 /**
- * Load quiz history
+ * Load quiz history (first page, or the next page when appending)
  */
-async function loadHistory() {
+async function loadHistory(append = false) {
     try {
-        const response = await fetch('/api/history');
+        const page = append ? historyPage + 1 : 1;
+        const response = await fetch(`/api/history?page=${page}`);
         const result = await response.json();
         
         if (result.success) {
-            displayHistory(result.history);
+            historyPage = result.page;
+            displayHistory(result.history, append);
+            elements.historyMore.classList.toggle('hidden', !result.has_more);
+            elements.historyActions.classList.toggle('hidden', result.total === 0);
         } else {
             throw new Error(result.error);
         }
@@ -652,8 +659,8 @@ async function loadHistory() {
 /**
  * Display quiz history
  */
-function displayHistory(history) {
-    if (history.length === 0) {
+function displayHistory(history, append = false) {
+    if (history.length === 0 && !append) {
         elements.historyList.innerHTML = `
             <div class="col-span-full text-center py-12">
                 <div class="w-24 h-24 bg-gray-100 rounded-full flex items-center justify-center mx-auto mb-4">
@@ -709,7 +716,11 @@ function displayHistory(history) {
         `;
     });
     
-    elements.historyList.innerHTML = historyHTML;
+    if (append) {
+        elements.historyList.insertAdjacentHTML('beforeend', historyHTML);
+    } else {
+        elements.historyList.innerHTML = historyHTML;
+    }
 }
 
 /**
@@ -738,21 +749,15 @@ async function loadQuizFromHistory(quizId) {
 /**
  * Export quiz from history
  */
-async function exportHistoryQuiz(quizId, format) {
-    try {
-        const response = await fetch(`/api/history/${quizId}`);
-        const result = await response.json();
-        
-        if (result.success) {
-            await exportQuiz(format);
-        } else {
-            throw new Error(result.error);
-        }
-        
-    } catch (error) {
-        console.error('Error exporting history quiz:', error);
-        showToast('error', 'Export Failed', 'Failed to export quiz from history');
-    }
+function exportHistoryQuiz(quizId, format) {
+    window.location.href = `/api/history/export?format=${format}&ids=${encodeURIComponent(quizId)}`;
+}
+
+/**
+ * Download the whole stored history in one file
+ */
+function exportAllHistory(format) {
+    window.location.href = `/api/history/export?format=${format}`;
 }
 
 /**
@@ -983,5 +988,7 @@ window.exportQuiz = exportQuiz;
 window.copyToClipboard = copyToClipboard;
 window.loadQuizFromHistory = loadQuizFromHistory;
 window.exportHistoryQuiz = exportHistoryQuiz;
+window.exportAllHistory = exportAllHistory;
+window.loadHistory = loadHistory;
 window.clearHistory = clearHistory;
 window.fetchUrlContent = fetchUrlContent;
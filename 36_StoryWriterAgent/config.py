@@ -166,12 +166,23 @@ class StoryConfig:
     DEFAULT_LANGUAGE = "english"
     
     # GPT settings
+    MODEL = "gpt-4"
     MAX_TOKENS = 2000
     TEMPERATURE = 0.8
     
+    # Long-form (chapter) generation settings
+    MAX_CHAPTERS = 12
+    CHAPTER_MAX_TOKENS = 1500
+    CHAPTER_WORDS = 600
+    CHAPTER_LOOKAHEAD = 1  # chapters requested ahead of the one being streamed
+    STREAM_METRICS_HISTORY = 100
+    
     # File storage settings
     STORIES_DIR = "stories"
     FAVORITES_FILE = "favorites.json"
+    INDEX_FILE = "library.db"  # SQLite library index, stored inside STORIES_DIR
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
     STORY_EXTENSIONS = [".txt", ".md"]
     
     # Web interface settings
@@ -221,5 +232,27 @@ Requirements:
 - Keep the story engaging and well-structured
 - Include a title in {language}
 
-Generate the story:"""
+Generate the story:""",
+        
+        "outline": """You are planning a {chapters}-chapter {genre} story with a {tone} tone, written in {language}.
+
+Prompt: {prompt}
+
+Return the plan in exactly this format and nothing else:
+TITLE: <story title in {language}>
+1. <one or two sentence synopsis of chapter 1>
+2. <one or two sentence synopsis of chapter 2>
+...
+{chapters}. <one or two sentence synopsis of chapter {chapters}>""",
+        
+        "chapter": """You are writing chapter {number} of {chapters} of the {genre} story "{title}" with a {tone} tone, in {language}.
+
+Original prompt: {prompt}
+
+Story plan:
+{outline}
+
+Write only chapter {number} (about {word_count} words), following its synopsis from the plan.
+{continuity}
+Begin with a heading line "Chapter {number}: <chapter title>" followed by the chapter text."""
     }
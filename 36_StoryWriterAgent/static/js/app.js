@@ -55,7 +55,8 @@ class StoryWriterApp {
             genre: formData.get('genre'),
             tone: formData.get('tone'),
             length: formData.get('length'),
-            language: formData.get('language')
+            language: formData.get('language'),
+            chapters: formData.get('chapters') || '1'
         };
 
         // Validate input
@@ -64,7 +65,89 @@ class StoryWriterApp {
             return;
         }
 
-        await this.generateStory(storyData);
+        if (window.EventSource) {
+            await this.streamStory(storyData);
+        } else {
+            await this.generateStory(storyData);
+        }
+    }
+
+    streamStory(storyData) {
+        const generateBtn = document.getElementById('generateBtn');
+        const storyDisplay = document.getElementById('storyDisplay');
+        const storyTitle = document.getElementById('storyTitle');
+        const storyContent = document.getElementById('storyContent');
+
+        generateBtn.disabled = true;
+        generateBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Writing...';
+        generateBtn.classList.add('generating');
+
+        const resetButton = () => {
+            generateBtn.disabled = false;
+            generateBtn.innerHTML = '<i class="fas fa-magic"></i> Generate Story';
+            generateBtn.classList.remove('generating');
+        };
+
+        return new Promise((resolve) => {
+            const params = new URLSearchParams(storyData);
+            const source = new EventSource(`/api/generate/stream?${params.toString()}`);
+            let finished = false;
+
+            const finish = () => {
+                finished = true;
+                source.close();
+                resetButton();
+                resolve();
+            };
+
+            source.addEventListener('start', (e) => {
+                const data = JSON.parse(e.data);
+                this.currentStory = null;
+                storyTitle.textContent = 'Writing...';
+                document.getElementById('storyGenre').textContent = data.genre;
+                document.getElementById('storyTone').textContent = data.tone;
+                document.getElementById('storyLength').textContent = data.length;
+                document.getElementById('storyLanguage').textContent = data.language;
+                storyContent.textContent = '';
+                storyDisplay.style.display = 'block';
+                storyDisplay.scrollIntoView({ behavior: 'smooth' });
+            });
+
+            source.addEventListener('outline', (e) => {
+                storyTitle.textContent = JSON.parse(e.data).title;
+            });
+
+            source.addEventListener('chapter', (e) => {
+                if (storyContent.textContent) {
+                    storyContent.textContent += '\n\n';
+                }
+            });
+
+            source.addEventListener('token', (e) => {
+                storyContent.textContent += JSON.parse(e.data).text;
+                storyContent.scrollTop = storyContent.scrollHeight;
+            });
+
+            source.addEventListener('done', (e) => {
+                const data = JSON.parse(e.data);
+                this.currentStory = data.story;
+                storyTitle.textContent = data.story.title;
+                storyContent.textContent = data.story.content;
+                const ttft = data.metrics.ttft_ms !== null ? `${(data.metrics.ttft_ms / 1000).toFixed(1)}s` : 'n/a';
+                this.showToast(`Story generated and saved! First words after ${ttft}`, 'success');
+                finish();
+            });
+
+            source.addEventListener('error', (e) => {
+                if (finished) return;
+                let message = 'Connection lost while generating story';
+                if (e.data) {
+                    message = JSON.parse(e.data).error || message;
+                }
+                this.showToast(`Error: ${message}`, 'error');
+                finish();
+            });
+        });
     }
 
     async generateStory(storyData) {
@@ -6,6 +6,10 @@ class StoriesManager {
         this.favorites = [];
         this.currentFilter = 'all';
         this.currentView = 'grid';
+        this.page = 1;
+        this.pageSize = 50;
+        this.total = 0;
+        this.searchTimer = null;
         this.init();
     }
 
@@ -22,6 +26,12 @@ class StoriesManager {
             searchInput.addEventListener('input', (e) => this.handleSearch(e.target.value));
         }
 
+        // Pagination
+        const loadMoreBtn = document.getElementById('loadMoreBtn');
+        if (loadMoreBtn) {
+            loadMoreBtn.addEventListener('click', () => this.loadStories(this.page + 1));
+        }
+
         // Filter buttons
         const filterBtns = document.querySelectorAll('.filter-btn');
         filterBtns.forEach(btn => {
@@ -78,14 +88,18 @@ class StoriesManager {
         }
     }
 
-    async loadStories() {
+    async loadStories(page = 1) {
         try {
-            const response = await fetch('/api/stories');
+            const response = await fetch(`/api/stories?page=${page}&page_size=${this.pageSize}`);
             const result = await response.json();
 
             if (result.success) {
-                this.stories = result.stories;
+                // Pages after the first are appended to what is already loaded
+                this.stories = page === 1 ? result.stories : this.stories.concat(result.stories);
+                this.page = page;
+                this.total = result.total;
                 this.renderStories();
+                this.updateLoadMore();
             } else {
                 throw new Error(result.error || 'Failed to load stories');
             }
@@ -187,20 +201,39 @@ class StoriesManager {
         `;
     }
 
+    updateLoadMore() {
+        const loadMore = document.getElementById('loadMore');
+        if (loadMore) {
+            loadMore.style.display = this.stories.length < this.total ? 'block' : 'none';
+        }
+    }
+
     handleSearch(query) {
+        clearTimeout(this.searchTimer);
         if (!query.trim()) {
             this.renderStories();
+            this.updateLoadMore();
             return;
         }
 
-        // Filter stories by search query
-        const filteredStories = this.stories.filter(story => 
-            story.title.toLowerCase().includes(query.toLowerCase()) ||
-            story.content.toLowerCase().includes(query.toLowerCase()) ||
-            story.prompt.toLowerCase().includes(query.toLowerCase())
-        );
-
-        this.renderFilteredStories(filteredStories);
+        // Debounce keystrokes, then run a ranked full-text search on the server
+        this.searchTimer = setTimeout(async () => {
+            try {
+                const response = await fetch(`/api/search?q=${encodeURIComponent(query)}&page_size=${this.pageSize}`);
+                const result = await response.json();
+                if (!result.success) {
+                    throw new Error(result.error || 'Search failed');
+                }
+                this.renderFilteredStories(result.results);
+                const loadMore = document.getElementById('loadMore');
+                if (loadMore) {
+                    loadMore.style.display = 'none';
+                }
+            } catch (error) {
+                console.error('Error searching stories:', error);
+                this.showToast(`Error searching stories: ${error.message}`, 'error');
+            }
+        }, 250);
     }
 
     renderFilteredStories(stories) {
@@ -342,6 +375,7 @@ class StoriesManager {
                 // Remove from local arrays
                 this.stories = this.stories.filter(story => story.id !== storyId);
                 this.favorites = this.favorites.filter(id => id !== storyId);
+                this.total = Math.max(0, this.total - 1);
 
                 // Re-render
                 this.renderStories();
@@ -475,7 +509,7 @@ class StoriesManager {
         const totalWords = document.getElementById('totalWords');
 
         if (totalStories) {
-            totalStories.textContent = this.stories.length;
+            totalStories.textContent = this.total || this.stories.length;
         }
         if (totalFavorites) {
             totalFavorites.textContent = this.favorites.length;
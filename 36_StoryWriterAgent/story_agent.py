@@ -4,14 +4,20 @@ Core StoryWriterAgent functionality for AI-powered story generation
 
 import json
 import os
+import queue
 import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 import openai
 from openai import OpenAI
 
 from config import StoryConfig
+from story_index import StoryIndex
 
 class StoryAgent:
     """Main agent class for story generation and management"""
@@ -26,8 +32,16 @@ class StoryAgent:
         # Create directories if they don't exist
         self.stories_dir.mkdir(exist_ok=True)
         
+        # Library index for listing/search; built from metadata files on first run
+        self.index = StoryIndex(self.stories_dir / self.config.INDEX_FILE)
+        if self.index.count() == 0:
+            self.rebuild_index()
+        
         # Load favorites
         self.favorites = self._load_favorites()
+        
+        # Recent streaming timings (time-to-first-token etc.), newest last
+        self.stream_metrics = deque(maxlen=self.config.STREAM_METRICS_HISTORY)
     
     def generate_story(
         self, 
@@ -38,7 +52,121 @@ class StoryAgent:
         language: str = "english"
     ) -> Dict[str, Any]:
         """Generate a story based on the given parameters"""
+        settings, messages = self._build_story_messages(prompt, genre, tone, length, language)
         
+        try:
+            # Generate story using OpenAI
+            response = self.client.chat.completions.create(
+                model=self.config.MODEL,
+                messages=messages,
+                max_tokens=self.config.MAX_TOKENS,
+                temperature=self.config.TEMPERATURE
+            )
+            
+            story_content = response.choices[0].message.content.strip()
+            
+            # Extract title and content
+            title, content = self._extract_title_and_content(story_content)
+            
+            return self._make_story_data(self._generate_story_id(), title, content, prompt, settings)
+            
+        except Exception as e:
+            raise Exception(f"Failed to generate story: {str(e)}")
+    
+    def generate_story_stream(
+        self,
+        prompt: str,
+        genre: str = "fantasy",
+        tone: str = "serious",
+        length: str = "medium",
+        language: str = "english",
+        chapters: int = 1
+    ) -> Iterator[Dict[str, Any]]:
+        """Generate a story as a stream of events.
+        
+        Yields dicts with an "event" key: "start", "chapter" (long-form only),
+        "token" (text as it arrives), and finally "done" with the saved story and
+        timing metrics. Tokens are appended to a draft file as they arrive; the
+        finished story is saved like any other.
+        
+        With chapters > 1 an outline is requested first, then each chapter is
+        generated from the outline. Chapter requests are pipelined: the next
+        chapter is already generating (and buffered) while the current one streams.
+        """
+        started = time.perf_counter()
+        chapters = max(1, min(int(chapters or 1), self.config.MAX_CHAPTERS))
+        settings, messages = self._build_story_messages(prompt, genre, tone, length, language)
+        story_id = self._generate_story_id()
+        draft_file = self.stories_dir / f"{story_id}_draft.txt"
+        metrics = {"story_id": story_id, "chapters": chapters, "ttft_ms": None, "chunks": 0}
+        
+        yield {"event": "start", "id": story_id, "chapters": chapters, **settings}
+        
+        if chapters == 1:
+            sections = [(None, self._stream_completion(messages, self.config.MAX_TOKENS))]
+            title = None
+        else:
+            title, outline = self._generate_outline(prompt, settings, chapters)
+            metrics["outline_ms"] = round((time.perf_counter() - started) * 1000)
+            yield {"event": "outline", "title": title, "outline": outline}
+            sections = self._pipelined_chapters(prompt, settings, title, outline, chapters)
+        
+        parts: List[str] = []
+        try:
+            with open(draft_file, 'w', encoding='utf-8') as draft:
+                for number, stream in sections:
+                    if number is not None:
+                        if parts:
+                            parts.append("\n\n")
+                            draft.write("\n\n")
+                        yield {"event": "chapter", "number": number}
+                    for text in stream:
+                        if metrics["ttft_ms"] is None:
+                            metrics["ttft_ms"] = round((time.perf_counter() - started) * 1000)
+                        metrics["chunks"] += 1
+                        parts.append(text)
+                        draft.write(text)
+                        draft.flush()
+                        yield {"event": "token", "text": text}
+        except Exception as e:
+            raise Exception(f"Failed to generate story: {str(e)}")
+        
+        story_text = "".join(parts).strip()
+        if title is None:
+            title, content = self._extract_title_and_content(story_text)
+        else:
+            content = story_text
+        story = self._make_story_data(story_id, title, content, prompt, settings)
+        if chapters > 1:
+            story["chapters"] = chapters
+        self.save_story(story)
+        draft_file.unlink(missing_ok=True)
+        
+        metrics["total_ms"] = round((time.perf_counter() - started) * 1000)
+        self.stream_metrics.append(metrics)
+        yield {"event": "done", "story": story, "metrics": metrics}
+    
+    def get_stream_metrics(self) -> Dict[str, Any]:
+        """Summarize time-to-first-token and total time over recent streamed requests"""
+        recent = list(self.stream_metrics)
+        ttfts = sorted(m["ttft_ms"] for m in recent if m.get("ttft_ms") is not None)
+        
+        def percentile(values, pct):
+            if not values:
+                return None
+            return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+        
+        return {
+            "requests": len(recent),
+            "ttft_ms_p50": percentile(ttfts, 50),
+            "ttft_ms_p95": percentile(ttfts, 95),
+            "recent": recent[-10:]
+        }
+    
+    def _build_story_messages(
+        self, prompt: str, genre: str, tone: str, length: str, language: str
+    ) -> Tuple[Dict[str, str], List[Dict[str, str]]]:
+        """Validate settings and build the chat messages for a single story"""
         # Validate inputs
         if genre not in self.config.GENRES:
             genre = self.config.DEFAULT_GENRE
@@ -70,48 +198,152 @@ class StoryAgent:
             language=language_info["name"]
         )
         
-        try:
-            # Generate story using OpenAI
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a creative and skilled storyteller who can write engaging stories in multiple languages and genres."
-                    },
-                    {
-                        "role": "user",
-                        "content": formatted_prompt
-                    }
-                ],
-                max_tokens=self.config.MAX_TOKENS,
-                temperature=self.config.TEMPERATURE
-            )
-            
-            story_content = response.choices[0].message.content.strip()
-            
-            # Extract title and content
-            title, content = self._extract_title_and_content(story_content)
-            
-            # Create story data
-            story_data = {
-                "id": self._generate_story_id(),
-                "title": title,
-                "content": content,
-                "prompt": prompt,
-                "genre": genre,
-                "tone": tone,
-                "length": length,
-                "language": language,
-                "created_at": datetime.now().isoformat(),
-                "word_count": len(content.split()),
-                "character_count": len(content)
+        settings = {"genre": genre, "tone": tone, "length": length, "language": language}
+        return settings, self._messages(formatted_prompt)
+    
+    def _messages(self, user_prompt: str) -> List[Dict[str, str]]:
+        return [
+            {
+                "role": "system",
+                "content": "You are a creative and skilled storyteller who can write engaging stories in multiple languages and genres."
+            },
+            {
+                "role": "user",
+                "content": user_prompt
             }
-            
-            return story_data
-            
-        except Exception as e:
-            raise Exception(f"Failed to generate story: {str(e)}")
+        ]
+    
+    def _make_story_data(self, story_id: str, title: str, content: str, prompt: str,
+                         settings: Dict[str, str]) -> Dict[str, Any]:
+        return {
+            "id": story_id,
+            "title": title,
+            "content": content,
+            "prompt": prompt,
+            "genre": settings["genre"],
+            "tone": settings["tone"],
+            "length": settings["length"],
+            "language": settings["language"],
+            "created_at": datetime.now().isoformat(),
+            "word_count": len(content.split()),
+            "character_count": len(content)
+        }
+    
+    def _stream_completion(self, messages: List[Dict[str, str]], max_tokens: int) -> Iterator[str]:
+        """Yield text deltas from a streaming chat completion"""
+        stream = self.client.chat.completions.create(
+            model=self.config.MODEL,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=self.config.TEMPERATURE,
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    def _generate_outline(self, prompt: str, settings: Dict[str, str], chapters: int) -> Tuple[str, List[str]]:
+        """Ask for a title and one synopsis per chapter"""
+        outline_prompt = self.config.STORY_PROMPTS["outline"].format(
+            chapters=chapters,
+            prompt=prompt,
+            genre=self.config.GENRES[settings["genre"]]["name"],
+            tone=self.config.TONES[settings["tone"]]["name"],
+            language=self.config.LANGUAGES[settings["language"]]["name"]
+        )
+        response = self.client.chat.completions.create(
+            model=self.config.MODEL,
+            messages=self._messages(outline_prompt),
+            max_tokens=150 + 80 * chapters,
+            temperature=self.config.TEMPERATURE
+        )
+        text = response.choices[0].message.content.strip()
+        
+        title = "Untitled Story"
+        synopses: List[str] = []
+        for line in text.splitlines():
+            line = line.strip()
+            if line.upper().startswith("TITLE:"):
+                title = line.split(":", 1)[1].strip().strip('"') or title
+                continue
+            match = re.match(r'^(\d+)[.)]\s*(.+)$', line)
+            if match:
+                synopses.append(match.group(2))
+        
+        # Pad or trim so there is exactly one synopsis per chapter
+        synopses = synopses[:chapters]
+        while len(synopses) < chapters:
+            synopses.append("Continue the story toward its conclusion.")
+        return title, synopses
+    
+    def _pipelined_chapters(
+        self, prompt: str, settings: Dict[str, str], title: str, outline: List[str], chapters: int
+    ) -> Iterator[Tuple[int, Iterator[str]]]:
+        """Yield (chapter_number, token_iterator) in order while prefetching later chapters.
+        
+        Each chapter depends only on the shared outline, so chapter N+1 can be
+        requested while chapter N is still being delivered. Its tokens are buffered
+        in a queue until the client reaches it.
+        """
+        outline_text = "\n".join(f"{i}. {synopsis}" for i, synopsis in enumerate(outline, 1))
+        lookahead = max(0, self.config.CHAPTER_LOOKAHEAD)
+        done = object()
+        cancelled = threading.Event()
+        queues: Dict[int, "queue.Queue"] = {}
+        
+        def produce(number: int, q: "queue.Queue"):
+            continuity = (
+                f"Pick up where chapter {number - 1} leaves off and do not retell earlier chapters."
+                if number > 1 else "Open the story and introduce its main characters."
+            )
+            chapter_prompt = self.config.STORY_PROMPTS["chapter"].format(
+                number=number,
+                chapters=chapters,
+                title=title,
+                prompt=prompt,
+                outline=outline_text,
+                word_count=self.config.CHAPTER_WORDS,
+                continuity=continuity,
+                genre=self.config.GENRES[settings["genre"]]["name"],
+                tone=self.config.TONES[settings["tone"]]["name"],
+                language=self.config.LANGUAGES[settings["language"]]["name"]
+            )
+            try:
+                for text in self._stream_completion(self._messages(chapter_prompt), self.config.CHAPTER_MAX_TOKENS):
+                    if cancelled.is_set():
+                        break
+                    q.put(text)
+            except Exception as e:
+                q.put(e)
+            q.put(done)
+        
+        def consume(q: "queue.Queue") -> Iterator[str]:
+            while True:
+                item = q.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        
+        executor = ThreadPoolExecutor(max_workers=lookahead + 1, thread_name_prefix="chapter")
+        
+        def submit(number: int):
+            if number <= chapters and number not in queues:
+                queues[number] = queue.Queue()
+                executor.submit(produce, number, queues[number])
+        
+        try:
+            for number in range(1, lookahead + 2):
+                submit(number)
+            for number in range(1, chapters + 1):
+                yield number, consume(queues[number])
+                submit(number + lookahead + 1)
+                del queues[number]
+        finally:
+            # Client disconnected or a chapter failed: stop producers that are still running
+            cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def save_story(self, story_data: Dict[str, Any], format: str = "both") -> Optional[str]:
         """Save story to file(s)"""
@@ -157,6 +389,7 @@ class StoryAgent:
             metadata_file = self.stories_dir / f"{story_id}_metadata.json"
             with open(metadata_file, 'w', encoding='utf-8') as f:
                 json.dump(story_data, f, indent=2, ensure_ascii=False)
+            self.index.upsert(story_data)
             
             return saved_paths[0] if saved_paths else None
             
@@ -164,31 +397,48 @@ class StoryAgent:
             print(f"Error saving story: {e}")
             return None
     
+    def rebuild_index(self) -> int:
+        """Re-index every *_metadata.json file in the stories directory"""
+        def load_all():
+            for metadata_file in self.stories_dir.glob("*_metadata.json"):
+                try:
+                    with open(metadata_file, 'r', encoding='utf-8') as f:
+                        yield json.load(f)
+                except Exception as e:
+                    print(f"Skipping unreadable metadata {metadata_file.name}: {e}")
+        
+        return self.index.upsert_many(load_all())
+    
     def get_story_list(self) -> List[Dict[str, Any]]:
         """Get list of all saved stories"""
-        stories = []
-        
         try:
-            for metadata_file in self.stories_dir.glob("*_metadata.json"):
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    story_data = json.load(f)
-                    stories.append(story_data)
-            
-            # Sort by creation date (newest first)
-            stories.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+            # Sorted by creation date (newest first)
+            stories, _ = self.index.list_page()
             return stories
-            
         except Exception as e:
             print(f"Error loading stories: {e}")
             return []
     
+    def get_story_page(self, page: int = 1, page_size: int = StoryConfig.DEFAULT_PAGE_SIZE,
+                       genre: Optional[str] = None) -> Dict[str, Any]:
+        """Get one page of saved stories (newest first) with the total count"""
+        page, page_size = self._clamp_page(page, page_size)
+        stories, total = self.index.list_page(offset=(page - 1) * page_size, limit=page_size, genre=genre)
+        return {"stories": stories, "total": total, "page": page, "page_size": page_size}
+    
     def get_story(self, story_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific story by ID"""
         try:
+            story = self.index.get(story_id)
+            if story:
+                return story
             metadata_file = self.stories_dir / f"{story_id}_metadata.json"
             if metadata_file.exists():
                 with open(metadata_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    story = json.load(f)
+                # Saved outside the agent; index it so later lookups hit the index
+                self.index.upsert(story)
+                return story
             return None
         except Exception as e:
             print(f"Error loading story {story_id}: {e}")
@@ -220,12 +470,7 @@ class StoryAgent:
     
     def get_favorites(self) -> List[Dict[str, Any]]:
         """Get list of favorite stories"""
-        favorite_stories = []
-        for story_id in self.favorites:
-            story = self.get_story(story_id)
-            if story:
-                favorite_stories.append(story)
-        return favorite_stories
+        return self.index.get_many(self.favorites)
     
     def delete_story(self, story_id: str) -> bool:
         """Delete a story and its files"""
@@ -235,6 +480,7 @@ class StoryAgent:
             for file_path in self.stories_dir.glob(f"{story_id}_*"):
                 file_path.unlink()
                 deleted_files.append(str(file_path))
+            self.index.delete(story_id)
             
             # Remove from favorites if present
             if story_id in self.favorites:
@@ -248,19 +494,28 @@ class StoryAgent:
             return False
     
     def search_stories(self, query: str) -> List[Dict[str, Any]]:
-        """Search stories by title, content, or prompt"""
-        all_stories = self.get_story_list()
-        query_lower = query.lower()
-        
-        matching_stories = []
-        for story in all_stories:
-            # Search in title, content, and prompt
-            if (query_lower in story.get('title', '').lower() or
-                query_lower in story.get('content', '').lower() or
-                query_lower in story.get('prompt', '').lower()):
-                matching_stories.append(story)
-        
-        return matching_stories
+        """Search stories by title, content, or prompt (best matches first)"""
+        results, _ = self.index.search(query)
+        return results
+    
+    def search_stories_page(self, query: str, page: int = 1,
+                            page_size: int = StoryConfig.DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """Ranked full-text search returning one page of results with the total count"""
+        page, page_size = self._clamp_page(page, page_size)
+        results, total = self.index.search(query, offset=(page - 1) * page_size, limit=page_size)
+        return {"results": results, "total": total, "page": page, "page_size": page_size}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get library statistics"""
+        stats = self.index.stats()
+        stats["total_favorites"] = len(self.get_favorites())
+        return stats
+    
+    def _clamp_page(self, page: int, page_size: int) -> tuple[int, int]:
+        """Keep pagination parameters within sane bounds"""
+        page = max(1, int(page or 1))
+        page_size = max(1, min(int(page_size or self.config.DEFAULT_PAGE_SIZE), self.config.MAX_PAGE_SIZE))
+        return page, page_size
     
     def get_genres(self) -> Dict[str, Dict[str, str]]:
         """Get available genres"""
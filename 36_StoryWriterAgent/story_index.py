@@ -0,0 +1,223 @@
+"""
+Persistent SQLite index of saved stories for fast listing and full-text search
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Columns copied out of the story metadata for filtering and sorting
+_META_COLUMNS = [
+    "title", "prompt", "genre", "tone", "length", "language",
+    "created_at", "word_count", "character_count",
+]
+
+# bm25 column weights for (title, prompt, content): title matches rank highest
+_RANK_WEIGHTS = (10.0, 4.0, 1.0)
+
+
+class StoryIndex:
+    """SQLite-backed story library index.
+
+    Story metadata lives in a regular table indexed by creation date and genre, and
+    title/prompt/content are mirrored into an FTS5 table for ranked search. If the
+    SQLite build lacks FTS5, search falls back to LIKE matching on the same table.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.fts_enabled = self._create_schema()
+
+    def _create_schema(self) -> bool:
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS stories (
+                    doc INTEGER PRIMARY KEY,
+                    id TEXT NOT NULL UNIQUE,
+                    title TEXT, prompt TEXT, genre TEXT, tone TEXT, length TEXT,
+                    language TEXT, created_at TEXT, word_count INTEGER,
+                    character_count INTEGER, data TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_stories_created ON stories(created_at DESC)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_stories_genre ON stories(genre, created_at DESC)")
+            try:
+                self._conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS stories_fts "
+                    "USING fts5(title, prompt, content, tokenize='unicode61')"
+                )
+                return True
+            except sqlite3.OperationalError:
+                return False
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def upsert(self, story: Dict[str, Any]) -> None:
+        """Insert or replace a story in the index"""
+        with self._lock, self._conn:
+            self._upsert(story)
+
+    def upsert_many(self, stories: Iterable[Dict[str, Any]]) -> int:
+        """Bulk insert stories in a single transaction"""
+        count = 0
+        with self._lock, self._conn:
+            for story in stories:
+                self._upsert(story)
+                count += 1
+        return count
+
+    def _upsert(self, story: Dict[str, Any]) -> None:
+        # FTS rows share the stories.doc rowid, so updates and deletes stay O(log n)
+        values = [story.get(column) for column in _META_COLUMNS]
+        data = json.dumps(story, ensure_ascii=False)
+        row = self._conn.execute("SELECT doc FROM stories WHERE id = ?", (story["id"],)).fetchone()
+        if row:
+            doc = row["doc"]
+            self._conn.execute(
+                f"UPDATE stories SET {', '.join(f'{c} = ?' for c in _META_COLUMNS)}, data = ? WHERE doc = ?",
+                [*values, data, doc],
+            )
+            if self.fts_enabled:
+                self._conn.execute("DELETE FROM stories_fts WHERE rowid = ?", (doc,))
+        else:
+            doc = self._conn.execute(
+                f"INSERT INTO stories (id, {', '.join(_META_COLUMNS)}, data) "
+                f"VALUES (?, {', '.join('?' for _ in _META_COLUMNS)}, ?)",
+                [story["id"], *values, data],
+            ).lastrowid
+        if self.fts_enabled:
+            self._conn.execute(
+                "INSERT INTO stories_fts (rowid, title, prompt, content) VALUES (?, ?, ?, ?)",
+                (doc, story.get("title", ""), story.get("prompt", ""), story.get("content", "")),
+            )
+
+    def delete(self, story_id: str) -> bool:
+        """Remove a story from the index"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT doc FROM stories WHERE id = ?", (story_id,)).fetchone()
+            if not row:
+                return False
+            self._conn.execute("DELETE FROM stories WHERE doc = ?", (row["doc"],))
+            if self.fts_enabled:
+                self._conn.execute("DELETE FROM stories_fts WHERE rowid = ?", (row["doc"],))
+            return True
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM stories").fetchone()[0]
+
+    def get(self, story_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM stories WHERE id = ?", (story_id,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def get_many(self, story_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch several stories in one query, preserving the order of story_ids"""
+        if not story_ids:
+            return []
+        placeholders = ", ".join("?" for _ in story_ids)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, data FROM stories WHERE id IN ({placeholders})", story_ids
+            ).fetchall()
+        by_id = {row["id"]: json.loads(row["data"]) for row in rows}
+        return [by_id[story_id] for story_id in story_ids if story_id in by_id]
+
+    def list_page(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        genre: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Return one page of stories (newest first) and the total count"""
+        where, params = ("WHERE genre = ?", [genre]) if genre else ("", [])
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM stories {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT data FROM stories {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                [*params, -1 if limit is None else limit, offset],
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows], total
+
+    def search(
+        self,
+        query: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Ranked full-text search over title, prompt and content"""
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
+            return [], 0
+        page_limit = -1 if limit is None else limit
+
+        if not self.fts_enabled:
+            return self._search_like(query, offset, page_limit)
+
+        # Prefix-match every term so partially typed words still hit
+        match = " AND ".join(f'"{term}"*' for term in terms)
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COUNT(*) FROM stories_fts WHERE stories_fts MATCH ?", (match,)
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"""
+                SELECT s.data FROM stories_fts JOIN stories s ON s.doc = stories_fts.rowid
+                WHERE stories_fts MATCH ?
+                ORDER BY bm25(stories_fts, {', '.join(str(w) for w in _RANK_WEIGHTS)}), s.created_at DESC
+                LIMIT ? OFFSET ?
+                """,
+                (match, page_limit, offset),
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows], total
+
+    def _search_like(self, query: str, offset: int, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        pattern = f"%{query.lower()}%"
+        where = "WHERE lower(title) LIKE ? OR lower(prompt) LIKE ? OR lower(data) LIKE ?"
+        params = [pattern, pattern, pattern]
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM stories {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT data FROM stories {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows], total
+
+    def stats(self) -> Dict[str, Any]:
+        """Aggregate counts computed in SQL rather than by loading every story"""
+        with self._lock:
+            total, words = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(word_count), 0) FROM stories"
+            ).fetchone()
+            distributions = {}
+            for column in ("genre", "tone", "language"):
+                rows = self._conn.execute(
+                    f"SELECT COALESCE({column}, 'unknown'), COUNT(*) FROM stories GROUP BY 1"
+                ).fetchall()
+                distributions[column] = {row[0]: row[1] for row in rows}
+        return {
+            "total_stories": total,
+            "total_words": words,
+            "genre_distribution": distributions["genre"],
+            "tone_distribution": distributions["tone"],
+            "language_distribution": distributions["language"],
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -3,7 +3,7 @@ Web application for StoryWriterAgent using FastAPI
 """
 
 from fastapi import FastAPI, HTTPException, Request, Form, File, UploadFile
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
@@ -30,6 +30,8 @@ class StoryListResponse(BaseModel):
     success: bool
     stories: List[Dict[str, Any]] = []
     total: int = 0
+    page: int = 1
+    page_size: int = 0
 
 def create_app(story_agent):
     """Create and configure FastAPI application"""
@@ -66,14 +68,15 @@ def create_app(story_agent):
     @app.get("/stories", response_class=HTMLResponse)
     async def stories_page(request: Request):
         """Serve the stories management page"""
-        stories = story_agent.get_story_list()
+        first_page = story_agent.get_story_page(page=1)
         favorites = story_agent.get_favorites()
         
         return templates.TemplateResponse(
             "stories.html",
             {
                 "request": request,
-                "stories": stories,
+                "stories": first_page["stories"],
+                "total_stories": first_page["total"],
                 "favorites": [f["id"] for f in favorites]
             }
         )
@@ -95,6 +98,45 @@ def create_app(story_agent):
         except Exception as e:
             return StoryResponse(success=False, error=str(e))
     
+    @app.get("/api/generate/stream")
+    def generate_story_stream(
+        prompt: str,
+        genre: str = "fantasy",
+        tone: str = "serious",
+        length: str = "medium",
+        language: str = "english",
+        chapters: int = 1
+    ):
+        """Stream a story to the browser over Server-Sent Events as it is generated"""
+        def event_stream():
+            try:
+                for event in story_agent.generate_story_stream(
+                    prompt=prompt,
+                    genre=genre,
+                    tone=tone,
+                    length=length,
+                    language=language,
+                    chapters=chapters
+                ):
+                    name = event.pop("event")
+                    yield f"event: {name}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+            except Exception as e:
+                yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+        
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    @app.get("/api/stream-metrics")
+    async def get_stream_metrics():
+        """Time-to-first-token and total latency for recent streamed generations"""
+        return JSONResponse({
+            "success": True,
+            "metrics": story_agent.get_stream_metrics()
+        })
+    
     @app.post("/api/save")
     async def save_story(
         story_id: str = Form(...),
@@ -126,14 +168,20 @@ def create_app(story_agent):
             })
     
     @app.get("/api/stories", response_model=StoryListResponse)
-    async def get_stories():
-        """Get list of all stories"""
+    async def get_stories(
+        page: int = 1,
+        page_size: int = StoryConfig.DEFAULT_PAGE_SIZE,
+        genre: Optional[str] = None
+    ):
+        """Get one page of stories (newest first)"""
         try:
-            stories = story_agent.get_story_list()
+            result = story_agent.get_story_page(page=page, page_size=page_size, genre=genre)
             return StoryListResponse(
                 success=True,
-                stories=stories,
-                total=len(stories)
+                stories=result["stories"],
+                total=result["total"],
+                page=result["page"],
+                page_size=result["page_size"]
             )
         except Exception as e:
             return StoryListResponse(
@@ -224,14 +272,13 @@ def create_app(story_agent):
             })
     
     @app.get("/api/search")
-    async def search_stories(q: str):
-        """Search stories by query"""
+    async def search_stories(q: str, page: int = 1, page_size: int = StoryConfig.DEFAULT_PAGE_SIZE):
+        """Ranked full-text search over stories"""
         try:
-            results = story_agent.search_stories(q)
+            result = story_agent.search_stories_page(q, page=page, page_size=page_size)
             return JSONResponse({
                 "success": True,
-                "results": results,
-                "total": len(results)
+                **result
             })
         except Exception as e:
             return JSONResponse({
@@ -267,44 +314,9 @@ def create_app(story_agent):
     async def get_stats():
         """Get statistics about stories"""
         try:
-            stories = story_agent.get_story_list()
-            favorites = story_agent.get_favorites()
-            
-            # Calculate stats
-            total_stories = len(stories)
-            total_favorites = len(favorites)
-            
-            # Genre distribution
-            genre_counts = {}
-            for story in stories:
-                genre = story.get('genre', 'unknown')
-                genre_counts[genre] = genre_counts.get(genre, 0) + 1
-            
-            # Tone distribution
-            tone_counts = {}
-            for story in stories:
-                tone = story.get('tone', 'unknown')
-                tone_counts[tone] = tone_counts.get(tone, 0) + 1
-            
-            # Language distribution
-            language_counts = {}
-            for story in stories:
-                language = story.get('language', 'unknown')
-                language_counts[language] = language_counts.get(language, 0) + 1
-            
-            # Total word count
-            total_words = sum(story.get('word_count', 0) for story in stories)
-            
             return JSONResponse({
                 "success": True,
-                "stats": {
-                    "total_stories": total_stories,
-                    "total_favorites": total_favorites,
-                    "total_words": total_words,
-                    "genre_distribution": genre_counts,
-                    "tone_distribution": tone_counts,
-                    "language_distribution": language_counts
-                }
+                "stats": story_agent.get_stats()
             })
             
         except Exception as e:
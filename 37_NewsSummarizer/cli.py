@@ -7,8 +7,9 @@ from typing import List, Tuple
 
 from config import settings
 from utils import ensure_directory, parse_date
-from news_fetcher import NewsFetcher
+from news_fetcher import NewsFetcher, ExtractionCache
 from summarizer import Summarizer, ArticleSummary
+from pipeline import NewsPipeline, PipelineReport
 
 from rich.console import Console
 from rich.table import Table
@@ -105,6 +106,26 @@ def render_results_table(summaries: List[ArticleSummary], query: str | None) ->
     console.print(table)
 
 
+def render_timing_report(report: PipelineReport) -> None:
+    table = Table(title="Timing breakdown", show_lines=False)
+    table.add_column("Stage", style="cyan")
+    table.add_column("Seconds", justify="right", style="magenta")
+    table.add_row("Search (SerpAPI)", f"{report.search_seconds:.2f}")
+    table.add_row("Extraction (sum)", f"{report.extract_seconds:.2f}")
+    table.add_row("Summarization (sum)", f"{report.summarize_seconds:.2f}")
+    table.add_row("Serial estimate", f"{report.serial_seconds:.2f}")
+    table.add_row("[bold]Wall clock[/bold]", f"[bold]{report.wall_seconds:.2f}[/bold]")
+    console.print(table)
+
+    if report.articles:
+        slowest = max(report.articles, key=lambda a: a.extract_seconds + a.summarize_seconds)
+        console.print(
+            f"[dim]Extraction cache hits: {report.cache_hits}/{len(report.articles)} • "
+            f"slowest article: {slowest.source} "
+            f"({slowest.extract_seconds:.2f}s extract + {slowest.summarize_seconds:.2f}s summarize)[/dim]"
+        )
+
+
 def open_file_cross_platform(path: str) -> None:
     try:
         if sys.platform.startswith("win"):
@@ -173,33 +194,35 @@ def main() -> None:
 
     console.print(Panel.fit(f"📰 NewsSummarizer for [bold]{date_str}[/bold]", border_style="blue"))
 
-    fetcher = NewsFetcher()
+    cache = ExtractionCache(os.path.join(settings.data_dir, "cache", "articles"), settings.cache_ttl_hours)
+    fetcher = NewsFetcher(
+        cache=cache,
+        per_domain_limit=settings.per_domain_limit,
+        max_workers=settings.max_workers,
+    )
     summarizer = Summarizer()
+    pipeline = NewsPipeline(fetcher, summarizer, max_workers=settings.max_workers)
 
     with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console) as progress:
         task_fetch = progress.add_task("Fetching articles via SerpAPI...", total=None)
-        items = fetcher.fetch_with_text(date=date_str, search=search, category=category)
-        progress.update(task_fetch, description=f"Fetched {len(items)} articles")
-
-        # Limit items according to top_n
-        items = items[:top_n]
-
-        summaries: List[ArticleSummary] = []
-        task_sum = progress.add_task("Summarizing articles with OpenAI...", total=len(items) if items else 1)
-        for item in items:
-            summaries.append(
-                summarizer.summarize(
-                    title=item["title"],
-                    url=item["url"],
-                    source=item["source"],
-                    category=item.get("category"),
-                    text=item.get("text", ""),
-                )
-            )
-            progress.advance(task_sum)
+        task_sum = progress.add_task("Extracting and summarizing articles...", total=1)
+
+        def on_fetched(count: int) -> None:
+            progress.update(task_fetch, description=f"Fetched {count} articles")
+            progress.update(task_sum, total=count or 1)
+
+        summaries, report = pipeline.run(
+            date=date_str,
+            search=search,
+            category=category,
+            top_n=top_n,
+            on_fetched=on_fetched,
+            on_summary=lambda _summary: progress.advance(task_sum),
+        )
 
     # Render results table (with section title and keyword)
     render_results_table(summaries, search)
+    render_timing_report(report)
 
     # Choose save format
     fmt, open_after = choose_save_format()
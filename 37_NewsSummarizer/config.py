@@ -11,5 +11,8 @@ class Settings:
     google_cse_id: str = os.getenv("GOOGLE_CSE_ID", "")
     google_api_key: str = os.getenv("GOOGLE_API_KEY", "")
     data_dir: str = os.getenv("DATA_DIR", "data")
+    max_workers: int = int(os.getenv("PIPELINE_MAX_WORKERS", "8"))
+    per_domain_limit: int = int(os.getenv("PER_DOMAIN_LIMIT", "2"))
+    cache_ttl_hours: float = float(os.getenv("EXTRACT_CACHE_TTL_HOURS", "24"))
 
 settings = Settings()
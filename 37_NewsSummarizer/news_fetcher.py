@@ -1,6 +1,13 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
+import hashlib
+import json
 import os
+import threading
+import time
 from urllib.parse import urlparse
 from newspaper import Article
 from serpapi import GoogleSearch
@@ -14,11 +21,74 @@ class NewsItem:
     category: Optional[str] = None
 
 
+class ExtractionCache:
+    """URL-keyed on-disk cache of extracted article text."""
+
+    def __init__(self, cache_dir: str, ttl_hours: float = 24.0) -> None:
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_hours * 3600
+        self.hits = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, url: str) -> Optional[str]:
+        path = self._path(url)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                text = json.load(f).get("text")
+        except (OSError, ValueError):
+            return None
+        if text is not None:
+            with self._lock:
+                self.hits += 1
+        return text
+
+    def set(self, url: str, text: str) -> None:
+        path = self._path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "text": text, "fetched_at": time.time()}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class DomainLimiter:
+    """Caps the number of simultaneous downloads per domain."""
+
+    def __init__(self, per_domain: int = 2) -> None:
+        self.per_domain = max(1, per_domain)
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = defaultdict(
+            lambda: threading.BoundedSemaphore(self.per_domain)
+        )
+
+    @contextmanager
+    def acquire(self, domain: str) -> Iterator[None]:
+        with self._lock:
+            semaphore = self._semaphores[domain]
+        with semaphore:
+            yield
+
+
 class NewsFetcher:
-    def __init__(self, serpapi_key: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        serpapi_key: Optional[str] = None,
+        cache: Optional[ExtractionCache] = None,
+        per_domain_limit: int = 2,
+        max_workers: int = 8,
+    ) -> None:
         self.serpapi_key = serpapi_key or os.getenv("SERPAPI_API_KEY", "")
         if not self.serpapi_key:
             raise ValueError("SERPAPI_API_KEY is required in environment or config.")
+        self.cache = cache
+        self.limiter = DomainLimiter(per_domain_limit)
+        self.max_workers = max(1, max_workers)
 
     def _extract_source(self, url: str) -> str:
         netloc = urlparse(url).netloc
@@ -33,6 +103,19 @@ class NewsFetcher:
         except Exception:
             return ""
 
+    def extract_text(self, url: str) -> str:
+        """Extract article text, using the cache and the per-domain download limit."""
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return cached
+        with self.limiter.acquire(self._extract_source(url)):
+            text = self._extract_text(url)
+        # Only cache successful extractions so transient failures are retried
+        if text and self.cache is not None:
+            self.cache.set(url, text)
+        return text
+
     def fetch(self, *, date: str, search: Optional[str], category: Optional[str]) -> List[NewsItem]:
         query = search or "Top news"
 
@@ -81,14 +164,15 @@ class NewsFetcher:
 
     def fetch_with_text(self, *, date: str, search: Optional[str], category: Optional[str]) -> List[dict]:
         items = self.fetch(date=date, search=search, category=category)
-        enriched: List[dict] = []
-        for item in items:
-            text = self._extract_text(item.url)
-            enriched.append({
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            texts = list(pool.map(self.extract_text, [item.url for item in items]))
+        return [
+            {
                 "title": item.title,
                 "url": item.url,
                 "source": item.source,
                 "category": item.category,
                 "text": text,
-            })
-        return enriched
+            }
+            for item, text in zip(items, texts)
+        ]
@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+import threading
+import time
+
+from news_fetcher import NewsFetcher, NewsItem
+from summarizer import ArticleSummary, Summarizer
+
+
+@dataclass
+class ArticleTiming:
+    title: str
+    source: str
+    extract_seconds: float = 0.0
+    summarize_seconds: float = 0.0
+
+
+@dataclass
+class PipelineReport:
+    search_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    cache_hits: int = 0
+    articles: List[ArticleTiming] = field(default_factory=list)
+
+    @property
+    def extract_seconds(self) -> float:
+        return sum(a.extract_seconds for a in self.articles)
+
+    @property
+    def summarize_seconds(self) -> float:
+        return sum(a.summarize_seconds for a in self.articles)
+
+    @property
+    def serial_seconds(self) -> float:
+        """Estimated wall time had every stage run one after another."""
+        return self.search_seconds + self.extract_seconds + self.summarize_seconds
+
+
+class NewsPipeline:
+    """Fetches, extracts and summarizes articles with extraction and summarization overlapping.
+
+    Each article is processed by a worker that extracts its text and then summarizes it,
+    so one article can be summarized while others are still downloading. Downloads are
+    throttled per domain by the fetcher; LLM calls are capped by ``max_summaries``.
+    """
+
+    def __init__(
+        self,
+        fetcher: NewsFetcher,
+        summarizer: Summarizer,
+        max_workers: int = 8,
+        max_summaries: int = 4,
+    ) -> None:
+        self.fetcher = fetcher
+        self.summarizer = summarizer
+        self.max_workers = max(1, max_workers)
+        self._summary_slots = threading.BoundedSemaphore(max(1, max_summaries))
+
+    def _process(self, item: NewsItem) -> Tuple[ArticleSummary, ArticleTiming]:
+        timing = ArticleTiming(title=item.title, source=item.source)
+
+        started = time.perf_counter()
+        text = self.fetcher.extract_text(item.url)
+        timing.extract_seconds = time.perf_counter() - started
+
+        with self._summary_slots:
+            started = time.perf_counter()
+            summary = self.summarizer.summarize(
+                title=item.title,
+                url=item.url,
+                source=item.source,
+                category=item.category,
+                text=text,
+            )
+            timing.summarize_seconds = time.perf_counter() - started
+        return summary, timing
+
+    def run(
+        self,
+        *,
+        date: str,
+        search: Optional[str],
+        category: Optional[str],
+        top_n: int = 10,
+        on_fetched: Optional[Callable[[int], None]] = None,
+        on_summary: Optional[Callable[[ArticleSummary], None]] = None,
+    ) -> Tuple[List[ArticleSummary], PipelineReport]:
+        report = PipelineReport()
+        cache = self.fetcher.cache
+        hits_before = cache.hits if cache is not None else 0
+        wall_started = time.perf_counter()
+
+        started = time.perf_counter()
+        items = self.fetcher.fetch(date=date, search=search, category=category)[:top_n]
+        report.search_seconds = time.perf_counter() - started
+        if on_fetched:
+            on_fetched(len(items))
+
+        results: List[Optional[Tuple[ArticleSummary, ArticleTiming]]] = [None] * len(items)
+        if items:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+                futures = {pool.submit(self._process, item): index for index, item in enumerate(items)}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    if on_summary:
+                        on_summary(results[futures[future]][0])
+
+        report.wall_seconds = time.perf_counter() - wall_started
+        report.articles = [timing for _, timing in results]
+        if cache is not None:
+            report.cache_hits = cache.hits - hits_before
+        # Keep the search ranking order regardless of completion order
+        return [summary for summary, _ in results], report
@@ -38,6 +38,16 @@ class MouseControlConfig:
     VOICE_TIMEOUT = float(os.getenv("VOICE_TIMEOUT", "2.0"))  # Reduced for better responsiveness
     VOICE_PHRASE_TIMEOUT = float(os.getenv("VOICE_PHRASE_TIMEOUT", "0.3"))
     VOICE_ENERGY_THRESHOLD = int(os.getenv("VOICE_ENERGY_THRESHOLD", "300"))
+    VOICE_PHRASE_LIMIT = float(os.getenv("VOICE_PHRASE_LIMIT", "2.0"))  # Longest phrase sent to online recognition
+    
+    # Offline command recognition (Vosk, limited to the command vocabulary)
+    OFFLINE_RECOGNITION = os.getenv("OFFLINE_RECOGNITION", "true").lower() == "true"
+    OFFLINE_MODEL_DIR = DATA_DIR / "models"  # One Vosk model per language: data/models/en, data/models/hi, ...
+    OFFLINE_SAMPLE_RATE = int(os.getenv("OFFLINE_SAMPLE_RATE", "16000"))
+    OFFLINE_CHUNK_MS = int(os.getenv("OFFLINE_CHUNK_MS", "50"))  # Audio per recognizer update
+    
+    # Speech-to-cursor latency tracking
+    LATENCY_HISTORY = int(os.getenv("LATENCY_HISTORY", "200"))
     
     # Text-to-speech settings
     TTS_ENABLED = os.getenv("TTS_ENABLED", "true").lower() == "true"
@@ -29,6 +29,7 @@ from config import CONFIG, get_api_key, setup_instructions
 from voice_handler import VoiceHandler
 from mouse_controller import MouseController
 from utils.command_parser import CommandParser
+from utils.latency import LatencyTrace, LatencyTracker
 
 class JarvisMouseControl:
     """Main JarvisMouseControl agent class"""
@@ -44,6 +45,7 @@ class JarvisMouseControl:
         self.command_parser = CommandParser(language)
         self.mouse_controller = MouseController()
         self.voice_handler = VoiceHandler(language)
+        self.latency = LatencyTracker(CONFIG.LATENCY_HISTORY)
         
         # Override config settings
         CONFIG.VOICE_ENABLED = voice_enabled
@@ -246,6 +248,10 @@ class JarvisMouseControl:
                             print("❌ Invalid language. Use: en, ur, hi")
                             continue
                     
+                    if user_input.lower() == 'latency':
+                        self._show_latency()
+                        continue
+                    
                     if user_input.lower() == 'voice':
                         # Try to enable voice mode
                         if self._enable_voice_mode():
@@ -292,10 +298,10 @@ class JarvisMouseControl:
             return
         
         print(f"\n🎤 Voice command: {text}")
-        self._process_command(text)
+        self._process_command(text, self.voice_handler.last_trace)
     
-    def _process_command(self, text: str):
-        """Process a command (voice or text)"""
+    def _process_command(self, text: str, trace: Optional[LatencyTrace] = None):
+        """Process a command (voice or text); voice commands pass their latency trace"""
         # Check for stop command first
         if self.command_parser.is_stop_command(text):
             print(self.command_parser.get_feedback_message("goodbye"))
@@ -306,6 +312,8 @@ class JarvisMouseControl:
         
         # Parse the command
         action_data = self.command_parser.parse_command(text)
+        if trace:
+            trace.mark("parsed")
         
         if not action_data:
             error_msg = self.command_parser.get_feedback_message("error_recognizing")
@@ -320,6 +328,12 @@ class JarvisMouseControl:
         
         # Execute the action
         success = self.mouse_controller.execute_action(action_data)
+        if trace:
+            trace.mark("executed")
+            self.latency.record(trace)
+            durations = trace.durations()
+            if "total" in durations:
+                print(f"⏱️  Speech to cursor: {durations['total'] * 1000:.0f}ms")
         
         if success:
             action_msg = self.command_parser.get_feedback_message("action_executed", action=action_data["action"])
@@ -343,6 +357,7 @@ class JarvisMouseControl:
         print("  help          - Show this help")
         print("  lang <code>   - Change language (en/ur/hi)")
         print("  voice         - Try to enable voice mode")
+        print("  latency       - Show speech-to-cursor timings")
         print("  quit/exit     - Exit the program")
         print("\n🌍 Languages:")
         print("  en - English")
@@ -350,6 +365,11 @@ class JarvisMouseControl:
         print("  hi - Hindi (हिंदी)")
         print("=" * 50)
     
+    def _show_latency(self):
+        """Show speech-to-cursor latency per pipeline stage"""
+        print("\n⏱️  Voice command latency (recent commands)")
+        print(self.latency.format_summary())
+    
     def _change_language(self, language: str) -> bool:
         """Change the agent language"""
         if language not in CONFIG.SUPPORTED_LANGUAGES:
@@ -375,6 +395,9 @@ class JarvisMouseControl:
             if self.voice_enabled:
                 self.voice_handler.stop_listening()
             
+            if len(self.latency):
+                self._show_latency()
+            
             print("\n👋 JarvisMouseControl stopped. Goodbye!")
 
 def main():
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Command recognition tests for JarvisMouseControl
+Checks the precompiled command matcher and replays recorded audio through the
+streaming pipeline; needs no microphone, speakers or speech model
+"""
+
+import math
+import struct
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import CONFIG
+from utils.audio_replay import replay_commands
+from utils.command_parser import CommandParser
+from utils.latency import LatencyTracker
+from utils.offline_recognizer import command_grammar
+
+SAMPLE_RATE = 16000
+
+
+def reference_parse(translations, language, text):
+    """Brute-force check of every pattern, to compare the matcher against"""
+    text_words = set(text.split())
+    action, best = None, 0
+    for name, languages in translations["commands"].items():
+        for pattern in languages.get(language, []):
+            words = set(pattern.split())
+            if words.issubset(text_words) and len(words) > best:
+                action, best = name, len(words)
+    if action is None:
+        return None
+    distance = "medium"
+    for modifier, languages in translations["modifiers"].items():
+        if any(p in text for p in languages.get(language, [])):
+            distance = modifier
+            break
+    return action, distance
+
+
+def test_matcher():
+    """The matcher must pick the most specific matching pattern and the first modifier"""
+    print("🧪 Testing command matcher...")
+    parser = CommandParser("en")
+    translations = parser.translations
+    for language in CONFIG.SUPPORTED_LANGUAGES:
+        parser.set_language(language)
+        patterns = [p for langs in translations["commands"].values() for p in langs.get(language, [])]
+        modifiers = [m for langs in translations["modifiers"].values() for m in langs.get(language, [])]
+        texts = patterns + [f"{p} {m}" for p in patterns for m in modifiers[:3]]
+        texts += [f"{a} {b}" for a in patterns[::4] for b in patterns[::5]] + ["hello there", "please move"]
+        for text in texts:
+            result = parser._parse_local_patterns(text)
+            got = (result["action"], result["distance"]) if result else None
+            expected = reference_parse(translations, language, text)
+            assert got == expected, f"{language}: {text!r} -> {got}, expected {expected}"
+        stop = translations["commands"]["stop"][language][0]
+        assert parser.is_stop_command(stop) and not parser.is_stop_command(patterns[0]), \
+            f"{language}: stop command detection is wrong"
+    for text, action in (("double click", "double_click"), ("right click", "right_click"), ("move left", "move_left")):
+        parser.set_language("en")
+        assert parser.parse_command(text)["action"] == action, f"{text!r} should be {action}"
+    print("✅ Matcher agrees with checking every pattern")
+
+
+def test_command_grammar():
+    """The offline grammar covers every command and rejects other speech"""
+    print("🧪 Testing offline command grammar...")
+    parser = CommandParser("en")
+    phrases = command_grammar(parser.translations, "en")
+    expected = ["move left", "double click", "move left little", "far right", "[unk]"]
+    missing = [p for p in expected if p not in phrases]
+    assert not missing, f"Grammar is missing {missing}"
+    assert not any("-" in p for p in phrases) and len(phrases) == len(set(phrases)), "Grammar has bad or duplicate phrases"
+    print(f"✅ Grammar has {len(phrases)} phrases")
+
+
+class ScriptedRecognizer:
+    """Stands in for Vosk: each burst of sound in the audio is 'recognised' as the next scripted phrase"""
+
+    def __init__(self, phrases, sample_rate=SAMPLE_RATE, end_silence=0.3):
+        self.phrases = list(phrases)
+        self.sample_rate = sample_rate
+        self.end_silence = end_silence
+        self.fed = 0.0
+        self.speech_end = None
+
+    def accept(self, chunk):
+        samples = struct.unpack(f"<{len(chunk) // 2}h", chunk[:len(chunk) // 2 * 2])
+        self.fed += len(samples) / self.sample_rate
+        if samples and max(abs(s) for s in samples) > 1000:
+            self.speech_end = self.fed
+        elif self.speech_end is not None and self.fed - self.speech_end >= self.end_silence:
+            return self.flush()
+        return None
+
+    def flush(self):
+        if self.speech_end is None or not self.phrases:
+            return None
+        trailing, self.speech_end = self.fed - self.speech_end, None
+        return {"text": self.phrases.pop(0), "trailing_seconds": trailing}
+
+
+def write_test_recording(path, bursts):
+    """Tone bursts separated by silence, as 16-bit mono audio"""
+    frames = bytearray()
+    for _ in range(bursts):
+        frames += b"\x00\x00" * int(SAMPLE_RATE * 0.4)
+        frames += b"".join(struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * i / SAMPLE_RATE)))
+                           for i in range(int(SAMPLE_RATE * 0.5)))
+    frames += b"\x00\x00" * int(SAMPLE_RATE * 0.6)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(bytes(frames))
+
+
+def test_audio_replay():
+    """Replaying a recording yields each command with per-stage timings"""
+    print("🧪 Testing audio replay...")
+    phrases = ["move left little", "double click", "hello"]
+    executed = []
+    tracker = LatencyTracker()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "commands.wav"
+        write_test_recording(path, len(phrases))
+        commands = replay_commands(str(path), ScriptedRecognizer(phrases), CommandParser("en"),
+                                   execute=executed.append, tracker=tracker)
+
+    actions = [(c["action"], c["distance"]) for c in commands]
+    assert actions == [("move_left", "small"), ("double_click", "medium"), (None, None)], f"Wrong commands: {actions}"
+    assert [a["action"] for a in executed] == ["move_left", "double_click"], f"Wrong actions executed: {executed}"
+    endpoint = commands[0]["durations_ms"].get("endpoint", 0)
+    assert 250 <= endpoint <= 400, \
+        f"Endpoint delay should be about the 300ms of trailing silence, got {endpoint:.0f}ms"
+    summary = tracker.summary()
+    assert summary.get("total", {}).get("count") == 3 and "parse" in summary, f"Latency summary incomplete: {summary}"
+    print(tracker.format_summary())
+    print("✅ Audio replay works")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("🧪 JarvisMouseControl - Command Recognition Tests")
+    print("=" * 60)
+
+    tests = [test_matcher, test_command_grammar, test_audio_replay]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {e}")
+
+    print(f"\n📊 {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
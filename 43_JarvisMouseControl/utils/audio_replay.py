@@ -0,0 +1,121 @@
+"""
+Replay recorded audio through the voice command pipeline
+Feeds a WAV file to the streaming recognizer chunk by chunk, exactly as the
+microphone loop does, then parses and (optionally) executes each command while
+timing every stage. Useful for repeatable latency measurements and for testing
+recognition without a microphone.
+
+Usage (from the project folder):
+    python -m utils.audio_replay recording.wav [--language en] [--realtime] [--execute]
+"""
+
+import argparse
+import sys
+import time
+import wave
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config import CONFIG
+from utils.latency import LatencyTrace, LatencyTracker
+from utils.offline_recognizer import CommandStream
+
+
+def read_wav(path: str) -> Tuple[int, bytes]:
+    """Sample rate and PCM data of a 16-bit mono WAV file"""
+    with wave.open(str(path), 'rb') as wav:
+        if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+            raise ValueError(f"{path}: expected 16-bit mono audio, got {wav.getsampwidth() * 8}-bit "
+                             f"with {wav.getnchannels()} channel(s)")
+        return wav.getframerate(), wav.readframes(wav.getnframes())
+
+
+def iter_chunks(pcm: bytes, sample_rate: int, chunk_ms: int) -> Iterator[bytes]:
+    size = max(2, int(sample_rate * chunk_ms / 1000) * 2)
+    for start in range(0, len(pcm), size):
+        yield pcm[start:start + size]
+
+
+def replay(path: str, recognizer, on_command: Callable[[str, LatencyTrace], None],
+           chunk_ms: int = CONFIG.OFFLINE_CHUNK_MS, realtime: bool = False):
+    """
+    Streams a WAV file into the recognizer. With realtime=True chunks arrive at
+    the pace a microphone would deliver them; otherwise as fast as they decode.
+    """
+    sample_rate, pcm = read_wav(path)
+    if getattr(recognizer, "sample_rate", sample_rate) != sample_rate:
+        raise ValueError(f"{path}: recorded at {sample_rate} Hz, recognizer expects {recognizer.sample_rate} Hz")
+    stream = CommandStream(recognizer, on_command)
+    chunk_seconds = chunk_ms / 1000
+    start = time.perf_counter()
+    for i, chunk in enumerate(iter_chunks(pcm, sample_rate, chunk_ms)):
+        captured_at = None
+        if realtime:
+            captured_at = start + (i + 1) * chunk_seconds
+            delay = captured_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        stream.feed(chunk, captured_at)
+    stream.flush()
+
+
+def replay_commands(path: str, recognizer, parser, execute: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                    tracker: Optional[LatencyTracker] = None, **options) -> List[Dict[str, Any]]:
+    """
+    Replays a recording through recognition, parsing and execution. `execute`
+    receives each parsed action (default: nothing is executed). Returns one
+    entry per recognised phrase with its action and stage timings.
+    """
+    tracker = tracker if tracker is not None else LatencyTracker()
+    commands = []
+
+    def on_command(text: str, trace: LatencyTrace):
+        action_data = parser.parse_command(text)
+        trace.mark("parsed")
+        if action_data and execute:
+            execute(action_data)
+        trace.mark("executed")
+        tracker.record(trace)
+        commands.append({
+            "text": text,
+            "action": action_data["action"] if action_data else None,
+            "distance": action_data["distance"] if action_data else None,
+            "durations_ms": {stage: seconds * 1000 for stage, seconds in trace.durations().items()},
+        })
+
+    replay(path, recognizer, on_command, **options)
+    return commands
+
+
+def main():
+    from utils.command_parser import CommandParser
+    from utils.offline_recognizer import create_offline_recognizer
+
+    parser = argparse.ArgumentParser(description="Replay a recording through JarvisMouseControl voice commands")
+    parser.add_argument("wav", help="16-bit mono WAV file")
+    parser.add_argument("--language", "-l", choices=CONFIG.SUPPORTED_LANGUAGES, default=CONFIG.DEFAULT_LANGUAGE)
+    parser.add_argument("--realtime", action="store_true", help="Feed audio at microphone pace")
+    parser.add_argument("--execute", action="store_true", help="Actually perform the mouse actions")
+    args = parser.parse_args()
+
+    sample_rate, _ = read_wav(args.wav)
+    recognizer = create_offline_recognizer(args.language, sample_rate)
+    if recognizer is None:
+        print("❌ Offline recognition is not available (install vosk and add a model to data/models)")
+        sys.exit(1)
+
+    execute = None
+    if args.execute:
+        from mouse_controller import MouseController
+        execute = MouseController().execute_action
+
+    tracker = LatencyTracker()
+    command_parser = CommandParser(args.language)
+    for command in replay_commands(args.wav, recognizer, command_parser, execute, tracker, realtime=args.realtime):
+        total = command["durations_ms"].get("total", 0.0)
+        print(f"🎤 {command['text']!r:30} -> {command['action'] or 'not recognized':14} {total:7.1f}ms")
+    print()
+    print(tracker.format_summary())
+
+
+if __name__ == "__main__":
+    main()
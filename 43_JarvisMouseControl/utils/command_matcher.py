@@ -0,0 +1,77 @@
+"""
+Precompiled command lookup for JarvisMouseControl
+Builds a word index over the command patterns once per language, so matching an
+utterance only looks at the patterns that share a word with it
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+
+class CommandMatcher:
+    """
+    Matches text against the command patterns of one language.
+
+    A pattern matches when all of its words appear in the text (in any order).
+    Instead of testing every pattern, each word of the text looks up the
+    patterns containing it and a pattern matches once all of its words have
+    been seen. The most specific match wins (most words, then translations
+    order), so "double click" is no longer taken for "click" and "right click"
+    for "right".
+    """
+
+    def __init__(self, translations: Dict[str, Any], language: str):
+        self.language = language
+        self._patterns: List[Tuple[str, str]] = []   # (action, pattern) in priority order
+        self._sizes: List[int] = []
+        self._index: Dict[str, List[int]] = {}
+
+        for action, languages in translations.get("commands", {}).items():
+            for pattern in languages.get(language, []):
+                words = set(pattern.lower().split())
+                if not words:
+                    continue
+                position = len(self._patterns)
+                self._patterns.append((action, pattern))
+                self._sizes.append(len(words))
+                for word in words:
+                    self._index.setdefault(word, []).append(position)
+
+        # Modifiers match as substrings; one alternation per modifier, checked in order
+        self._modifiers: List[Tuple[str, Pattern]] = []
+        for modifier, languages in translations.get("modifiers", {}).items():
+            patterns = [p.lower() for p in languages.get(language, []) if p]
+            if patterns:
+                self._modifiers.append((modifier, re.compile("|".join(map(re.escape, patterns)))))
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def _matching(self, text: str) -> List[int]:
+        """Positions of every pattern whose words all occur in the text, best first"""
+        hits: Dict[int, int] = {}
+        for word in set(text.lower().split()):
+            for position in self._index.get(word, ()):
+                hits[position] = hits.get(position, 0) + 1
+        matching = [position for position, count in hits.items() if count == self._sizes[position]]
+        return sorted(matching, key=lambda position: (-self._sizes[position], position))
+
+    def match(self, text: str) -> Optional[str]:
+        """The action of the best matching pattern, or None"""
+        matching = self._matching(text)
+        return self._patterns[matching[0]][0] if matching else None
+
+    def matches_action(self, text: str, action: str) -> bool:
+        """Whether any pattern of the given action matches the text"""
+        return any(self._patterns[position][0] == action for position in self._matching(text))
+
+    def modifier(self, text: str, default: str = "medium") -> str:
+        text = text.lower()
+        for modifier, regex in self._modifiers:
+            if regex.search(text):
+                return modifier
+        return default
+
+    def phrases(self) -> List[str]:
+        """All command patterns, in priority order"""
+        return [pattern for _, pattern in self._patterns]
@@ -9,6 +9,7 @@ from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
 import openai
 from config import CONFIG, get_api_key
+from utils.command_matcher import CommandMatcher
 
 class CommandParser:
     """Parses voice and text commands into mouse actions"""
@@ -17,6 +18,7 @@ class CommandParser:
         """Initialize command parser with specified language"""
         self.language = language
         self.translations = self._load_translations()
+        self._matchers: Dict[str, CommandMatcher] = {}
         self.api_key = get_api_key()
         
         # Initialize OpenAI client if API key is available
@@ -35,6 +37,13 @@ class CommandParser:
             print(f"⚠️  Error loading translations: {e}")
             return {}
     
+    @property
+    def matcher(self) -> CommandMatcher:
+        """Command matcher for the current language, built on first use"""
+        if self.language not in self._matchers:
+            self._matchers[self.language] = CommandMatcher(self.translations, self.language)
+        return self._matchers[self.language]
+    
     def parse_command(self, text: str) -> Optional[Dict[str, Any]]:
         """
         Parse a command text into mouse action
@@ -65,27 +74,11 @@ class CommandParser:
     
     def _parse_local_patterns(self, text: str) -> Optional[Dict[str, Any]]:
         """Parse command using local pattern matching"""
-        commands = self.translations.get("commands", {})
-        
-        # Check each command type
-        for action, languages in commands.items():
-            if self.language in languages:
-                patterns = languages[self.language]
-                for pattern in patterns:
-                    if self._text_matches_pattern(text, pattern):
-                        return self._create_action_dict(action, text)
-        
+        action = self.matcher.match(text)
+        if action:
+            return self._create_action_dict(action, text)
         return None
     
-    def _text_matches_pattern(self, text: str, pattern: str) -> bool:
-        """Check if text matches a command pattern"""
-        # Simple word-based matching
-        text_words = set(text.split())
-        pattern_words = set(pattern.split())
-        
-        # Check if all pattern words are in text
-        return pattern_words.issubset(text_words)
-    
     def _create_action_dict(self, action: str, original_text: str) -> Dict[str, Any]:
         """Create action dictionary from parsed command"""
         # Extract modifiers (small, medium, large)
@@ -101,16 +94,7 @@ class CommandParser:
     
     def _extract_distance_modifier(self, text: str) -> str:
         """Extract distance modifier from text"""
-        modifiers = self.translations.get("modifiers", {})
-        
-        for modifier, languages in modifiers.items():
-            if self.language in languages:
-                patterns = languages[self.language]
-                for pattern in patterns:
-                    if pattern in text:
-                        return modifier
-        
-        return "medium"  # Default distance
+        return self.matcher.modifier(text)  # "medium" when no modifier is given
     
     def _parse_with_openai(self, text: str) -> Optional[Dict[str, Any]]:
         """Parse command using OpenAI for better understanding"""
@@ -230,10 +214,4 @@ class CommandParser:
     
     def is_stop_command(self, text: str) -> bool:
         """Check if text is a stop command"""
-        stop_commands = self.translations.get("commands", {}).get("stop", {})
-        if self.language in stop_commands:
-            patterns = stop_commands[self.language]
-            for pattern in patterns:
-                if self._text_matches_pattern(text.lower(), pattern):
-                    return True
-        return False
+        return self.matcher.matches_action(text, "stop")
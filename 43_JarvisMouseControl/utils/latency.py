@@ -0,0 +1,88 @@
+"""
+Speech-to-cursor latency tracking for JarvisMouseControl
+Each voice command carries a trace of timestamps from the end of speech to the
+finished mouse action; the tracker keeps recent traces and summarises each stage
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+# Timestamps in pipeline order
+MARKS = ("speech_end", "captured", "recognized", "parsed", "executed")
+
+# Stage name -> (from mark, to mark)
+STAGES = {
+    "endpoint": ("speech_end", "captured"),     # silence needed to decide the phrase is over
+    "recognize": ("captured", "recognized"),
+    "parse": ("recognized", "parsed"),
+    "execute": ("parsed", "executed"),          # includes the cursor movement itself
+}
+
+
+class LatencyTrace:
+    """Timestamps (time.perf_counter seconds) of one command passing through the pipeline"""
+
+    def __init__(self, **marks: float):
+        self.marks: Dict[str, float] = dict(marks)
+        self.text: Optional[str] = None
+
+    def mark(self, name: str, at: Optional[float] = None) -> "LatencyTrace":
+        self.marks[name] = time.perf_counter() if at is None else at
+        return self
+
+    def durations(self) -> Dict[str, float]:
+        """Seconds spent in each stage that has both marks, plus "total" from the first mark to the last"""
+        result = {stage: self.marks[end] - self.marks[start]
+                  for stage, (start, end) in STAGES.items() if start in self.marks and end in self.marks}
+        present = [self.marks[name] for name in MARKS if name in self.marks]
+        if len(present) > 1:
+            result["total"] = present[-1] - present[0]
+        return result
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class LatencyTracker:
+    """Keeps the most recent traces and reports per-stage statistics in milliseconds"""
+
+    def __init__(self, max_traces: int = 200):
+        self._traces: deque = deque(maxlen=max_traces)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._traces)
+
+    def record(self, trace: LatencyTrace):
+        with self._lock:
+            self._traces.append(trace.durations())
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            traces = list(self._traces)
+        summary = {}
+        for stage in (*STAGES, "total"):
+            values = [t[stage] * 1000 for t in traces if stage in t]
+            if values:
+                summary[stage] = {
+                    "count": len(values),
+                    "mean_ms": sum(values) / len(values),
+                    "p50_ms": _percentile(values, 0.5),
+                    "p95_ms": _percentile(values, 0.95),
+                    "max_ms": max(values),
+                }
+        return summary
+
+    def format_summary(self) -> str:
+        summary = self.summary()
+        if not summary:
+            return "No voice commands timed yet"
+        lines = [f"{'stage':<10} {'count':>5} {'mean':>9} {'p50':>9} {'p95':>9} {'max':>9}"]
+        for stage, stats in summary.items():
+            lines.append(f"{stage:<10} {stats['count']:>5} {stats['mean_ms']:>7.1f}ms {stats['p50_ms']:>7.1f}ms "
+                         f"{stats['p95_ms']:>7.1f}ms {stats['max_ms']:>7.1f}ms")
+        return "\n".join(lines)
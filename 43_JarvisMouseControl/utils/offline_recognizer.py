@@ -0,0 +1,139 @@
+"""
+Offline command recognition for JarvisMouseControl
+Streams microphone audio into a Vosk recognizer whose grammar only contains the
+command phrases from translations.json, so a command is decoded locally while it
+is being spoken instead of being uploaded once the phrase is over
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from config import CONFIG
+from utils.latency import LatencyTrace
+
+try:
+    import vosk
+except ImportError:  # optional: voice input falls back to Google recognition
+    vosk = None
+
+
+def load_translations() -> Dict[str, Any]:
+    try:
+        with open(CONFIG.TRANSLATIONS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️  Could not load translations for offline recognition: {e}")
+        return {}
+
+
+def command_grammar(translations: Dict[str, Any], language: str) -> List[str]:
+    """
+    Phrases the recognizer may output: every command pattern, movement commands
+    with a distance modifier before or after them ("move left little", "far right"),
+    and "[unk]" so out-of-vocabulary speech is rejected instead of forced onto a command
+    """
+    modifiers = [m.lower() for patterns in translations.get("modifiers", {}).values()
+                 for m in patterns.get(language, [])]
+    phrases = []
+    for action, languages in translations.get("commands", {}).items():
+        for pattern in languages.get(language, []):
+            phrase = " ".join(pattern.lower().replace("-", " ").split())
+            phrases.append(phrase)
+            if action.startswith("move_"):
+                for modifier in modifiers:
+                    phrases.extend((f"{phrase} {modifier}", f"{modifier} {phrase}"))
+    return list(dict.fromkeys(phrases)) + ["[unk]"]
+
+
+def model_path_for(language: str) -> Path:
+    """VOSK_MODEL_<LANG> if set, otherwise data/models/<lang>"""
+    return Path(os.getenv(f"VOSK_MODEL_{language.upper()}") or CONFIG.OFFLINE_MODEL_DIR / language)
+
+
+class VoskCommandRecognizer:
+    """
+    Vosk recognizer restricted to a phrase list. `accept` takes 16-bit mono PCM
+    in chunks of any size and returns a result when Vosk detects the end of an
+    utterance: {"text": ..., "trailing_seconds": audio fed after the last word}.
+    """
+
+    def __init__(self, model_path: Path, phrases: List[str], sample_rate: int = 16000):
+        if vosk is None:
+            raise RuntimeError("vosk is not installed (pip install vosk)")
+        vosk.SetLogLevel(-1)
+        self.sample_rate = sample_rate
+        self.model = vosk.Model(str(model_path))
+        self._recognizer = vosk.KaldiRecognizer(self.model, sample_rate, json.dumps(phrases, ensure_ascii=False))
+        self._recognizer.SetWords(True)
+        self._bytes_per_second = sample_rate * 2
+        self._fed_seconds = 0.0
+
+    def accept(self, chunk: bytes) -> Optional[Dict[str, Any]]:
+        self._fed_seconds += len(chunk) / self._bytes_per_second
+        if self._recognizer.AcceptWaveform(chunk):
+            return self._result(self._recognizer.Result())
+        return None
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """Result for any speech still being decoded (call when the audio ends)"""
+        return self._result(self._recognizer.FinalResult())
+
+    def _result(self, raw: str) -> Optional[Dict[str, Any]]:
+        result = json.loads(raw)
+        words = [w for w in result.get("result", []) if w.get("word") != "[unk]"]
+        text = " ".join(w["word"] for w in words) or result.get("text", "").replace("[unk]", "").strip()
+        if not text:
+            return None
+        # Word times count from the start of the stream
+        trailing = max(0.0, self._fed_seconds - words[-1]["end"]) if words else None
+        return {"text": text, "trailing_seconds": trailing}
+
+
+def create_offline_recognizer(language: str, sample_rate: int = None) -> Optional[VoskCommandRecognizer]:
+    """Vosk recognizer for the language's command vocabulary, or None if vosk or the model is missing"""
+    if vosk is None or not CONFIG.OFFLINE_RECOGNITION:
+        return None
+    model_path = model_path_for(language)
+    if not model_path.is_dir():
+        print(f"💡 No offline speech model for '{language}' at {model_path}; using online recognition")
+        return None
+    try:
+        phrases = command_grammar(load_translations(), language)
+        recognizer = VoskCommandRecognizer(model_path, phrases, sample_rate or CONFIG.OFFLINE_SAMPLE_RATE)
+        print(f"✅ Offline command recognition ready ({len(phrases) - 1} phrases)")
+        return recognizer
+    except Exception as e:
+        print(f"⚠️  Could not load offline speech model: {e}")
+        return None
+
+
+class CommandStream:
+    """
+    Feeds audio chunks to a streaming recognizer and calls `on_command(text, trace)`
+    for every recognised phrase. Used for the live microphone and for replaying
+    recorded audio, so both go through the same path.
+    """
+
+    def __init__(self, recognizer, on_command: Callable[[str, LatencyTrace], None]):
+        self.recognizer = recognizer
+        self.on_command = on_command
+
+    def feed(self, chunk: bytes, captured_at: Optional[float] = None):
+        """`captured_at` is when the chunk finished recording (time.perf_counter), default now"""
+        captured = time.perf_counter() if captured_at is None else captured_at
+        self._emit(self.recognizer.accept(chunk), captured)
+
+    def flush(self):
+        self._emit(self.recognizer.flush(), time.perf_counter())
+
+    def _emit(self, result: Optional[Dict[str, Any]], captured: float):
+        if not result:
+            return
+        trace = LatencyTrace(captured=captured).mark("recognized")
+        if result.get("trailing_seconds") is not None:
+            trace.mark("speech_end", captured - result["trailing_seconds"])
+        trace.text = result["text"]
+        self.on_command(result["text"], trace)
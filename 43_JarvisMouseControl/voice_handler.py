@@ -9,6 +9,8 @@ import threading
 import time
 from typing import Optional, Callable, Dict, Any
 from config import CONFIG
+from utils.latency import LatencyTrace
+from utils.offline_recognizer import CommandStream, create_offline_recognizer
 
 class VoiceHandler:
     """Handles voice input and output for JarvisMouseControl"""
@@ -22,9 +24,12 @@ class VoiceHandler:
         self.voice_callback = None
         self.listening_thread = None
         self.microphone_index = None
+        self.offline_recognizer = None
+        self.last_trace: Optional[LatencyTrace] = None  # timing of the command being delivered to the callback
         
         # Initialize speech recognition
         self._init_speech_recognition()
+        self.offline_recognizer = create_offline_recognizer(language)
         
         # Initialize text-to-speech
         self._init_tts()
@@ -108,8 +113,15 @@ class VoiceHandler:
                 self.is_listening = False
                 return
             
-            with sr.Microphone(device_index=self.microphone_index) as source:
-                self._do_listening(source)
+            if self.offline_recognizer:
+                # Record at the model's rate so audio goes to the recognizer unconverted
+                with sr.Microphone(device_index=self.microphone_index,
+                                   sample_rate=self.offline_recognizer.sample_rate,
+                                   chunk_size=int(self.offline_recognizer.sample_rate * CONFIG.OFFLINE_CHUNK_MS / 1000)) as source:
+                    self._do_offline_listening(source)
+            else:
+                with sr.Microphone(device_index=self.microphone_index) as source:
+                    self._do_listening(source)
         except Exception as e:
             print(f"❌ Error in voice listening loop: {e}")
             print("💡 Voice input will be disabled")
@@ -148,14 +160,15 @@ class VoiceHandler:
             while self.is_listening:
                 try:
                     # Listen for audio with shorter timeout
-                    audio = self.recognizer.listen(source, timeout=2, phrase_time_limit=3)
+                    audio = self.recognizer.listen(source, timeout=2, phrase_time_limit=CONFIG.VOICE_PHRASE_LIMIT)
+                    trace = LatencyTrace(captured=time.perf_counter())
                     
                     # Recognize speech
                     text = self.recognizer.recognize_google(audio, language=self._get_google_language_code())
+                    trace.mark("recognized")
                     
-                    if text and self.voice_callback:
-                        print(f"🎤 Heard: {text}")
-                        self.voice_callback(text)
+                    if text:
+                        self._deliver(text, trace)
                         
                 except sr.WaitTimeoutError:
                     # Timeout is normal, continue listening
@@ -175,6 +188,31 @@ class VoiceHandler:
             print(f"❌ Error in listening process: {e}")
             self.is_listening = False
     
+    def _do_offline_listening(self, source):
+        """Stream microphone audio into the offline recognizer until listening stops"""
+        try:
+            print("✅ Microphone ready for voice commands (offline recognition)")
+            stream = CommandStream(self.offline_recognizer, self._deliver)
+            while self.is_listening:
+                data = source.stream.read(source.CHUNK)
+                if not data:
+                    break
+                stream.feed(data)
+        except Exception as e:
+            print(f"❌ Error in listening process: {e}")
+            self.is_listening = False
+    
+    def _deliver(self, text: str, trace: Optional[LatencyTrace] = None):
+        """Pass recognized text to the callback; its timing is available as last_trace meanwhile"""
+        if not self.voice_callback:
+            return
+        print(f"🎤 Heard: {text}")
+        self.last_trace = trace
+        try:
+            self.voice_callback(text)
+        finally:
+            self.last_trace = None
+    
     def _get_google_language_code(self) -> str:
         """Get Google Speech Recognition language code"""
         language_codes = {
@@ -267,6 +305,8 @@ class VoiceHandler:
         """Change the voice handler language"""
         if language in CONFIG.SUPPORTED_LANGUAGES:
             self.language = language
+            # The grammar is per language; takes effect the next time listening starts
+            self.offline_recognizer = create_offline_recognizer(language)
             print(f"🌍 Voice language changed to: {CONFIG.LANGUAGE_NAMES.get(language, language)}")
             return True
         return False
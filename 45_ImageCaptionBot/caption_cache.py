@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+HASH_BITS = 64
+
+
+class CaptionCache:
+    """LRU cache of caption results keyed by perceptual hash and request options.
+
+    A lookup also matches any stored image whose hash is within `max_distance`
+    bits, so re-uploads, screenshots and re-compressed copies reuse the earlier
+    result. Hashes are split into max_distance + 1 bands and indexed per band:
+    two hashes that differ in at most max_distance bits must agree on at least
+    one whole band, so only those candidates are compared.
+    """
+
+    def __init__(self, capacity: int = 512, max_distance: int = 3) -> None:
+        self.capacity = capacity
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        self._band_bits = -(-HASH_BITS // bands)
+        self._bands = bands
+        self._entries: "OrderedDict[Tuple[int, Hashable], Any]" = OrderedDict()
+        self._index: List[Dict[Tuple[int, Hashable], Set[int]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _band_keys(self, phash: int, options: Hashable) -> List[Tuple[int, Hashable]]:
+        mask = (1 << self._band_bits) - 1
+        return [((phash >> (i * self._band_bits)) & mask, options) for i in range(self._bands)]
+
+    def get(self, phash: int, options: Hashable) -> Optional[Any]:
+        with self._lock:
+            if (phash, options) in self._entries:
+                return self._hit((phash, options))
+
+            best: Optional[int] = None
+            best_distance = self.max_distance + 1
+            for band, key in zip(self._index, self._band_keys(phash, options)):
+                for candidate in band.get(key, ()):
+                    distance = bin(candidate ^ phash).count("1")
+                    if distance < best_distance:
+                        best, best_distance = candidate, distance
+            if best is None:
+                self.misses += 1
+                return None
+            return self._hit((best, options))
+
+    def put(self, phash: int, options: Hashable, value: Any) -> None:
+        with self._lock:
+            key = (phash, options)
+            if key not in self._entries:
+                for band, band_key in zip(self._index, self._band_keys(phash, options)):
+                    band.setdefault(band_key, set()).add(phash)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _hit(self, key: Tuple[int, Hashable]) -> Any:
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def _evict(self) -> None:
+        (phash, options), _ = self._entries.popitem(last=False)
+        for band, band_key in zip(self._index, self._band_keys(phash, options)):
+            members = band.get(band_key)
+            if members is not None:
+                members.discard(phash)
+                if not members:
+                    del band[band_key]
@@ -21,4 +21,15 @@ class CONFIG:
     max_image_bytes: int = 8 * 1024 * 1024  # 8MB
     allowed_exts: tuple[str, ...] = (".jpg", ".jpeg", ".png", ".webp")
 
+    # pre-processing: uploads are fitted within max_image_side px and re-encoded before captioning
+    max_image_side: int = int(os.getenv("MAX_IMAGE_SIDE", "1024"))
+    jpeg_quality: int = int(os.getenv("JPEG_QUALITY", "85"))
+
+    # caption cache: near-duplicate images (perceptual hash within phash_max_distance bits) reuse results
+    caption_cache_size: int = int(os.getenv("CAPTION_CACHE_SIZE", "512"))
+    phash_max_distance: int = int(os.getenv("PHASH_MAX_DISTANCE", "3"))
+
+    # images of an album captioned at once by /api/captions/batch
+    batch_max_workers: int = int(os.getenv("BATCH_MAX_WORKERS", "4"))
+
 
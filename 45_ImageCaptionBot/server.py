@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import os
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Tuple
 
 from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
+from caption_cache import CaptionCache
 from config import CONFIG
+from image_processing import PreparedImage, prepare_image
 from vision_service import VisionCaptioner
 
 
@@ -40,6 +43,9 @@ LENGTHS = [
 ]
 
 
+caption_cache = CaptionCache(CONFIG.caption_cache_size, CONFIG.phash_max_distance)
+
+
 def _guess_mime(filename: str) -> str:
     low = filename.lower()
     if low.endswith((".jpg", ".jpeg")):
@@ -51,6 +57,18 @@ def _guess_mime(filename: str) -> str:
     return "application/octet-stream"
 
 
+def _prepare(data: bytes, filename: str) -> PreparedImage:
+    return prepare_image(data, _guess_mime(filename), CONFIG.max_image_side, CONFIG.jpeg_quality)
+
+
+async def _prepare_upload(data: bytes, filename: str) -> PreparedImage:
+    # Decoding and resizing are CPU work; keep them off the event loop
+    try:
+        return await asyncio.to_thread(_prepare, data, filename)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Could not read image: {filename}")
+
+
 @app.on_event("startup")
 async def startup_event() -> None:
     if not CONFIG.openai_api_key:
@@ -90,20 +108,26 @@ async def caption_endpoint(
         if not CONFIG.openai_api_key:
             raise HTTPException(status_code=500, detail="OPENAI_API_KEY is not configured")
 
-        captioner = VisionCaptioner(CONFIG.openai_api_key, CONFIG.openai_model)
-        mime = _guess_mime(image.filename)
-        caption = captioner.generate_caption(
-            data,
-            mime,
-            language=language,
-            style=style,
-            length=length,
-            hashtags=bool(int(hashtags)),
-        )
-        if not caption:
-            raise HTTPException(status_code=500, detail="Failed to generate caption")
-
-        return {"success": True, "caption": caption, "language": language, "style": style, "length": length, "hashtags": bool(int(hashtags))}
+        prepared = await _prepare_upload(data, image.filename)
+        options = ("caption", language, style, length, bool(int(hashtags)))
+        caption = caption_cache.get(prepared.phash, options)
+        cached = caption is not None
+        if not cached:
+            captioner = VisionCaptioner(CONFIG.openai_api_key, CONFIG.openai_model)
+            caption = await asyncio.to_thread(
+                captioner.generate_caption,
+                prepared.data,
+                prepared.mime_type,
+                language=language,
+                style=style,
+                length=length,
+                hashtags=bool(int(hashtags)),
+            )
+            if not caption:
+                raise HTTPException(status_code=500, detail="Failed to generate caption")
+            caption_cache.put(prepared.phash, options, caption)
+
+        return {"success": True, "caption": caption, "language": language, "style": style, "length": length, "hashtags": bool(int(hashtags)), "cached": cached}
     except HTTPException as he:
         raise he
     except Exception as e:  # noqa: BLE001
@@ -122,8 +146,8 @@ async def captions_batch_endpoint(
         if not CONFIG.openai_api_key:
             raise HTTPException(status_code=500, detail="OPENAI_API_KEY is not configured")
 
-        captioner = VisionCaptioner(CONFIG.openai_api_key, CONFIG.openai_model)
-        all_captions = []
+        # Validate the whole album before spending any API calls
+        uploads: List[Tuple[str, bytes]] = []
         for img in images:
             ext_ok = any(img.filename.lower().endswith(ext) for ext in CONFIG.allowed_exts)
             if not ext_ok:
@@ -133,16 +157,59 @@ async def captions_batch_endpoint(
                 raise HTTPException(status_code=400, detail=f"Empty file: {img.filename}")
             if len(data) > CONFIG.max_image_bytes:
                 raise HTTPException(status_code=400, detail=f"Image too large: {img.filename}")
+            uploads.append((img.filename, data))
 
-            mime = _guess_mime(img.filename)
-            platform_map = captioner.generate_platform_captions(
-                data, mime, language=language, tone=tone, variations=int(variations), temperature=float(temperature)
+        captioner = VisionCaptioner(CONFIG.openai_api_key, CONFIG.openai_model)
+        options = ("platforms", language, tone, int(variations), float(temperature))
+        pool = asyncio.Semaphore(CONFIG.batch_max_workers)
+
+        async def prepare(filename: str, data: bytes) -> PreparedImage:
+            async with pool:
+                return await _prepare_upload(data, filename)
+
+        prepared = await asyncio.gather(*(prepare(filename, data) for filename, data in uploads))
+
+        # Near-duplicates within the album (bursts, edited copies) share one API call
+        leaders: List[int] = []
+        leader_of: List[int] = []
+        for i, image in enumerate(prepared):
+            leader = next(
+                (j for j in leaders if bin(prepared[j].phash ^ image.phash).count("1") <= CONFIG.phash_max_distance),
+                None,
             )
+            if leader is None:
+                leaders.append(i)
+                leader = i
+            leader_of.append(leader)
+
+        async def caption(image: PreparedImage) -> Dict[str, List[Dict[str, Any]]]:
+            platform_map = caption_cache.get(image.phash, options)
+            if platform_map is not None:
+                return platform_map
+            async with pool:
+                platform_map = await asyncio.to_thread(
+                    captioner.generate_platform_captions,
+                    image.data,
+                    image.mime_type,
+                    language=language,
+                    tone=tone,
+                    variations=int(variations),
+                    temperature=float(temperature),
+                )
+            if any(platform_map.values()):
+                caption_cache.put(image.phash, options, platform_map)
+            return platform_map
+
+        leader_results = dict(zip(leaders, await asyncio.gather(*(caption(prepared[i]) for i in leaders))))
+
+        all_captions = []
+        for (filename, _), leader in zip(uploads, leader_of):
+            platform_map = leader_results[leader]
             for platform, captions_list in platform_map.items():
                 for caption_data in captions_list:
                     all_captions.append({
                         "platform": platform,
-                        "title": img.filename, # Using filename as title as per instruction
+                        "title": filename, # Using filename as title as per instruction
                         "caption": caption_data.get("caption", ""),
                         "hashtags": caption_data.get("hashtags", []),
                     })
@@ -0,0 +1,164 @@
+"""
+Helpers for TextAnalyzerAgent.analyze_batch: result cache, rate limiter,
+request packing and parsing of Gemini's JSON replies.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sentiment_lexicon import LexiconScore, describe_tone
+
+SENTIMENTS = ("Positive", "Negative", "Neutral", "Mixed")
+
+BATCH_PROMPT = """Analyze the tone and sentiment of each text in the JSON array below.
+Return only a JSON array with one object per input text, in any order, of the form
+{{"id": <the text's id>, "summary": "<one short sentence>", "tone": ["<tone>", ...], "sentiment": "Positive|Negative|Neutral|Mixed", "score": <number from -1 (very negative) to 1 (very positive)>}}
+Tones are words such as Formal, Informal, Optimistic, Concerned, Frustrated, Appreciative, Sarcastic, Neutral.
+
+Texts:
+{texts}
+"""
+
+
+def text_key(text: str, version: str) -> str:
+    """Cache key: the text with whitespace normalised, plus the prompt version"""
+    normalised = " ".join(text.split())
+    return hashlib.sha256(f"{version}\n{normalised}".encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """Analysis results by text key, stored in SQLite so they survive restarts and can be shared"""
+
+    def __init__(self, path: str = ":memory:"):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT NOT NULL)")
+            self._db.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, dict]:
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):  # stay under SQLite's variable limit
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._db.execute(f"SELECT key, result FROM results WHERE key IN ({placeholders})", chunk)
+                for key, result in rows:
+                    found[key] = json.loads(result)
+        return found
+
+    def put_many(self, results: Dict[str, dict]) -> None:
+        if not results:
+            return
+        rows = [(key, json.dumps(result, ensure_ascii=False)) for key, result in results.items()]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO results (key, result) VALUES (?, ?)", rows)
+            self._db.commit()
+
+
+class RateLimiter:
+    """Spaces calls evenly so that no more than `per_minute` start in any minute, across threads"""
+
+    def __init__(self, per_minute: int):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def pack_batches(items: Iterable[Tuple[str, str]], max_texts: int, max_chars: int,
+                 max_text_chars: int) -> List[List[Tuple[str, str]]]:
+    """
+    Groups (key, text) pairs into requests of at most max_texts texts and
+    about max_chars characters. Long texts are cut to max_text_chars, which
+    is plenty to judge tone and sentiment.
+    """
+    batches: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    size = 0
+    for key, text in items:
+        text = text[:max_text_chars]
+        if current and (len(current) >= max_texts or size + len(text) > max_chars):
+            batches.append(current)
+            current, size = [], 0
+        current.append((key, text))
+        size += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(batch: List[Tuple[str, str]]) -> str:
+    """Texts are numbered by their position in the batch to keep ids short"""
+    texts = [{"id": i, "text": text} for i, (_, text) in enumerate(batch)]
+    return BATCH_PROMPT.format(texts=json.dumps(texts, ensure_ascii=False))
+
+
+def parse_batch_response(response_text: str, batch: List[Tuple[str, str]]) -> Dict[str, dict]:
+    """
+    Maps Gemini's JSON array back to text keys. Entries that are missing or
+    malformed are left out, so the caller can retry just those texts.
+    """
+    try:
+        items = json.loads(response_text)
+    except ValueError:
+        return {}
+    if isinstance(items, dict):  # a single object, or the array wrapped in one
+        items = next((value for value in items.values() if isinstance(value, list)), [items])
+    if not isinstance(items, list):
+        return {}
+
+    results = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            index = int(item.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if not 0 <= index < len(batch):
+            continue
+        sentiment = str(item.get("sentiment", "")).strip().capitalize()
+        if sentiment not in SENTIMENTS:
+            continue
+        tone = item.get("tone") or []
+        if isinstance(tone, str):
+            tone = [part.strip() for part in tone.split(",") if part.strip()]
+        try:
+            score = max(-1.0, min(1.0, float(item.get("score", 0.0))))
+        except (TypeError, ValueError):
+            score = 0.0
+        results[batch[index][0]] = {
+            "summary": str(item.get("summary", "")).strip(),
+            "tone": [str(t) for t in tone],
+            "sentiment": sentiment,
+            "score": round(score, 3),
+        }
+    return results
+
+
+def lexicon_result(text: str, score: LexiconScore, error: Optional[str] = None) -> dict:
+    """A result in the same shape as the LLM's, built from the local lexicon score"""
+    if score.hits:
+        summary = f"{score.sentiment} wording ({', '.join(score.hits[:4])})."
+    else:
+        summary = "No clearly positive or negative wording."
+    result = {
+        "summary": summary,
+        "tone": describe_tone(text, score),
+        "sentiment": score.sentiment,
+        "score": score.compound,
+    }
+    if error:
+        result["error"] = error
+    return result
@@ -3,3 +3,13 @@ import os
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'your_secret_key')
     GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
+
+    # Batch analysis
+    GEMINI_RPM = int(os.environ.get('GEMINI_RPM', 60))  # requests per minute allowed by your quota
+    MAX_CONCURRENT_REQUESTS = int(os.environ.get('MAX_CONCURRENT_REQUESTS', 4))
+    BATCH_SIZE = int(os.environ.get('BATCH_SIZE', 25))  # texts per Gemini request
+    BATCH_MAX_CHARS = int(os.environ.get('BATCH_MAX_CHARS', 12000))
+    BATCH_TEXT_MAX_CHARS = int(os.environ.get('BATCH_TEXT_MAX_CHARS', 2000))  # longer texts are truncated
+    MAX_BATCH_TEXTS = int(os.environ.get('MAX_BATCH_TEXTS', 5000))  # per /analyze/batch call
+    LEXICON_THRESHOLD = float(os.environ.get('LEXICON_THRESHOLD', 0.5))  # |score| needed to skip Gemini
+    CACHE_DB = os.environ.get('CACHE_DB', 'analysis_cache.sqlite3')
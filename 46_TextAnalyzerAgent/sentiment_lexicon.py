@@ -0,0 +1,166 @@
+"""
+Fast local sentiment pre-scoring, in the style of VADER.
+
+Scores a text from a word lexicon with negation, intensifiers, "but"
+contrast, capitalisation and exclamation marks, and says whether the score
+is clear enough to skip the LLM. Thousands of short reviews per second on
+one core; ambiguous texts (mixed, weak, unfamiliar or sarcastic wording)
+are left to Gemini.
+"""
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+# Valence per word, roughly -4 (very negative) to +4 (very positive)
+LEXICON: Dict[str, float] = {
+    # positive
+    "good": 1.9, "great": 3.1, "excellent": 3.2, "amazing": 2.8, "awesome": 3.1, "fantastic": 2.6,
+    "wonderful": 2.7, "perfect": 2.7, "love": 3.2, "loved": 2.9, "loves": 2.7, "lovely": 2.8,
+    "like": 1.3, "liked": 1.8, "likes": 1.5, "enjoy": 2.2, "enjoyed": 2.3, "happy": 2.7, "glad": 2.0,
+    "pleased": 1.9, "satisfied": 1.8, "nice": 1.8, "best": 3.2, "better": 1.9, "beautiful": 2.9,
+    "brilliant": 2.8, "superb": 3.1, "outstanding": 3.0, "impressive": 2.3, "impressed": 2.1,
+    "recommend": 1.5, "recommended": 1.5, "helpful": 1.8, "friendly": 2.2, "fast": 1.1, "quick": 1.0,
+    "easy": 1.9, "reliable": 1.9, "comfortable": 1.8, "solid": 1.3, "sturdy": 1.4, "worth": 1.2,
+    "fine": 0.8, "ok": 0.9, "okay": 0.9, "decent": 1.2, "cool": 1.3, "fun": 2.3, "thanks": 1.9,
+    "thank": 1.5, "appreciate": 1.7, "appreciated": 1.9, "delighted": 2.9, "exceeded": 1.6,
+    "flawless": 2.8, "favorite": 2.0, "favourite": 2.0, "pleasant": 2.3, "smooth": 1.2, "clean": 1.4,
+    "fresh": 1.3, "delicious": 2.7, "tasty": 2.0, "affordable": 1.4, "bargain": 1.6, "gorgeous": 3.0,
+    "incredible": 2.9, "exceptional": 2.9, "terrific": 2.9, "fabulous": 2.9, "superior": 2.0,
+    "works": 0.8, "worked": 0.7, "win": 2.4, "success": 2.7, "successful": 2.6, "positive": 2.1,
+    "generous": 2.2, "kind": 2.1, "polite": 1.8, "professional": 1.4, "responsive": 1.3,
+    "convenient": 1.6, "effective": 1.8, "efficient": 1.7, "accurate": 1.5, "durable": 1.6,
+    "stylish": 1.8, "elegant": 2.1, "charming": 2.2, "joy": 2.8, "excited": 2.1, "exciting": 2.2,
+    "hope": 1.6, "hopeful": 1.7, "calm": 1.3, "safe": 1.4, "secure": 1.4, "wow": 2.3,
+    # negative
+    "bad": -2.5, "terrible": -3.1, "awful": -3.1, "horrible": -3.1, "worst": -3.1, "worse": -2.1,
+    "poor": -2.1, "hate": -2.7, "hated": -3.0, "hates": -2.6, "dislike": -1.6, "disliked": -1.7,
+    "disappointed": -2.2, "disappointing": -2.2, "disappointment": -2.3, "broken": -1.9, "broke": -1.8,
+    "useless": -1.9, "waste": -1.8, "wasted": -2.2, "refund": -1.0, "return": -0.5, "returned": -0.9,
+    "slow": -1.2, "late": -1.0, "delayed": -1.2, "never": -0.3, "problem": -1.7, "problems": -1.7,
+    "issue": -1.0, "issues": -1.1, "defective": -2.3, "faulty": -2.0, "cheap": -0.8, "flimsy": -1.8,
+    "rude": -2.0, "unhelpful": -1.9, "annoying": -1.9, "annoyed": -1.8, "angry": -2.3, "upset": -1.6,
+    "frustrating": -2.0, "frustrated": -1.9, "unacceptable": -2.6, "ridiculous": -1.8, "scam": -2.9,
+    "fraud": -2.8, "fake": -2.1, "junk": -2.2, "garbage": -2.6, "trash": -2.4, "crap": -2.6,
+    "sucks": -2.3, "suck": -2.1, "fail": -2.5, "failed": -2.3, "fails": -2.2, "failure": -2.6,
+    "missing": -1.2, "damaged": -2.0, "dirty": -1.9, "noisy": -1.2, "uncomfortable": -1.7,
+    "overpriced": -1.9, "expensive": -0.9, "confusing": -1.3, "difficult": -1.4, "hard": -0.4,
+    "wrong": -2.1, "error": -1.6, "errors": -1.6, "crash": -1.8, "crashes": -1.8, "bug": -1.2,
+    "bugs": -1.3, "sad": -2.1, "unhappy": -2.1, "poorly": -2.0, "mediocre": -1.3, "meh": -0.8,
+    "boring": -1.3, "stale": -1.5, "cold": -0.6, "bland": -1.4, "nasty": -2.6, "disgusting": -2.9,
+    "dangerous": -2.1, "unsafe": -1.9, "unreliable": -1.9, "lost": -1.3, "lies": -1.8, "lied": -2.0,
+    "avoid": -1.3, "regret": -1.9, "complaint": -1.7, "complain": -1.4, "cancelled": -1.2,
+    "canceled": -1.2, "leaking": -1.6, "leaks": -1.5, "stopped": -0.9, "ignored": -1.5,
+    "pathetic": -2.6, "dreadful": -2.9, "mess": -1.5, "nightmare": -2.7, "unusable": -2.4,
+    "worthless": -2.6, "lacking": -1.3, "inferior": -1.9, "painful": -2.1, "hurt": -2.1,
+    # emoticons and emoji
+    ":)": 2.0, ":-)": 2.0, ":d": 2.3, "(:": 2.0, ":(": -1.9, ":-(": -1.9, "):": -1.9, ":/": -1.0,
+    "<3": 1.9, "😀": 2.0, "😃": 2.0, "😊": 2.0, "😍": 2.8, "👍": 1.8, "❤️": 2.5, "❤": 2.5, "🙂": 1.4,
+    "😞": -1.9, "😡": -2.6, "😠": -2.4, "👎": -1.8, "😢": -1.9, "😭": -2.0, "🙁": -1.5, "🤮": -2.6,
+}
+
+NEGATIONS = frozenset({
+    "not", "no", "never", "none", "nobody", "nothing", "neither", "nor", "nowhere", "cannot",
+    "without", "hardly", "barely", "scarcely", "isnt", "wasnt", "arent", "werent", "dont", "doesnt",
+    "didnt", "wont", "wouldnt", "cant", "couldnt", "shouldnt", "havent", "hasnt", "hadnt", "aint",
+})
+# Intensity added to (or, when negative, removed from) the next sentiment word
+BOOSTERS: Dict[str, float] = {
+    "very": 0.293, "really": 0.293, "so": 0.293, "extremely": 0.293, "super": 0.293, "incredibly": 0.293,
+    "absolutely": 0.293, "totally": 0.293, "completely": 0.293, "highly": 0.293, "truly": 0.293,
+    "most": 0.293, "too": 0.2, "quite": 0.15, "pretty": 0.15, "slightly": -0.293, "somewhat": -0.293,
+    "barely": -0.293, "marginally": -0.293, "little": -0.293, "kinda": -0.293, "sort": -0.293,
+}
+# Phrases that usually flip or undercut the literal words
+SARCASM_CUES = ("yeah right", "oh great", "just great", "thanks a lot", "/s", "as if", "what a joke")
+
+_TOKEN = re.compile(r"[:;]-?[()dDpP/]|\(:|\):|<3|[\w']+|[^\w\s]", re.UNICODE)
+NEGATION_SCALAR = -0.74
+CAPS_BOOST = 0.733
+EXCLAMATION_BOOST = 0.292
+
+
+@dataclass
+class LexiconScore:
+    compound: float  # -1 (negative) to 1 (positive)
+    positive: float  # summed positive valence
+    negative: float  # summed negative valence (as a positive number)
+    sentiment: str   # Positive, Negative, Neutral or Mixed
+    confident: bool  # clear enough to use without the LLM
+    hits: List[str] = field(default_factory=list)  # words that contributed, strongest first
+
+
+def score_text(text: str, threshold: float = 0.5, max_chars: int = 1000) -> LexiconScore:
+    """Scores one text; `confident` is False for anything an LLM should look at"""
+    tokens = _TOKEN.findall(text)
+    mixed_case = not text.isupper()
+    lowered = [token.lower().replace("'", "") if token[0].isalnum() else token.lower() for token in tokens]
+
+    contributions = []  # (token index, valence)
+    but_index = -1
+    for i, word in enumerate(lowered):
+        if word in ("but", "however", "although", "though") and but_index < 0:
+            but_index = i
+        valence = LEXICON.get(word)
+        if valence is None:
+            continue
+        if tokens[i].isupper() and mixed_case and len(tokens[i]) > 1:
+            valence += math.copysign(CAPS_BOOST, valence)
+        for distance in (1, 2, 3):
+            j = i - distance
+            if j < 0:
+                break
+            boost = BOOSTERS.get(lowered[j])
+            if boost:
+                valence += math.copysign(boost, valence) * (1.0, 0.95, 0.9)[distance - 1]
+            if lowered[j] in NEGATIONS:
+                valence *= NEGATION_SCALAR
+        contributions.append((i, valence))
+
+    if but_index >= 0:
+        # The clause after "but" carries the writer's verdict
+        contributions = [(i, v * (0.5 if i < but_index else 1.5)) for i, v in contributions]
+
+    total = sum(v for _, v in contributions)
+    exclamations = min(text.count("!"), 4)
+    if total and exclamations:
+        total += math.copysign(exclamations * EXCLAMATION_BOOST, total)
+    compound = total / math.sqrt(total * total + 15) if total else 0.0
+
+    positive = sum(v for _, v in contributions if v > 0)
+    negative = -sum(v for _, v in contributions if v < 0)
+    is_mixed = min(positive, negative) >= 1.0 and min(positive, negative) / max(positive, negative) > 0.4
+    if is_mixed:
+        sentiment = "Mixed"
+    elif compound >= 0.05:
+        sentiment = "Positive"
+    elif compound <= -0.05:
+        sentiment = "Negative"
+    else:
+        sentiment = "Neutral"
+
+    lowered_text = text.lower()
+    confident = (
+        bool(contributions)
+        and abs(compound) >= threshold
+        and not is_mixed
+        and len(text) <= max_chars
+        and not any(cue in lowered_text for cue in SARCASM_CUES)
+    )
+    ranked = sorted(contributions, key=lambda item: -abs(item[1]))
+    hits = list(dict.fromkeys(lowered[i] for i, _ in ranked))
+    return LexiconScore(round(compound, 4), round(positive, 3), round(negative, 3), sentiment, confident, hits)
+
+
+def describe_tone(text: str, score: LexiconScore) -> List[str]:
+    """Rough tone labels for texts the lexicon handled on its own"""
+    emphatic = "!" in text or any(word.isupper() and len(word) > 2 for word in text.split())
+    if score.sentiment == "Positive":
+        tones = ["Enthusiastic" if emphatic else "Appreciative"]
+    elif score.sentiment == "Negative":
+        tones = ["Frustrated" if emphatic else "Disappointed"]
+    else:
+        tones = ["Neutral"]
+    informal = any(token in LEXICON and not token.isalpha() for token in _TOKEN.findall(text)) or text == text.lower()
+    tones.append("Informal" if informal else "Formal")
+    return tones
@@ -1,10 +1,22 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import google.generativeai as genai
 from config import Config
+from sentiment_lexicon import score_text
+from batch_analysis import (
+    AnalysisCache, RateLimiter, build_batch_prompt, lexicon_result, pack_batches, parse_batch_response, text_key,
+)
+
+# Bump when the batch prompt changes so cached results are not reused
+ANALYSIS_VERSION = "1"
 
 class TextAnalyzerAgent:
     def __init__(self):
         genai.configure(api_key=Config.GEMINI_API_KEY)
         self.model = genai.GenerativeModel('gemini-2.0-flash-001')
+        self.cache = AnalysisCache(Config.CACHE_DB)
+        self.rate_limiter = RateLimiter(Config.GEMINI_RPM)
 
     def analyze_text(self, text):
         prompt = f"""
@@ -27,3 +39,109 @@ class TextAnalyzerAgent:
                 return "Summary: Analysis failed. No text response from API.\nTone: N/A\nSentiment: N/A"
         except Exception as e:
             return f"Summary: Analysis encountered an error. ({str(e)})\nTone: N/A\nSentiment: N/A"
+
+    def analyze_batch(self, texts, use_llm=True):
+        """
+        Analyzes many texts at once and returns structured results in input order.
+
+        Each text is looked up in the cache first, then scored with the local
+        lexicon; only texts the lexicon is unsure about go to Gemini, packed
+        many per request and sent concurrently under the rate limit. Identical
+        texts are analyzed once.
+
+        Returns:
+            {"results": [{"id", "summary", "tone", "sentiment", "score", "source"}, ...],
+             "stats": {...}}, where source is "cache", "lexicon" or "llm".
+        """
+        started = time.perf_counter()
+        keys = [text_key(text, ANALYSIS_VERSION) for text in texts]
+        unique = dict(zip(keys, texts))
+        cached = self.cache.get_many(list(unique))
+
+        results = {key: dict(result, source="cache") for key, result in cached.items()}
+        pending = {}
+        for key, text in unique.items():
+            if key in results:
+                continue
+            score = score_text(text, threshold=Config.LEXICON_THRESHOLD)
+            if score.confident or not use_llm or not text.strip():
+                results[key] = dict(lexicon_result(text, score), source="lexicon")
+            else:
+                pending[key] = (text, score)
+
+        batches = pack_batches(
+            ((key, text) for key, (text, _) in pending.items()),
+            Config.BATCH_SIZE, Config.BATCH_MAX_CHARS, Config.BATCH_TEXT_MAX_CHARS,
+        )
+        analyzed = {}
+        errors = {}
+        request_count = 0
+        if batches:
+            with ThreadPoolExecutor(max_workers=Config.MAX_CONCURRENT_REQUESTS) as pool:
+                for batch_results, batch_errors, requests_made in pool.map(self._analyze_llm_batch, batches):
+                    analyzed.update(batch_results)
+                    errors.update(batch_errors)
+                    request_count += requests_made
+        self.cache.put_many(analyzed)
+
+        for key, (text, score) in pending.items():
+            if key in analyzed:
+                results[key] = dict(analyzed[key], source="llm")
+            else:
+                # Gemini failed for this text: fall back to the lexicon and say so
+                error = errors.get(key, "No analysis returned")
+                results[key] = dict(lexicon_result(text, score, error=error), source="lexicon")
+
+        sources = [results[key]["source"] for key in keys]
+        stats = {
+            "texts": len(texts),
+            "unique_texts": len(unique),
+            "from_cache": sources.count("cache"),
+            "from_lexicon": sources.count("lexicon"),
+            "from_llm": sources.count("llm"),
+            "llm_requests": request_count,
+            "errors": sum(1 for key in keys if "error" in results[key]),
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        return {
+            "results": [dict(results[key], id=i) for i, key in enumerate(keys)],
+            "stats": stats,
+        }
+
+    def _analyze_llm_batch(self, batch, attempts=3):
+        """
+        Sends one packed request. Texts missing from the reply are retried in
+        smaller requests; returns (results, errors, number of requests made).
+        """
+        error = None
+        for attempt in range(attempts):
+            self.rate_limiter.wait()
+            try:
+                response = self.model.generate_content(
+                    build_batch_prompt(batch),
+                    generation_config={"response_mime_type": "application/json", "temperature": 0},
+                )
+                results = parse_batch_response(response.text, batch)
+                break
+            except Exception as e:  # quota, network or blocked response
+                error = f"Analysis encountered an error. ({str(e)})"
+                time.sleep(2 ** attempt)
+        else:
+            return {}, {key: error for key, _ in batch}, attempts
+        requests_made = attempt + 1
+
+        missing = [item for item in batch if item[0] not in results]
+        if not missing:
+            return results, {}, requests_made
+        if len(batch) == 1:
+            return results, {batch[0][0]: "No analysis returned"}, requests_made
+
+        errors = {}
+        middle = (len(missing) + 1) // 2
+        for part in (missing[:middle], missing[middle:]):
+            if part:
+                part_results, part_errors, part_requests = self._analyze_llm_batch(part, attempts)
+                results.update(part_results)
+                errors.update(part_errors)
+                requests_made += part_requests
+        return results, errors, requests_made
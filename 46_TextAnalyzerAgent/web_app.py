@@ -32,3 +32,21 @@ def analyze():
         app.logger.error(f"Error during text analysis: {e}")
         app.logger.error(traceback.format_exc())
         return jsonify({'error': 'An internal server error occurred during analysis.'}), 500
+
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    payload = request.get_json(silent=True) or {}
+    texts = payload.get('texts')
+    if not isinstance(texts, list) or not texts:
+        return jsonify({'error': 'Provide "texts" as a non-empty list of strings'}), 400
+    if not all(isinstance(text, str) for text in texts):
+        return jsonify({'error': 'Every item in "texts" must be a string'}), 400
+    if len(texts) > Config.MAX_BATCH_TEXTS:
+        return jsonify({'error': f'At most {Config.MAX_BATCH_TEXTS} texts per request'}), 400
+
+    try:
+        return jsonify(analyzer.analyze_batch(texts, use_llm=payload.get('use_llm', True) is not False))
+    except Exception as e:
+        app.logger.error(f"Error during batch analysis: {e}")
+        app.logger.error(traceback.format_exc())
+        return jsonify({'error': 'An internal server error occurred during analysis.'}), 500
@@ -0,0 +1,195 @@
+"""
+Repair benchmark: a corpus of malformed documents with known intended values
+
+Each case is generated from a valid document, so a repair only counts as a
+success when the repaired text parses to exactly the original value. The
+regex-based repair that JsonParser used before is included as a baseline.
+
+    python benchmark_repair.py
+    python benchmark_repair.py --docs 500 --large-mb 10
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from core.json_repair import repair_json
+
+
+def legacy_fix(json_string: str) -> str:
+    """The previous JsonParser._attempt_fix, kept for comparison"""
+    fixed_string = json_string.replace("'", '"')
+    fixed_string = re.sub(r'([{\s,]+)(\b[a-zA-Z_][a-zA-Z0-9_]*\b)(?=\s*:)', r'\1"\2"', fixed_string, flags=re.MULTILINE)
+    fixed_string = re.sub(r':\s*(\\b(?!true\\b|false\\b|null\\b)[a-zA-Z_][a-zA-Z0-9_]*\\b)([,\]} ]|$)', r':"\1"\2', fixed_string, flags=re.IGNORECASE | re.MULTILINE)
+    fixed_string = re.sub(r':\s*(\\b(?!true\\b|false\\b|null\\b)[a-zA-Z_][a-zA-Z0-9_]*\\b)$', r':"\1"', fixed_string, flags=re.IGNORECASE | re.MULTILINE)
+    fixed_string = re.sub(r',\s*([}\]])', r'\1', fixed_string)
+    return fixed_string
+
+
+def new_fix(json_string: str) -> str:
+    return repair_json(json_string).text
+
+
+def make_record(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        "id": i,
+        "name": rng.choice(["Ada", "O'Brien", "Zoë", "Mary-Jane", "D'Angelo"]) + f" {i}",
+        "note": rng.choice(["it's fine", "say \"hi\"", "a, b: c", "path C:\\temp", "ok"]),
+        "active": rng.random() > 0.5,
+        "score": rng.choice([round(rng.uniform(-10, 10), 2), rng.randint(0, 1000), None]),
+        "tags": rng.sample(["a", "b", "c", "d"], k=rng.randint(0, 3)),
+        "address": {"city": rng.choice(["Lahore", "Berlin", "Lima"]), "zip": rng.randint(10000, 99999)},
+    }
+
+
+def to_js(value: Any, quote: str = "'", bare_keys: bool = True, trailing_commas: bool = False,
+          comments: bool = False, python: bool = False) -> str:
+    """Serialise in a JavaScript / Python literal style that strict JSON rejects"""
+    if isinstance(value, dict):
+        parts = []
+        for key, item in value.items():
+            key_text = key if bare_keys and re.fullmatch(r"[A-Za-z_]\w*", key) else _quote(key, quote)
+            parts.append(f"{key_text}: {to_js(item, quote, bare_keys, trailing_commas, comments, python)}")
+        if comments and parts:
+            parts[0] = "/* record */ " + parts[0]
+        return "{" + ", ".join(parts) + ("," if trailing_commas and parts else "") + "}"
+    if isinstance(value, list):
+        parts = [to_js(item, quote, bare_keys, trailing_commas, comments, python) for item in value]
+        body = ",\n  // item\n  ".join(parts) if comments else ", ".join(parts)
+        return "[" + body + ("," if trailing_commas and parts else "") + "]"
+    if isinstance(value, str):
+        return _quote(value, quote)
+    if python:
+        return repr(value)
+    return json.dumps(value)
+
+
+def _quote(text: str, quote: str) -> str:
+    escaped = text.replace("\\", "\\\\")
+    if quote == '"':
+        escaped = escaped.replace('"', '\\"')
+    return quote + escaped + quote
+
+
+def build_corpus(docs: int, seed: int = 40) -> List[Tuple[str, str, Any]]:
+    """(kind, malformed text, intended value) triples"""
+    rng = random.Random(seed)
+    mutations: Dict[str, Callable[[Any], str]] = {
+        "single-quotes": lambda v: to_js(v, bare_keys=False),
+        "unquoted-keys": lambda v: to_js(v, quote='"'),
+        "trailing-commas": lambda v: to_js(v, quote='"', bare_keys=False, trailing_commas=True),
+        "comments": lambda v: to_js(v, quote='"', bare_keys=False, comments=True),
+        "python-repr": repr,
+        "js-literal": lambda v: to_js(v, trailing_commas=True, comments=True),
+        "missing-commas": lambda v: json.dumps(v, indent=2).replace(",\n", "\n"),
+    }
+    corpus = []
+    for i in range(docs):
+        records = [make_record(rng, i * 10 + j) for j in range(rng.randint(1, 5))]
+        kind = list(mutations)[i % len(mutations)]
+        corpus.append((kind, mutations[kind](records), records))
+
+        # Unquoted values that contain colons and slashes, with and without a trailing comment
+        url = rng.choice(["http://x.com/y", "https://example.org/a/b?q=1", "ftp://host/file.txt"])
+        comment = rng.choice(["", " // link", " /* link */"])
+        corpus.append(("bare-urls", f"{{url: {url}{comment}\n, id: {i}}}", {"url": url, "id": i}))
+
+        # Unquoted times and ISO dates start like numbers but stay whole
+        stamp = rng.choice([f"{rng.randint(0, 23)}:{rng.randint(0, 59):02d}", f"{rng.randint(0, 23):02d}:30:15",
+                            f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"])
+        corpus.append(("bare-times", f"{{at: {stamp}, id: {i}}}", {"at": stamp, "id": i}))
+
+        # NaN / Infinity are mapped to null
+        value = {"value": rng.choice([math.nan, math.inf, -math.inf]), "id": i}
+        corpus.append(("nan", json.dumps(value), {"value": None, "id": i}))
+    return corpus
+
+
+def evaluate(fix: Callable[[str], str], corpus: List[Tuple[str, str, Any]]) -> Dict[str, List[int]]:
+    """Per kind: [cases, repaired to the intended value]"""
+    results: Dict[str, List[int]] = {}
+    for kind, text, expected in corpus:
+        counts = results.setdefault(kind, [0, 0])
+        counts[0] += 1
+        try:
+            if json.loads(fix(text)) == expected:
+                counts[1] += 1
+        except (ValueError, RecursionError):
+            pass
+    return results
+
+
+def large_documents(size_mb: float, seed: int = 40) -> Dict[str, Tuple[str, Any]]:
+    """A heavily malformed JS-style literal and a valid export with one trailing comma"""
+    rng = random.Random(seed)
+    records = []
+    size = 0
+    while size < size_mb * 1024 * 1024:
+        record = make_record(rng, len(records))
+        records.append(record)
+        size += len(json.dumps(record))
+    one_error = json.dumps(records, indent=2)
+    one_error = one_error[:-2] + ",\n]"
+    return {
+        "JS literal": (to_js(records, trailing_commas=True, comments=True), records),
+        "one trailing comma": (one_error, records),
+    }
+
+
+def time_fix(fix: Callable[[str], str], text: str, records: Any) -> Tuple[float, bool]:
+    start = time.perf_counter()
+    repaired = fix(text)
+    elapsed = time.perf_counter() - start
+    try:
+        ok = json.loads(repaired) == records
+    except ValueError:
+        ok = False
+    return elapsed, ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON repair speed and success rate")
+    parser.add_argument("--docs", type=int, default=300)
+    parser.add_argument("--large-mb", type=float, default=5)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.docs)
+    total_chars = sum(len(text) for _, text, _ in corpus)
+    print(f"Corpus: {len(corpus)} documents, {total_chars / 1024:.0f} KB\n")
+
+    fixers = {"legacy regex": legacy_fix, "single-pass": new_fix}
+    reports = {name: evaluate(fix, corpus) for name, fix in fixers.items()}
+
+    kinds = list(next(iter(reports.values())))
+    print(f"{'kind':<16}" + "".join(f"{name:>16}" for name in fixers))
+    print("-" * (16 + 16 * len(fixers)))
+    for kind in kinds + ["total"]:
+        row = f"{kind:<16}"
+        for name in fixers:
+            if kind == "total":
+                cases = sum(c[0] for c in reports[name].values())
+                good = sum(c[1] for c in reports[name].values())
+            else:
+                cases, good = reports[name][kind]
+            row += f"{good:>9}/{cases:<3} {100 * good / cases:>3.0f}%"
+        print(row)
+
+    for label, (text, records) in large_documents(args.large_mb).items():
+        size_mb = len(text) / (1024 * 1024)
+        print(f"\nLarge document, {label} ({size_mb:.1f} MB):")
+        for name, fix in fixers.items():
+            elapsed, ok = time_fix(fix, text, records)
+            print(f"  {name:<14} {elapsed:6.2f}s  {size_mb / elapsed:6.1f} MB/s  {'correct' if ok else 'wrong result'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Throughput benchmark: streaming engine vs. the load-everything path
+
+Generates a synthetic export of the requested size and times each operation in
+a fresh subprocess, so peak memory (max RSS) is measured per operation.
+
+    python benchmark_stream.py
+    python benchmark_stream.py --size-mb 200 --ops current stream-format stream-stats
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+OPS = ["current", "stream-format", "stream-minify", "stream-stats", "stream-query", "ndjson-stats"]
+
+
+def generate(path: str, size_mb: float, ndjson: bool = False, seed: int = 58) -> None:
+    """Write an array of user records (or one record per line) of roughly size_mb"""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    written = 0
+    with open(path, "w", encoding="utf-8") as f:
+        if not ndjson:
+            f.write("[")
+        i = 0
+        while written < target:
+            record = {
+                "id": i,
+                "name": f"user_{i}",
+                "email": f"user{i}@example.com",
+                "active": rng.random() > 0.3,
+                "score": round(rng.uniform(0, 100), 3),
+                "tags": rng.sample(["admin", "beta", "trial", "pro", "legacy"], k=rng.randint(0, 3)),
+                "address": {"city": rng.choice(["Lahore", "Berlin", "Lima"]), "zip": None},
+            }
+            line = json.dumps(record)
+            if ndjson:
+                line += "\n"
+            elif i:
+                line = "," + line
+            written += f.write(line)
+            i += 1
+        if not ndjson:
+            f.write("]")
+
+
+def run_op(op: str, source: str, output: str) -> None:
+    """Runs one operation in this process (called in a subprocess)"""
+    from core.json_formatter import JsonFormatter
+    from core.json_parser import JsonParser
+    from core.json_stream import JsonStreamer
+
+    if op == "current":
+        data, error, _ = JsonParser().parse_from_file(source)
+        if error:
+            raise SystemExit(error)
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(JsonFormatter().pretty_print(data))
+    elif op == "stream-format":
+        JsonFormatter().pretty_print_stream(source, output)
+    elif op == "stream-minify":
+        JsonFormatter().minify_stream(source, output)
+    elif op == "stream-stats":
+        JsonStreamer().statistics(source)
+    elif op == "stream-query":
+        sum(1 for _ in JsonStreamer().query(source, "$[*].address.city"))
+    elif op == "ndjson-stats":
+        JsonStreamer().statistics(source, ndjson=True)
+
+
+def max_rss_mb() -> str:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return "-"
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return f"{rss / (1024 * 1024 if sys.platform == 'darwin' else 1024):.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming JSON operations")
+    parser.add_argument("--size-mb", type=float, default=50)
+    parser.add_argument("--ops", nargs="+", choices=OPS, default=OPS)
+    parser.add_argument("--run", nargs=3, metavar=("OP", "SOURCE", "OUTPUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        op, source, output = args.run
+        start = time.perf_counter()
+        run_op(op, source, output)
+        print(json.dumps({"seconds": time.perf_counter() - start, "rss_mb": max_rss_mb()}))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "export.json")
+        ndjson_path = os.path.join(tmp, "export.ndjson")
+        generate(json_path, args.size_mb)
+        if "ndjson-stats" in args.ops:
+            generate(ndjson_path, args.size_mb, ndjson=True)
+
+        print(f"{'operation':<15} {'seconds':>9} {'MB/s':>8} {'peak RSS MB':>12}")
+        print("-" * 47)
+        for op in args.ops:
+            source = ndjson_path if op.startswith("ndjson") else json_path
+            size_mb = os.path.getsize(source) / (1024 * 1024)
+            result = subprocess.run(
+                [sys.executable, __file__, "--run", op, source, os.path.join(tmp, "out.json")],
+                capture_output=True, text=True, check=True,
+            )
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            print(f"{op:<15} {stats['seconds']:>9.2f} {size_mb / stats['seconds']:>8.1f} {stats['rss_mb']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import openai
-from typing import Any, Dict
+from collections import OrderedDict
+from typing import Any, Dict, Optional
 from config.openai_config import OpenAIConfig
+from core.json_skeleton import infer_skeleton, render_skeleton, skeleton_hash, SkeletonNode
 
 class JsonExplainer:
     """Handles explanation and suggestions for JSON data using OpenAI GPT"""
@@ -8,6 +10,12 @@ class JsonExplainer:
     def __init__(self, config: OpenAIConfig):
         self.config = config
         self.client = config.get_client()
+        # Explanations keyed by skeleton hash: structurally identical payloads reuse the answer
+        self._cache: "OrderedDict[tuple, str]" = OrderedDict()
+        try:
+            self.cache_size = int(config.get_env_variable("EXPLANATION_CACHE_SIZE", "64"))
+        except ValueError:
+            self.cache_size = 64
 
     def explain_json(self, json_data: Dict[str, Any], was_fixed: bool = False) -> str:
         """
@@ -20,10 +28,16 @@ class JsonExplainer:
         Returns:
             A Markdown-formatted explanation.
         """
+        skeleton = infer_skeleton(json_data)
         if not self.config.is_available():
-            return self._fallback_explanation(json_data, was_fixed)
+            return self._fallback_explanation(json_data, was_fixed, skeleton)
+
+        cache_key = (skeleton_hash(skeleton), was_fixed, self.config.get_model())
+        if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+            return self._cache[cache_key]
 
-        prompt = self._create_explanation_prompt(json_data, was_fixed)
+        prompt = self._create_explanation_prompt(json_data, was_fixed, skeleton)
         try:
             response = self.client.chat.completions.create(
                 model=self.config.get_model(),
@@ -34,10 +48,15 @@ class JsonExplainer:
                 max_tokens=self.config.get_max_tokens(),
                 temperature=self.config.get_temperature()
             )
-            return response.choices[0].message.content.strip()
+            explanation = response.choices[0].message.content.strip()
         except Exception as e:
             print(f"Error calling OpenAI API for JSON explanation: {e}")
-            return self._fallback_explanation(json_data, was_fixed)
+            return self._fallback_explanation(json_data, was_fixed, skeleton)
+
+        self._cache[cache_key] = explanation
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return explanation
 
     def _get_system_prompt_explain(self, was_fixed: bool) -> str:
         """System prompt for JSON explanation"""
@@ -57,14 +76,19 @@ Guidelines:
             base_prompt += "\nAdditionally, inform the user that the JSON was automatically corrected before analysis, and briefly explain what kinds of corrections were made (e.g., adding double quotes to keys or string values)."
         return base_prompt
 
-    def _create_explanation_prompt(self, json_data: Dict[str, Any], was_fixed: bool) -> str:
-        """Create prompt for JSON explanation"""
-        import json
-        json_string = json.dumps(json_data, indent=2)
-        prompt_text = f"""Please explain the following JSON data in detail. Focus on:
+    def _create_explanation_prompt(self, json_data: Dict[str, Any], was_fixed: bool, skeleton: Optional[SkeletonNode] = None) -> str:
+        """
+        Create prompt for JSON explanation.
+
+        Only the structural skeleton is sent, not the document: array elements are
+        merged into one shape, annotated with types, counts, optional/nullable keys
+        and a few example values, so the prompt stays small for any payload size.
+        """
+        outline = render_skeleton(skeleton or infer_skeleton(json_data))
+        prompt_text = f"""Please explain the JSON data summarised below in detail. The outline merges all elements of each array ([*]) into one representative shape; "key?" marks keys missing from some objects, "×N" is how many elements were merged, and "e.g." lists sample values. Focus on:
 
-```json
-{json_string}
+```text
+{outline}
 ```
 
 Provide:
@@ -82,16 +106,15 @@ Format the response in clean Markdown with proper code blocks, clear headings, a
             prompt_text += "\nAlso, mention that the input JSON was automatically corrected to be valid JSON before this analysis. Briefly describe the types of corrections made (e.g., unquoted keys were wrapped in double quotes)."
         return prompt_text
 
-    def _fallback_explanation(self, json_data: Dict[str, Any], was_fixed: bool) -> str:
+    def _fallback_explanation(self, json_data: Dict[str, Any], was_fixed: bool, skeleton: Optional[SkeletonNode] = None) -> str:
         """Fallback explanation when OpenAI is not available"""
-        import json
-        json_string = json.dumps(json_data, indent=2)
+        outline = render_skeleton(skeleton or infer_skeleton(json_data))
         fixed_note = "(Note: The JSON was automatically corrected.)" if was_fixed else ""
         return f"""### JSON Explanation (Offline Mode) {fixed_note}
 
-**Parsed JSON:**
-```json
-{json_string}
+**Structure:**
+```text
+{outline}
 ```
 
 **Note:** AI-powered explanations are not available offline. Please set up your OpenAI API key for detailed analysis and suggestions.
@@ -1,6 +1,8 @@
 import json
 from typing import Any, Dict, Optional, Tuple
 
+from core.json_stream import JsonStreamer
+
 class JsonFormatter:
     """Handles formatting of JSON data"""
 
@@ -28,3 +30,32 @@ class JsonFormatter:
             A minified JSON string.
         """
         return json.dumps(json_data, separators=(',', ':'))
+
+    def pretty_print_stream(self, source: str, output_path: str, indent: int = 2, ndjson: bool = False) -> int:
+        """
+        Pretty prints a JSON file or URL straight into output_path without loading it.
+
+        Args:
+            source: Local file path or http(s) URL.
+            output_path: File to write.
+            indent: The indentation level for pretty printing.
+            ndjson: Treat the source as NDJSON (written back one record per line).
+
+        Returns:
+            The number of characters written.
+        """
+        return JsonStreamer().format_to_file(source, output_path, indent=indent, ndjson=ndjson)
+
+    def minify_stream(self, source: str, output_path: str, ndjson: bool = False) -> int:
+        """
+        Minifies a JSON file or URL straight into output_path without loading it.
+
+        Args:
+            source: Local file path or http(s) URL.
+            output_path: File to write.
+            ndjson: Treat the source as NDJSON.
+
+        Returns:
+            The number of characters written.
+        """
+        return JsonStreamer().format_to_file(source, output_path, indent=None, ndjson=ndjson)
@@ -1,11 +1,15 @@
 import json
 import requests
 from typing import Any, Dict, Optional, Tuple
-import re
+from core.json_repair import repair_json, RepairResult
 
 class JsonParser:
     """Handles parsing and validating JSON data from various sources"""
 
+    def __init__(self):
+        # Fixes applied by the most recent parse, with their locations (None if none were needed)
+        self.last_repair: Optional[RepairResult] = None
+
     def parse_from_string(self, json_string: str) -> Tuple[Optional[Dict[str, Any]], Optional[str], bool]:
         """
         Parses and validates a JSON string. Attempts to fix common errors if parsing fails.
@@ -18,56 +22,34 @@ class JsonParser:
             a boolean indicating if the JSON was fixed.
         """
         fixed = False
+        self.last_repair = None
         try:
-            data = json.loads(json_string)
+            # NaN / Infinity are not JSON; rejecting them lets the repair replace them with null
+            data = json.loads(json_string, parse_constant=self._reject_constant)
             return data, None, fixed
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             # Attempt to fix common issues
-            fixed_json_string = self._attempt_fix(json_string)
-            if fixed_json_string != json_string:
+            repair = self._attempt_fix(json_string)
+            if repair.fix_count:
                 fixed = True
+                self.last_repair = repair
                 try:
-                    data = json.loads(fixed_json_string)
+                    data = json.loads(repair.text)
                     return data, None, fixed
                 except json.JSONDecodeError as fixed_e:
                     return None, f"JSON parsing error even after attempt to fix: {fixed_e}", fixed
             return None, f"JSON parsing error: {e}", fixed
 
-    def _attempt_fix(self, json_string: str) -> str:
+    @staticmethod
+    def _reject_constant(name: str) -> None:
+        raise ValueError(f"Invalid constant {name}")
+
+    def _attempt_fix(self, json_string: str) -> RepairResult:
         """
-        Attempts to fix common JSON syntax errors like unquoted keys or single quotes.
-        This is a heuristic and might not catch all errors or produce valid JSON in all cases.
+        Repairs common JSON syntax errors (quotes, unquoted keys, trailing commas,
+        comments, NaN, ...) in a single pass. See core.json_repair.repair_json.
         """
-        fixed_string = json_string.replace("'", '"')
-
-        # More robust approach: Try to load with JavaScript-like syntax parsing first.
-        # This is a common pattern for handling malformed JSON.
-        try:
-            # Use a JavaScript-like parser if available (e.g., `demjson` or `json5`)
-            # Since we don't have these, we'll try a more aggressive regex approach.
-
-            # Add double quotes to unquoted keys
-            # Matches keys that are valid identifiers (start with letter/underscore, contain letters/numbers/underscores)
-            # and are not already quoted, and are followed by a colon.
-            fixed_string = re.sub(r'([{\s,]+)(\b[a-zA-Z_][a-zA-Z0-9_]*\b)(?=\s*:)', r'\1"\2"', fixed_string, flags=re.MULTILINE)
-
-            # Add double quotes around unquoted string values
-            # Matches values after a colon, that are not numbers, booleans, or null,
-            # and are not already quoted. Captures until a comma, closing brace/bracket, or end of string.
-            fixed_string = re.sub(r':\s*(\\b(?!true\\b|false\\b|null\\b)[a-zA-Z_][a-zA-Z0-9_]*\\b)([,\]} ]|$)', r':"\1"\2', fixed_string, flags=re.IGNORECASE|re.MULTILINE)
-            
-            # Handle cases where value is at the end of the JSON string without a trailing comma/bracket/brace
-            fixed_string = re.sub(r':\s*(\\b(?!true\\b|false\\b|null\\b)[a-zA-Z_][a-zA-Z0-9_]*\\b)$' , r':"\1"' , fixed_string , flags=re.IGNORECASE|re.MULTILINE)
-
-            # Fix trailing commas in objects or arrays (e.g., `[1,2,]` or `{"a":1,}`)
-            fixed_string = re.sub(r',\s*([}\]])', r'\1', fixed_string)
-
-        except Exception as e:
-            # If aggressive regex itself fails, fall back to original string
-            print(f"Warning: Aggressive regex fix failed: {e}")
-            pass # Will re-attempt json.loads with potentially partially fixed string
-
-        return fixed_string
+        return repair_json(json_string)
 
     def parse_from_file(self, file_path: str) -> Tuple[Optional[Dict[str, Any]], Optional[str], bool]:
         """
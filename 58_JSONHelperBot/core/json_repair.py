@@ -0,0 +1,394 @@
+import bisect
+import json
+import re
+from json.encoder import encode_basestring
+from typing import List, NamedTuple, Optional, Tuple
+
+MAX_REPORTED_FIXES = 200
+
+_WHITESPACE = re.compile(r'[ \t\n\r\ufeff\u00a0]*')
+# A number followed by ":", "/" or "-" and more text is a bare value (12:30, 2024-01-01, 1/2), not a number
+_NUMBER = re.compile(r'[-+]?(?:0[xX][0-9a-fA-F]+|(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?)(?![\w.]|[:/\-]\w)')
+_BARE_KEY = re.compile(r'[\w$\-]+')
+# A colon only ends a bare value when whitespace or a delimiter follows it, so URLs and times stay whole
+_BARE_VALUE = re.compile(r'(?:[^,:{}\[\]\n\r]|:(?=[^\s,{}\[\]]))+')
+# Comments inside a bare value start at a token boundary: "http://x" is a value, "x // note" has a comment
+_BARE_COMMENT = re.compile(r'(?:^|(?<=\s))(?://|/\*)')
+_HEX4 = re.compile(r'[0-9a-fA-F]{4}')
+# Runs of characters a string can copy through unchanged, per closing quote
+_STRING_RUNS = {
+    '"': re.compile(r'[^"\\\x00-\x1f]+'),
+    "'": re.compile(r'[^\'"\\\x00-\x1f]+'),
+    "”": re.compile(r'[^”"\\\x00-\x1f]+'),
+}
+_QUOTES = {'"': '"', "'": "'", "“": "”"}
+_VALID_ESCAPES = frozenset('"\\/bfnrt')
+_LITERALS = {
+    "true": "true", "false": "false", "null": "null",
+    "True": "true", "False": "false", "TRUE": "true", "FALSE": "false",
+    "None": "null", "NULL": "null", "Null": "null", "nil": "null", "undefined": "null",
+    "NaN": "null", "Infinity": "null", "-Infinity": "null", "+Infinity": "null",
+}
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _reject_constant(name: str) -> None:
+    raise ValueError(f"Invalid constant {name}")
+
+
+# Strict C decoder: containers that are already valid JSON are copied through in one step
+_STRICT = json.JSONDecoder(parse_constant=_reject_constant)
+# Containers whose first token is valid JSON; anything else is not worth a strict decode attempt
+_STRICT_START = re.compile(r'\{[ \t\n\r]*["}]|\[[ \t\n\r]*[\]"\[{\-0-9tfn]')
+
+# Repairer states
+_VALUE, _AFTER_VALUE, _KEY, _COLON = range(4)
+
+
+class RepairFix(NamedTuple):
+    offset: int
+    line: int
+    column: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"line {self.line}, column {self.column}: {self.message}"
+
+
+class RepairResult(NamedTuple):
+    text: str
+    fixes: List[RepairFix]  # the first MAX_REPORTED_FIXES, in input order
+    fix_count: int
+
+
+def repair_json(text: str) -> RepairResult:
+    """
+    Rewrites almost-JSON into valid JSON in a single left-to-right pass.
+
+    Handles single and curly quotes, unquoted keys and string values, trailing
+    and missing commas, missing colons, // /* */ and # comments, NaN/Infinity,
+    Python literals (True/False/None), hex and loosely written numbers, stray
+    backslashes and control characters in strings, and unclosed strings,
+    objects and arrays. String contents are never rewritten beyond escaping,
+    so apostrophes inside values survive.
+    """
+    return _Repairer(text).run()
+
+
+class _Repairer:
+    def __init__(self, text: str):
+        self.text = text
+        self.out: List[str] = []
+        self._fixes: List[Tuple[int, str]] = []
+        self.fix_count = 0
+
+    def fix(self, offset: int, message: str) -> None:
+        self.fix_count += 1
+        if len(self._fixes) < MAX_REPORTED_FIXES:
+            self._fixes.append((offset, message))
+
+    def run(self) -> RepairResult:
+        text = self.text
+        n = len(text)
+        append = self.out.append
+        stack: List[str] = []  # open "{" / "["
+        state = _VALUE
+        pending_comma: Optional[int] = None  # a "," read but not yet written
+        started = False
+        i = 0
+
+        whitespace = _WHITESPACE.match
+
+        while True:
+            i = whitespace(text, i).end()
+            if i < n and (text[i] == "/" or text[i] == "#"):
+                i = self.skip(i)
+            if i >= n:
+                break
+            c = text[i]
+
+            if state == _AFTER_VALUE:
+                if not stack:
+                    self.fix(i, "Removed extra data after the JSON value")
+                    break
+                if c == ",":
+                    pending_comma = i
+                    state = _KEY if stack[-1] == "{" else _VALUE
+                    i += 1
+                elif c in "}]":
+                    i = self.close(i, stack)
+                elif c == ":" and stack[-1] == "{":
+                    self.fix(i, "Removed unexpected ':'")
+                    i += 1
+                else:
+                    self.fix(i, "Inserted missing comma")
+                    pending_comma = i
+                    state = _KEY if stack[-1] == "{" else _VALUE
+                continue
+
+            if state == _COLON:
+                if c == ":":
+                    i += 1
+                elif c == "=":
+                    self.fix(i, "Replaced '=' with ':'")
+                    i += 1
+                else:
+                    self.fix(i, "Inserted missing ':'")
+                append(":")
+                state = _VALUE
+                continue
+
+            if state == _KEY:
+                if c == "}" or c == "]":
+                    if pending_comma is not None:
+                        self.fix(pending_comma, "Removed trailing comma")
+                        pending_comma = None
+                    i = self.close(i, stack)
+                    state = _AFTER_VALUE
+                elif c == ",":
+                    self.fix(i, "Removed extra comma")
+                    i += 1
+                elif c in _QUOTES or _BARE_KEY.match(text, i):
+                    if pending_comma is not None:
+                        append(",")
+                        pending_comma = None
+                    if c in _QUOTES:
+                        i = self.string(i)
+                    else:
+                        end = _BARE_KEY.match(text, i).end()
+                        self.fix(i, "Quoted key")
+                        append(encode_basestring(text[i:end]))
+                        i = end
+                    state = _COLON
+                else:
+                    self.fix(i, f"Removed unexpected {c!r}")
+                    i += 1
+                continue
+
+            # _VALUE: at the top level, after ':' or inside an array
+            in_object = bool(stack) and stack[-1] == "{"
+            if c == "," or c in "}]":
+                if in_object:
+                    self.fix(i, "Inserted null for missing value")
+                    append("null")
+                    state = _AFTER_VALUE
+                elif c == "," and stack:
+                    self.fix(i, "Removed extra comma")
+                    i += 1
+                elif stack:
+                    if pending_comma is not None:
+                        self.fix(pending_comma, "Removed trailing comma")
+                        pending_comma = None
+                    i = self.close(i, stack)
+                    state = _AFTER_VALUE
+                else:
+                    self.fix(i, f"Removed unexpected {c!r}")
+                    i += 1
+                continue
+            if c == ":":
+                self.fix(i, "Removed unexpected ':'")
+                i += 1
+                continue
+
+            if pending_comma is not None:
+                append(",")
+                pending_comma = None
+            started = True
+            if c == "{" or c == "[":
+                end = _valid_container_end(text, i)
+                if end:
+                    append(text[i:end])
+                    i = end
+                    state = _AFTER_VALUE
+                    continue
+                append(c)
+                stack.append(c)
+                state = _KEY if c == "{" else _VALUE
+                i += 1
+                continue
+            if c in _QUOTES:
+                i = self.string(i)
+            else:
+                i = self.scalar(i)
+            state = _AFTER_VALUE
+
+        if not started:
+            # Nothing that looks like a value: leave it to the JSON error message
+            return RepairResult(text, [], 0)
+        if state == _COLON:
+            self.fix(n, "Inserted missing ':'")
+            append(":")
+            state = _VALUE
+        if state == _VALUE and stack and stack[-1] == "{":
+            self.fix(n, "Inserted null for missing value")
+            append("null")
+        if pending_comma is not None:
+            self.fix(pending_comma, "Removed trailing comma")
+        while stack:
+            opener = stack.pop()
+            self.fix(n, f"Closed unclosed '{opener}'")
+            append(_CLOSERS[opener])
+        return RepairResult("".join(self.out), self._locate(), self.fix_count)
+
+    def skip(self, i: int) -> int:
+        """Skips whitespace and comments"""
+        text = self.text
+        i = _WHITESPACE.match(text, i).end()
+        while i < len(text) and text[i] in "/#":
+            if text.startswith("/*", i):
+                end = text.find("*/", i + 2)
+                end = len(text) if end == -1 else end + 2
+            elif text.startswith("//", i) or text[i] == "#":
+                end = text.find("\n", i)
+                end = len(text) if end == -1 else end
+            else:
+                return i
+            self.fix(i, "Removed comment")
+            i = _WHITESPACE.match(text, end).end()
+        return i
+
+    def close(self, i: int, stack: List[str]) -> int:
+        c = self.text[i]
+        if not stack:
+            self.fix(i, f"Removed unmatched {c!r}")
+            return i + 1
+        expected = _CLOSERS[stack.pop()]
+        if c != expected:
+            self.fix(i, f"Replaced {c!r} with {expected!r}")
+        self.out.append(expected)
+        return i + 1
+
+    def string(self, i: int) -> int:
+        """Copies a quoted string starting at i as a double-quoted JSON string"""
+        text = self.text
+        n = len(text)
+        append = self.out.append
+        opener = text[i]
+        closer = _QUOTES[opener]
+        if opener != '"':
+            self.fix(i, "Replaced single quotes with double quotes" if opener == "'" else "Replaced curly quotes")
+        runs = _STRING_RUNS[closer]
+        start = i
+        i += 1
+        append('"')
+        while True:
+            m = runs.match(text, i)
+            if m:
+                append(m.group())
+                i = m.end()
+            if i >= n:
+                self.fix(start, "Closed unterminated string")
+                break
+            c = text[i]
+            if c == closer:
+                if closer == "'" and text[i + 1:i + 2].isalnum():
+                    # 'O'Brien', 'don't': an apostrophe, not the end of the string
+                    append("'")
+                    i += 1
+                    continue
+                i += 1
+                break
+            if c == '"':
+                append('\\"')
+                i += 1
+            elif c == "\\":
+                nxt = text[i + 1:i + 2]
+                if nxt in _VALID_ESCAPES and nxt:
+                    append(text[i:i + 2])
+                    i += 2
+                elif nxt == "u" and _HEX4.match(text, i + 2):
+                    append(text[i:i + 6])
+                    i += 6
+                elif nxt == "'":
+                    if opener == '"':
+                        self.fix(i, "Removed invalid escape \\'")
+                    append("'")
+                    i += 2
+                else:
+                    self.fix(i, "Escaped stray backslash")
+                    append("\\\\")
+                    i += 1
+            else:
+                self.fix(i, "Escaped control character in string")
+                append(json.dumps(c)[1:-1])
+                i += 1
+        append('"')
+        return i
+
+    def scalar(self, i: int) -> int:
+        """Numbers, literals and bare words"""
+        text = self.text
+        append = self.out.append
+        m = _NUMBER.match(text, i)
+        if m:
+            raw = m.group()
+            number = _normalise_number(raw)
+            if number != raw:
+                self.fix(i, f"Rewrote number {raw} as {number}")
+            append(number)
+            return m.end()
+
+        m = _BARE_VALUE.match(text, i)
+        word = _BARE_COMMENT.split(m.group(), 1)[0].rstrip() if m else ""
+        if not word:
+            self.fix(i, f"Removed unexpected {text[i]!r}")
+            return i + 1
+        literal = _LITERALS.get(word)
+        if literal is None:
+            self.fix(i, f"Quoted bare value {word!r}")
+            append(encode_basestring(word))
+        else:
+            if literal != word:
+                self.fix(i, f"Replaced {word} with {literal}")
+            append(literal)
+        return i + len(word)
+
+    def _locate(self) -> List[RepairFix]:
+        if not self._fixes:
+            return []
+        newlines = [m.start() for m in re.finditer("\n", self.text)]
+        located = []
+        for offset, message in sorted(self._fixes, key=lambda fix: fix[0]):
+            line = bisect.bisect_left(newlines, offset)
+            line_start = newlines[line - 1] + 1 if line else 0
+            located.append(RepairFix(offset, line + 1, offset - line_start + 1, message))
+        return located
+
+
+def _valid_container_end(text: str, i: int) -> int:
+    """
+    End of the container at i if it is already strict JSON, else 0.
+
+    Decodes growing slices rather than the whole remaining text: a failed
+    decode costs time proportional to where it failed, so invalid containers
+    are rejected after a few hundred characters instead of rescanning the rest
+    of a large document each time.
+    """
+    if not _STRICT_START.match(text, i):
+        return 0
+    window = 256
+    while True:
+        chunk = text[i:i + window]
+        try:
+            return i + _STRICT.raw_decode(chunk)[1]
+        except RecursionError:
+            return 0
+        except ValueError as e:
+            # An error near the end of the slice may just mean the container continues
+            if i + window >= len(text) or getattr(e, "pos", 0) < window // 2:
+                return 0
+            window *= 4
+
+
+def _normalise_number(raw: str) -> str:
+    """+1 -> 1, 007 -> 7, .5 -> 0.5, 5. -> 5.0, 0x1F -> 31"""
+    sign = "-" if raw[0] == "-" else ""
+    body = raw.lstrip("+-")
+    if body[:2] in ("0x", "0X"):
+        return sign + str(int(body, 16))
+    mantissa, e, exponent = body.partition("e") if "e" in body else body.partition("E")
+    whole, dot, fraction = mantissa.partition(".")
+    whole = whole.lstrip("0") or "0"
+    if dot and not fraction:
+        fraction = "0"
+    return sign + whole + (("." + fraction) if dot else "") + (e + exponent if e else "")
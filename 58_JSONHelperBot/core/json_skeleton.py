@@ -0,0 +1,166 @@
+import hashlib
+import json
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+MAX_EXAMPLES = 3
+MAX_EXAMPLE_CHARS = 40
+
+
+class SkeletonNode:
+    """Merged shape of every value found at one generalised path"""
+
+    __slots__ = ("count", "types", "examples", "keys", "objects", "items", "arrays", "min_length", "max_length")
+
+    def __init__(self):
+        self.count = 0  # values seen at this path
+        self.types: Counter = Counter()
+        self.examples: List[Any] = []
+        self.keys: Dict[str, "SkeletonNode"] = {}  # first-seen order
+        self.objects = 0  # how many of the values were objects
+        self.items: Optional["SkeletonNode"] = None  # all array elements merged
+        self.arrays = 0
+        self.min_length: Optional[int] = None
+        self.max_length = 0
+
+    @property
+    def nullable(self) -> bool:
+        return "null" in self.types
+
+    def type_label(self) -> str:
+        return " | ".join(name for name, _ in self.types.most_common())
+
+
+def _type_name(value: Any) -> str:
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, bool):
+        return "boolean"
+    if value is None:
+        return "null"
+    return "number"
+
+
+def infer_skeleton(value: Any, max_examples: int = MAX_EXAMPLES) -> SkeletonNode:
+    """
+    Summarises a parsed JSON value as one representative shape.
+
+    Objects in an array are merged key by key, so a list of 10,000 records
+    becomes a single record shape with per-key types, how often each key is
+    present, nullability and a few distinct example values.
+    """
+    root = SkeletonNode()
+    # Children are pushed in reverse so values (and examples) are visited in document order
+    stack: List[Tuple[SkeletonNode, Any]] = [(root, value)]
+    while stack:
+        node, value = stack.pop()
+        type_name = _type_name(value)
+        node.count += 1
+        node.types[type_name] += 1
+
+        if type_name == "object":
+            node.objects += 1
+            pending = []
+            for key, child in value.items():
+                child_node = node.keys.get(key)
+                if child_node is None:
+                    child_node = node.keys[key] = SkeletonNode()
+                pending.append((child_node, child))
+            stack.extend(reversed(pending))
+        elif type_name == "array":
+            node.arrays += 1
+            length = len(value)
+            node.min_length = length if node.min_length is None else min(node.min_length, length)
+            node.max_length = max(node.max_length, length)
+            if value and node.items is None:
+                node.items = SkeletonNode()
+            stack.extend((node.items, child) for child in reversed(value))
+        elif type_name != "null" and len(node.examples) < max_examples:
+            if isinstance(value, str) and len(value) > MAX_EXAMPLE_CHARS:
+                value = value[:MAX_EXAMPLE_CHARS] + "…"
+            if value not in node.examples:
+                node.examples.append(value)
+    return root
+
+
+def skeleton_signature(node: SkeletonNode) -> Any:
+    """Structure only (types, keys, optional keys, element shapes); counts and examples are ignored"""
+    signature: Dict[str, Any] = {"types": sorted(node.types)}
+    if node.keys:
+        signature["keys"] = {
+            key: [skeleton_signature(child), child.count < node.objects]
+            for key, child in sorted(node.keys.items())
+        }
+    if node.items is not None:
+        signature["items"] = skeleton_signature(node.items)
+    return signature
+
+
+def skeleton_hash(node: SkeletonNode) -> str:
+    """Stable hash shared by structurally identical documents"""
+    canonical = json.dumps(skeleton_signature(node), separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def render_skeleton(node: SkeletonNode, max_keys: int = 40, max_depth: int = 12, max_lines: int = 400) -> str:
+    """
+    Compact, indented text outline of a skeleton, e.g.
+
+        $: array (length 1200)
+          [*]: object ×1200
+            id: number  e.g. 1, 2, 3
+            email?: string | null (present in 950/1200, null in 12)  e.g. "a@example.com"
+    """
+    lines: List[str] = []
+    # (label, node, depth, object count of the parent); node None marks elided keys
+    stack: List[Tuple[str, Optional[SkeletonNode], int, Optional[int]]] = [("$", node, 0, None)]
+    while stack:
+        if len(lines) >= max_lines:
+            lines.append("… (outline truncated)")
+            break
+        label, node, depth, parent_objects = stack.pop()
+        indent = "  " * depth
+        if node is None:
+            lines.append(f"{indent}… {label} more keys")
+            continue
+
+        optional = parent_objects is not None and node.count < parent_objects
+        notes = []
+        if optional:
+            notes.append(f"present in {node.count}/{parent_objects}")
+        if node.nullable and len(node.types) > 1:
+            notes.append(f"null in {node.types['null']}")
+        if node.arrays:
+            if node.min_length == node.max_length:
+                notes.append(f"length {node.max_length}")
+            else:
+                notes.append(f"length {node.min_length}–{node.max_length}")
+
+        line = f"{indent}{label}{'?' if optional else ''}: {node.type_label()}"
+        if label == "[*]":
+            line += f" ×{node.count}"
+        if notes:
+            line += f" ({', '.join(notes)})"
+        if node.examples:
+            line += "  e.g. " + ", ".join(json.dumps(example, ensure_ascii=False) for example in node.examples)
+        lines.append(line)
+
+        if depth >= max_depth:
+            if node.keys or node.items is not None:
+                lines.append(f"{indent}  … (nested deeper)")
+            continue
+
+        children: List[Tuple[str, Optional[SkeletonNode], int, Optional[int]]] = []
+        for key in list(node.keys)[:max_keys]:
+            children.append((key, node.keys[key], depth + 1, node.objects))
+        hidden = len(node.keys) - max_keys
+        if hidden > 0:
+            children.append((str(hidden), None, depth + 1, None))
+        if node.items is not None:
+            children.append(("[*]", node.items, depth + 1, None))
+        stack.extend(reversed(children))
+    return "\n".join(lines)
@@ -0,0 +1,650 @@
+import json
+import re
+from collections import Counter
+from json.decoder import scanstring
+from json.encoder import encode_basestring_ascii
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+import requests
+
+CHUNK_SIZE = 1 << 20  # 1 MiB of text per read
+# Containers up to this many characters can be decoded in one go by the C scanner
+COLLAPSE_LIMIT = 4 << 20
+
+PathComponent = Union[str, int]
+Event = Tuple[str, Any]
+
+_TOKEN = re.compile(
+    r'[ \t\n\r]*(?:([{}\[\]:,])|(")|(-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?)|(true|false|null))'
+)
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_LITERALS = {"true": ("boolean", True), "false": ("boolean", False), "null": ("null", None)}
+
+
+
+def _reject_constant(name: str) -> None:
+    raise ValueError(f"Invalid constant {name}")
+
+
+# Strict like the tokenizer: NaN / Infinity are not JSON
+_DECODER = json.JSONDecoder(parse_constant=_reject_constant)
+
+# Parser states
+_VALUE, _ARRAY_FIRST, _AFTER_VALUE, _KEY_FIRST, _KEY, _COLON = range(6)
+
+
+class JsonStreamError(ValueError):
+    """Raised when streamed JSON is malformed"""
+
+    def __init__(self, message: str, offset: int):
+        super().__init__(f"{message} (char {offset})")
+        self.offset = offset
+
+
+def _tokenize(chunks: Iterable[str]) -> Iterator[Tuple[str, Any, int]]:
+    """
+    Yields (kind, value, offset) tokens from text chunks, reading only as far as needed.
+
+    Kinds are the punctuation characters themselves, "string", "number",
+    "boolean" and "null". Strings are decoded with the C-accelerated scanner
+    from the json module; a token cut off at a chunk boundary is retried once
+    more text has been read.
+
+    Sending True in reply to a "{" or "[" token asks for the whole container
+    instead: the reply is ("value", decoded, offset), or None (and tokenizing
+    carries on inside the container) when it is invalid or over COLLAPSE_LIMIT.
+    """
+    chunks = iter(chunks)
+    buf = ""
+    pos = 0
+    consumed = 0  # characters dropped from the front of buf
+    eof = False
+
+    def refill() -> bool:
+        nonlocal buf, pos, consumed, eof
+        if eof:
+            return False
+        # Read at least as much as is still unread so retries of a long token stay linear
+        pending = []
+        wanted = max(len(buf) - pos, 1)
+        added = 0
+        while added < wanted:
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+                break
+            pending.append(chunk)
+            added += len(chunk)
+        if not added:
+            return False
+        consumed += pos
+        buf = buf[pos:] + "".join(pending)
+        pos = 0
+        if consumed == 0 and buf.startswith("\ufeff"):
+            buf = buf[1:]
+            consumed = 1
+        return True
+
+    refill()
+    match = _TOKEN.match
+    while True:
+        m = match(buf, pos)
+        if (m is None or (m.lastindex > 2 and len(buf) - m.end() < 3)) and refill():
+            # Nothing recognisable yet, or a number that may continue in the next chunk
+            # ("1" + "e+5" needs up to two characters of lookahead to tell)
+            continue
+        if m is None:
+            end = _WHITESPACE.match(buf, pos).end()
+            if end == len(buf):
+                return
+            raise JsonStreamError("Unexpected character", consumed + end)
+
+        kind = m.lastindex
+        start = m.start(kind)
+        if kind == 1:
+            pos = m.end()
+            char = buf[start]
+            if (yield char, None, consumed + start) and char in "{[":
+                pos = start
+                while True:
+                    try:
+                        value, end = _DECODER.raw_decode(buf, pos)
+                    except ValueError:
+                        if len(buf) - pos < COLLAPSE_LIMIT and refill():
+                            continue
+                        pos += 1
+                        yield None
+                    else:
+                        offset, pos = consumed + pos, end
+                        yield "value", value, offset
+                    break
+        elif kind == 2:
+            try:
+                value, end = scanstring(buf, m.end(), True)
+            except json.JSONDecodeError as e:
+                if refill():
+                    continue
+                raise JsonStreamError(e.msg, consumed + e.pos) from None
+            pos = end
+            yield "string", value, consumed + start
+        elif kind == 3:
+            text = m.group(3)
+            pos = m.end()
+            if "." in text or "e" in text or "E" in text:
+                yield "number", float(text), consumed + start
+            else:
+                yield "number", int(text), consumed + start
+        else:
+            pos = m.end()
+            kind_name, value = _LITERALS[m.group(4)]
+            yield kind_name, value, consumed + start
+
+
+class JsonEventParser:
+    """
+    Incremental JSON parser producing (event, value) pairs, in the style of iterparse.
+
+    Events are start_map, map_key, end_map, start_array, end_array, string,
+    number, boolean and null. While iterating, `path` holds the location of the
+    current value as a list of keys (str) and array indices (int); for map_key
+    and end_* events it is the path of the enclosing container.
+
+    Only the current chunk and the open containers are held in memory, so
+    files far larger than RAM can be scanned.
+
+    With collapse_depth set, objects and arrays at that depth or deeper are
+    decoded whole by the C scanner and reported as a single ("value", decoded)
+    event, which is several times faster than one event per token. Containers
+    larger than COLLAPSE_LIMIT are still streamed event by event.
+    """
+
+    def __init__(self, chunks: Iterable[str], multiple_values: bool = False, collapse_depth: Optional[int] = None):
+        """
+        Args:
+            chunks: Text chunks, e.g. from iter_file_chunks or iter_url_chunks.
+            multiple_values: Accept a stream of concatenated / whitespace-separated
+                top-level values instead of exactly one.
+            collapse_depth: Path length from which containers are reported as
+                "value" events (1 = the elements of a top-level array).
+        """
+        self._chunks = chunks
+        self.multiple_values = multiple_values
+        self.collapse_depth = collapse_depth
+        self.path: List[PathComponent] = []
+
+    def __iter__(self) -> Iterator[Event]:
+        path = self.path
+        stack: List[bool] = []  # True for objects, False for arrays
+        state = _VALUE
+        offset = 0
+        collapse_depth = self.collapse_depth
+        tokens = _tokenize(self._chunks)
+
+        for kind, value, offset in tokens:
+            if state == _AFTER_VALUE:
+                if not stack:
+                    if not self.multiple_values:
+                        raise JsonStreamError("Extra data", offset)
+                    state = _VALUE
+                elif kind == ",":
+                    if stack[-1]:
+                        path.pop()
+                        state = _KEY
+                    else:
+                        path[-1] += 1
+                        state = _VALUE
+                    continue
+                elif kind == "}" and stack[-1]:
+                    path.pop()
+                    stack.pop()
+                    yield "end_map", None
+                    continue
+                elif kind == "]" and not stack[-1]:
+                    path.pop()
+                    stack.pop()
+                    yield "end_array", None
+                    continue
+                else:
+                    raise JsonStreamError("Expecting ',' delimiter", offset)
+
+            if state == _ARRAY_FIRST:
+                if kind == "]":
+                    stack.pop()
+                    state = _AFTER_VALUE
+                    yield "end_array", None
+                    continue
+                path.append(0)
+                state = _VALUE
+
+            if state == _VALUE:
+                if (kind == "{" or kind == "[") and collapse_depth is not None and len(path) >= collapse_depth:
+                    decoded = tokens.send(True)
+                    if decoded is not None:
+                        state = _AFTER_VALUE
+                        yield "value", decoded[1]
+                        continue
+                if kind == "{":
+                    stack.append(True)
+                    state = _KEY_FIRST
+                    yield "start_map", None
+                elif kind == "[":
+                    stack.append(False)
+                    state = _ARRAY_FIRST
+                    yield "start_array", None
+                elif kind in ("string", "number", "boolean", "null"):
+                    state = _AFTER_VALUE
+                    yield kind, value
+                else:
+                    raise JsonStreamError("Expecting value", offset)
+                continue
+
+            if state == _KEY_FIRST or state == _KEY:
+                if kind == "string":
+                    yield "map_key", value
+                    path.append(value)
+                    state = _COLON
+                elif kind == "}" and state == _KEY_FIRST:
+                    stack.pop()
+                    state = _AFTER_VALUE
+                    yield "end_map", None
+                else:
+                    raise JsonStreamError("Expecting property name enclosed in double quotes", offset)
+                continue
+
+            if state == _COLON:
+                if kind != ":":
+                    raise JsonStreamError("Expecting ':' delimiter", offset)
+                state = _VALUE
+
+        if stack or (state != _AFTER_VALUE and not (self.multiple_values and state == _VALUE)):
+            raise JsonStreamError("Unexpected end of data", offset)
+
+
+def build_value(event: str, value: Any, events: Iterator[Event]) -> Any:
+    """Materialise the value that starts with (event, value), consuming its events"""
+    if event == "start_map":
+        root: Any = {}
+    elif event == "start_array":
+        root = []
+    else:
+        return value
+
+    stack = [root]
+    key = None
+    for event, value in events:
+        container = stack[-1]
+        if event == "map_key":
+            key = value
+            continue
+        if event in ("end_map", "end_array"):
+            stack.pop()
+            if not stack:
+                return root
+            continue
+        if event == "start_map":
+            value = {}
+        elif event == "start_array":
+            value = []
+        if isinstance(container, dict):
+            container[key] = value
+        else:
+            container.append(value)
+        if event in ("start_map", "start_array"):
+            stack.append(value)
+    raise JsonStreamError("Unexpected end of data", -1)
+
+
+def format_path(path: Iterable[PathComponent]) -> str:
+    """JSONPath-style string for a parser path, e.g. $.users[3].name"""
+    parts = ["$"]
+    for part in path:
+        if isinstance(part, int):
+            parts.append(f"[{part}]")
+        elif re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", part):
+            parts.append(f".{part}")
+        else:
+            parts.append(f"[{json.dumps(part)}]")
+    return "".join(parts)
+
+
+_WILDCARD = object()
+_PATH_PART = re.compile(r'\.([A-Za-z_][A-Za-z0-9_\-]*|\*)|\[(\*|-?\d+|"(?:[^"\\]|\\.)*"|\'[^\']*\')\]')
+
+
+def compile_path(expression: str) -> List[Any]:
+    """
+    Parses a JSONPath subset: $, .key, ["key"], [index], .* and [*].
+
+    Examples: $.users[*].email, $.data[0], $.*.id
+    """
+    expression = expression.strip()
+    if expression.startswith("$"):
+        expression = expression[1:]
+    elif expression and not expression.startswith(("[", ".")):
+        expression = "." + expression
+
+    parts: List[Any] = []
+    pos = 0
+    while pos < len(expression):
+        m = _PATH_PART.match(expression, pos)
+        if not m:
+            raise ValueError(f"Unsupported path syntax near '{expression[pos:]}'")
+        name, bracket = m.group(1), m.group(2)
+        token = name if name is not None else bracket
+        if token == "*":
+            parts.append(_WILDCARD)
+        elif name is not None:
+            parts.append(name)
+        elif bracket[0] == '"':
+            parts.append(json.loads(bracket))
+        elif bracket[0] == "'":
+            parts.append(bracket[1:-1])
+        else:
+            parts.append(int(bracket))
+        pos = m.end()
+    return parts
+
+
+def _path_matches(pattern: List[Any], path: List[PathComponent]) -> bool:
+    if len(pattern) != len(path):
+        return False
+    for want, have in zip(pattern, path):
+        if want is _WILDCARD:
+            continue
+        if isinstance(want, int) != isinstance(have, int) or want != have:
+            return False
+    return True
+
+
+def _generalise(path: List[PathComponent]) -> str:
+    return "$" + "".join("[*]" if isinstance(part, int) else f".{part}" for part in path)
+
+
+_TYPE_NAMES = {
+    "start_map": "object", "start_array": "array", "string": "string",
+    "number": "number", "boolean": "boolean", "null": "null",
+}
+
+
+class JsonStreamer:
+    """Streaming operations on JSON / NDJSON that never hold the whole document"""
+
+    # ------------------------------------------------------------------
+    # Sources
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def iter_file_chunks(file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+        with open(file_path, "r", encoding="utf-8") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    @staticmethod
+    def iter_url_chunks(url: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+        with requests.get(url, stream=True, timeout=10) as response:
+            response.raise_for_status()
+            if response.encoding is None:
+                response.encoding = "utf-8"
+            for chunk in response.iter_content(chunk_size=chunk_size, decode_unicode=True):
+                if chunk:
+                    yield chunk
+
+    @staticmethod
+    def iter_lines(source: str) -> Iterator[str]:
+        """Lines of a local file or URL, without reading the whole body"""
+        if source.startswith(("http://", "https://")):
+            with requests.get(source, stream=True, timeout=10) as response:
+                response.raise_for_status()
+                if response.encoding is None:
+                    response.encoding = "utf-8"
+                yield from response.iter_lines(decode_unicode=True)
+        else:
+            with open(source, "r", encoding="utf-8") as f:
+                yield from f
+
+    def chunks(self, source: str) -> Iterator[str]:
+        """Text chunks of a local file path or an http(s) URL"""
+        if source.startswith(("http://", "https://")):
+            return self.iter_url_chunks(source)
+        return self.iter_file_chunks(source)
+
+    def events(
+        self, source: str, multiple_values: bool = False, collapse_depth: Optional[int] = None
+    ) -> JsonEventParser:
+        """Event parser over a file path or URL (read its `path` while iterating)"""
+        return JsonEventParser(self.chunks(source), multiple_values=multiple_values, collapse_depth=collapse_depth)
+
+    def iter_ndjson(self, source: str) -> Iterator[Tuple[int, Any, Optional[str]]]:
+        """
+        Parses NDJSON / JSON Lines one record at a time.
+
+        Yields:
+            (line_number, record, error) tuples; record is None and error is set
+            for lines that are not valid JSON. Blank lines are skipped.
+        """
+        for line_number, line in enumerate(self.iter_lines(source), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_number, json.loads(line), None
+            except json.JSONDecodeError as e:
+                yield line_number, None, str(e)
+
+    # ------------------------------------------------------------------
+    # Operations
+    # ------------------------------------------------------------------
+
+    def query(self, source: str, expression: str, ndjson: bool = False) -> Iterator[Tuple[str, Any]]:
+        """
+        Yields (path, value) for every value matching a JSONPath-subset expression.
+
+        Only matching values are materialised. For NDJSON input the expression
+        is applied to each record and paths are prefixed with the line number.
+        """
+        pattern = compile_path(expression)
+        if ndjson:
+            for line_number, record, error in self.iter_ndjson(source):
+                if error is None:
+                    for path, value in _query_value(record, [], pattern):
+                        yield f"line {line_number}: {path}", value
+            return
+
+        # Records are decoded whole and searched in memory; only the outer levels need events
+        parser = self.events(source, collapse_depth=1)
+        yield from _query_parser(parser, pattern)
+
+    def statistics(self, source: str, ndjson: bool = False, max_paths: int = 200) -> Dict[str, Any]:
+        """
+        Type statistics per generalised path ($.users[*].name) in a single pass.
+
+        Returns:
+            A dict with total value counts by type, the maximum nesting depth,
+            the number of records (NDJSON) and per-path counts by type for the
+            first `max_paths` distinct paths.
+        """
+        totals: Counter = Counter()
+        paths: Dict[str, Counter] = {}
+        max_depth = 0
+        records = 0
+        invalid = 0
+
+        def record(key: str, type_name: str, depth: int) -> None:
+            nonlocal max_depth
+            totals[type_name] += 1
+            if depth > max_depth:
+                max_depth = depth
+            counter = paths.get(key)
+            if counter is None:
+                if len(paths) >= max_paths:
+                    return
+                counter = paths[key] = Counter()
+            counter[type_name] += 1
+
+        def record_value(key: str, value: Any, depth: int) -> None:
+            # Same counts as the events of a decoded subtree would give, in document order
+            stack = [(key, value, depth)]
+            while stack:
+                key, value, depth = stack.pop()
+                if isinstance(value, dict):
+                    record(key, "object", depth)
+                    stack.extend((f"{key}.{k}", v, depth + 1) for k, v in reversed(value.items()))
+                elif isinstance(value, list):
+                    record(key, "array", depth)
+                    stack.extend((key + "[*]", v, depth + 1) for v in reversed(value))
+                else:
+                    record(key, _scalar_event(value), depth)
+
+        def record_events(path: List[PathComponent], events: Iterable[Event]) -> None:
+            for event, value in events:
+                if event == "value":
+                    record_value(_generalise(path), value, len(path))
+                    continue
+                type_name = _TYPE_NAMES.get(event)
+                if type_name is not None:
+                    record(_generalise(path), type_name, len(path))
+
+        if ndjson:
+            for _, value, error in self.iter_ndjson(source):
+                if error is not None:
+                    invalid += 1
+                    continue
+                records += 1
+                record_value("$", value, 0)
+        else:
+            parser = self.events(source, collapse_depth=1)
+            record_events(parser.path, parser)
+            records = 1
+
+        return {
+            "records": records,
+            "invalid_records": invalid,
+            "values": sum(totals.values()),
+            "types": dict(totals),
+            "max_depth": max_depth,
+            "paths": {path: dict(counter) for path, counter in paths.items()},
+            "paths_truncated": len(paths) >= max_paths,
+        }
+
+    def format_to_file(self, source: str, output_path: str, indent: Optional[int] = 2, ndjson: bool = False) -> int:
+        """
+        Streams a pretty-printed (indent) or minified (indent=None) copy of source to output_path.
+
+        Output is identical to json.dumps with the same settings. NDJSON input is
+        written back as NDJSON (one minified record per line, invalid lines dropped).
+
+        Returns:
+            The number of characters written.
+        """
+        with open(output_path, "w", encoding="utf-8") as out:
+            if ndjson:
+                written = 0
+                for _, record, error in self.iter_ndjson(source):
+                    if error is None:
+                        written += out.write(json.dumps(record, separators=(",", ":")) + "\n")
+                return written
+            return write_events(self.events(source, collapse_depth=1), out, indent)
+
+
+def _scalar_event(value: Any) -> str:
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, bool):
+        return "boolean"
+    if value is None:
+        return "null"
+    return "number"
+
+
+def _query_parser(parser: JsonEventParser, pattern: List[Any]) -> Iterator[Tuple[str, Any]]:
+    path = parser.path
+    events = iter(parser)
+    for event, value in events:
+        if event in ("map_key", "end_map", "end_array"):
+            continue
+        if event == "value" and len(path) < len(pattern):
+            if _path_matches(pattern[:len(path)], path):
+                yield from _query_value(value, list(path), pattern)
+        elif _path_matches(pattern, path):
+            location = format_path(path)
+            yield location, build_value(event, value, events)
+
+
+def _query_value(value: Any, path: List[PathComponent], pattern: List[Any]) -> Iterator[Tuple[str, Any]]:
+    """Matches for the rest of pattern inside an already decoded value at path"""
+    if len(path) == len(pattern):
+        yield format_path(path), value
+        return
+    want = pattern[len(path)]
+    if isinstance(value, dict):
+        if want is _WILDCARD:
+            children: Iterable[Tuple[PathComponent, Any]] = value.items()
+        else:
+            children = [(want, value[want])] if isinstance(want, str) and want in value else []
+    elif isinstance(value, list):
+        if want is _WILDCARD:
+            children = enumerate(value)
+        else:
+            children = [(want, value[want])] if isinstance(want, int) and 0 <= want < len(value) else []
+    else:
+        return
+    for key, child in children:
+        path.append(key)
+        yield from _query_value(child, path, pattern)
+        path.pop()
+
+
+def write_events(events: Iterable[Event], out: TextIO, indent: Optional[int] = 2) -> int:
+    """Serialise an event stream to out exactly as json.dumps(value, indent=indent) would"""
+    write = out.write
+    written = 0
+    pretty = indent is not None
+    key_sep = ": " if pretty else ":"
+    # One flag per open container: True until its first child is written
+    first: List[bool] = []
+    after_key = False
+
+    for event, value in events:
+        if event in ("end_map", "end_array"):
+            was_empty = first.pop()
+            closer = "}" if event == "end_map" else "]"
+            if pretty and not was_empty:
+                closer = "\n" + " " * (indent * len(first)) + closer
+            written += write(closer)
+            continue
+
+        if not after_key and first:
+            # Value or key inside a container: separator and indentation first
+            prefix = "" if first[-1] else ","
+            first[-1] = False
+            if pretty:
+                prefix += "\n" + " " * (indent * len(first))
+            written += write(prefix)
+        after_key = False
+
+        if event == "map_key":
+            written += write(encode_basestring_ascii(value) + key_sep)
+            after_key = True
+        elif event == "start_map":
+            first.append(True)
+            written += write("{")
+        elif event == "start_array":
+            first.append(True)
+            written += write("[")
+        elif event == "value":
+            text = json.dumps(value, indent=indent, separators=None if pretty else (",", ":"))
+            if pretty and first:
+                text = text.replace("\n", "\n" + " " * (indent * len(first)))
+            written += write(text)
+        elif event == "string":
+            written += write(encode_basestring_ascii(value))
+        elif event == "number":
+            written += write(float.__repr__(value) if isinstance(value, float) else int.__repr__(value))
+        elif event == "boolean":
+            written += write("true" if value else "false")
+        else:
+            written += write("null")
+    return written
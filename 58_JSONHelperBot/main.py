@@ -17,6 +17,7 @@ from core.json_parser import JsonParser
 from core.json_explainer import JsonExplainer
 from core.json_formatter import JsonFormatter
 from core.json_chatbot import JsonChatbot
+from core.json_stream import JsonStreamer
 from utils.cli_interface import CLIInterface
 
 class JSONHelperBot:
@@ -30,6 +31,7 @@ class JSONHelperBot:
         self.explainer = JsonExplainer(self.config)
         self.formatter = JsonFormatter()
         self.chatbot = JsonChatbot(self.config)
+        self.streamer = JsonStreamer()
         self.last_parsed_json: Optional[Dict[str, Any]] = None
 
     def process_input(self, args) -> None:
@@ -44,6 +46,10 @@ class JSONHelperBot:
             self.show_main_menu()
             return
 
+        if getattr(args, 'query', None) or getattr(args, 'stats', False) or getattr(args, 'output', None):
+            self.process_stream(args)
+            return
+
         json_data = None
         error_message = None
         raw_input_content = None
@@ -66,6 +72,7 @@ class JSONHelperBot:
             self.cli.print_error(f"Input JSON is invalid: {error_message}")
             if was_fixed:
                 self.cli.print_warning("Attempted to fix JSON, but it remains malformed.")
+                self.show_repairs()
             if raw_input_content:
                 self.cli.print_markdown(f"```json\n{raw_input_content}\n```", title="Malformed Input")
             return
@@ -77,11 +84,13 @@ class JSONHelperBot:
             self.cli.print_header("✨ Cleaned and Formatted JSON")
             if was_fixed:
                 self.cli.print_info("Note: Input JSON was automatically fixed before formatting.")
+                self.show_repairs()
             self.cli.print_json_output(processed_output, title="Formatted JSON")
         else:
             self.cli.print_header("📊 JSON Parsing and Explanation")
             if was_fixed:
                 self.cli.print_info("Note: Input JSON was automatically fixed before parsing and explanation.")
+                self.show_repairs()
             self.cli.print_json_output(processed_output, title="Parsed JSON")
             with self.console.status("[bold blue]Calling OpenAI for JSON explanation...[/bold blue]", spinner="dots") as status:
                 sleep(1) # Simulate work
@@ -97,6 +106,54 @@ class JSONHelperBot:
         elif self.cli.confirm_action("Do you want to copy the processed JSON to clipboard?"):
             self.cli.copy_to_clipboard(processed_output)
 
+    def show_repairs(self) -> None:
+        """Lists the automatic fixes applied by the last parse, with line/column"""
+        repair = self.parser.last_repair
+        if not repair or not repair.fixes:
+            return
+        lines = [f"- {fix}" for fix in repair.fixes]
+        if repair.fix_count > len(repair.fixes):
+            lines.append(f"- … and {repair.fix_count - len(repair.fixes):,} more")
+        self.cli.print_markdown("\n".join(lines), title=f"🔧 {repair.fix_count:,} automatic fixes")
+
+    def process_stream(self, args) -> None:
+        """Query, profile or reformat a file/URL without loading the whole document"""
+        source = args.upload or args.fetch
+        if not source:
+            self.cli.print_error("--query, --stats and --output need --upload <file> or --fetch <url>.")
+            return
+        ndjson = getattr(args, 'ndjson', False)
+
+        try:
+            if args.query:
+                self.cli.print_header(f"🔎 Query {args.query}")
+                matches = 0
+                for path, value in self.streamer.query(source, args.query, ndjson=ndjson):
+                    matches += 1
+                    if matches <= args.limit:
+                        self.cli.print_json_output(self.formatter.pretty_print(value), title=path)
+                if matches > args.limit:
+                    self.cli.print_info(f"Showing {args.limit} of {matches} matches (use --limit to show more).")
+                elif not matches:
+                    self.cli.print_warning("No values matched the query.")
+
+            if args.stats:
+                with self.console.status("[bold blue]Scanning document...[/bold blue]", spinner="dots"):
+                    stats = self.streamer.statistics(source, ndjson=ndjson)
+                self.cli.print_statistics(stats)
+
+            if args.output:
+                with self.console.status(f"[bold blue]Writing {args.output}...[/bold blue]", spinner="dots"):
+                    if args.minify:
+                        written = self.formatter.minify_stream(source, args.output, ndjson=ndjson)
+                    else:
+                        written = self.formatter.pretty_print_stream(source, args.output, ndjson=ndjson)
+                self.cli.print_success(f"Wrote {written:,} characters to [green]{args.output}[/green]")
+        except ValueError as e:
+            self.cli.print_error(f"Input JSON is invalid: {e}")
+        except Exception as e:
+            self.cli.print_error(f"Streaming failed: {e}")
+
     def handle_chat_mode(self) -> None:
         """Handles conversational chat mode"""
         self.cli.print_header("💬 JSON Chatbot")
@@ -191,6 +248,13 @@ class JSONHelperBot:
         parser.add_argument('--menu', '-m', action='store_true', help='Show main menu (default if no other args)')
         parser.add_argument('--interactive', '-i', action='store_true', help='Run in interactive mode for quick actions')
         parser.add_argument('--chat', '-c', action='store_true', help='Enter chatbot conversation mode')
+        # Streaming operations for large files / URLs (never load the whole document)
+        parser.add_argument('--query', type=str, help='Stream values matching a path, e.g. "$.items[*].id"')
+        parser.add_argument('--limit', type=int, default=20, help='Maximum query matches to display (default: 20)')
+        parser.add_argument('--stats', action='store_true', help='Stream type statistics per path')
+        parser.add_argument('--output', type=str, help='Stream the formatted JSON into this file')
+        parser.add_argument('--minify', action='store_true', help='With --output, write minified JSON')
+        parser.add_argument('--ndjson', action='store_true', help='Input is NDJSON / JSON Lines (one value per line)')
         return parser
 
 def main():
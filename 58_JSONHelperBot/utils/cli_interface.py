@@ -189,6 +189,28 @@ class CLIInterface:
         )
         return choice
 
+    def print_statistics(self, stats: Dict[str, Any], title: str = "JSON Statistics") -> None:
+        """Print streamed type statistics as tables"""
+        summary = Table(show_header=False, box=ROUNDED, padding=(0, 1))
+        summary.add_column("Metric", style="cyan")
+        summary.add_column("Value", style="bold white")
+        summary.add_row("Records", str(stats["records"]))
+        if stats["invalid_records"]:
+            summary.add_row("Invalid records", f"[red]{stats['invalid_records']}[/red]")
+        summary.add_row("Values", f"{stats['values']:,}")
+        summary.add_row("Max depth", str(stats["max_depth"]))
+        for type_name, count in sorted(stats["types"].items()):
+            summary.add_row(f"  {type_name}", f"{count:,}")
+        self.console.print(Panel(summary, title=title, border_style="magenta"))
+
+        paths = Table(show_header=True, box=ROUNDED, padding=(0, 1))
+        paths.add_column("Path", style="yellow")
+        paths.add_column("Types", style="white")
+        for path, types in stats["paths"].items():
+            paths.add_row(path, ", ".join(f"{name} × {count:,}" for name, count in types.items()))
+        caption = " (first paths only)" if stats["paths_truncated"] else ""
+        self.console.print(Panel(paths, title=f"Paths{caption}", border_style="dim"))
+
     def confirm_action(self, message: str) -> bool:
         """Ask for confirmation"""
         return Confirm.ask(message, default=False)
@@ -206,6 +228,7 @@ class CLIInterface:
 - **Clean/Format JSON**: Add `--clean` to any command to only format and pretty print JSON without AI explanation
 - **Explain JSON (default)**: Use `--explain` (or omit for default behavior) for AI explanation
 - **Chat with Bot**: Use `--chat` to enter conversational mode
+- **Large files (streaming)**: With `--upload`/`--fetch`, add `--query <path>`, `--stats` or `--output <file>` (plus `--minify`) to work on the document without loading it; add `--ndjson` for one-record-per-line input
 - **Exit**: `exit`, `quit`, or `q`
 
 ## Examples
@@ -219,6 +242,11 @@ python main.py --upload my_data.json --save parsed_data.json
 # Fetch from URL, clean, and copy to clipboard
 python main.py --fetch https://jsonplaceholder.typicode.com/todos/1 --clean --copy
 
+# Stream a large export: query, statistics, reformat to a file
+python main.py --upload export.json --query '$.items[*].id'
+python main.py --upload events.ndjson --ndjson --stats
+python main.py --upload export.json --output export.min.json --minify
+
 # Enter chatbot conversation mode
 python main.py --chat
 
@@ -5,3 +5,9 @@ class Config:
     FLASK_SECRET_KEY = os.getenv("FLASK_SECRET_KEY", "supersecretkey") # Fallback for development
     UPLOAD_FOLDER = 'uploads' # Folder to temporarily store uploaded files
     ALLOWED_EXTENSIONS = {'txt', 'docx'}
+    # Long documents are cleaned in paragraph-aligned chunks, several at a time
+    CHUNK_MAX_CHARS = int(os.getenv("CHUNK_MAX_CHARS", 6000))
+    CHUNK_MIN_CHARS = int(os.getenv("CHUNK_MIN_CHARS", 2000))
+    MAX_CONCURRENT_CHUNKS = int(os.getenv("MAX_CONCURRENT_CHUNKS", 4))
+    CHUNK_CACHE_SIZE = int(os.getenv("CHUNK_CACHE_SIZE", 2048))
+    CHUNK_CACHE_FOLDER = os.getenv("CHUNK_CACHE_FOLDER", 'chunk_cache') # Cleaned chunks, reused across runs
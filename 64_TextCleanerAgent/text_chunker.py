@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+@dataclass
+class Chunk:
+    index: int
+    text: str     # paragraphs to clean, joined by blank lines
+    context: str  # the paragraph before the chunk, sent for continuity only
+    key: str      # content hash used by the cache
+
+
+def split_paragraphs(text: str, max_chars: int) -> List[str]:
+    """Paragraphs separated by blank lines; oversized ones are split at sentence ends."""
+    paragraphs = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            paragraphs.append(paragraph)
+            continue
+        piece = ""
+        for sentence in _SENTENCE_END.split(paragraph):
+            while len(sentence) > max_chars:  # no sentence breaks at all
+                if piece:
+                    paragraphs.append(piece)
+                    piece = ""
+                paragraphs.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            if piece and len(piece) + 1 + len(sentence) > max_chars:
+                paragraphs.append(piece)
+                piece = ""
+            piece = f"{piece} {sentence}" if piece else sentence
+        if piece:
+            paragraphs.append(piece)
+    return paragraphs
+
+
+def chunk_key(text: str, version: str) -> str:
+    return hashlib.sha256(f"{version}\n{text}".encode("utf-8")).hexdigest()
+
+
+def build_chunks(text: str, max_chars: int = 6000, min_chars: int = 2000, version: str = "1") -> List[Chunk]:
+    """
+    Groups paragraphs into chunks of at most max_chars.
+
+    Boundaries are content-defined: once a chunk has min_chars, it ends after
+    any paragraph whose hash falls on a boundary (about one in four). An edit
+    therefore only shifts the boundaries next to it, and every other chunk
+    keeps its text, and its cache key, from the previous run.
+    """
+    paragraphs = split_paragraphs(text, max_chars)
+    chunks: List[Chunk] = []
+    current: List[str] = []
+    size = 0
+    context = ""
+
+    def flush():
+        nonlocal current, size, context
+        body = "\n\n".join(current)
+        chunks.append(Chunk(len(chunks), body, context, chunk_key(body, version)))
+        context = current[-1]
+        current, size = [], 0
+
+    for i, paragraph in enumerate(paragraphs):
+        if current and size + 2 + len(paragraph) > max_chars:
+            flush()
+        current.append(paragraph)
+        size += len(paragraph) + (2 if size else 0)
+        is_anchor = hashlib.md5(paragraph.encode("utf-8")).digest()[0] % 4 == 0
+        if size >= min_chars and is_anchor and i < len(paragraphs) - 1:
+            flush()
+    if current:
+        flush()
+    return chunks
+
+
+class ChunkCache:
+    """LRU of per-chunk results keyed by content hash, optionally persisted as one JSON file per chunk"""
+
+    def __init__(self, capacity: int = 2048, directory: Optional[str] = None):
+        self.capacity = capacity
+        self.directory = directory
+        self._entries: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        if not self.directory:
+            return None
+        try:
+            with open(os.path.join(self.directory, f"{key}.json"), "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Dict[str, str]) -> None:
+        self._remember(key, value)
+        if self.directory:
+            path = os.path.join(self.directory, f"{key}.json")
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+    def _remember(self, key: str, value: Dict[str, str]) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
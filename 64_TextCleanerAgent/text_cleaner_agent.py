@@ -1,16 +1,43 @@
 import google.generativeai as genai
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 import requests
 from bs4 import BeautifulSoup
 from docx import Document
+from .config import Config
+from .text_chunker import Chunk, ChunkCache, build_chunks
+
+PROMPT_VERSION = "1"  # Bump when the cleaning prompt changes so cached chunks are not reused
+SUMMARY_MARKER = "===SUMMARY==="
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_chunk_cache() -> ChunkCache:
+    """Process-wide chunk cache, so agents created per request still share results."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ChunkCache(Config.CHUNK_CACHE_SIZE, Config.CHUNK_CACHE_FOLDER)
+        return _shared_cache
+
 
 class TextCleanerAgent:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache: Optional[ChunkCache] = None, max_workers: Optional[int] = None):
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-2.0-flash-001')
+        self.cache = cache if cache is not None else get_chunk_cache()
+        self.max_workers = max_workers or Config.MAX_CONCURRENT_CHUNKS
 
-    def _clean_with_gemini(self, text: str) -> str:
-        """Sends text to Gemini API for cleaning and returns the polished version."""
+    def _clean_with_gemini(self, text: str, context: str = "") -> str:
+        """Sends text to Gemini API for cleaning; the reply is the polished version, then a short summary after SUMMARY_MARKER."""
+        context_block = f"""
+        For continuity, this is the passage that comes directly before the text. Do not include it in your answer:
+        {context}
+        """ if context else ""
         prompt = f"""
         You are TextCleanerAgent, an intelligent assistant powered by Google's Gemini API. Your job is to take messy, unstructured, or poorly written text and return a polished, grammatically correct, and well-formatted version.
 
@@ -21,15 +48,61 @@ class TextCleanerAgent:
         - Maintain the original meaning
         - Format content into clean, readable paragraphs
 
+        Return only the cleaned text. Then write a line containing only {SUMMARY_MARKER} followed by a one to three sentence summary of the text.
+        {context_block}
         Here is the text to clean:
         {text}
         """
         response = self.model.generate_content(prompt)
         return response.text
 
+    def _clean_chunk(self, chunk: Chunk) -> Dict[str, str]:
+        cleaned, _, summary = self._clean_with_gemini(chunk.text, chunk.context).partition(SUMMARY_MARKER)
+        result = {"cleaned": cleaned.strip(), "summary": summary.strip()}
+        self.cache.put(chunk.key, result)
+        return result
+
+    def clean_document(self, text: str) -> Dict[str, Any]:
+        """
+        Cleans text of any length chunk by chunk.
+
+        Chunks are cleaned concurrently (max_workers at a time) and reassembled in
+        order; each call also returns a summary of its chunk for the hierarchical
+        summary. Chunks already in the cache, e.g. unchanged paragraphs of an edited
+        document, are not sent again.
+
+        Returns:
+            dict with the cleaned text, per-chunk summaries, and the number of chunks
+            and of chunks served from the cache.
+        """
+        chunks = build_chunks(text, Config.CHUNK_MAX_CHARS, Config.CHUNK_MIN_CHARS, PROMPT_VERSION)
+        results: List[Optional[Dict[str, str]]] = [None] * len(chunks)
+        pending: Dict[str, List[Chunk]] = {}  # identical chunks are cleaned once
+        for chunk in chunks:
+            cached = self.cache.get(chunk.key)
+            if cached is not None:
+                results[chunk.index] = cached
+            else:
+                pending.setdefault(chunk.key, []).append(chunk)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+                first_chunks = [same[0] for same in pending.values()]
+                for same, result in zip(pending.values(), pool.map(self._clean_chunk, first_chunks)):
+                    for chunk in same:
+                        results[chunk.index] = result
+
+        return {
+            "cleaned": "\n\n".join(result["cleaned"] for result in results),
+            "summaries": [result["summary"] or result["cleaned"] for result in results],
+            "chunks": len(chunks),
+            "cached_chunks": len(chunks) - sum(len(same) for same in pending.values()),
+        }
+
     def clean_text(self, text: str, summarize: bool = False, provide_diff: bool = False) -> str:
         """Cleans the given text using Gemini API."""
-        cleaned_text = self._clean_with_gemini(text)
+        document = self.clean_document(text)
+        cleaned_text = document["cleaned"]
 
         output = ""
         if provide_diff:
@@ -43,13 +116,46 @@ class TextCleanerAgent:
         if summarize:
             output += "\n\nSummary:\n"
             output += "--------------------\n"
-            output += self._summarize_with_gemini(cleaned_text)
+            output += self._combine_summaries(document["summaries"])
 
         return output
 
-    def _summarize_with_gemini(self, text: str) -> str:
+    def _combine_summaries(self, summaries: List[str]) -> str:
+        """Reduces per-chunk summaries to one, in concurrent rounds while they exceed one chunk."""
+        if not summaries:
+            return ""
+        if len(summaries) == 1:
+            return summaries[0]
+        while True:
+            joined = "\n\n".join(summaries)
+            if len(joined) <= Config.CHUNK_MAX_CHARS:
+                return self._summarize_with_gemini(joined, of_sections=True)
+            groups: List[List[str]] = [[]]
+            size = 0
+            for summary in summaries:
+                if groups[-1] and size + len(summary) > Config.CHUNK_MAX_CHARS:
+                    groups.append([])
+                    size = 0
+                groups[-1].append(summary)
+                size += len(summary) + 2
+            if len(groups) == len(summaries):
+                # Every summary is too long to share a call: pair them so each round halves the count
+                groups = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(groups))) as pool:
+                summaries = list(pool.map(
+                    lambda group: self._summarize_with_gemini("\n\n".join(group), of_sections=True), groups
+                ))
+
+    def _summarize_with_gemini(self, text: str, of_sections: bool = False) -> str:
         """Summarizes the given text using Gemini API."""
-        prompt = f"""
+        if of_sections:
+            prompt = f"""
+        The following are summaries of consecutive sections of one document, in order.
+        Please combine them into one concise and clear summary of the whole:
+        {text}
+        """
+        else:
+            prompt = f"""
         Please summarize the following text concisely and clearly:
         {text}
         """
@@ -0,0 +1,136 @@
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class TTLCache:
+    """Thread-safe TTL cache with request coalescing.
+
+    Concurrent callers asking for the same missing key share a single call to the
+    loader: the first caller loads, the others wait for its result.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 256) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, "_Flight"] = {}
+        self._lock = threading.Lock()
+        self.requests: Counter = Counter()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+        return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        if len(self._entries) >= self.max_entries and key not in self._entries:
+            # Drop expired entries first, then the one closest to expiry
+            for k in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+                del self._entries[k]
+            if len(self._entries) >= self.max_entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+        self._entries[key] = (now + self.ttl_seconds, value)
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        *,
+        track: bool = True,
+        store_if: Callable[[Any], bool] = bool,
+    ) -> Any:
+        """Return the cached value for key, loading it at most once across threads.
+
+        ``track`` counts the lookup toward the key's popularity; background refreshes
+        pass ``track=False`` so they do not inflate it. Values failing ``store_if``
+        (by default, empty results) are returned but not cached.
+        """
+        with self._lock:
+            if track:
+                self.requests[key] += 1
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            flight = self._inflight.get(key)
+            if flight is None:
+                flight = _Flight()
+                self._inflight[key] = flight
+                leader = True
+                self.misses += 1
+            else:
+                leader = False
+                self.coalesced += 1
+
+        if not leader:
+            return flight.wait()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            flight.fail(e)
+            raise
+        with self._lock:
+            if store_if(value):
+                self._store(key, value)
+            del self._inflight[key]
+        flight.resolve(value)
+        return value
+
+    def refresh(self, key: Hashable, loader: Callable[[], Any], *, store_if: Callable[[Any], bool] = bool) -> Any:
+        """Reload key ahead of expiry; readers keep getting the current entry meanwhile."""
+        value = loader()
+        if store_if(value):
+            self.set(key, value)
+        return value
+
+    def popular(self, n: int) -> List[Hashable]:
+        with self._lock:
+            return [key for key, _ in self.requests.most_common(n)]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+            }
+
+
+class _Flight:
+    """A single in-progress load that other callers can wait on."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._value: Any = None
+        self._error: Optional[BaseException] = None
+
+    def resolve(self, value: Any) -> None:
+        self._value = value
+        self._event.set()
+
+    def fail(self, error: BaseException) -> None:
+        self._error = error
+        self._event.set()
+
+    def wait(self) -> Any:
+        self._event.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
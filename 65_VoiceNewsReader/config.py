@@ -40,6 +40,17 @@ class Config:
     # Storage
     AUDIO_DIR = os.getenv("AUDIO_DIR", "audio")
 
+    # Caching and prefetch
+    NEWS_CACHE_TTL = int(os.getenv("NEWS_CACHE_TTL", "300"))  # seconds
+    AUDIO_CACHE_TTL = int(os.getenv("AUDIO_CACHE_TTL", "3600"))  # seconds
+    PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "True").lower() == "true"
+    PREFETCH_INTERVAL = int(os.getenv("PREFETCH_INTERVAL", "240"))  # seconds, keep below NEWS_CACHE_TTL
+    PREFETCH_TOP_N = int(os.getenv("PREFETCH_TOP_N", "5"))
+    # Feeds always kept warm, as comma-separated category:country pairs
+    PREFETCH_FEEDS = [
+        f.strip() for f in os.getenv("PREFETCH_FEEDS", "general:us,technology:us,business:us").split(",") if f.strip()
+    ]
+
     @classmethod
     def validate(cls):
         if not (cls.NEWSAPI_KEY or cls.BING_NEWS_KEY):
@@ -9,6 +9,7 @@ import uvicorn
 
 from config import Config
 from news_agent import VoiceNewsAgent
+from prefetcher import NewsPrefetcher
 
 
 BASE_DIR = Path(__file__).parent
@@ -48,6 +49,22 @@ except Exception as e:
     print(f"Warning: Agent init failed: {e}")
     agent = None
 
+prefetcher: Optional[NewsPrefetcher] = None
+if agent is not None and Config.PREFETCH_ENABLED:
+    prefetcher = NewsPrefetcher(agent)
+
+
+@app.on_event("startup")
+async def start_prefetcher():
+    if prefetcher is not None:
+        prefetcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_prefetcher():
+    if prefetcher is not None:
+        prefetcher.stop()
+
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -55,7 +72,7 @@ async def home(request: Request):
 
 
 @app.post("/api/read")
-async def read_news(payload: ReadRequest):
+def read_news(payload: ReadRequest):
     if agent is None:
         raise HTTPException(status_code=500, detail="Agent not available")
     try:
@@ -84,6 +101,9 @@ async def health():
         "status": "healthy",
         "agent_available": agent is not None,
         "tts_engine": Config.TTS_ENGINE,
+        "prefetch_enabled": prefetcher is not None,
+        "news_cache": agent.news.cache.stats() if agent else None,
+        "audio_cache": agent.audio_cache.stats() if agent else None,
     }
 
 
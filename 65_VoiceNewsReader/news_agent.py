@@ -1,5 +1,9 @@
+import hashlib
+import os
+import threading
 from typing import Dict, Any, List, Optional, Tuple
 from config import Config
+from cache import TTLCache
 from news_service import NewsService
 from tts_service import TTSService
 
@@ -10,6 +14,11 @@ class VoiceNewsAgent:
     def __init__(self) -> None:
         self.news = NewsService()
         self.tts = TTSService()
+        # Audio keyed by script + voice settings -> (mime, filename)
+        self.audio_cache = TTLCache(ttl_seconds=Config.AUDIO_CACHE_TTL)
+        # Most recent voice options per feed, so the prefetcher warms what listeners use
+        self._feed_options: Dict[Tuple[Optional[str], ...], Dict[str, Any]] = {}
+        self._options_lock = threading.Lock()
 
     def read_news(
         self,
@@ -25,46 +34,36 @@ class VoiceNewsAgent:
         voice_pitch: Optional[float],
         transcript: bool = True,
     ) -> Dict[str, Any]:
-        items = self.news.fetch_top_headlines(
-            category=category or Config.DEFAULT_CATEGORY,
-            country=country or Config.DEFAULT_COUNTRY,
-            q=q,
-            limit=limit or Config.DEFAULT_LIMIT,
-            language=language or Config.TTS_LANGUAGE,
-            date_range=date_range or "any",
-        )
+        filters = {
+            "category": category or Config.DEFAULT_CATEGORY,
+            "country": country or Config.DEFAULT_COUNTRY,
+            "q": q,
+            "language": language or Config.TTS_LANGUAGE,
+            "date_range": date_range or "any",
+        }
+        limit = limit or Config.DEFAULT_LIMIT
+        items = self.news.fetch_top_headlines(limit=limit, **filters)
 
         if not items:
             return {"success": False, "error": "No news available. Check API keys or filters."}
 
-        # Build script: title + short summary lines
-        lines: List[str] = []
-        for idx, it in enumerate(items[:limit]):
-            title = (it.get("title") or "").strip()
-            desc = (it.get("description") or "").strip()
-            source = (it.get("source") or "").strip()
-            line = f"{idx+1}. {title} — {source}. {desc}"
-            lines.append(line)
-        script = "\n".join(lines)
-
-        # TTS language handling: pass through language for engines that support it
-        if hasattr(self.tts, "language"):
-            self.tts.language = (language or Config.TTS_LANGUAGE) or "en"
+        with self._options_lock:
+            self._feed_options[self.news.cache_key(**filters)] = {
+                "limit": limit,
+                "voice_gender": voice_gender,
+                "voice_rate": voice_rate,
+                "voice_pitch": voice_pitch,
+            }
 
-        mime, audio_bytes = self.tts.synthesize(
+        script = self.build_script(items, limit)
+        mime, filename = self.synthesize_cached(
             script,
+            language=filters["language"],
             gender=voice_gender,
             rate=voice_rate,
             pitch=voice_pitch,
         )
 
-        # Persist audio to file for download
-        ext = ".mp3" if mime == "audio/mpeg" else ".wav"
-        filename = f"news_{abs(hash(script))}{ext}"
-        path = f"{Config.AUDIO_DIR}/{filename}"
-        with open(path, "wb") as f:
-            f.write(audio_bytes)
-
         payload: Dict[str, Any] = {
             "success": True,
             "items": items[:limit],
@@ -76,4 +75,58 @@ class VoiceNewsAgent:
             payload["transcript"] = script
         return payload
 
+    @staticmethod
+    def build_script(items: List[Dict[str, Any]], limit: int) -> str:
+        # Build script: title + short summary lines
+        lines: List[str] = []
+        for idx, it in enumerate(items[:limit]):
+            title = (it.get("title") or "").strip()
+            desc = (it.get("description") or "").strip()
+            source = (it.get("source") or "").strip()
+            line = f"{idx+1}. {title} — {source}. {desc}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def synthesize_cached(
+        self,
+        script: str,
+        *,
+        language: Optional[str],
+        gender: Optional[str],
+        rate: Optional[int],
+        pitch: Optional[float],
+    ) -> Tuple[str, str]:
+        """Synthesize script to an audio file once per script/voice combination.
+
+        Returns (mime, filename). Concurrent requests for the same audio share one
+        TTS call.
+        """
+        language = (language or Config.TTS_LANGUAGE) or "en"
+        fingerprint = "\x1f".join(str(part) for part in (script, language, gender, rate, pitch))
+        key = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+        def load() -> Tuple[str, str]:
+            mime, audio_bytes = self.tts.synthesize(
+                script,
+                gender=gender,
+                rate=rate,
+                pitch=pitch,
+                language=language,
+            )
+            # Persist audio to file for download
+            ext = ".mp3" if mime == "audio/mpeg" else ".wav"
+            filename = f"news_{key[:16]}{ext}"
+            path = os.path.join(Config.AUDIO_DIR, filename)
+            with open(path, "wb") as f:
+                f.write(audio_bytes)
+            return mime, filename
+
+        mime, filename = self.audio_cache.get_or_load(key, load)
+        if not os.path.exists(os.path.join(Config.AUDIO_DIR, filename)):
+            # File was cleaned up from disk; regenerate it
+            mime, filename = self.audio_cache.refresh(key, load)
+        return mime, filename
 
+    def feed_options(self, key: Tuple[Optional[str], ...]) -> Dict[str, Any]:
+        with self._options_lock:
+            return dict(self._feed_options.get(key, {}))
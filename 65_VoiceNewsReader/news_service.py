@@ -1,8 +1,12 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import requests
 from datetime import datetime
 from urllib.parse import urlencode
 from config import Config
+from cache import TTLCache
+
+# Upstream page size; requests are cached at this size and sliced to the caller's limit
+MAX_PAGE_SIZE = 10
 
 
 class NewsService:
@@ -13,6 +17,7 @@ class NewsService:
     def __init__(self):
         self.newsapi_key = Config.NEWSAPI_KEY
         self.bing_key = Config.BING_NEWS_KEY
+        self.cache = TTLCache(ttl_seconds=Config.NEWS_CACHE_TTL)
         # Common country name/code normalization map
         self.country_map = {
             # codes map to themselves
@@ -48,8 +53,62 @@ class NewsService:
         - If keyword-only search (q present) and no country/category → use `everything` with language.
         - Else → use `top-headlines` with country/category/q and pageSize.
         Falls back to Bing News if configured.
+
+        Results are cached per normalized filter set, and concurrent callers with the
+        same filters share one upstream fetch.
+        """
+        limit = max(1, min(int(limit or 5), MAX_PAGE_SIZE))
+        key = self.cache_key(category=category, country=country, q=q, language=language, date_range=date_range)
+        items = self.cache.get_or_load(key, lambda: self._fetch_for_key(key))
+        return items[:limit]
+
+    def cache_key(
+        self,
+        *,
+        category: Optional[str] = None,
+        country: Optional[str] = None,
+        q: Optional[str] = None,
+        language: Optional[str] = None,
+        date_range: Optional[str] = None,
+    ) -> Tuple[Optional[str], ...]:
+        """Normalize filters so equivalent requests ("USA" vs "us") share a cache entry.
+
+        Countries without a code ("Japan") stay in the key as lowercased names: the
+        fetch still filters on them through the keyword fallback.
         """
-        limit = max(1, min(int(limit or 5), 10))
+        return (
+            (category or "").strip().lower() or None,
+            self._normalize_country(country) or (country or "").strip().lower() or None,
+            " ".join((q or "").lower().split()) or None,
+            (language or "").strip().lower() or None,
+            (date_range or "any").strip().lower(),
+        )
+
+    def refresh(self, key: Tuple[Optional[str], ...]) -> List[Dict]:
+        """Re-fetch a cached feed ahead of expiry (used by the prefetcher)."""
+        return self.cache.refresh(key, lambda: self._fetch_for_key(key))
+
+    def _fetch_for_key(self, key: Tuple[Optional[str], ...]) -> List[Dict]:
+        category, country, q, language, date_range = key
+        return self._fetch_uncached(
+            category=category,
+            country=country,
+            q=q,
+            limit=MAX_PAGE_SIZE,
+            language=language,
+            date_range=date_range,
+        )
+
+    def _fetch_uncached(
+        self,
+        *,
+        category: Optional[str],
+        country: Optional[str],
+        q: Optional[str],
+        limit: int,
+        language: Optional[str],
+        date_range: Optional[str],
+    ) -> List[Dict]:
         use_keyword_only = bool(q) and not (country or category)
         if self.newsapi_key:
             try:
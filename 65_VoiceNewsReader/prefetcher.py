@@ -0,0 +1,89 @@
+import threading
+from typing import List, Optional, Tuple
+
+from config import Config
+from news_agent import VoiceNewsAgent
+
+
+class NewsPrefetcher:
+    """Background thread that keeps popular feeds and their audio warm.
+
+    Every ``interval`` seconds it refreshes the configured feeds plus the most
+    requested ones, then pre-synthesizes their audio with the voice options the
+    last listener of that feed used, so typical requests are served from cache.
+    """
+
+    def __init__(
+        self,
+        agent: VoiceNewsAgent,
+        *,
+        interval: int = Config.PREFETCH_INTERVAL,
+        top_n: int = Config.PREFETCH_TOP_N,
+        feeds: Optional[List[str]] = None,
+    ) -> None:
+        self.agent = agent
+        self.interval = max(10, interval)
+        self.top_n = top_n
+        self.feeds = Config.PREFETCH_FEEDS if feeds is None else feeds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="news-prefetcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _configured_keys(self) -> List[Tuple[Optional[str], ...]]:
+        keys = []
+        for feed in self.feeds:
+            category, _, country = feed.partition(":")
+            keys.append(self.agent.news.cache_key(
+                category=category or Config.DEFAULT_CATEGORY,
+                country=country or Config.DEFAULT_COUNTRY,
+                language=Config.TTS_LANGUAGE,
+                date_range="any",
+            ))
+        return keys
+
+    def targets(self) -> List[Tuple[Optional[str], ...]]:
+        keys = self._configured_keys()
+        for key in self.agent.news.cache.popular(self.top_n):
+            if key not in keys:
+                keys.append(key)
+        return keys
+
+    def warm(self, key: Tuple[Optional[str], ...]) -> None:
+        items = self.agent.news.refresh(key)
+        if not items:
+            return
+        options = self.agent.feed_options(key)
+        limit = options.get("limit") or Config.DEFAULT_LIMIT
+        language = key[3]
+        self.agent.synthesize_cached(
+            self.agent.build_script(items, limit),
+            language=language,
+            gender=options.get("voice_gender"),
+            rate=options.get("voice_rate"),
+            pitch=options.get("voice_pitch"),
+        )
+
+    def run_once(self) -> None:
+        for key in self.targets():
+            if self._stop.is_set():
+                return
+            try:
+                self.warm(key)
+            except Exception as e:
+                print(f"Prefetch failed for {key}: {e}")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
@@ -1,6 +1,7 @@
 import os
 import tempfile
 import base64
+import threading
 from typing import Optional, Tuple
 
 from config import Config
@@ -49,9 +50,20 @@ class TTSService:
             except Exception:
                 self.pyttsx3_engine = None
 
+        # pyttsx3 drives a single native engine that must not be used from two threads
+        self._pyttsx3_lock = threading.Lock()
+
         os.makedirs(Config.AUDIO_DIR, exist_ok=True)
 
-    def synthesize(self, text: str, *, gender: Optional[str] = None, rate: Optional[int] = None, pitch: Optional[float] = None) -> Tuple[str, bytes]:
+    def synthesize(
+        self,
+        text: str,
+        *,
+        gender: Optional[str] = None,
+        rate: Optional[int] = None,
+        pitch: Optional[float] = None,
+        language: Optional[str] = None,
+    ) -> Tuple[str, bytes]:
         text = (text or "").strip()
         if not text:
             raise ValueError("Empty text for TTS")
@@ -61,6 +73,7 @@ class TTSService:
         voice_gender = (gender or self.default_gender).lower()
         voice_rate = rate or self.rate
         voice_pitch = pitch or self.pitch
+        voice_language = language or self.language or "en"
 
         audio_bytes: Optional[bytes] = None
         mime = "audio/mpeg"
@@ -86,7 +99,7 @@ class TTSService:
         # gTTS fallback
         if gTTS:
             try:
-                tts = gTTS(text=text, lang=(self.language or "en"), slow=False)
+                tts = gTTS(text=text, lang=voice_language, slow=False)
                 with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as f:
                     temp_path = f.name
                 tts.save(temp_path)
@@ -106,8 +119,9 @@ class TTSService:
             try:
                 with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as f:
                     temp_path = f.name
-                self.pyttsx3_engine.save_to_file(text, temp_path)
-                self.pyttsx3_engine.runAndWait()
+                with self._pyttsx3_lock:
+                    self.pyttsx3_engine.save_to_file(text, temp_path)
+                    self.pyttsx3_engine.runAndWait()
                 with open(temp_path, "rb") as f:
                     audio_bytes = f.read()
                 try:
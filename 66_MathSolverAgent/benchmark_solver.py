@@ -0,0 +1,95 @@
+"""
+Latency by problem class: local SymPy tier (cold and cached) versus Gemini
+
+    python benchmark_solver.py            # local tier only, no API key needed
+    python benchmark_solver.py --llm      # also time Gemini on the same problems
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from local_solver import normalise_problem, parse_problem, solve_parsed
+
+PROBLEMS = {
+    "arithmetic": ["2 + 2 * 3", "1/3 + 1/6", "sqrt(2) * sqrt(8)", "2^64 - 1", "sin(pi/6) + cos(pi/3)"],
+    "equation": ["2x + 3 = 7", "3x² - 12x = 0", "x^2 - 2 = 0", "solve for y: 2y - 4 = x", "x^3 - 6x^2 + 11x - 6 = 0"],
+    "system": ["x + y = 10, x - y = 2", "2x + 3y = 12 and x - y = 1", "x + y + z = 6; x - y = 0; 2z = 4",
+               "x^2 + y^2 = 25; x - y = 1"],
+    "derivative": ["derivative of x^3 + 2x", "d/dx sin(x) * x^2", "differentiate e^(2x) / x", "derivative of ln(x^2 + 1)"],
+    "integral": ["integrate x^2 dx", "integrate x^2 dx from 0 to 1", "integral of 1/x", "integrate x * e^x dx",
+                 "integrate sin(x)^2 dx from 0 to pi"],
+    "simplify": ["simplify (x^2 - 1)/(x - 1)", "factor x^2 - 5x + 6", "expand (x + 1)^3"],
+    "word problem": ["A train travels 120 km in 2 hours. What is its average speed?",
+                     "If 3 pencils cost 45 rupees, how much do 7 pencils cost?"],
+}
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def time_local(problem, repeats):
+    """Median milliseconds to parse and solve, or None when the problem is left to the LLM"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        parsed = parse_problem(problem)
+        if parsed is None or solve_parsed(parsed) is None:
+            return None
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MathSolverAgent latency by problem class")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--llm", action="store_true", help="Also time Gemini (needs GEMINI_API_KEY)")
+    args = parser.parse_args()
+
+    agent = None
+    if args.llm:
+        from math_agent import MathSolverAgent
+        agent = MathSolverAgent()
+
+    header = f"{'class':<14}{'problems':>9}{'local':>8}{'local p50':>11}{'local p95':>11}{'cached':>10}"
+    if agent:
+        header += f"{'gemini p50':>12}"
+    print(header)
+    print("-" * len(header))
+
+    parse_problem("x = 1")  # import and warm up SymPy's parser outside the timings
+    for problem_class, problems in PROBLEMS.items():
+        local = [t for t in (time_local(p, args.repeats) for p in problems) if t is not None]
+
+        # A cache hit costs what MathSolverAgent does before returning it: normalise, then look up
+        cache = {"text|" + normalise_problem(p): {} for p in problems}
+        start = time.perf_counter()
+        for problem in problems * 1000:
+            cache.get("text|" + normalise_problem(problem))
+        cached_ms = (time.perf_counter() - start) * 1000 / (len(problems) * 1000)
+
+        row = f"{problem_class:<14}{len(problems):>9}{len(local):>8}"
+        if local:
+            row += f"{percentile(local, 0.5):>9.1f}ms{percentile(local, 0.95):>9.1f}ms"
+        else:
+            row += f"{'-':>11}{'-':>11}"
+        row += f"{cached_ms * 1000:>8.1f}us"
+        if agent:
+            timings = []
+            for problem in problems:
+                start = time.perf_counter()
+                agent._solve_with_gemini(problem)
+                timings.append((time.perf_counter() - start) * 1000)
+            row += f"{percentile(timings, 0.5):>10.0f}ms"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,10 @@ class Config:
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
     UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "uploads")
     ALLOWED_EXTENSIONS = {'txt', 'docx', 'pdf'}
+    LOCAL_SOLVER = os.getenv("LOCAL_SOLVER", "True").lower() == "true"  # answer plain maths with SymPy
+    LOCAL_SOLVER_TIMEOUT = float(os.getenv("LOCAL_SOLVER_TIMEOUT", "5"))  # seconds before falling back to Gemini
+    LOCAL_SOLVER_WORKERS = int(os.getenv("LOCAL_SOLVER_WORKERS", "2"))
+    SOLUTION_CACHE_SIZE = int(os.getenv("SOLUTION_CACHE_SIZE", "1024"))
 
     @classmethod
     def validate(cls):
@@ -0,0 +1,319 @@
+"""
+Local symbolic solver tier for MathSolverAgent.
+
+Problems written as plain maths (arithmetic, equations, linear systems,
+derivatives, integrals, simplify/expand/factor) are parsed with SymPy and
+solved directly, in milliseconds and without an API call. Anything else,
+including word problems, is left to Gemini: parse_problem returns None.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import sympy
+from sympy.parsing.sympy_parser import (
+    convert_xor, implicit_multiplication_application, parse_expr, standard_transformations,
+)
+
+_TRANSFORMATIONS = standard_transformations + (implicit_multiplication_application, convert_xor)
+
+# Words allowed inside an expression; any other word means prose, which goes to the LLM
+_FUNCTIONS: Dict[str, object] = {
+    "sin": sympy.sin, "cos": sympy.cos, "tan": sympy.tan, "cot": sympy.cot, "sec": sympy.sec, "csc": sympy.csc,
+    "asin": sympy.asin, "acos": sympy.acos, "atan": sympy.atan, "arcsin": sympy.asin, "arccos": sympy.acos,
+    "arctan": sympy.atan, "sinh": sympy.sinh, "cosh": sympy.cosh, "tanh": sympy.tanh,
+    "log": sympy.log, "ln": sympy.log, "exp": sympy.exp, "sqrt": sympy.sqrt, "abs": sympy.Abs,
+    "pi": sympy.pi, "e": sympy.E, "oo": sympy.oo, "inf": sympy.oo, "infinity": sympy.oo,
+}
+# Results built from these are correct but no help to a student; Gemini explains those instead
+_OPAQUE = (sympy.exp_polar, sympy.lowergamma, sympy.uppergamma, sympy.meijerg, sympy.hyper, sympy.polylog)
+_LOCAL_DICT = dict(_FUNCTIONS, **{letter: sympy.Symbol(letter) for letter in "abcdfghijklmnopqrstuvwxyz"})
+
+_UNICODE = {"²": "^2", "³": "^3", "×": "*", "·": "*", "÷": "/", "−": "-", "–": "-", "√": "sqrt", "π": "pi"}
+_ALLOWED_CHARS = re.compile(r"^[0-9a-z\s+\-*/^().,=]+$")
+_WORD = re.compile(r"[a-z]+")
+_NON_FINITE = re.compile(r"\b(?:zoo|nan|oo)\b")
+# Inputs that would make SymPy compute enormous numbers: long literals, huge powers, numeric power towers
+_TOO_BIG = re.compile(r"\d{16,}|\^\s*\(?\s*\d{4,}|\d\s*\^\s*\(?\s*\d+\s*\)?\s*\^\s*\(?\s*\d")
+MAX_PROBLEM_CHARS = 200
+
+_DERIVATIVE = re.compile(
+    r"^(?:find |what is |compute )?(?:the )?(?:derivative of|differentiate)\s+(?P<expr>.+?)"
+    r"(?:\s+(?:with respect to|wrt)\s+(?P<var>[a-z]))?$"
+)
+_DERIVATIVE_D = re.compile(r"^d/d(?P<var>[a-z])\s*(?P<expr>.+)$")
+_INTEGRAL = re.compile(
+    r"^(?:find |what is |compute |evaluate )?(?:the )?(?:integral of|integrate)\s+(?P<expr>.+?)"
+    r"(?:\s*d(?P<var>[a-z]))?(?:\s+from\s+(?P<lower>\S+)\s+to\s+(?P<upper>\S+))?$"
+)
+_TRANSFORM = re.compile(r"^(?P<op>simplify|expand|factor)\s*:?\s+(?P<expr>.+)$")
+_SOLVE = re.compile(
+    r"^(?:solve|find|calculate|compute|evaluate|what is|what's)"
+    r"(?:\s+for\s+(?P<vars>[a-z](?:\s*(?:,|and)\s*[a-z])*))?\s*:?\s*(?P<body>.+)$"
+)
+_EQUATION_SPLIT = re.compile(r"\s*(?:;|,|\band\b)\s*")
+
+
+@dataclass
+class ParsedProblem:
+    kind: str  # arithmetic, expression, equation, system, derivative, integral, simplify, expand, factor
+    expressions: List[sympy.Expr]
+    variables: List[sympy.Symbol] = field(default_factory=list)
+    limits: Optional[tuple] = None  # (lower, upper) of a definite integral
+
+    @property
+    def key(self) -> str:
+        """Canonical form: the same problem written differently ("2x+3=7", "2*x + 3 = 7") shares a key"""
+        limits = sympy.srepr(self.limits) if self.limits else ""
+        parts = [sympy.srepr(expr) for expr in self.expressions]
+        return f"{self.kind}|{','.join(map(str, self.variables))}|{limits}|{';'.join(parts)}"
+
+
+def normalise_problem(problem: str) -> str:
+    """Lower-cased, ASCII operators, single spaces, no trailing full stop or question mark"""
+    text = problem.strip().lower()
+    for symbol, replacement in _UNICODE.items():
+        text = text.replace(symbol, replacement)
+    text = text.replace("**", "^")
+    text = re.sub(r"\s+", " ", text)
+    # "!" is kept: "5!" is a factorial, and the local parser leaves it to the LLM
+    return text.rstrip(" .?")
+
+
+def _parse(text: str) -> Optional[sympy.Expr]:
+    text = text.strip()
+    if not text or not _ALLOWED_CHARS.match(text) or _TOO_BIG.search(text):
+        return None
+    if any(word not in _FUNCTIONS and len(word) > 1 for word in _WORD.findall(text)):
+        return None
+    try:
+        expr = parse_expr(text, local_dict=_LOCAL_DICT, transformations=_TRANSFORMATIONS)
+    except Exception:  # SymPy raises many different types on malformed input
+        return None
+    return expr if isinstance(expr, sympy.Expr) else None
+
+
+def _parse_equation(text: str) -> Optional[sympy.Expr]:
+    """'lhs = rhs' as the expression lhs - rhs (equal to zero)"""
+    if text.count("=") != 1:
+        return None
+    left, right = (_parse(side) for side in text.split("="))
+    if left is None or right is None:
+        return None
+    return left - right
+
+
+def _pick_variable(expr: sympy.Expr, requested: Optional[str] = None) -> Optional[sympy.Symbol]:
+    symbols = sorted(expr.free_symbols, key=str)
+    if requested:
+        return sympy.Symbol(requested)
+    if not symbols:
+        return None
+    return sympy.Symbol("x") if sympy.Symbol("x") in symbols else symbols[0]
+
+
+def parse_problem(problem: str) -> Optional[ParsedProblem]:
+    """Recognises problems the local solver can answer; None means "ask the LLM" """
+    text = normalise_problem(problem)
+    if not text or len(text) > MAX_PROBLEM_CHARS:
+        return None
+
+    match = _DERIVATIVE.match(text) or _DERIVATIVE_D.match(text)
+    if match:
+        expr = _parse(match.group("expr"))
+        if expr is None:
+            return None
+        variable = _pick_variable(expr, match.group("var"))
+        return ParsedProblem("derivative", [expr], [variable] if variable else [])
+
+    match = _INTEGRAL.match(text)
+    if match:
+        expr = _parse(match.group("expr"))
+        if expr is None:
+            return None
+        variable = _pick_variable(expr, match.group("var")) or sympy.Symbol("x")
+        limits = None
+        if match.group("lower"):
+            lower, upper = _parse(match.group("lower")), _parse(match.group("upper"))
+            if lower is None or upper is None:
+                return None
+            limits = (lower, upper)
+        return ParsedProblem("integral", [expr], [variable], limits)
+
+    match = _TRANSFORM.match(text)
+    if match:
+        expr = _parse(match.group("expr"))
+        return ParsedProblem(match.group("op"), [expr]) if expr is not None else None
+
+    requested: List[str] = []
+    match = _SOLVE.match(text)
+    if match:
+        text = match.group("body")
+        if match.group("vars"):
+            requested = _WORD.findall(match.group("vars").replace("and", ","))
+
+    if "=" not in text:
+        expr = _parse(text)
+        if expr is None:
+            return None
+        return ParsedProblem("expression" if expr.free_symbols else "arithmetic", [expr])
+
+    parts = [part for part in _EQUATION_SPLIT.split(text) if part]
+    if len(parts) > 1 and all("=" in part for part in parts):
+        equations = [_parse_equation(part) for part in parts]
+        if any(eq is None for eq in equations):
+            return None
+        symbols = requested or sorted({str(s) for eq in equations for s in eq.free_symbols})
+        return ParsedProblem("system", equations, [sympy.Symbol(name) for name in symbols])
+
+    equation = _parse_equation(text)
+    if equation is None:
+        return None
+    variable = _pick_variable(equation, requested[0] if requested else None)
+    return ParsedProblem("equation", [equation], [variable] if variable else [])
+
+
+def _with_decimal(value: sympy.Expr) -> str:
+    """Exact value, followed by a decimal approximation when it is not a plain number"""
+    text = sympy.sstr(value)
+    if value.is_number and value.is_real and not value.is_Rational:
+        return f"{text} ≈ {sympy.sstr(sympy.N(value, 6))}"
+    return text
+
+
+def solve_parsed(parsed: ParsedProblem) -> Optional[dict]:
+    """Solution in MathSolverAgent's response format, or None when SymPy cannot finish the job"""
+    solver = _SOLVERS[parsed.kind]
+    result = solver(parsed)
+    if result is None:
+        return None
+    steps, final_answer, graph = result
+    if _NON_FINITE.search(final_answer):
+        return None  # zoo / nan / oo: let the LLM explain the singularity
+    return {
+        "steps": [f"Step {i}: {step}" for i, step in enumerate(steps, 1)],
+        "final_answer": final_answer,
+        "graph_description": graph,
+    }
+
+
+def _solve_arithmetic(parsed: ParsedProblem):
+    expr = parsed.expressions[0]
+    value = sympy.simplify(expr)
+    if value.has(sympy.zoo, sympy.nan, sympy.oo, -sympy.oo):
+        answer = "undefined"  # 1/0, 0/0
+        return [f"Evaluate {sympy.sstr(expr)}", "Division by zero: the value is undefined"], answer, ""
+    if value.has(sympy.Float) and value.is_real:
+        answer = format(float(value), ".12g")  # decimals in, decimals out: 0.1 + 0.2 = 0.3
+    else:
+        answer = _with_decimal(value)
+    return [f"Evaluate {sympy.sstr(expr)}", f"= {answer}"], answer, ""
+
+
+def _solve_transform(parsed: ParsedProblem):
+    expr = parsed.expressions[0]
+    operation = {"expression": sympy.simplify, "simplify": sympy.simplify,
+                 "expand": sympy.expand, "factor": sympy.factor}[parsed.kind]
+    result = operation(expr)
+    name = "Simplify" if parsed.kind == "expression" else parsed.kind.capitalize()
+    return [f"{name} {sympy.sstr(expr)}", f"= {sympy.sstr(result)}"], sympy.sstr(result), ""
+
+
+def _solve_equation(parsed: ParsedProblem):
+    expr = parsed.expressions[0]
+    if not parsed.variables:
+        holds = sympy.simplify(expr) == 0
+        return [f"Check whether {sympy.sstr(expr)} = 0"], "True" if holds else "False", ""
+
+    variable = parsed.variables[0]
+    expanded = sympy.expand(expr)
+    steps = [f"Move every term to one side: {sympy.sstr(expanded)} = 0"]
+    factored = sympy.factor(expanded)
+    if factored != expanded and factored.is_Mul:
+        steps.append(f"Factor: {sympy.sstr(factored)} = 0")
+    solutions = sympy.solve(expanded, variable)
+    if not isinstance(solutions, list):
+        return None
+    if not solutions:
+        steps.append(f"The equation has no solution for {variable}")
+        return steps, "No solution", ""
+
+    answers = [f"{variable} = {_with_decimal(s)}" for s in solutions]
+    steps.append(f"Solve for {variable}: " + ", ".join(answers))
+    graph = ""
+    real_roots = [s for s in solutions if s.is_real]
+    if len(expanded.free_symbols) == 1 and real_roots:
+        roots = ", ".join(_with_decimal(s) for s in real_roots)
+        graph = f"The graph of y = {sympy.sstr(expanded)} crosses the x-axis at {variable} = {roots}."
+    return steps, ", ".join(answers), graph
+
+
+def _solve_system(parsed: ParsedProblem):
+    equations, variables = parsed.expressions, parsed.variables
+    steps = ["Write the system:"] + [f"  {sympy.sstr(eq)} = 0" for eq in equations]
+    is_linear = all(sympy.Poly(eq, *variables).total_degree() <= 1
+                    for eq in equations if eq.is_polynomial(*variables))
+    if is_linear and all(eq.is_polynomial(*variables) for eq in equations):
+        steps.append("Solve the linear system by elimination")
+        solutions = list(sympy.linsolve(equations, variables))
+    else:
+        steps.append("Solve the equations simultaneously by substitution")
+        solutions = [tuple(s[v] if v in s else v for v in variables)
+                     for s in sympy.solve(equations, variables, dict=True)]
+    if not solutions:
+        steps.append("The system has no solution")
+        return steps, "No solution", ""
+
+    answers = ["; ".join(f"{v} = {_with_decimal(value)}" for v, value in zip(variables, solution))
+               for solution in solutions]
+    steps.append("Solution: " + " or ".join(answers))
+    return steps, " or ".join(answers), ""
+
+
+def _solve_derivative(parsed: ParsedProblem):
+    expr = parsed.expressions[0]
+    if not parsed.variables:
+        return [f"{sympy.sstr(expr)} is a constant, so its derivative is 0"], "0", ""
+    variable = parsed.variables[0]
+    derivative = sympy.diff(expr, variable)
+    simplified = sympy.simplify(derivative)
+    steps = [f"Differentiate {sympy.sstr(expr)} with respect to {variable}", f"d/d{variable} = {sympy.sstr(derivative)}"]
+    if simplified != derivative:
+        steps.append(f"Simplify: {sympy.sstr(simplified)}")
+    return steps, sympy.sstr(simplified), ""
+
+
+def _solve_integral(parsed: ParsedProblem):
+    expr, variable = parsed.expressions[0], parsed.variables[0]
+    antiderivative = sympy.integrate(expr, variable)
+    if antiderivative.has(sympy.Integral, *_OPAQUE):
+        return None  # no elementary closed form; let the LLM explain
+    steps = [f"Find an antiderivative of {sympy.sstr(expr)} with respect to {variable}",
+             f"∫ {sympy.sstr(expr)} d{variable} = {sympy.sstr(antiderivative)} + C"]
+    if parsed.limits is None:
+        return steps, f"{sympy.sstr(antiderivative)} + C", ""
+
+    lower, upper = parsed.limits
+    # Integrated over the interval rather than F(b) - F(a), which is wrong across a singularity
+    value = sympy.simplify(sympy.integrate(expr, (variable, lower, upper)))
+    if value.has(sympy.Integral, sympy.nan, sympy.zoo, *_OPAQUE):
+        return None
+    bounds = f"from {sympy.sstr(lower)} to {sympy.sstr(upper)}"
+    if value in (sympy.oo, -sympy.oo):
+        steps.append(f"Evaluate {bounds}: the integral diverges to {sympy.sstr(value)}")
+        return steps, "The integral diverges", ""
+    steps.append(f"Evaluate {bounds}: {_with_decimal(value)}")
+    return steps, _with_decimal(value), ""
+
+
+_SOLVERS = {
+    "arithmetic": _solve_arithmetic,
+    "expression": _solve_transform,
+    "simplify": _solve_transform,
+    "expand": _solve_transform,
+    "factor": _solve_transform,
+    "equation": _solve_equation,
+    "system": _solve_system,
+    "derivative": _solve_derivative,
+    "integral": _solve_integral,
+}
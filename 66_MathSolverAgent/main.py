@@ -43,7 +43,7 @@ async def solve_problem_get():
     return {"message": "This is the GET endpoint for /api/solve. Use POST to submit problems."}
 
 @app.post("/api/solve")
-async def solve_problem_api(payload: SolveRequest):
+def solve_problem_api(payload: SolveRequest):
     if agent is None:
         raise HTTPException(status_code=500, detail="MathSolverAgent not initialized.")
     try:
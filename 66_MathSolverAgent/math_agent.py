@@ -1,6 +1,36 @@
 import google.generativeai as genai
+import threading
 import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from config import Config
+from local_solver import normalise_problem, parse_problem, solve_parsed
+
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "top_p": 1,
+    "top_k": 1,
+    "max_output_tokens": 2048,
+}
+
+SAFETY_SETTINGS = [
+    {
+        "category": "HARM_CATEGORY_HARASSMENT",
+        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+    },
+    {
+        "category": "HARM_CATEGORY_HATE_SPEECH",
+        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+    },
+    {
+        "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
+        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+    },
+    {
+        "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
+        "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+    },
+]
 
 class MathSolverAgent:
     def __init__(self):
@@ -12,43 +42,92 @@ class MathSolverAgent:
             print("DEBUG: Gemini API Key is not set in config.py")
 
         genai.configure(api_key=Config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(model_name="gemini-2.0-flash-001")
+        self.model = genai.GenerativeModel(model_name="gemini-2.0-flash-001",
+                                           generation_config=GENERATION_CONFIG,
+                                           safety_settings=SAFETY_SETTINGS)
+
+        # Solutions by normalised problem text and by canonical SymPy form
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # SymPy cannot be interrupted, so hard problems run here and are abandoned after the timeout.
+        # Abandoned problems keep their worker busy; once every worker is stuck, local solving is skipped.
+        self._local_pool = ThreadPoolExecutor(max_workers=Config.LOCAL_SOLVER_WORKERS, thread_name_prefix="sympy")
+        self._stuck_lock = threading.Lock()
+        self._stuck = 0
 
     def solve_math_problem(self, problem: str):
         """
-        Solves a math problem step-by-step using the Google Gemini API in streaming mode.
+        Solves a math problem step-by-step. Cached answers are returned first;
+        plain maths (arithmetic, equations, systems, derivatives, integrals) is
+        solved locally with SymPy; word problems and anything SymPy cannot
+        finish in time go to the Google Gemini API.
         """
-        
-        generation_config = {
-            "temperature": 0.7,
-            "top_p": 1,
-            "top_k": 1,
-            "max_output_tokens": 2048,
-        }
-
-        safety_settings = [
-            {
-                "category": "HARM_CATEGORY_HARASSMENT",
-                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-            },
-            {
-                "category": "HARM_CATEGORY_HATE_SPEECH",
-                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-            },
-            {
-                "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-            },
-            {
-                "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-            },
-        ]
+        text_key = "text|" + normalise_problem(problem)
+        cached = self._cache_get(text_key)
+        if cached:
+            return cached
 
-        self.model = genai.GenerativeModel(model_name="gemini-2.0-flash-001",
-                                      generation_config=generation_config,
-                                      safety_settings=safety_settings)
+        parsed = parse_problem(problem) if Config.LOCAL_SOLVER else None
+        if parsed is not None:
+            form_key = "form|" + parsed.key
+            cached = self._cache_get(form_key)
+            if cached:
+                self._cache_put(text_key, cached)
+                return cached
+            solution = self._solve_locally(parsed)
+            if solution is not None:
+                solution.update(source="local", problem_class=parsed.kind)
+                self._cache_put(text_key, solution)
+                self._cache_put(form_key, solution)
+                return solution
+
+        solution = self._solve_with_gemini(problem)
+        solution.update(source="gemini", problem_class=parsed.kind if parsed else "general")
+        if solution["final_answer"] != "Error":
+            self._cache_put(text_key, solution)
+        return solution
 
+    def _solve_locally(self, parsed):
+        with self._stuck_lock:
+            if self._stuck >= Config.LOCAL_SOLVER_WORKERS:
+                print("DEBUG: Local solver busy with abandoned problems; using Gemini")
+                return None
+        future = self._local_pool.submit(solve_parsed, parsed)
+        try:
+            return future.result(timeout=Config.LOCAL_SOLVER_TIMEOUT)
+        except FutureTimeout:
+            print(f"DEBUG: Local solver timed out on a {parsed.kind} problem; using Gemini")
+            if not future.cancel():  # already running: it holds a worker until SymPy finishes
+                with self._stuck_lock:
+                    self._stuck += 1
+                future.add_done_callback(self._release_stuck)
+        except Exception as e:
+            print(f"DEBUG: Local solver failed ({e}); using Gemini")
+        return None
+
+    def _release_stuck(self, future):
+        with self._stuck_lock:
+            self._stuck -= 1
+
+    def _cache_get(self, key):
+        with self._cache_lock:
+            solution = self._cache.get(key)
+            if solution is None:
+                return None
+            self._cache.move_to_end(key)
+        return dict(solution, cached=True)
+
+    def _cache_put(self, key, solution):
+        with self._cache_lock:
+            self._cache[key] = solution
+            self._cache.move_to_end(key)
+            while len(self._cache) > Config.SOLUTION_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def _solve_with_gemini(self, problem: str):
+        """
+        Solves a math problem step-by-step using the Google Gemini API in streaming mode.
+        """
         prompt_parts = [
             "You are MathSolverAgent, an AI chatbot that solves math problems step-by-step with clear logic and explanation. ",
             "You should:\n",
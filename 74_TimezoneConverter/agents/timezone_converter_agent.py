@@ -4,6 +4,7 @@ import re
 from typing import Any, Dict, Optional
 from dotenv import load_dotenv
 from config import MODEL_PROVIDER, MODEL_NAME, GEMINI_API_KEY, DEFAULT_SOURCE_TIMEZONE, DEFAULT_TARGET_TIMEZONE
+from utils.query_grammar import parse_query
 
 load_dotenv()
 
@@ -13,6 +14,8 @@ class TimezoneConverterAgent:
         self.model_name = MODEL_NAME
         self.gemini_api_key = GEMINI_API_KEY
         self.system_prompt_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'prompts', 'system_prompt.txt')
+        self._system_prompt = None
+        self._model = None
 
     def _extract_json(self, text: str) -> Optional[Dict[str, Any]]:
         if not text:
@@ -30,19 +33,28 @@ class TimezoneConverterAgent:
                     return None
             return None
 
+    def _get_system_prompt(self) -> str:
+        if self._system_prompt is None:
+            try:
+                with open(self.system_prompt_path, 'r', encoding='utf-8') as f:
+                    self._system_prompt = f.read()
+            except Exception:
+                self._system_prompt = "You extract time and timezones and reply only JSON."
+        return self._system_prompt
+
+    def _get_model(self):
+        # Created on first use: most queries are parsed locally and never need it
+        if self._model is None:
+            import google.generativeai as genai
+            genai.configure(api_key=self.gemini_api_key)
+            self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
     def _llm_parse(self, prompt: str) -> Dict[str, Any]:
-        try:
-            with open(self.system_prompt_path, 'r', encoding='utf-8') as f:
-                system_prompt = f.read()
-        except Exception:
-            system_prompt = "You extract time and timezones and reply only JSON."
-        user_prompt = system_prompt + "\nUser query:" + prompt.strip()
+        user_prompt = self._get_system_prompt() + "\nUser query:" + prompt.strip()
         if self.model_provider == "gemini" and self.gemini_api_key:
             try:
-                import google.generativeai as genai
-                genai.configure(api_key=self.gemini_api_key)
-                model = genai.GenerativeModel(self.model_name)
-                resp = model.generate_content(user_prompt)
+                resp = self._get_model().generate_content(user_prompt)
                 text = (getattr(resp, 'text', None) or '').strip()
                 data = self._extract_json(text)
                 if data:
@@ -110,6 +122,10 @@ class TimezoneConverterAgent:
         }
 
     def parse_user_input(self, user_str: str) -> Dict[str, Any]:
+        # Local grammar first; the LLM only sees queries it cannot read
+        parsed = parse_query(user_str)
+        if parsed:
+            return parsed
         parsed = self._llm_parse(user_str)
         if 'error' in parsed:
             # fallback to heuristic parser
@@ -120,9 +136,8 @@ class TimezoneConverterAgent:
         return parsed
 
     def perform_timezone_conversion(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
-        from utils.timezone_utils import resolve_timezone_name, get_timezone_info
+        from utils.timezone_utils import resolve_timezone_name, get_timezone_info, get_tz
         from datetime import datetime
-        import pytz
         
         input_time = parsed.get("input_time")
         input_date = parsed.get("input_date")
@@ -144,8 +159,8 @@ class TimezoneConverterAgent:
                     continue
             if naive_dt is None:
                 raise Exception("Could not parse date/time.")
-            src_tz_obj = pytz.timezone(source_tz)
-            tgt_tz_obj = pytz.timezone(target_tz)
+            src_tz_obj = get_tz(source_tz)
+            tgt_tz_obj = get_tz(target_tz)
             src_dt = src_tz_obj.localize(naive_dt, is_dst=None)
             tgt_dt = src_dt.astimezone(tgt_tz_obj)
             out = {
@@ -0,0 +1,35 @@
+import argparse
+import time
+
+from utils.bulk_convert import convert_csv
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a CSV column of timestamps into one or more timezones",
+        epilog='Example: python -m cli.bulk events.csv --column start --source "New York" --targets IST Tokyo UTC',
+    )
+    parser.add_argument("input", help="CSV file to read")
+    parser.add_argument("--column", required=True, help="Column holding the timestamps")
+    parser.add_argument("--source", default="UTC", help="Timezone of timestamps without an offset (default: UTC)")
+    parser.add_argument("--targets", nargs="+", required=True, help="Timezones, abbreviations or cities to convert to")
+    parser.add_argument("--output", help="CSV file to write (default: <input>_converted.csv)")
+    parser.add_argument("--input-format", help="strptime format of the timestamps (default: inferred)")
+    parser.add_argument("--output-format", help="strftime format for converted values (default: ISO with offset)")
+    args = parser.parse_args()
+
+    output = args.output or args.input.rsplit(".", 1)[0] + "_converted.csv"
+    start = time.perf_counter()
+    try:
+        stats = convert_csv(args.input, output, args.column, args.source, args.targets,
+                            args.input_format, args.output_format)
+    except (ValueError, OSError) as e:
+        parser.exit(1, f"❗ {e}\n")
+    elapsed = time.perf_counter() - start
+    print(f"✅ Converted {stats['rows']:,} rows into {len(args.targets)} timezone(s) in {elapsed:.2f}s → {output}")
+    if stats["unparsed"]:
+        print(f"⚠️ {stats['unparsed']:,} rows could not be parsed or fall in a DST gap/overlap (left empty)")
+
+
+if __name__ == "__main__":
+    main()
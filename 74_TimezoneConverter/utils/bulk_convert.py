@@ -0,0 +1,98 @@
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from utils.timezone_utils import resolve_timezone_name
+
+# Timestamps that carry their own offset ("...+05:30", "...Z") are converted from that offset
+_HAS_OFFSET = r"(?:[+-]\d{2}:?\d{2}|[zZ])\s*$"
+
+
+def resolve_zones(names: List[str]) -> Dict[str, str]:
+    """User zone names ("IST", "New York", "Asia/Tokyo") to IANA names; raises ValueError on unknown ones"""
+    zones = {}
+    for name in names:
+        zone = resolve_timezone_name(name)
+        if not zone:
+            raise ValueError(f"Unknown timezone or location: {name}")
+        zones[name] = zone
+    return zones
+
+
+def _parse(values: pd.Series, input_format: Optional[str], utc: bool) -> pd.Series:
+    """Vectorised parse; rows the inferred format misses are retried one by one"""
+    parsed = pd.to_datetime(values, format=input_format, errors="coerce", utc=utc)
+    if input_format is None:
+        missed = parsed.isna() & values.notna()
+        if missed.any():
+            parsed[missed] = pd.to_datetime(values[missed], format="mixed", errors="coerce", utc=utc)
+    return parsed
+
+
+def to_utc(values: pd.Series, source_tz: str, input_format: Optional[str] = None) -> pd.Series:
+    """
+    Parses a column of timestamps into UTC. Naive timestamps are read as
+    source_tz wall-clock times; times that do not exist or are ambiguous
+    there (DST gaps and overlaps) become NaT rather than guesses.
+    """
+    values = values.astype("string").str.strip().replace("", pd.NA)
+    has_offset = values.str.contains(_HAS_OFFSET, regex=True, na=False)
+    result = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns, UTC]")
+    if has_offset.any():
+        result[has_offset] = _parse(values[has_offset], input_format, utc=True)
+    naive = ~has_offset
+    if naive.any():
+        local = _parse(values[naive], input_format, utc=False)
+        result[naive] = local.dt.tz_localize(source_tz, ambiguous="NaT", nonexistent="NaT").dt.tz_convert("UTC")
+    return result
+
+
+def _format_iso(converted: pd.Series, utc: pd.Series) -> pd.Series:
+    """
+    "YYYY-MM-DD HH:MM:SS+HH:MM" strings, built from array operations: the
+    wall-clock part via the fast naive formatter, the offset looked up from
+    the handful of distinct offsets. Much quicker than formatting each
+    timezone-aware timestamp on its own, which is what to_csv would do.
+    """
+    local = converted.dt.tz_localize(None)
+    offsets = (local - utc.dt.tz_localize(None)).dt.total_seconds()
+    labels = {}
+    for seconds in offsets.dropna().unique():
+        hours, minutes = divmod(abs(int(seconds)) // 60, 60)
+        labels[seconds] = f"{'-' if seconds < 0 else '+'}{hours:02d}:{minutes:02d}"
+    return local.astype(str) + offsets.map(labels)
+
+
+def convert_frame(df: pd.DataFrame, column: str, source_tz: str, target_zones: Dict[str, str],
+                  input_format: Optional[str] = None, output_format: Optional[str] = None) -> pd.DataFrame:
+    """Adds one column per target zone, named "<column> (<zone>)", converting the whole column at once"""
+    if column not in df.columns:
+        raise ValueError(f"Column '{column}' not found. Available columns: {', '.join(map(str, df.columns))}")
+    utc = to_utc(df[column], source_tz, input_format)
+    for zone in dict.fromkeys(target_zones.values()):
+        converted = utc.dt.tz_convert(zone)
+        df[f"{column} ({zone})"] = converted.dt.strftime(output_format) if output_format else _format_iso(converted, utc)
+    return df
+
+
+def convert_csv(input_path: str, output_path: str, column: str, source: str, targets: List[str],
+                input_format: Optional[str] = None, output_format: Optional[str] = None,
+                chunksize: int = 200_000) -> Dict[str, int]:
+    """
+    Converts a CSV column of timestamps into several zones and writes the
+    file with the new columns added. The file is processed in chunks, so its
+    size is not limited by memory. Returns row counts.
+    """
+    if not targets:
+        raise ValueError("At least one target timezone is required")
+    source_tz = resolve_zones([source])[source]
+    target_zones = resolve_zones(targets)
+    first_column = f"{column} ({next(iter(target_zones.values()))})"
+    stats = {"rows": 0, "unparsed": 0}
+    reader = pd.read_csv(input_path, chunksize=chunksize, dtype={column: "string"}, keep_default_na=False)
+    for i, chunk in enumerate(reader):
+        chunk = convert_frame(chunk, column, source_tz, target_zones, input_format, output_format)
+        stats["rows"] += len(chunk)
+        stats["unparsed"] += int(chunk[first_column].isna().sum())
+        chunk.to_csv(output_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+    return stats
@@ -0,0 +1,164 @@
+import re
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.timezone_utils import OFFSET_PATTERN, offset_zone, resolve_timezone_name
+
+# Local grammar for conversion queries: a time, an optional date and up to two
+# places or zones, e.g. "Convert 3 PM PST to IST", "22:00 UTC to CET on 2025-10-18",
+# "What's 12 noon Chicago in London time?". Anything it cannot read goes to the LLM.
+
+_TIME_PATTERNS = [
+    re.compile(r"\b(?P<h>\d{1,2}):(?P<m>\d{2})(?::\d{2})?(?:\s*(?P<ampm>[ap])\.?m\b\.?)?"),
+    re.compile(r"\b(?P<h>\d{1,2})\s*(?P<ampm>[ap])\.?m\b\.?"),
+    re.compile(r"\b(?:12\s*)?(?P<noon>noon|midday)\b"),
+    re.compile(r"\b(?:12\s*)?(?P<midnight>midnight)\b"),
+]
+
+_MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+_MONTH = r"(?P<month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+_DAY = r"(?P<day>\d{1,2})(?:st|nd|rd|th)?"
+_YEAR = r"(?:,?\s+(?P<year>\d{4}))?"
+_DATE_PATTERNS = [
+    re.compile(r"\b(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})\b"),
+    re.compile(rf"\b{_MONTH}\s+{_DAY}\b{_YEAR}"),
+    re.compile(rf"\b{_DAY}\s+(?:of\s+)?{_MONTH}{_YEAR}"),
+]
+_RELATIVE_DAYS = {"yesterday": -1, "today": 0, "tonight": 0, "tomorrow": 1}
+
+_WORD = re.compile(r"[a-z][a-z_\-]*(?:/[a-z_\-]+)*")
+_TARGET_WORDS = {"to", "into"}
+# A bare tz-database city ("kolkata") only counts as a place after one of these
+_PLACE_WORDS = {"in", "from", "to", "into"}
+# Never place names on their own, however the tz database spells things
+_STOPWORDS = {"in", "to", "into", "at", "on", "is", "it", "the", "a", "an", "what", "whats", "time", "s", "and",
+              "for", "from", "convert", "me", "when", "call", "meeting", "will", "be", "there", "of", "my"}
+_MAX_PLACE_WORDS = 3
+
+
+def _find_time(text: str) -> Optional[Tuple[str, Tuple[int, int]]]:
+    for pattern in _TIME_PATTERNS:
+        for m in pattern.finditer(text):
+            groups = m.groupdict()
+            if groups.get("noon"):
+                return "12:00 PM", m.span()
+            if groups.get("midnight"):
+                return "12:00 AM", m.span()
+            hour, minute = int(groups["h"]), int(groups.get("m") or 0)
+            ampm = groups.get("ampm")
+            if minute > 59 or hour > (12 if ampm else 23) or (ampm and hour == 0):
+                continue
+            if ampm:
+                return f"{hour:d}:{minute:02d} {ampm.upper()}M", m.span()
+            return f"{hour:02d}:{minute:02d}", m.span()
+    return None
+
+
+def _find_date(text: str, today: date) -> Optional[Tuple[str, Tuple[int, int]]]:
+    for pattern in _DATE_PATTERNS:
+        m = pattern.search(text)
+        if not m:
+            continue
+        month = m.group("month")
+        month = int(month) if month.isdigit() else _MONTHS[month[:3]]
+        year = int(m.group("year")) if m.group("year") else today.year
+        try:
+            return date(year, month, int(m.group("day"))).isoformat(), m.span()
+        except ValueError:
+            continue
+    for word, offset in _RELATIVE_DAYS.items():
+        m = re.search(rf"\b{word}\b", text)
+        if m:
+            return (today + timedelta(days=offset)).isoformat(), m.span()
+    return None
+
+
+def _mask(text: str, spans: List[Tuple[int, int]]) -> str:
+    for start, end in spans:
+        text = text[:start] + " " * (end - start) + text[end:]
+    return text
+
+
+def _find_offsets(text: str) -> Optional[List[Tuple[int, str, str, Tuple[int, int]]]]:
+    """
+    (position, Etc/ zone, word before it, span) for each "GMT+5" style offset,
+    or None when one of them (e.g. "GMT+5:30") has no fixed-offset zone.
+    """
+    offsets = []
+    for m in OFFSET_PATTERN.finditer(text):
+        zone = offset_zone(m.group("sign"), int(m.group("h")), int(m.group("m") or 0))
+        if zone is None:
+            return None
+        before = _WORD.findall(text[:m.start()])
+        offsets.append((m.start(), zone, before[-1] if before else "", m.span()))
+    return offsets
+
+
+def _find_places(text: str) -> List[Tuple[int, str, str]]:
+    """(position, IANA zone, word before it) for each place or zone mentioned, longest names first"""
+    places = []
+    words = [(m.start(), m.group()) for m in _WORD.finditer(text)]
+    i = 0
+    while i < len(words):
+        before = words[i - 1][1] if i else ""
+        for n in range(min(_MAX_PLACE_WORDS, len(words) - i), 0, -1):
+            phrase = " ".join(word for _, word in words[i:i + n])
+            if n == 1 and phrase in _STOPWORDS:
+                continue
+            zone = resolve_timezone_name(phrase, cities=before in _PLACE_WORDS)
+            if zone:
+                places.append((words[i][0], zone, before))
+                i += n
+                break
+        else:
+            i += 1
+    return places
+
+
+def parse_query(user_str: str, today: Optional[date] = None) -> Optional[Dict[str, Any]]:
+    """
+    Parses a conversion request without the LLM. Returns the same fields the
+    LLM extraction does, or None when there is no time or no recognisable zone.
+    """
+    text = user_str.lower()
+    # Offsets first, so the "5:30" of "GMT+5:30" is not read as the time
+    offsets = _find_offsets(text)
+    if offsets is None:
+        return None
+    text = _mask(text, [span for *_, span in offsets])
+    found_time = _find_time(text)
+    if not found_time:
+        return None
+    input_time, time_span = found_time
+    found_date = _find_date(text, today or date.today())
+
+    # Blank out the time and date so "pm" or "may" are not read as places
+    masked = _mask(text, [span for _, span in filter(None, [found_time, found_date])])
+    places = sorted(_find_places(masked) + [offset[:3] for offset in offsets])
+    if not places:
+        return None
+
+    source = target = None
+    targets = [p for p in places if p[2] in _TARGET_WORDS]
+    if len(places) == 1:
+        if targets:
+            target = places[0][1]
+        else:
+            source = places[0][1]
+    else:
+        target_place = targets[-1] if targets else None
+        candidates = [p for p in places if p is not target_place]
+        # The zone the time belongs to is the one written next to it
+        source_place = min(candidates, key=lambda p: abs(p[0] - time_span[0]))
+        if target_place is None:
+            target_place = [p for p in places if p is not source_place][-1]
+        source, target = source_place[1], target_place[1]
+
+    return {
+        "input_time": input_time,
+        "input_date": found_date[0] if found_date else None,
+        "source_timezone": source,
+        "target_timezone": target,
+        "note": "grammar",
+    }
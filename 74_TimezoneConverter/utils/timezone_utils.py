@@ -1,5 +1,7 @@
 import pytz
+import re
 from datetime import datetime
+from functools import lru_cache
 
 _ABBR_MAP = {
     # Common North America
@@ -46,9 +48,65 @@ _LOCATION_MAP = {
     "india": "Asia/Kolkata",
 }
 
+# Zones whose last segment is a city people actually name in a query. The rest of
+# the tz database ("Indian/Christmas", "Antarctica/Casey", "America/Phoenix")
+# is only matched by its full name, so everyday words are not taken for places.
+_CITY_ZONES = (
+    "America/Anchorage", "America/Argentina/Buenos_Aires", "America/Bogota", "America/Caracas",
+    "America/Denver", "America/Detroit", "America/Edmonton", "America/Halifax", "America/Havana",
+    "America/Lima", "America/Mexico_City", "America/Montevideo", "America/Panama", "America/Santiago",
+    "America/Sao_Paulo", "America/Toronto", "America/Vancouver", "America/Winnipeg",
+    "Europe/Amsterdam", "Europe/Athens", "Europe/Belgrade", "Europe/Brussels", "Europe/Bucharest",
+    "Europe/Budapest", "Europe/Copenhagen", "Europe/Dublin", "Europe/Helsinki", "Europe/Istanbul",
+    "Europe/Kiev", "Europe/Lisbon", "Europe/Madrid", "Europe/Moscow", "Europe/Oslo", "Europe/Prague",
+    "Europe/Riga", "Europe/Rome", "Europe/Sofia", "Europe/Stockholm", "Europe/Tallinn", "Europe/Vienna",
+    "Europe/Vilnius", "Europe/Warsaw", "Europe/Zurich",
+    "Asia/Almaty", "Asia/Amman", "Asia/Baghdad", "Asia/Baku", "Asia/Bangkok", "Asia/Beirut", "Asia/Colombo",
+    "Asia/Dhaka", "Asia/Ho_Chi_Minh", "Asia/Jakarta", "Asia/Jerusalem", "Asia/Kabul", "Asia/Karachi",
+    "Asia/Kathmandu", "Asia/Kolkata", "Asia/Kuala_Lumpur", "Asia/Manila", "Asia/Riyadh", "Asia/Shanghai",
+    "Asia/Taipei", "Asia/Tashkent", "Asia/Tbilisi", "Asia/Tehran", "Asia/Yangon", "Asia/Yerevan",
+    "Africa/Accra", "Africa/Addis_Ababa", "Africa/Algiers", "Africa/Cairo", "Africa/Casablanca",
+    "Africa/Johannesburg", "Africa/Khartoum", "Africa/Lagos", "Africa/Nairobi", "Africa/Tunis",
+    "Australia/Adelaide", "Australia/Brisbane", "Australia/Darwin", "Australia/Hobart", "Australia/Perth",
+    "Pacific/Auckland", "Pacific/Honolulu",
+)
+
+# "GMT+5", "UTC -3", "utc+05:00"; minutes other than :00 have no Etc/ zone
+OFFSET_PATTERN = re.compile(r"\b(?:gmt|utc)\s*(?P<sign>[+-])\s*(?P<h>\d{1,2})(?::?(?P<m>\d{2}))?\b", re.I)
+
+
+@lru_cache(maxsize=1)
+def _zone_index() -> dict:
+    """Every tz database zone name, case-insensitively ("asia/kolkata")"""
+    return {zone.lower(): zone for zone in pytz.all_timezones}
+
+
+@lru_cache(maxsize=1)
+def _city_index() -> dict:
+    """The city part of the curated zones ("kolkata", "sao paulo", "buenos aires")"""
+    return {zone.rsplit("/", 1)[-1].replace("_", " ").lower(): zone for zone in _CITY_ZONES}
+
+
+def offset_zone(sign: str, hours: int, minutes: int = 0):
+    """Fixed-offset zone for UTC+hours:minutes, or None when the tz database has none"""
+    if minutes or hours > (14 if sign == "+" else 12):
+        return None
+    if hours == 0:
+        return "UTC"
+    # Etc/ zone names use POSIX signs: UTC+5 is Etc/GMT-5
+    return f"Etc/GMT{'-' if sign == '+' else '+'}{hours}"
+
+
+@lru_cache(maxsize=None)
+def get_tz(name: str):
+    """pytz.timezone, memoised; building a zone reads and parses its tzdata file"""
+    return pytz.timezone(name)
+
+
 # Mapping/abbreviation logic can be expanded
-def resolve_timezone_name(name: str) -> str:
-    """Best effort: map user input to IANA/Olson timezone."""
+@lru_cache(maxsize=4096)
+def resolve_timezone_name(name: str, cities: bool = True) -> str:
+    """Best effort: map user input to IANA/Olson timezone. cities=False leaves out bare city names."""
     if not name:
         return None
     key = name.strip().lower()
@@ -61,18 +119,20 @@ def resolve_timezone_name(name: str) -> str:
     key2 = key.replace('_', ' ').replace('-', ' ').strip()
     if key2 in _LOCATION_MAP:
         return _LOCATION_MAP[key2]
-    # already a valid tz?
-    try:
-        if name in pytz.all_timezones:
-            return name
-    except Exception:
-        pass
-    return None
+    offset = OFFSET_PATTERN.fullmatch(key)
+    if offset:
+        return offset_zone(offset.group("sign"), int(offset.group("h")), int(offset.group("m") or 0))
+    # already a valid tz, or one of the curated cities?
+    index = _zone_index()
+    zone = index.get(key) or index.get(key2)
+    if zone or not cities:
+        return zone
+    return _city_index().get(key2)
 
 def is_dst(dt: datetime, tz: str) -> bool:
     """Returns True if date/time is DST in given timezone, else False."""
     try:
-        tz_info = pytz.timezone(tz)
+        tz_info = get_tz(tz)
         return bool(tz_info.localize(dt, is_dst=None).dst())
     except Exception:
         return False
@@ -80,12 +140,12 @@ def is_dst(dt: datetime, tz: str) -> bool:
 def get_timezone_info(tz: str) -> dict:
     """Returns formatted info for a timezone."""
     try:
-        tz_obj = pytz.timezone(tz)
+        tz_obj = get_tz(tz)
         now = datetime.now(tz_obj)
         return {
             "zone": tz,
-            "long_name": tz_obj.tzname(now),
-            "offset": str(tz_obj.utcoffset(now) or "")
+            "long_name": now.tzname(),
+            "offset": str(now.utcoffset() or "")
         }
     except Exception:
         return {"zone": tz, "error": "Invalid timezone"}
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .routes import generate_image, download_image
+from .utils.file_handler import close_client
 
 app = FastAPI()
 
@@ -15,6 +16,10 @@ app.add_middleware(
 app.include_router(generate_image.router)
 app.include_router(download_image.router)
 
+@app.on_event("shutdown")
+async def shutdown():
+    await close_client()
+
 @app.get("/")
 async def root():
     return {"message": "ImageDownloaderBot Backend is running!"}
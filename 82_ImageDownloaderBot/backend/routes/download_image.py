@@ -1,8 +1,10 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, HttpUrl
-from typing import Optional
-from ..utils.file_handler import download_image_from_url
+from typing import Optional, List
+from ..utils.file_handler import (
+    download_image_from_url, download_images, extract_image_urls, BULK_CONCURRENCY, MAX_BULK_IMAGES
+)
 import re
 
 router = APIRouter()
@@ -48,3 +50,36 @@ async def download_image(request: DownloadImageRequest):
         raise he
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to download image: {str(e)}")
+
+class BulkDownloadRequest(BaseModel):
+    urls: List[str] = []
+    page_url: Optional[str] = None  # gallery page whose images should be downloaded
+    concurrency: int = BULK_CONCURRENCY
+    max_images: int = MAX_BULK_IMAGES
+
+@router.post("/download/bulk")
+async def download_images_bulk(request: BulkDownloadRequest):
+    try:
+        urls = [url.strip() for url in request.urls if url and url.strip()]
+        if request.page_url:
+            urls.extend(await extract_image_urls(request.page_url.strip()))
+
+        # Keep the first occurrence of each URL
+        urls = list(dict.fromkeys(urls))[: max(1, min(request.max_images, MAX_BULK_IMAGES))]
+        if not urls:
+            raise HTTPException(status_code=400, detail="No image URLs provided or found on the page")
+
+        results = await download_images(urls, concurrency=max(1, min(request.concurrency, BULK_CONCURRENCY)))
+        saved = [r for r in results if "error" not in r]
+
+        return {
+            "message": f"Downloaded {len(saved)} of {len(results)} images",
+            "downloaded": len(saved),
+            "duplicates": sum(1 for r in saved if r["duplicate"]),
+            "failed": len(results) - len(saved),
+            "images": results
+        }
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to download images: {str(e)}")
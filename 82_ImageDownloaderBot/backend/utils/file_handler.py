@@ -1,16 +1,79 @@
 import os
 import httpx
 import aiofiles
+import asyncio
+import hashlib
 import uuid
 import base64
-from datetime import datetime
-from typing import Optional
+import time
+from contextlib import asynccontextmanager
+from html.parser import HTMLParser
+from typing import Optional, List, Dict, Any, Tuple
 import re
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urljoin
 
 IMAGE_DIR = "./downloaded_images"
 os.makedirs(IMAGE_DIR, exist_ok=True)
 
+# Downloads larger than this are aborted mid-stream
+MAX_IMAGE_BYTES = int(os.getenv("MAX_IMAGE_BYTES", 25 * 1024 * 1024))
+MAX_PAGE_BYTES = int(os.getenv("MAX_PAGE_BYTES", 5 * 1024 * 1024))
+# Bulk downloads: images in flight overall, per host, and the minimum gap between requests to one host
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", 8))
+PER_HOST_CONCURRENCY = int(os.getenv("PER_HOST_CONCURRENCY", 2))
+PER_HOST_DELAY = float(os.getenv("PER_HOST_DELAY", 0.25))
+MAX_BULK_IMAGES = int(os.getenv("MAX_BULK_IMAGES", 200))
+
+CHUNK_SIZE = 64 * 1024
+USER_AGENT = "ImageDownloaderBot/1.0"
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Shared client so connections (and TLS sessions) are pooled across downloads"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(max_connections=BULK_CONCURRENCY * 2, max_keepalive_connections=BULK_CONCURRENCY),
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+class HostThrottle:
+    """Limits concurrent requests per host and spaces out request starts"""
+
+    def __init__(self, concurrency: int = PER_HOST_CONCURRENCY, delay: float = PER_HOST_DELAY):
+        self.concurrency = concurrency
+        self.delay = delay
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        host = urlparse(url).netloc.lower()
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.concurrency))
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with semaphore:
+            async with lock:
+                wait = self._last_start.get(host, 0.0) + self.delay - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._last_start[host] = time.monotonic()
+            yield
+
+
 def is_valid_url(url: str) -> bool:
     try:
         result = urlparse(url)
@@ -18,30 +81,71 @@ def is_valid_url(url: str) -> bool:
     except:
         return False
 
-def get_file_extension(url: str) -> str:
-    """Extract file extension from URL or default to png"""
+def get_file_extension(url: str, content_type: str = "") -> str:
+    """Extract file extension from URL (or the response content type) or default to png"""
     if url.startswith('data:image/'):
         # Extract extension from base64 image
         mime_match = re.match(r'data:image/(\w+);base64,', url)
         return mime_match.group(1) if mime_match else 'png'
-    
+
     # Extract extension from URL
     ext_match = re.search(r'\.([a-zA-Z0-9]+)(?:\?.*)?$', url)
     if ext_match and len(ext_match.group(1)) <= 5:
         return ext_match.group(1).lower()
+
+    mime_match = re.match(r'image/([a-zA-Z0-9]+)', content_type)
+    if mime_match:
+        return {'jpeg': 'jpg'}.get(mime_match.group(1).lower(), mime_match.group(1).lower())
     return 'png'
 
-async def save_generated_image(image_url: str, prompt: str) -> Optional[str]:
+
+def _store(temp_path: str, digest: str, extension: str) -> Tuple[str, bool]:
+    """Move a finished download to its content address; returns (path, already_stored)"""
+    file_path = os.path.join(IMAGE_DIR, f"{digest}.{extension}")
+    if os.path.exists(file_path):
+        os.remove(temp_path)
+        return file_path, True
+    os.replace(temp_path, file_path)
+    return file_path, False
+
+
+async def _write_bytes(data: bytes, extension: str) -> Dict[str, Any]:
+    digest = hashlib.sha256(data).hexdigest()
+    file_path = os.path.join(IMAGE_DIR, f"{digest}.{extension}")
+    if os.path.exists(file_path):
+        return {"local_path": file_path, "sha256": digest, "bytes": len(data), "duplicate": True}
+
+    temp_path = os.path.join(IMAGE_DIR, f".{uuid.uuid4()}.part")
+    async with aiofiles.open(temp_path, 'wb') as f:
+        await f.write(data)
+    file_path, duplicate = _store(temp_path, digest, extension)
+    return {"local_path": file_path, "sha256": digest, "bytes": len(data), "duplicate": duplicate}
+
+
+@asynccontextmanager
+async def _no_throttle():
+    yield
+
+
+async def fetch_image(url: str, throttle: Optional[HostThrottle] = None) -> Dict[str, Any]:
     """
-    Downloads an image from a URL and saves it locally.
-    Returns the file path if successful, None otherwise.
+    Streams an image (http(s) or data: URL) to disk under its SHA-256.
+    Identical images are stored once. Raises on invalid input, non-image
+    responses or images over MAX_IMAGE_BYTES.
     """
-    try:
-        if not is_valid_url(image_url):
-            raise ValueError("Invalid image URL provided")
+    if url.startswith('data:image/'):
+        header, encoded = url.split(",", 1)
+        data = base64.b64decode(encoded)
+        if len(data) > MAX_IMAGE_BYTES:
+            raise ValueError(f"Image exceeds {MAX_IMAGE_BYTES} bytes")
+        return await _write_bytes(data, get_file_extension(url))
+
+    if not is_valid_url(url):
+        raise ValueError("Invalid URL provided")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(image_url)
+    throttle_slot = throttle.slot(url) if throttle else _no_throttle()
+    async with throttle_slot:
+        async with get_client().stream("GET", url) as response:
             response.raise_for_status()
 
             # Verify content type is an image
@@ -49,13 +153,40 @@ async def save_generated_image(image_url: str, prompt: str) -> Optional[str]:
             if not content_type.startswith('image/'):
                 raise ValueError(f"Invalid content type: {content_type}")
 
-        file_name = f"generated_{uuid.uuid4()}.{get_file_extension(image_url)}"
-        file_path = os.path.join(IMAGE_DIR, file_name)
+            declared = int(response.headers.get('content-length') or 0)
+            if declared > MAX_IMAGE_BYTES:
+                raise ValueError(f"Image exceeds {MAX_IMAGE_BYTES} bytes")
+
+            hasher = hashlib.sha256()
+            size = 0
+            temp_path = os.path.join(IMAGE_DIR, f".{uuid.uuid4()}.part")
+            try:
+                async with aiofiles.open(temp_path, 'wb') as f:
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        size += len(chunk)
+                        if size > MAX_IMAGE_BYTES:
+                            raise ValueError(f"Image exceeds {MAX_IMAGE_BYTES} bytes")
+                        hasher.update(chunk)
+                        await f.write(chunk)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+    file_path, duplicate = _store(temp_path, hasher.hexdigest(), get_file_extension(url, content_type))
+    return {"local_path": file_path, "sha256": hasher.hexdigest(), "bytes": size, "duplicate": duplicate}
+
+
+async def save_generated_image(image_url: str, prompt: str) -> Optional[str]:
+    """
+    Downloads an image from a URL and saves it locally.
+    Returns the file path if successful, None otherwise.
+    """
+    try:
+        if not is_valid_url(image_url):
+            raise ValueError("Invalid image URL provided")
 
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(response.content)
-        
-        return file_path
+        return (await fetch_image(image_url))["local_path"]
 
     except httpx.TimeoutException:
         print(f"Timeout downloading image from {image_url}")
@@ -73,44 +204,7 @@ async def download_image_from_url(url: str) -> Optional[str]:
     Returns the file path if successful, None otherwise.
     """
     try:
-        if url.startswith('data:image/'):
-            # Handle base64 image
-            try:
-                header, encoded = url.split(",", 1)
-                file_extension = get_file_extension(url)
-                data = base64.b64decode(encoded)
-                
-                file_name = f"downloaded_{uuid.uuid4()}.{file_extension}"
-                file_path = os.path.join(IMAGE_DIR, file_name)
-                
-                async with aiofiles.open(file_path, 'wb') as f:
-                    await f.write(data)
-                return file_path
-            except Exception as e:
-                print(f"Error processing base64 image: {e}")
-                return None
-        
-        else:
-            # Handle URL
-            if not is_valid_url(url):
-                raise ValueError("Invalid URL provided")
-
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-
-                # Verify content type is an image
-                content_type = response.headers.get('content-type', '')
-                if not content_type.startswith('image/'):
-                    raise ValueError(f"Invalid content type: {content_type}")
-
-            file_name = f"downloaded_{uuid.uuid4()}.{get_file_extension(url)}"
-            file_path = os.path.join(IMAGE_DIR, file_name)
-
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(response.content)
-            
-            return file_path
+        return (await fetch_image(url))["local_path"]
 
     except httpx.TimeoutException:
         print(f"Timeout downloading image from {url}")
@@ -121,3 +215,88 @@ async def download_image_from_url(url: str) -> Optional[str]:
     except Exception as e:
         print(f"Error downloading image from {url}: {e}")
         return None
+
+
+class _ImageLinkParser(HTMLParser):
+    """Collects image URLs from <img>, <source srcset>, og:image and links to image files"""
+
+    IMAGE_LINK = re.compile(r'\.(jpg|jpeg|png|gif|bmp|webp|svg)(\?.*)?$', re.IGNORECASE)
+
+    def __init__(self):
+        super().__init__()
+        self.urls: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "img":
+            for key in ("src", "data-src", "data-original"):
+                if attrs.get(key):
+                    self.urls.append(attrs[key])
+            self._add_srcset(attrs.get("srcset"))
+        elif tag == "source":
+            self._add_srcset(attrs.get("srcset"))
+        elif tag == "meta" and attrs.get("property") in ("og:image", "twitter:image") and attrs.get("content"):
+            self.urls.append(attrs["content"])
+        elif tag == "a" and attrs.get("href") and self.IMAGE_LINK.search(attrs["href"]):
+            self.urls.append(attrs["href"])
+
+    def _add_srcset(self, srcset: Optional[str]):
+        if not srcset:
+            return
+        # Largest candidate is listed last by convention
+        candidates = [part.strip().split(" ")[0] for part in srcset.split(",") if part.strip()]
+        if candidates:
+            self.urls.append(candidates[-1])
+
+
+async def extract_image_urls(page_url: str, limit: int = MAX_BULK_IMAGES) -> List[str]:
+    """Fetch a gallery page and return the absolute image URLs on it, in page order"""
+    if not is_valid_url(page_url):
+        raise ValueError("Invalid page URL provided")
+
+    chunks = []
+    size = 0
+    async with get_client().stream("GET", page_url) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_PAGE_BYTES:
+                break
+            chunks.append(chunk)
+        encoding = response.encoding or "utf-8"
+        base_url = str(response.url)
+
+    parser = _ImageLinkParser()
+    parser.feed(b"".join(chunks).decode(encoding, errors="replace"))
+
+    seen = set()
+    urls = []
+    for raw in parser.urls:
+        url = raw if raw.startswith("data:image/") else urljoin(base_url, raw.strip())
+        if url not in seen and (url.startswith("data:image/") or url.startswith(("http://", "https://"))):
+            seen.add(url)
+            urls.append(url)
+    return urls[:limit]
+
+
+async def download_images(urls: List[str], concurrency: int = BULK_CONCURRENCY) -> List[Dict[str, Any]]:
+    """
+    Downloads many images concurrently (at most `concurrency` in flight, and
+    PER_HOST_CONCURRENCY per host). Returns one result per URL, in order;
+    failures carry an "error" instead of raising.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    throttle = HostThrottle()
+
+    async def download(url: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return {"url": url, **await fetch_image(url, throttle)}
+            except httpx.TimeoutException:
+                return {"url": url, "error": "Timed out"}
+            except httpx.HTTPStatusError as e:
+                return {"url": url, "error": f"HTTP {e.response.status_code}"}
+            except Exception as e:
+                return {"url": url, "error": str(e)}
+
+    return await asyncio.gather(*(download(url) for url in urls))
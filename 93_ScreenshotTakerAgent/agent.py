@@ -2,10 +2,8 @@ import speech_recognition as sr
 import pyautogui
 import os
 import datetime
-import time
 import sys
-from PIL import Image
-from mss import mss
+from utils.capture_engine import CaptureEngine
 from utils.llm_service import LLMService
 from config import Config
 from colorama import Fore, Style
@@ -21,6 +19,7 @@ class ScreenshotTakerAgent:
         self.recognizer = sr.Recognizer()
         self.screenshots_dir = Config.SCREENSHOTS_DIR
         Config.ensure_screenshots_dir_exists()
+        self.capture_engine = CaptureEngine(self.screenshots_dir)
         self.llm_service = LLMService(provider="gemini") # Default to Gemini
         self.last_screenshot_filepath = None
         self.prompt_template = self._load_prompt_template("prompts/screenshot_prompt.txt")
@@ -52,48 +51,84 @@ class ScreenshotTakerAgent:
             print(f"{Fore.RED}Could not request results from Google Speech Recognition service; {e}{Style.RESET_ALL}")
             return None
 
+    def _active_window_region(self):
+        """
+        Returns the active window's screen region, or None to capture the full screen.
+        """
+        try:
+            active_window = pyautogui.getActiveWindow()
+            if active_window:
+                return {
+                    "top": active_window.top,
+                    "left": active_window.left,
+                    "width": active_window.width,
+                    "height": active_window.height,
+                }
+            print(f"{Fore.YELLOW}No active window found. Taking a full screenshot instead.{Style.RESET_ALL}")
+        except Exception as e:
+            print(f"{Fore.RED}Could not capture active window ({e}). Taking a full screenshot instead.{Style.RESET_ALL}")
+        return None
+
     def take_screenshot(self, window=False):
         """
         Takes a screenshot of the entire screen or the active window.
+        The image is encoded in the background; the path is returned right away.
         """
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        filename = f"{'window_' if window else ''}{timestamp}.png"
-        filepath = os.path.join(self.screenshots_dir, filename)
-
-        if window:
-            try:
-                active_window = pyautogui.getActiveWindow()
-                if active_window:
-                    # Capture the active window using its coordinates
-                    with mss() as sct:
-                        monitor = {
-                            "top": active_window.top,
-                            "left": active_window.left,
-                            "width": active_window.width,
-                            "height": active_window.height,
-                        }
-                        sct_img = sct.grab(monitor)
-                        # Convert to PIL Image and save
-                        Image.frombytes("RGB", sct_img.size, sct_img.rgb).save(filepath)
-                    print(f"{Fore.GREEN}Window screenshot saved: {filepath}{Style.RESET_ALL}")
-                else:
-                    print(f"{Fore.YELLOW}No active window found. Taking a full screenshot instead.{Style.RESET_ALL}")
-                    pyautogui.screenshot(filepath)
-            except Exception as e:
-                print(f"{Fore.RED}Could not capture active window ({e}). Taking a full screenshot instead.{Style.RESET_ALL}")
-                pyautogui.screenshot(filepath)
-        else:
-            pyautogui.screenshot(filepath)
-        
+        region = self._active_window_region() if window else None
+        filepath = self.capture_engine.take(region, name=f"{'window_' if window else ''}{timestamp}")
+
         print(f"{Fore.GREEN}Screenshot saved: {filepath}{Style.RESET_ALL}")
         return filepath
 
+    def start_interval_capture(self, interval=None, duration=None, window=False):
+        """
+        Captures a screenshot every `interval` seconds in the background, skipping unchanged screens.
+        """
+        session = self.capture_engine.start_interval(interval, duration=duration,
+                                                     region=self._active_window_region() if window else None)
+        limit = f" for {duration:g}s" if duration else " until you say stop"
+        print(f"{Fore.GREEN}Capturing every {session.interval:g}s{limit}.{Style.RESET_ALL}")
+
+    def burst_capture(self, count=None, window=False):
+        """
+        Captures a quick series of screenshots and waits for it to finish.
+        """
+        session = self.capture_engine.burst(count, region=self._active_window_region() if window else None)
+        session.wait()
+        self.capture_engine.flush()
+        if session.files:
+            self.last_screenshot_filepath = session.files[-1]
+        self._print_session_summary(session)
+
+    def stop_capture(self):
+        """
+        Stops a running interval capture.
+        """
+        session = self.capture_engine.stop()
+        if not session:
+            print(f"{Fore.YELLOW}No capture is running.{Style.RESET_ALL}")
+            return
+        self.capture_engine.flush()
+        if session.files:
+            self.last_screenshot_filepath = session.files[-1]
+        self._print_session_summary(session)
+
+    def _print_session_summary(self, session):
+        summary = session.summary()
+        stats = self.capture_engine.get_stats()
+        print(f"{Fore.GREEN}{summary['mode'].capitalize()} capture: {summary['saved']} saved, "
+              f"{summary['duplicates']} unchanged skipped, {summary['dropped']} dropped "
+              f"(grab {stats['avg_grab_ms']:.1f}ms, encode {stats['avg_encode_ms']:.1f}ms on average){Style.RESET_ALL}")
+
     def save_screenshot(self, filepath, new_name=None):
         """
         Saves the screenshot with a new name if provided.
         """
         if new_name:
-            new_filepath = os.path.join(self.screenshots_dir, f"{new_name}.png")
+            self.capture_engine.flush()
+            extension = os.path.splitext(filepath)[1]
+            new_filepath = os.path.join(self.screenshots_dir, f"{new_name}{extension}")
             os.rename(filepath, new_filepath)
             print(f"{Fore.GREEN}Screenshot saved as: {new_filepath}{Style.RESET_ALL}")
             return new_filepath
@@ -103,6 +138,7 @@ class ScreenshotTakerAgent:
         """
         Opens the most recent screenshot.
         """
+        self.capture_engine.flush()
         files = os.listdir(self.screenshots_dir)
         if not files:
             print(f"{Fore.YELLOW}No screenshots found.{Style.RESET_ALL}")
@@ -139,6 +175,9 @@ class ScreenshotTakerAgent:
         intent = None
         name = None
         window = False
+        interval = None
+        duration = None
+        count = None
 
         for line in llm_response.split('\n'):
             if line.startswith("Intent:"):
@@ -147,6 +186,18 @@ class ScreenshotTakerAgent:
                 name = line.split(":")[1].strip()
             elif line.startswith("Window:"):
                 window = line.split(":")[1].strip().lower() == "true"
+            elif line.startswith(("Interval:", "Duration:", "Count:")):
+                key, value = line.split(":", 1)
+                try:
+                    number = float(value.strip())
+                except ValueError:
+                    continue
+                if key == "Interval":
+                    interval = number
+                elif key == "Duration":
+                    duration = number
+                else:
+                    count = int(number)
 
         if intent == "take_screenshot":
             self.last_screenshot_filepath = self.take_screenshot(window=window)
@@ -157,6 +208,12 @@ class ScreenshotTakerAgent:
                 print(f"{Fore.YELLOW}No screenshot to save. Please take a screenshot first.{Style.RESET_ALL}")
         elif intent == "open_last_screenshot":
             self.open_last_screenshot()
+        elif intent == "start_interval_capture":
+            self.start_interval_capture(interval, duration=duration, window=window)
+        elif intent == "burst_capture":
+            self.burst_capture(count, window=window)
+        elif intent == "stop_capture":
+            self.stop_capture()
         else:
             print(f"{Fore.RED}Unknown command or intent not recognized by LLM.{Style.RESET_ALL}")
 
@@ -164,10 +221,12 @@ class ScreenshotTakerAgent:
         """
         Runs the agent's main loop.
         """
-        while True:
-            command = self.listen_for_command()
-            self.process_command(command)
-            time.sleep(1)
+        try:
+            while True:
+                command = self.listen_for_command()
+                self.process_command(command)
+        finally:
+            self.capture_engine.close()
 
 if __name__ == '__main__':
     agent = ScreenshotTakerAgent()
@@ -11,6 +11,21 @@ class Config:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     SCREENSHOTS_DIR = "screenshots"
 
+    # Capture engine
+    IMAGE_FORMAT = os.getenv("SCREENSHOT_FORMAT", "png")  # png or webp
+    PNG_COMPRESS_LEVEL = int(os.getenv("PNG_COMPRESS_LEVEL", "6"))
+    WEBP_QUALITY = int(os.getenv("WEBP_QUALITY", "80"))
+    WEBP_METHOD = int(os.getenv("WEBP_METHOD", "4"))  # 0 (fast) to 6 (smallest)
+    ENCODER_WORKERS = int(os.getenv("ENCODER_WORKERS", str(min(4, os.cpu_count() or 1))))
+    ENCODE_QUEUE_SIZE = int(os.getenv("ENCODE_QUEUE_SIZE", "32"))  # Frames waiting to be encoded
+    CAPTURE_INTERVAL = float(os.getenv("CAPTURE_INTERVAL", "5"))  # Seconds between interval captures
+    BURST_COUNT = int(os.getenv("BURST_COUNT", "10"))
+    BURST_FPS = float(os.getenv("BURST_FPS", "10"))  # 0 = as fast as possible
+    DEDUP_UNCHANGED = os.getenv("DEDUP_UNCHANGED", "true").lower() == "true"
+    DEDUP_SCALE = int(os.getenv("DEDUP_SCALE", "8"))  # Thumbnail is 1/DEDUP_SCALE of the frame
+    DEDUP_TOLERANCE = int(os.getenv("DEDUP_TOLERANCE", "2"))  # Grey levels ignored as noise
+    DEDUP_MIN_CHANGED = float(os.getenv("DEDUP_MIN_CHANGED", "0"))  # Fraction of thumbnail pixels that must change
+
     @staticmethod
     def ensure_screenshots_dir_exists():
         """
@@ -1,11 +1,48 @@
-from agent import ScreenshotTakerAgent
+import argparse
 from config import config
 
+def run_capture(args):
+    """
+    Runs an interval or burst capture without voice commands (works under a virtual display such as Xvfb).
+    """
+    from utils.capture_engine import CaptureEngine
+
+    engine = CaptureEngine(config.SCREENSHOTS_DIR, image_format=args.format)
+    try:
+        if args.burst:
+            session = engine.burst(args.burst, fps=args.fps)
+        else:
+            session = engine.start_interval(args.interval, duration=args.duration, count=args.count)
+        try:
+            session.wait()
+        except KeyboardInterrupt:
+            session.stop()
+    finally:
+        engine.close()
+    summary, stats = session.summary(), engine.get_stats()
+    print(f"{summary['saved']} saved, {summary['duplicates']} unchanged skipped, {summary['dropped']} dropped, "
+          f"{summary['missed']} intervals missed; grab {stats['avg_grab_ms']:.1f}ms, "
+          f"encode {stats['avg_encode_ms']:.1f}ms on average")
+
 def main():
     """
     Main function to run the ScreenshotTakerAgent.
     """
+    parser = argparse.ArgumentParser(description="Voice-controlled screenshot agent")
+    parser.add_argument("--interval", type=float, help="Capture every N seconds instead of listening for commands")
+    parser.add_argument("--duration", type=float, help="Stop interval capture after N seconds")
+    parser.add_argument("--count", type=int, help="Stop interval capture after N grabs")
+    parser.add_argument("--burst", type=int, help="Capture a burst of N screenshots and exit")
+    parser.add_argument("--fps", type=float, help="Burst rate in frames per second (0 = as fast as possible)")
+    parser.add_argument("--format", choices=["png", "webp"], help="Image format (default: SCREENSHOT_FORMAT or png)")
+    args = parser.parse_args()
+
     config.ensure_screenshots_dir_exists()
+    if args.interval or args.burst:
+        run_capture(args)
+        return
+
+    from agent import ScreenshotTakerAgent
     agent = ScreenshotTakerAgent()
     agent.run()
 
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Capture engine tests for ScreenshotTakerAgent
+Drives bursts and single shots with a fake screen grabber, so no display is
+needed; the last test grabs the real screen with mss and is skipped when there
+is no display (run it under Xvfb: xvfb-run python test_capture_engine.py)
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from PIL import Image
+
+from utils import capture_engine
+from utils.capture_engine import CaptureEngine
+
+WIDTH, HEIGHT = 64, 48
+
+
+class FakeShot:
+    def __init__(self, size, bgra):
+        self.size = size
+        self.bgra = bgra
+
+
+class FakeScreen:
+    """Plays back a list of solid grey levels, one per grab, then repeats the last one"""
+
+    def __init__(self, levels):
+        self.levels = list(levels)
+        self.grabbed = 0
+        self.grabbers = []
+        self._lock = threading.Lock()
+
+    def grabber(self):
+        grabber = FakeGrabber(self)
+        self.grabbers.append(grabber)
+        return grabber
+
+    def next_frame(self):
+        with self._lock:
+            level = self.levels[min(self.grabbed, len(self.levels) - 1)]
+            self.grabbed += 1
+        return FakeShot((WIDTH, HEIGHT), bytes([level, level, level, 255]) * (WIDTH * HEIGHT))
+
+
+class FakeGrabber:
+    """Stands in for an mss instance"""
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.monitors = [{}, {"top": 0, "left": 0, "width": WIDTH, "height": HEIGHT}]
+        self.closed = False
+
+    def grab(self, region):
+        return self.screen.next_frame()
+
+    def close(self):
+        self.closed = True
+
+
+def skip(reason):
+    """pytest.skip under pytest, a note when run as a script"""
+    if "pytest" in sys.modules:
+        sys.modules["pytest"].skip(reason)
+    print(f"⏭️  Skipped: {reason}")
+
+
+def test_burst_count():
+    """A burst grabs exactly `count` frames and writes each one"""
+    print("🧪 Testing burst count...")
+    screen = FakeScreen(range(0, 250, 25))
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = CaptureEngine(tmp, "png", grabber_factory=screen.grabber)
+        session = engine.burst(5, fps=0, dedup=False)
+        session.wait(5)
+        engine.flush()
+        summary = session.summary()
+        assert summary["grabbed"] == 5 and summary["saved"] == 5, f"Wrong burst summary: {summary}"
+        assert all(os.path.exists(path) for path in session.files), "Burst frames were not written"
+        with Image.open(session.files[0]) as image:
+            assert image.size == (WIDTH, HEIGHT), f"Wrong image size: {image.size}"
+        engine.close()
+    print("✅ Burst grabs and saves every frame")
+
+
+def test_unchanged_frames_skipped():
+    """Frames identical to the last kept one are counted, not saved"""
+    print("🧪 Testing unchanged frame detection...")
+    screen = FakeScreen([10, 10, 200, 200, 200, 10])
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = CaptureEngine(tmp, "png", grabber_factory=screen.grabber)
+        session = engine.burst(6, fps=0, dedup=True)
+        session.wait(5)
+        engine.flush()
+        summary = session.summary()
+        assert summary["saved"] == 3 and summary["duplicates"] == 3, f"Wrong dedup summary: {summary}"
+        assert engine.get_stats()["duplicates"] == 3, "Engine stats miss the duplicates"
+        engine.close()
+    print("✅ Unchanged frames are skipped")
+
+
+def test_full_queue_drops_frames():
+    """With the encoder stalled and the queue full, the burst drops frames instead of waiting"""
+    print("🧪 Testing dropped frames on a full queue...")
+    screen = FakeScreen(range(0, 250, 25))
+    gate = threading.Event()
+    original = capture_engine.FORMATS["png"]
+    # Encoding waits on the gate, so the single worker holds one frame and the queue fills up
+    capture_engine.FORMATS["png"] = ("png", lambda: gate.wait(5) and {"format": "PNG"})
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = CaptureEngine(tmp, "png", workers=1, queue_size=1, grabber_factory=screen.grabber)
+            session = engine.burst(6, fps=0, dedup=False)
+            session.wait(5)
+            summary = session.summary()
+            gate.set()
+            engine.flush()
+            assert summary["grabbed"] == 6, f"Burst stopped early: {summary}"
+            assert summary["dropped"] >= 4 and summary["saved"] + summary["dropped"] == 6, \
+                f"Wrong drop accounting: {summary}"
+            assert engine.get_stats()["dropped"] == summary["dropped"], "Engine stats miss the drops"
+            assert all(os.path.exists(path) for path in session.files), "Queued frames were not written"
+            engine.close()
+    finally:
+        gate.set()
+        capture_engine.FORMATS["png"] = original
+    print("✅ A full queue drops frames")
+
+
+def test_flush_and_close():
+    """flush() waits for queued frames; close() stops the workers and closes every grabber"""
+    print("🧪 Testing flush and close...")
+    screen = FakeScreen([50])
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = CaptureEngine(tmp, "webp", workers=2, grabber_factory=screen.grabber)
+        paths = [engine.take(name=f"shot_{i}") for i in range(3)]
+        engine.flush()
+        assert all(os.path.exists(path) and path.endswith(".webp") for path in paths), "flush() returned early"
+        assert engine.get_stats()["queued"] == 0, "Queue not empty after flush()"
+        engine.close()
+        assert not any(worker.is_alive() for worker in engine._workers), "Encoder threads still running"
+        assert screen.grabbers and all(grabber.closed for grabber in screen.grabbers), "Grabbers left open"
+    print("✅ flush() and close() work")
+
+
+def test_real_screen():
+    """Smoke test with real mss grabs; needs a display such as Xvfb"""
+    print("🧪 Testing real screen capture...")
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        skip("no display (run under xvfb-run)")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = CaptureEngine(tmp, "png")
+        try:
+            path = engine.take(name="single")
+            session = engine.burst(3, fps=0, dedup=False)
+            session.wait(10)
+            engine.flush()
+            assert os.path.exists(path), "Single screenshot was not written"
+            assert session.summary()["grabbed"] == 3, f"Wrong burst summary: {session.summary()}"
+            assert all(os.path.exists(p) for p in session.files), "Burst frames were not written"
+        finally:
+            engine.close()
+    print("✅ Real screen capture works")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("🧪 ScreenshotTakerAgent - Capture Engine Tests")
+    print("=" * 60)
+
+    tests = [test_burst_count, test_unchanged_frames_skipped, test_full_queue_drops_frames,
+             test_flush_and_close, test_real_screen]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"❌ {e}")
+
+    print(f"\n📊 {passed}/{len(tests)} tests passed")
+    return passed == len(tests)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
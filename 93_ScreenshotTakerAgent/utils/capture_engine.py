@@ -0,0 +1,316 @@
+import datetime
+import os
+import queue
+import threading
+import time
+from PIL import Image, ImageChops
+from mss import mss
+from colorama import Fore, Style
+from config import Config
+
+# File extension and PIL save options per image format
+FORMATS = {
+    "png": ("png", lambda: {"format": "PNG", "compress_level": Config.PNG_COMPRESS_LEVEL}),
+    "webp": ("webp", lambda: {"format": "WEBP", "quality": Config.WEBP_QUALITY, "method": Config.WEBP_METHOD}),
+}
+
+
+class Frame:
+    """
+    A grabbed screen region waiting in the encode queue.
+    """
+    __slots__ = ("size", "bgra", "filepath", "captured_at")
+
+    def __init__(self, size, bgra, filepath, captured_at):
+        self.size = size
+        self.bgra = bgra
+        self.filepath = filepath
+        self.captured_at = captured_at
+
+
+class FrameDiffer:
+    """
+    Detects unchanged screens by comparing a small grayscale thumbnail of each
+    frame with the last frame that was kept. A frame counts as changed when more
+    than `min_changed` (a fraction) of the thumbnail pixels differ by more than
+    `tolerance` grey levels.
+    """
+    def __init__(self, scale=None, tolerance=None, min_changed=None):
+        self.scale = scale or Config.DEDUP_SCALE
+        self.tolerance = Config.DEDUP_TOLERANCE if tolerance is None else tolerance
+        self.min_changed = Config.DEDUP_MIN_CHANGED if min_changed is None else min_changed
+        self._last = None
+
+    def thumbnail(self, size, bgra):
+        image = Image.frombytes("RGB", size, bgra, "raw", "BGRX")
+        return image.reduce(self.scale).convert("L") if min(size) >= self.scale else image.convert("L")
+
+    def changed(self, size, bgra):
+        """
+        Returns True (and remembers the frame) if it differs from the last kept one.
+        """
+        thumb = self.thumbnail(size, bgra)
+        if self._last is not None and self._last.size == thumb.size:
+            histogram = ImageChops.difference(thumb, self._last).histogram()
+            if sum(histogram[self.tolerance + 1:]) <= self.min_changed * thumb.width * thumb.height:
+                return False
+        self._last = thumb
+        return True
+
+
+class CaptureSession:
+    """
+    Captures frames on its own thread, either every `interval` seconds or, with
+    interval 0, as fast as the screen can be grabbed. Stops after `count` grabs,
+    after `duration` seconds or when stop() is called. Frames go to the engine's
+    encode queue without waiting, so a slow encoder drops frames instead of
+    slowing the capture down.
+    """
+    def __init__(self, engine, mode, interval=0.0, count=None, duration=None, region=None, dedup=True):
+        self.engine = engine
+        self.mode = mode
+        self.interval = interval
+        self.count = count
+        self.duration = duration
+        self.region = region
+        self.differ = FrameDiffer() if dedup else None
+        self.files = []
+        self.grabbed = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self.missed = 0  # interval ticks skipped because a grab ran late
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"{mode}-capture", daemon=True)
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        self.wait(timeout)
+
+    def wait(self, timeout=None):
+        """
+        Waits until the session has finished capturing (encoding may still be running).
+        """
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self):
+        stamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        start = next_due = time.perf_counter()
+        try:
+            while not self._stop_event.is_set():
+                if self.count and self.grabbed >= self.count:
+                    break
+                if self.duration and time.perf_counter() - start >= self.duration:
+                    break
+
+                size, bgra, captured_at = self.engine.grab(self.region)
+                self.grabbed += 1
+                if self.differ and not self.differ.changed(size, bgra):
+                    self.duplicates += 1
+                    self.engine._count("duplicates")
+                else:
+                    filepath = self.engine.filepath(f"{self.mode}_{stamp}_{len(self.files) + 1:04d}")
+                    if self.engine.submit(Frame(size, bgra, filepath, captured_at), block=False):
+                        self.files.append(filepath)
+                    else:
+                        self.dropped += 1
+
+                if self.interval:
+                    # Schedule from the start time so grabs do not drift; skip ticks that already passed
+                    next_due += self.interval
+                    now = time.perf_counter()
+                    if next_due < now:
+                        skipped = int((now - next_due) // self.interval) + 1
+                        self.missed += skipped
+                        next_due += skipped * self.interval
+                    self._stop_event.wait(next_due - now)
+        except Exception as e:
+            self.engine._count("errors")
+            print(f"{Fore.RED}{self.mode.capitalize()} capture stopped: {e}{Style.RESET_ALL}")
+        finally:
+            self.engine.release_grabber()
+
+    def summary(self):
+        return {
+            "mode": self.mode,
+            "grabbed": self.grabbed,
+            "saved": len(self.files),
+            "duplicates": self.duplicates,
+            "dropped": self.dropped,
+            "missed": self.missed,
+        }
+
+
+class CaptureEngine:
+    """
+    Grabs screens with one persistent mss instance per thread and encodes them on
+    a pool of background threads fed by a bounded queue, so grabbing never waits
+    for PNG/WebP compression. Supports single shots, interval capture and bursts.
+    """
+    def __init__(self, output_dir=None, image_format=None, workers=None, queue_size=None, grabber_factory=mss):
+        self.output_dir = output_dir or Config.SCREENSHOTS_DIR
+        self.image_format = (image_format or Config.IMAGE_FORMAT).lower()
+        if self.image_format not in FORMATS:
+            raise ValueError(f"Unsupported image format: {self.image_format}")
+        self._grabber_factory = grabber_factory
+        self._local = threading.local()
+        self._grabbers = []
+        self._queue = queue.Queue(maxsize=queue_size or Config.ENCODE_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._stats = {"grabbed": 0, "saved": 0, "duplicates": 0, "dropped": 0, "errors": 0,
+                       "grab_seconds": 0.0, "encode_seconds": 0.0}
+        self.session = None
+        self._workers = [threading.Thread(target=self._encode_loop, name=f"screenshot-encoder-{i}", daemon=True)
+                         for i in range(workers or Config.ENCODER_WORKERS)]
+        for worker in self._workers:
+            worker.start()
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _grabber(self):
+        # mss handles are not shared between threads, so each thread keeps its own open
+        grabber = getattr(self._local, "grabber", None)
+        if grabber is None:
+            grabber = self._local.grabber = self._grabber_factory()
+            with self._lock:
+                self._grabbers.append(grabber)
+        return grabber
+
+    def release_grabber(self):
+        """
+        Closes the calling thread's grabber (capture threads call this when they finish).
+        """
+        grabber = getattr(self._local, "grabber", None)
+        if grabber is not None:
+            self._local.grabber = None
+            with self._lock:
+                if grabber in self._grabbers:
+                    self._grabbers.remove(grabber)
+            grabber.close()
+
+    def grab(self, region=None):
+        """
+        Grabs a region ({"top", "left", "width", "height"}) or the primary monitor.
+        Returns (size, BGRA bytes, perf_counter time of the grab).
+        """
+        grabber = self._grabber()
+        started = time.perf_counter()
+        shot = grabber.grab(region or grabber.monitors[1])
+        finished = time.perf_counter()
+        with self._lock:
+            self._stats["grabbed"] += 1
+            self._stats["grab_seconds"] += finished - started
+        return shot.size, shot.bgra, finished
+
+    def filepath(self, name):
+        return os.path.join(self.output_dir, f"{name}.{FORMATS[self.image_format][0]}")
+
+    def submit(self, frame, block=True):
+        """
+        Queues a frame for encoding. Without `block`, a full queue drops the frame and returns False.
+        """
+        try:
+            self._queue.put(frame, block=block)
+            return True
+        except queue.Full:
+            self._count("dropped")
+            return False
+
+    def take(self, region=None, name=None):
+        """
+        Grabs one screenshot and queues it for encoding; returns the file path it
+        will be written to. Call flush() before reading the file.
+        """
+        size, bgra, captured_at = self.grab(region)
+        name = name or datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        filepath = self.filepath(name)
+        self.submit(Frame(size, bgra, filepath, captured_at))
+        return filepath
+
+    def _encode_loop(self):
+        while True:
+            frame = self._queue.get()
+            try:
+                if frame is None:
+                    return
+                started = time.perf_counter()
+                image = Image.frombytes("RGB", frame.size, frame.bgra, "raw", "BGRX")
+                image.save(frame.filepath, **FORMATS[self.image_format][1]())
+                with self._lock:
+                    self._stats["saved"] += 1
+                    self._stats["encode_seconds"] += time.perf_counter() - started
+            except Exception as e:
+                self._count("errors")
+                print(f"{Fore.RED}Could not save {frame.filepath}: {e}{Style.RESET_ALL}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """
+        Waits until every queued frame has been written.
+        """
+        self._queue.join()
+
+    def start_interval(self, interval=None, duration=None, count=None, region=None, dedup=None):
+        """
+        Starts capturing every `interval` seconds in the background, replacing any running session.
+        """
+        return self._start(CaptureSession(self, "interval", interval or Config.CAPTURE_INTERVAL, count, duration,
+                                          region, Config.DEDUP_UNCHANGED if dedup is None else dedup))
+
+    def burst(self, count=None, fps=None, region=None, dedup=None):
+        """
+        Starts a burst of `count` grabs at `fps` frames per second (0 = as fast as possible).
+        """
+        fps = Config.BURST_FPS if fps is None else fps
+        return self._start(CaptureSession(self, "burst", 1.0 / fps if fps else 0.0, count or Config.BURST_COUNT,
+                                          None, region, Config.DEDUP_UNCHANGED if dedup is None else dedup))
+
+    def _start(self, session):
+        self.stop()
+        self.session = session.start()
+        return session
+
+    def stop(self):
+        """
+        Stops the running interval or burst session, if any.
+        """
+        session, self.session = self.session, None
+        if session:
+            session.stop()
+        return session
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        grab_seconds, encode_seconds = stats.pop("grab_seconds"), stats.pop("encode_seconds")
+        stats["avg_grab_ms"] = grab_seconds / stats["grabbed"] * 1000 if stats["grabbed"] else 0.0
+        stats["avg_encode_ms"] = encode_seconds / stats["saved"] * 1000 if stats["saved"] else 0.0
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def close(self):
+        """
+        Stops capturing, writes out queued frames and releases the grabbers.
+        """
+        self.stop()
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        for grabber in self._grabbers:
+            try:
+                grabber.close()
+            except Exception:
+                pass
+        self._grabbers = []